@@ -35,6 +35,8 @@
 ##########################################################################
 
 import os
+import sys
+import traceback
 
 import IECore
 
@@ -72,6 +74,40 @@ class execute( Gaffer.Application ) :
 					allowEmptyList = False,
 				),
 				
+				IECore.StringParameter(
+					name = "diskCacheDirectory",
+					description = "A directory in which to store expensive computed "
+						"values, so that they may be reused by subsequent executions "
+						"on the same host. Leave empty to disable the disk cache.",
+					defaultValue = "",
+				),
+				
+				IECore.BoolParameter(
+					name = "performanceMonitor",
+					description = "Turns on a performance monitor, and outputs "
+						"statistics describing the most expensive plugs once "
+						"execution is complete.",
+					defaultValue = False,
+				),
+				
+				IECore.IntParameter(
+					name = "processes",
+					description = "The number of processes to execute frames in. "
+						"Worker processes are forked before the script is loaded, "
+						"and each loads the script and executes a share of the frames.",
+					defaultValue = 1,
+					minValue = 1,
+				),
+				
+				IECore.IntParameter(
+					name = "threads",
+					description = "The number of threads used for computation in "
+						"each process. A value of 0 chooses automatically based "
+						"on the number of cores.",
+					defaultValue = 0,
+					minValue = 0,
+				),
+				
 			]
 			
 		)
@@ -83,7 +119,81 @@ class execute( Gaffer.Application ) :
 		)
 		
 	def _run( self, args ) :
+		
+		frames = self.parameters()["frames"].getFrameListValue().asList()
+		numProcesses = min( args["processes"].value, len( frames ) )
+		if numProcesses <= 1 :
+			return self.__executeFrames( frames, args )
+		
+		# Fork the workers before anything has been loaded or computed, as
+		# fork() only duplicates the calling thread, and would leave the
+		# workers with broken copies of any TBB or ComputeFuture threads
+		# started by the parent. Each worker then loads the script itself.
+		# The frames are interleaved between the workers to balance the load
+		# when the cost of frames varies through the sequence.
+		
+		sys.stdout.flush()
+		sys.stderr.flush()
+		
+		pids = []
+		for i in range( 0, numProcesses ) :
+			pid = os.fork()
+			if pid == 0 :
+				status = 1
+				try :
+					status = self.__executeFrames( frames[i::numProcesses], args )
+				except :
+					traceback.print_exc()
+				finally :
+					sys.stdout.flush()
+					sys.stderr.flush()
+					# skip the cleanup of the parent's state
+					os._exit( status )
+			pids.append( pid )
+		
+		result = 0
+		for pid in pids :
+			pid, status = os.waitpid( pid, 0 )
+			if not os.WIFEXITED( status ) or os.WEXITSTATUS( status ) != 0 :
+				result = 1
+		
+		return result
+	
+	def __executeFrames( self, frames, args ) :
+		
+		# The scheduler must be initialised before the script is loaded,
+		# because TBB fixes the number of threads the first time it is used.
+		threads = args["threads"].value
+		with IECore.tbb_task_scheduler_init( threads if threads else IECore.tbb_task_scheduler_init.automatic ) :
 			
+			if args["diskCacheDirectory"].value :
+				Gaffer.ValuePlug.setDiskCacheDirectory( args["diskCacheDirectory"].value )
+			
+			scriptNode, nodes = self.__load( args )
+			if scriptNode is None :
+				return 1
+			
+			if args["performanceMonitor"].value :
+				monitor = Gaffer.PerformanceMonitor()
+				with monitor :
+					failedFrames = self.__execute( scriptNode, nodes, frames )
+				IECore.msg( IECore.Msg.Level.Info, "gaffer execute", "Performance statistics :\n" + monitor.formatStatistics() )
+			else :
+				failedFrames = self.__execute( scriptNode, nodes, frames )
+		
+		if failedFrames :
+			IECore.msg(
+				IECore.Msg.Level.Error, "gaffer execute",
+				"Failed frames : %s" % ", ".join( str( f ) for f in failedFrames )
+			)
+			return 1
+		
+		return 0
+	
+	## Returns the loaded script and the nodes to execute, or
+	# ( None, None ) if they couldn't be found.
+	def __load( self, args ) :
+		
 		scriptNode = Gaffer.ScriptNode( os.path.splitext( os.path.basename( args["script"].value ) )[0] )
 		scriptNode["fileName"].setValue( os.path.abspath( args["script"].value ) )
 		scriptNode.load()
@@ -95,10 +205,10 @@ class execute( Gaffer.Application ) :
 				node = scriptNode.getChild( nodeName )
 				if node is None :
 					IECore.msg( IECore.Msg.Level.Error, "gaffer execute", "Node \"%s\" does not exist" % nodeName )
-					return 1
+					return None, None
 				if not hasattr( node, "execute" ) :
 					IECore.msg( IECore.Msg.Level.Error, "gaffer execute", "Node \"%s\" is not executable" % nodeName )
-					return 1
+					return None, None
 				nodes.append( node )
 		else :
 			for node in scriptNode.children() :
@@ -106,15 +216,27 @@ class execute( Gaffer.Application ) :
 					nodes.append( node )
 			if not nodes :
 				IECore.msg( IECore.Msg.Level.Error, "gaffer execute", "Script has no executable nodes" )
-				return 1
+				return None, None
 		
+		return scriptNode, nodes
+
+	## Returns the list of frames which failed to execute. A failure
+	# is reported immediately, and execution continues with the next
+	# frame.
+	def __execute( self, scriptNode, nodes, frames ) :
+	
+		failedFrames = []
 		context = Gaffer.Context( scriptNode.context() )
-		for frame in self.parameters()["frames"].getFrameListValue().asList() :
+		for frame in frames :
 			context.setFrame( frame )
-			for node in nodes :
-				node.execute( [ context ] )
+			try :
+				for node in nodes :
+					node.execute( [ context ] )
+			except Exception, e :
+				IECore.msg( IECore.Msg.Level.Error, "gaffer execute", "Frame %d failed : %s" % ( frame, e ) )
+				failedFrames.append( frame )
 		
-		return 0
+		return failedFrames
 
 IECore.registerRunTimeTyped( execute )
 
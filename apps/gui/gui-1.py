@@ -65,6 +65,14 @@ class gui( Gaffer.Application ) :
 					description = "Opens the UI in full screen mode.",
 					defaultValue = False,
 				),
+				
+				IECore.BoolParameter(
+					name = "performanceMonitor",
+					description = "Turns on a performance monitor, and outputs "
+						"statistics describing the most expensive plugs when "
+						"the application exits.",
+					defaultValue = False,
+				),
 			]
 			
 		)
@@ -96,7 +104,13 @@ class gui( Gaffer.Application ) :
 			primaryWindow = GafferUI.ScriptWindow.acquire( primaryScript )
 			primaryWindow.setFullScreen( True )
 			
-		GafferUI.EventLoop.mainEventLoop().start()		
+		if args["performanceMonitor"].value :
+			monitor = Gaffer.PerformanceMonitor()
+			with monitor :
+				GafferUI.EventLoop.mainEventLoop().start()
+			IECore.msg( IECore.Msg.Level.Info, "gaffer gui", "Performance statistics :\n" + monitor.formatStatistics() )
+		else :
+			GafferUI.EventLoop.mainEventLoop().start()		
 				
 		return 0
 
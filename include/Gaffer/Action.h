@@ -68,6 +68,11 @@ class Action : public IECore::RefCounted
 		typedef boost::function<void ()> Function;
 
 		static void enact( GraphComponentPtr subject, const Function &doFn, const Function &undoFn );
+		/// As above, but for use with Action subclasses which implement
+		/// memoryUsage() or canMerge(). The action is enacted immediately,
+		/// and takes its place in the undo history if undo is enabled for
+		/// subject.
+		static void enact( GraphComponentPtr subject, Ptr action );
 
 	protected :
 
@@ -76,6 +81,25 @@ class Action : public IECore::RefCounted
 		
 		void doAction();
 		void undoAction();
+		
+		/// Returns an estimate of the memory used by the Action, so that
+		/// ScriptNode can keep the undo history within the limit specified
+		/// by ScriptNode::setUndoMemoryLimit(). The default implementation
+		/// returns sizeof( Action ), and should be reimplemented by
+		/// subclasses which store significant amounts of data.
+		virtual size_t memoryUsage() const;
+		/// May be implemented to return true if other, which has been done
+		/// immediately after this Action, can be merged into it. This allows
+		/// a series of edits (for instance the values set while dragging a
+		/// slider) to be stored as a single Action. The default implementation
+		/// returns false.
+		virtual bool canMerge( const Action *other ) const;
+		/// Merges other into this Action, so that undoing this undoes both and
+		/// redoing this redoes both. The default implementation adopts the
+		/// do function from other, which is only appropriate when other entirely
+		/// supersedes the effect of this Action, as is the case for consecutive
+		/// calls to ValuePlug::setValue().
+		virtual void merge( const Action *other );
 
 	private :
 
@@ -0,0 +1,180 @@
+//////////////////////////////////////////////////////////////////////////
+//  
+//  Copyright (c) 2013, Image Engine Design Inc. All rights reserved.
+//  
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//  
+//      * Redistributions of source code must retain the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer.
+//  
+//      * Redistributions in binary form must reproduce the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer in the documentation and/or other materials provided with
+//        the distribution.
+//  
+//      * Neither the name of John Haddon nor the names of
+//        any other contributors to this software may be used to endorse or
+//        promote products derived from this software without specific prior
+//        written permission.
+//  
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//  
+//////////////////////////////////////////////////////////////////////////
+
+
+#ifndef GAFFER_ARITHMETICEXPRESSIONENGINE_H
+#define GAFFER_ARITHMETICEXPRESSIONENGINE_H
+
+#include <stdint.h>
+
+#include "IECore/InternedString.h"
+
+#include "Gaffer/Expression.h"
+
+namespace Gaffer
+{
+
+/// An Expression::Engine for simple arithmetic expressions, registered
+/// with the type "arithmetic". Expressions are compiled into a compact
+/// bytecode when the engine is created, and are evaluated entirely in
+/// C++ without touching python, so they don't hold the GIL and may be
+/// evaluated concurrently by many threads.
+///
+/// The language uses a subset of the python syntax, so that simple
+/// python expressions may be used unchanged :
+///
+/// parent["node"]["plug"] = sin( context.getFrame() * pi / 12 ) + parent["other"]["plug"]
+///
+/// - A single assignment to a FloatPlug, IntPlug or BoolPlug is allowed,
+///   and FloatPlugs, IntPlugs and BoolPlugs may be read.
+/// - context["name"], context.get( "name" ) and context.get( "name", default )
+///   read numeric context variables, and context.getFrame() reads the frame.
+/// - The operators + - * / % ** < > <= >= == != are supported, along with
+///   parentheses and unary minus.
+/// - The functions abs, ceil, floor, sqrt, exp, log, pow, sin, cos, tan,
+///   asin, acos, atan, atan2, min, max, clamp, int and float are available,
+///   as is the constant pi.
+///
+/// Arithmetic follows the python 2 rules for mixing integers and floats.
+/// Integer literals, IntPlugs, BoolPlugs and integer or bool context variables
+/// provide integer values, and operations on integers produce integers, so that
+/// "/" performs floor division and "10 / 4 * 4" evaluates to 8. If either operand
+/// is a float the operation is performed in double precision, as are all the
+/// functions other than abs, int, min, max and clamp, which preserve integers.
+/// Integers are 64 bit, rather than being promoted to arbitrary precision on
+/// overflow, and octal and hexadecimal literals are not supported. Division by
+/// zero is an error. Float results are truncated when written to an IntPlug.
+class ArithmeticExpressionEngine : public Expression::Engine
+{
+
+	public :
+	
+		/// Throws if the expression is not valid.
+		ArithmeticExpressionEngine( const std::string &expression );
+		virtual ~ArithmeticExpressionEngine();
+		
+		virtual std::string outPlug();
+		virtual void inPlugs( std::vector<std::string> &plugPaths );
+		virtual void contextNames( std::vector<std::string> &names );
+		virtual void execute( const Context *context, const std::vector<const ValuePlug *> &proxyInputs, ValuePlug *proxyOutput );
+		
+	private :
+	
+		class Parser;
+		friend class Parser;
+		struct Evaluation;
+		friend struct Evaluation;
+	
+		enum Opcode
+		{
+			PushConstant,
+			PushInput,
+			PushContextVariable,
+			PushFrame,
+			Negate,
+			Add,
+			Subtract,
+			Multiply,
+			Divide,
+			Modulo,
+			Power,
+			Less,
+			Greater,
+			LessEqual,
+			GreaterEqual,
+			Equal,
+			NotEqual,
+			Absolute,
+			ToInteger,
+			ToFloat,
+			Minimum,
+			Maximum,
+			Clamp,
+			CallUnary,
+			CallBinary
+		};
+		
+		typedef double (*UnaryFunction)( double );
+		typedef double (*BinaryFunction)( double, double );
+		
+		// A value on the stack, which may be either
+		// an integer or a float.
+		struct Value
+		{
+			Value();
+			Value( int64_t i );
+			Value( double f );
+			
+			double toFloat() const;
+			
+			bool isInteger;
+			union
+			{
+				int64_t i;
+				double f;
+			};
+		};
+		
+		struct Instruction
+		{
+			Instruction( Opcode o, const Value &v = Value(), size_t i = 0 );
+		
+			Opcode opcode;
+			// the constant for PushConstant, and the
+			// default value for PushContextVariable.
+			Value value;
+			// the index into the inputs for PushInput, and
+			// into m_contextNames for PushContextVariable.
+			size_t index;
+			bool hasDefault;
+			UnaryFunction unaryFunction;
+			BinaryFunction binaryFunction;
+		};
+		
+		typedef std::vector<Instruction> Program;
+		
+		Program m_program;
+		size_t m_maxStackSize;
+		
+		std::string m_outPlug;
+		std::vector<std::string> m_inPlugs;
+		std::vector<IECore::InternedString> m_contextNames;
+		
+};
+
+} // namespace Gaffer
+
+#endif // GAFFER_ARITHMETICEXPRESSIONENGINE_H
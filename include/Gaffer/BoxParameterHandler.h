@@ -69,6 +69,7 @@ class BoxParameterHandler : public ParameterHandler
 		virtual Gaffer::ConstPlugPtr plug() const;
 		virtual void setParameterValue();
 		virtual void setPlugValue();
+		virtual IECore::ObjectPtr computeParameterValue() const;
 		
 	private :
 	
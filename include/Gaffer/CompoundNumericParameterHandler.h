@@ -68,6 +68,7 @@ class CompoundNumericParameterHandler : public ParameterHandler
 		virtual Gaffer::ConstPlugPtr plug() const;
 		virtual void setParameterValue();
 		virtual void setPlugValue();
+		virtual IECore::ObjectPtr computeParameterValue() const;
 		
 	private :
 	
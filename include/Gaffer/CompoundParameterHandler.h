@@ -65,6 +65,7 @@ class CompoundParameterHandler : public ParameterHandler
 		virtual Gaffer::ConstPlugPtr plug() const;
 		virtual void setParameterValue();
 		virtual void setPlugValue();
+		virtual IECore::ObjectPtr computeParameterValue() const;
 		
 		ParameterHandlerPtr childParameterHandler( IECore::ParameterPtr childParameter );
 		ConstParameterHandlerPtr childParameterHandler( IECore::ParameterPtr childParameter ) const;
@@ -0,0 +1,141 @@
+//////////////////////////////////////////////////////////////////////////
+//  
+//  Copyright (c) 2013, Image Engine Design Inc. All rights reserved.
+//  
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//  
+//      * Redistributions of source code must retain the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer.
+//  
+//      * Redistributions in binary form must reproduce the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer in the documentation and/or other materials provided with
+//        the distribution.
+//  
+//      * Neither the name of John Haddon nor the names of
+//        any other contributors to this software may be used to endorse or
+//        promote products derived from this software without specific prior
+//        written permission.
+//  
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//  
+//////////////////////////////////////////////////////////////////////////
+
+
+#ifndef GAFFER_COMPUTEFUTURE_H
+#define GAFFER_COMPUTEFUTURE_H
+
+#include "boost/function.hpp"
+#include "boost/thread/mutex.hpp"
+#include "boost/thread/condition_variable.hpp"
+
+#include "tbb/atomic.h"
+
+#include "IECore/Object.h"
+#include "IECore/Exception.h"
+
+namespace Gaffer
+{
+
+IE_CORE_FORWARDDECLARE( Context )
+
+/// A ComputeFuture represents a value being computed asynchronously on a
+/// background thread, typically launched via ValuePlug::getValueAsync().
+/// This allows a UI to request an expensive value without blocking, and
+/// to cancel the request if it becomes stale before it has completed -
+/// for instance because the graph or the context has been changed.
+///
+/// Cancellation is cooperative. Computations which haven't yet started are
+/// never started, and those in progress are stopped the next time
+/// checkCancellation() is called. ValuePlug calls checkCancellation() before
+/// each hash and compute, so upstream evaluation stops promptly, but nodes
+/// with particularly long running computes should also call it periodically
+/// from within compute() itself.
+class ComputeFuture : public IECore::RefCounted
+{
+
+	public :
+
+		IE_CORE_DECLAREMEMBERPTR( ComputeFuture )
+
+		virtual ~ComputeFuture();
+
+		typedef boost::function<IECore::ConstObjectPtr ()> Function;
+
+		/// Launches f on a background thread, with a copy of the
+		/// current context in scope, and returns immediately.
+		static ComputeFuturePtr launch( Function f );
+
+		/// Returns true if the computation has finished, whether by
+		/// succeeding, failing or being cancelled.
+		bool done() const;
+		/// Waits until the computation is done and returns the result.
+		/// If the computation failed, the exception is rethrown as an
+		/// IECore::Exception, and if it was cancelled then Cancelled is
+		/// thrown.
+		IECore::ConstObjectPtr get();
+
+		/// Requests that the computation be cancelled. Returns
+		/// immediately, without waiting for the computation to stop.
+		void cancel();
+		bool cancelled() const;
+
+		/// Throws Cancelled if the current computation is being performed
+		/// on behalf of a ComputeFuture which has been cancelled, and does
+		/// nothing otherwise. This is cheap enough to be called frequently.
+		/// The future is found via the current Context, so the check works
+		/// equally well from threads spawned by the computation (with
+		/// tbb::parallel_for for instance), provided they use copies of the
+		/// original context.
+		static void checkCancellation();
+
+		/// The exception thrown by checkCancellation().
+		class Cancelled : public IECore::Exception
+		{
+		
+			public :
+			
+				Cancelled();
+		
+		};
+
+	private :
+
+		ComputeFuture( Function f );
+
+		// Called on the background thread to perform the computation.
+		void run();
+
+		class Dispatcher;
+
+		Function m_function;
+		ConstContextPtr m_context;
+
+		tbb::atomic<bool> m_cancelled;
+
+		mutable boost::mutex m_mutex;
+		boost::condition_variable m_condition;
+		bool m_done;
+		IECore::ConstObjectPtr m_result;
+		std::string m_error;
+
+};
+
+IE_CORE_DECLAREPTR( ComputeFuture );
+
+} // namespace Gaffer
+
+#endif // GAFFER_COMPUTEFUTURE_H
@@ -63,6 +63,16 @@ class ComputeNode : public DependencyNode
 
 		IE_CORE_DECLARERUNTIMETYPEDEXTENSION( Gaffer::ComputeNode, ComputeNodeTypeId, DependencyNode );
 		
+		/// May be implemented to return true if the hashes computed by this node are
+		/// stable from one session to the next, so that the values they identify may be
+		/// stored in the disk cache and reused by subsequent sessions - see
+		/// ValuePlug::setDiskCacheDirectory(). This requires that the node's TypeId is
+		/// fixed (Python nodes must be registered with an explicit TypeId), and that the
+		/// hash accounts for any external state the computation depends on - for instance
+		/// the modification times of files which are read. Values are only stored on disk
+		/// if every node upstream also returns true. The default implementation returns false.
+		virtual bool hashIsStableBetweenSessions() const;
+		
 	protected :
 		
 		/// Called to compute the hashes for output Plugs. Must be implemented to call the base
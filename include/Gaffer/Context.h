@@ -37,6 +37,11 @@
 #ifndef GAFFER_CONTEXT_H
 #define GAFFER_CONTEXT_H
 
+#include <map>
+#include <set>
+
+#include "tbb/spin_mutex.h"
+
 #include "IECore/CompoundData.h"
 #include "IECore/InternedString.h"
 
@@ -45,6 +50,8 @@
 namespace Gaffer
 {
 
+IE_CORE_FORWARDDECLARE( ComputeFuture )
+
 /// This class defines the context in which a computation is performed. The most basic element
 /// common to all Contexts is the frame number, but a context may hold entirely arbitrary
 /// information useful to specific types of computation. Contexts are made current using the
@@ -52,6 +59,21 @@ namespace Gaffer
 /// made with respect to the current Context. Each thread maintains a stack of contexts,
 /// allowing computations in different contexts to be performed in parallel, and allowing
 /// contexts to be changed temporarily for a specific computation.
+///
+/// Contexts are frequently copied during computation, typically in order to change
+/// only one or two variables before evaluating an upstream plug. Copying is therefore
+/// cheap - the entries are held in storage shared between the original and the copy,
+/// and each context holds only a small number of its own overrides on top. The hash
+/// is also maintained incrementally, so that set() and hash() are constant time
+/// operations regardless of the number of entries.
+///
+/// Nodes needn't declare which variables their computations depend upon.
+/// Instead, the variables accessed via get() during ComputeNode::hash()
+/// are recorded, and ValuePlug keys its hash cache on only those variables.
+/// A node whose hash doesn't read the frame will therefore share its cached
+/// hash (and hence its cached value) between all frames. Calling hash(),
+/// names() or operator == during ComputeNode::hash() is taken to mean that
+/// the result depends on the entire context.
 class Context : public IECore::RefCounted
 {
 
@@ -94,6 +116,8 @@ class Context : public IECore::RefCounted
 		/// A signal emitted when an element of the context is changed.
 		ChangedSignal &changedSignal();
 		
+		/// Returns a hash representing the contents of the context.
+		/// This is cached internally, so is cheap to call.
 		IECore::MurmurHash hash() const;
 		
 		bool operator == ( const Context &other ) const;
@@ -107,6 +131,12 @@ class Context : public IECore::RefCounted
 		/// of accepting Contexts, CompoundData, CompoundObjects etc.
 		std::string substitute( const std::string &input ) const;
 		
+		/// Returns the ComputeFuture on whose behalf computations in this
+		/// context are being performed, or 0 if there is none. This is passed
+		/// on to copies of the context, but does not contribute to hash() or
+		/// operator ==. See ComputeFuture::checkCancellation().
+		const ComputeFuture *computeFuture() const;
+		
 		/// The Scope class is used to push and pop the current context on
 		/// the calling thread.
 		class Scope
@@ -126,8 +156,95 @@ class Context : public IECore::RefCounted
 		
 	private :
 	
-		IECore::CompoundDataPtr m_data;
+		friend class ComputeFuture;
+		friend class ValuePlug;
+	
+		// The values are stored along with a hash of the name and value
+		// of the entry. The hash of the context as a whole is derived from
+		// the sum of the entry hashes, which is independent of the order
+		// in which entries were set, and can be updated in constant time
+		// when a single entry changes.
+		struct Storage
+		{
+			IECore::ConstDataPtr data;
+			uint64_t hash[2];
+		};
+		
+		typedef std::map<IECore::InternedString, Storage> Map;
+		
+		// Entries are held in an immutable SharedMap, which is shared with
+		// all copies of the context, and changes are made in a small map of
+		// overrides private to each context. Copying a context therefore only
+		// copies the overrides. When there are too many overrides, they are
+		// merged into a new SharedMap.
+		struct SharedMap : public IECore::RefCounted
+		{
+			Map map;
+		};
+		
+		IE_CORE_DECLAREPTR( SharedMap )
+		
+		// Returns the storage for the named entry, or 0 if it doesn't exist.
+		const Storage *storage( const IECore::InternedString &name ) const;
+		// Fills entries with all the entries of the context, in name order.
+		void entries( std::vector<const Map::value_type *> &entries ) const;
+		
+		// Called when an entry has been changed, to update its hash and
+		// the hash of the context as a whole, and to emit changedSignal().
+		// The previousHash is the hash of the entry before it was changed,
+		// or 0 for a new entry.
+		void entryChanged( const IECore::InternedString &name, Storage &storage, const uint64_t *previousHash );
+		
+		// Records the names of the entries read from a context. ValuePlug::hash()
+		// assigns a tracker to a copy of the current context before calling
+		// ComputeNode::hash(). The tracker is passed on to further copies, so
+		// reads made by upstream nodes in modified contexts are recorded too.
+		class DependencyTracker : public IECore::RefCounted
+		{
+		
+			public :
+			
+				DependencyTracker();
+				
+				IE_CORE_DECLAREMEMBERPTR( DependencyTracker )
+				
+				typedef std::set<IECore::InternedString> Names;
+				
+				void add( const IECore::InternedString &name );
+				void add( const DependencyTracker *other );
+				void addAll();
+				// Records that the hash depends on a node whose hashes
+				// are not stable between sessions - see
+				// ComputeNode::hashIsStableBetweenSessions().
+				void addUnstable();
+				
+				// The accessors must only be used once tracking is complete.
+				const Names &names() const;
+				bool all() const;
+				bool unstable() const;
+			
+			private :
+			
+				tbb::spin_mutex m_mutex;
+				Names m_names;
+				bool m_all;
+				bool m_unstable;
+				
+		};
+		
+		IE_CORE_DECLAREPTR( DependencyTracker )
+		
+		// Returns a hash of just the named entries, equivalent to hash()
+		// for a context reduced to contain only those entries.
+		IECore::MurmurHash variablesHash( const DependencyTracker::Names &names ) const;
+		
+		ConstSharedMapPtr m_sharedMap;
+		Map m_overrides;
+		uint64_t m_hashSum[2];
+		IECore::MurmurHash m_hash;
 		ChangedSignal *m_changedSignal;
+		ConstComputeFuturePtr m_computeFuture;
+		DependencyTrackerPtr m_dependencyTracker;
 
 };
 
@@ -48,9 +48,9 @@ struct Context::Accessor
 	typedef const T &ResultType;
 	
 	/// Returns true if the value has changed
-	bool set( IECore::DataPtr &data, const T &value )
+	bool set( IECore::ConstDataPtr &data, const T &value )
 	{
-		IECore::TypedData<T> *d = IECore::runTimeCast<IECore::TypedData<T> >( data.get() );
+		const IECore::TypedData<T> *d = IECore::runTimeCast<const IECore::TypedData<T> >( data.get() );
 		if( d )
 		{
 			if( d->readable() == value )
@@ -58,18 +58,19 @@ struct Context::Accessor
 				// no change so early out
 				return false;
 			}
-			else
+			else if( d->refCount() == 1 )
 			{
+				// we're the sole owner of the data, so we can
 				// update in place to avoid allocations
-				d->writable() = value;
+				const_cast<IECore::TypedData<T> *>( d )->writable() = value;
 				return true;
-			}			
-		}
-		else
-		{
-			data = new IECore::TypedData<T>( value );
-			return true;
+			}
 		}
+		
+		// the data may be shared with other contexts, so
+		// we must replace it rather than modify it.
+		data = new IECore::TypedData<T>( value );
+		return true;
 	}
 	
 	ResultType get( const IECore::ConstDataPtr &data )
@@ -88,7 +89,7 @@ struct Context::Accessor<T, typename boost::enable_if<boost::is_base_of<IECore::
 	typedef typename boost::remove_pointer<T>::type ValueType;
 	typedef const ValueType *ResultType;
 	
-	bool set( IECore::DataPtr &data, const T &value )
+	bool set( IECore::ConstDataPtr &data, const T &value )
 	{
 		const ValueType *d = IECore::runTimeCast<const ValueType>( data.get() );
 		if( d && d->isEqualTo( value ) )
@@ -100,7 +101,7 @@ struct Context::Accessor<T, typename boost::enable_if<boost::is_base_of<IECore::
 		return true;
 	}
 	
-	ResultType get( const IECore::DataPtr &data )
+	ResultType get( const IECore::ConstDataPtr &data )
 	{
 		if( !data->isInstanceOf( T::staticTypeId() ) )
 		{
@@ -113,36 +114,58 @@ struct Context::Accessor<T, typename boost::enable_if<boost::is_base_of<IECore::
 template<typename T>
 void Context::set( const IECore::InternedString &name, const T &value )
 {
-	IECore::DataPtr &d = m_data->writable()[name];
-	if( Accessor<T>().set( d, value ) )
+	Map::iterator it = m_overrides.find( name );
+	if( it != m_overrides.end() )
 	{
-		if( m_changedSignal )
+		if( Accessor<T>().set( it->second.data, value ) )
 		{
-			(*m_changedSignal)( this, name );		
+			entryChanged( name, it->second, it->second.hash );
 		}
+		return;
+	}
+	
+	// the entry is either new or in the shared storage, which
+	// we mustn't modify, so we make an override for it.
+	const Storage *shared = m_sharedMap ? storage( name ) : 0;
+	IECore::ConstDataPtr data = shared ? shared->data : 0;
+	if( Accessor<T>().set( data, value ) )
+	{
+		Storage &s = m_overrides[name];
+		s.data = data;
+		entryChanged( name, s, shared ? shared->hash : 0 );
 	}
 }
 
 template<typename T>
 typename Context::Accessor<T>::ResultType Context::get( const IECore::InternedString &name ) const
 {
-	IECore::CompoundDataMap::const_iterator it = m_data->readable().find( name );
-	if( it == m_data->readable().end() )
+	if( m_dependencyTracker )
+	{
+		m_dependencyTracker->add( name );
+	}
+	
+	const Storage *s = storage( name );
+	if( !s )
 	{
 		throw IECore::Exception( boost::str( boost::format( "Context has no entry named \"%s\"" ) % name.value() ) );
 	}
-	return Accessor<T>().get( it->second );
+	return Accessor<T>().get( s->data );
 }
 
 template<typename T>
 typename Context::Accessor<T>::ResultType Context::get( const IECore::InternedString &name, typename Accessor<T>::ResultType defaultValue ) const
 {
-	IECore::CompoundDataMap::const_iterator it = m_data->readable().find( name );
-	if( it == m_data->readable().end() )
+	if( m_dependencyTracker )
+	{
+		m_dependencyTracker->add( name );
+	}
+	
+	const Storage *s = storage( name );
+	if( !s )
 	{
 		return defaultValue;
 	}
-	return Accessor<T>().get( it->second );
+	return Accessor<T>().get( s->data );
 }
 		
 } // namespace Gaffer
@@ -63,6 +63,7 @@ class DateTimeParameterHandler : public ParameterHandler
 		virtual Gaffer::ConstPlugPtr plug() const;
 		virtual void setParameterValue();
 		virtual void setPlugValue();
+		virtual IECore::ObjectPtr computeParameterValue() const;
 				
 	private :
 
@@ -119,12 +119,28 @@ class Despatcher : public IECore::RunTimeTyped
 		/// hash.
 		static void uniqueTasks( const Executable::Tasks &tasks, std::vector< TaskDescription > &uniqueTasks );
 
+		/// @name Incremental execution
+		/// Utility functions that despatchers may use to skip tasks whose outputs
+		/// are already up to date. The executionHash() of each completed task is
+		/// recorded in a hidden file next to each of its executionOutputs().
+		//////////////////////////////////////////////////////////////
+		//@{
+		/// Returns true if the task has outputs, and they all exist and were
+		/// recorded with the specified hash.
+		static bool upToDate( const Executable::Task &task, const IECore::MurmurHash &hash );
+		/// Records the hash alongside the outputs of a successfully executed task.
+		static void recordExecution( const Executable::Task &task, const IECore::MurmurHash &hash );
+		//@}
+
 	private :
 
 		typedef std::map< std::string, DespatcherPtr > DespatcherMap;
 		static DespatcherMap g_despatchers;
 
 		typedef std::map< IECore::MurmurHash, std::vector< size_t > > TaskSet;
+		static const Executable *executable( const Executable::Task &task );
+		static std::string executionRecordFileName( const std::string &outputFileName );
+
 		static const Executable::Task &uniqueTask( const Executable::Task &task, std::vector< Despatcher::TaskDescription > &uniqueTasks, TaskSet &seenTasks );
 
 		static DespatchSignal g_preDespatchSignal;
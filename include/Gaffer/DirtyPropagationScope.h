@@ -0,0 +1,65 @@
+//////////////////////////////////////////////////////////////////////////
+//  
+//  Copyright (c) 2013, Image Engine Design Inc. All rights reserved.
+//  
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//  
+//      * Redistributions of source code must retain the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer.
+//  
+//      * Redistributions in binary form must reproduce the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer in the documentation and/or other materials provided with
+//        the distribution.
+//  
+//      * Neither the name of John Haddon nor the names of
+//        any other contributors to this software may be used to endorse or
+//        promote products derived from this software without specific prior
+//        written permission.
+//  
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//  
+//////////////////////////////////////////////////////////////////////////
+
+
+#ifndef GAFFER_DIRTYPROPAGATIONSCOPE_H
+#define GAFFER_DIRTYPROPAGATIONSCOPE_H
+
+#include "boost/noncopyable.hpp"
+
+namespace Gaffer
+{
+
+/// Making many edits to a graph in quick succession, as happens when
+/// a script is loaded or pasted, would ordinarily emit plugDirtiedSignal()
+/// for the same downstream plugs after every single edit. While a
+/// DirtyPropagationScope is active on the calling thread, plugs are still
+/// dirtied immediately, but the signals are deferred until the outermost
+/// scope is destroyed, at which point they are emitted exactly once for
+/// each affected plug. Scopes may be nested.
+class DirtyPropagationScope : boost::noncopyable
+{
+
+	public :
+	
+		DirtyPropagationScope();
+		~DirtyPropagationScope();
+
+};
+
+} // namespace Gaffer
+
+#endif // GAFFER_DIRTYPROPAGATIONSCOPE_H
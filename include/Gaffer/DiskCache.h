@@ -0,0 +1,141 @@
+//////////////////////////////////////////////////////////////////////////
+//  
+//  Copyright (c) 2013, Image Engine Design Inc. All rights reserved.
+//  
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//  
+//      * Redistributions of source code must retain the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer.
+//  
+//      * Redistributions in binary form must reproduce the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer in the documentation and/or other materials provided with
+//        the distribution.
+//  
+//      * Neither the name of John Haddon nor the names of
+//        any other contributors to this software may be used to endorse or
+//        promote products derived from this software without specific prior
+//        written permission.
+//  
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//  
+//////////////////////////////////////////////////////////////////////////
+
+
+#ifndef GAFFER_DISKCACHE_H
+#define GAFFER_DISKCACHE_H
+
+#include <map>
+#include <list>
+#include <string>
+
+#include "boost/noncopyable.hpp"
+
+#include "tbb/mutex.h"
+
+#include "IECore/Object.h"
+#include "IECore/MurmurHash.h"
+
+namespace Gaffer
+{
+
+/// The DiskCache class provides persistent storage for IECore::Objects,
+/// keyed by MurmurHash. Each value is stored in its own file within a
+/// directory, so the cache may be shared between processes on the same
+/// host, and survives from one session to the next. When the total size
+/// of the files exceeds the limit, the least recently used files are
+/// removed. Keys are combined with a version number for the file format,
+/// so that files written by incompatible versions are ignored.
+///
+/// The cache is used by ValuePlug as a second level behind its in-memory
+/// cache - see ValuePlug::setDiskCacheDirectory().
+class DiskCache : boost::noncopyable
+{
+
+	public :
+
+		/// An empty directory disables the cache.
+		DiskCache( const std::string &directory = "", size_t maxCost = 1024 * 1024 * 1024 );
+		~DiskCache();
+
+		/// Sets the directory used to store the cache files, creating it
+		/// if necessary. Any files already in the directory are adopted
+		/// into the cache, so that values written by previous sessions
+		/// may be reused. An empty string disables the cache.
+		/// Orphaned temporary files left by processes which exited while
+		/// writing are removed.
+		void setDirectory( const std::string &directory );
+		std::string getDirectory() const;
+		/// Returns true if a directory has been specified.
+		bool enabled() const;
+
+		/// Sets the maximum number of bytes to be used by the
+		/// cache files, removing files if necessary.
+		void setMaxCost( size_t maxCost );
+		size_t getMaxCost() const;
+		/// Returns the number of bytes currently used by the
+		/// cache files.
+		size_t currentCost() const;
+
+		/// Returns the value stored for the key, or 0 if no
+		/// such value exists.
+		IECore::ObjectPtr get( const IECore::MurmurHash &key );
+		/// Stores the value for the key. Returns false if the value
+		/// could not be stored - for instance because it is larger
+		/// than getMaxCost().
+		bool set( const IECore::MurmurHash &key, const IECore::Object *value );
+		/// Returns true if a value is stored for the key.
+		bool cached( const IECore::MurmurHash &key ) const;
+		/// Removes all the values from the cache, deleting
+		/// the files from disk. This includes files written by
+		/// other processes sharing the directory, and any orphaned
+		/// temporary files.
+		void clear();
+
+	private :
+
+		std::string entryName( const IECore::MurmurHash &key ) const;
+		std::string fileName( const std::string &directory, const std::string &entryName ) const;
+		// The following methods must be called with m_mutex held.
+		void addEntry( const std::string &entryName, size_t cost );
+		void removeEntry( const std::string &entryName );
+		void limitCost();
+
+		// Entries are identified by entryName(), which is
+		// also used to name the files.
+		typedef std::list<std::string> LRUList;
+		struct Entry
+		{
+			size_t cost;
+			LRUList::iterator lruPosition;
+		};
+		typedef std::map<std::string, Entry> EntryMap;
+
+		// Only accessed with m_mutex held, so that setDirectory()
+		// may be called concurrently with get() and set().
+		std::string m_directory;
+		size_t m_maxCost;
+		size_t m_currentCost;
+		// least recently used entries are at the front
+		LRUList m_lruList;
+		EntryMap m_entries;
+		mutable tbb::mutex m_mutex;
+
+};
+
+} // namespace Gaffer
+
+#endif // GAFFER_DISKCACHE_H
@@ -38,6 +38,7 @@
 #define GAFFER_EXECUTABLE_H
 
 #include <vector>
+#include <string>
 #include "IECore/MurmurHash.h"
 #include "IECore/RefCounted.h"
 
@@ -96,6 +97,20 @@ class Executable
 		/// in sequence.
 		virtual void execute( const Contexts &contexts ) const = 0;	
 
+		/// May be implemented to list the files which execute() creates for the
+		/// given context. Despatchers use this to record the executionHash()
+		/// alongside the outputs, so that tasks whose outputs are already up
+		/// to date may be skipped. The default implementation lists no files,
+		/// meaning that the task is always executed.
+		virtual void executionOutputs( const Context *context, std::vector<std::string> &fileNames ) const;
+
+		/// May be implemented to return true if execute() may safely be called
+		/// concurrently with the execution of other tasks, in the same process.
+		/// Despatchers which execute tasks in parallel threads use this to decide
+		/// which tasks must be executed on their own. The default implementation
+		/// returns false.
+		virtual bool executionIsThreadSafe() const;
+
 	protected :
 
 		/// Constructs the Executable for the Node, also creates the plugs that 
@@ -243,6 +243,15 @@ class GraphComponent : public IECore::RunTimeTyped, public boost::signals::track
 		void setNameInternal( const IECore::InternedString &name );
 		void addChildInternal( GraphComponentPtr child );
 		void removeChildInternal( GraphComponentPtr child, bool emitParentChanged );
+		
+		/// Index of children by name, to provide constant time lookups
+		/// in getChild() and setName(). Created on demand when the first
+		/// child is added, so that leaf components pay only for a pointer.
+		struct ChildIndex;
+		void indexChild( GraphComponent *child );
+		void unindexChild( GraphComponent *child );
+		bool isIndexed( const GraphComponent *child ) const;
+		const GraphComponent *getChildInternal( const IECore::InternedString &name ) const;
 
 		/// \todo The memory overhead of all these signals may become too great.
 		/// At this point we need to reimplement the signal returning functions to
@@ -258,6 +267,7 @@ class GraphComponent : public IECore::RunTimeTyped, public boost::signals::track
 		IECore::InternedString m_name;
 		GraphComponent *m_parent;
 		ChildContainer m_children;
+		ChildIndex *m_childIndex;
 
 };
 
@@ -66,6 +66,7 @@ class NumericParameterHandler : public ParameterHandler
 		virtual Gaffer::ConstPlugPtr plug() const;
 		virtual void setParameterValue();
 		virtual void setPlugValue();
+		virtual IECore::ObjectPtr computeParameterValue() const;
 				
 	private :
 	
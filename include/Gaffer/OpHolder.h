@@ -37,6 +37,8 @@
 #ifndef GAFFER_OPHOLDER_H
 #define GAFFER_OPHOLDER_H
 
+#include "tbb/mutex.h"
+
 #include "Gaffer/ParameterisedHolder.h"
 
 namespace IECore
@@ -78,6 +80,13 @@ class OpHolder : public ParameterisedHolderComputeNode
 	private :
 	
 		ParameterHandlerPtr m_resultParameterHandler;
+		// The op's parameters are shared between all computations, so
+		// we hold this while transferring values to and from them. Where
+		// possible, computations avoid the parameters entirely, computing
+		// their operands directly from the plugs with
+		// ParameterHandler::computeParameterValue(), so that they may
+		// run in parallel.
+		mutable tbb::mutex m_parametersMutex;
 		
 };
 
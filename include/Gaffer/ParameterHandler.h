@@ -41,6 +41,7 @@
 #include "boost/function.hpp"
 
 #include "IECore/Parameter.h"
+#include "IECore/MurmurHash.h"
 
 #include "Gaffer/Plug.h"
 
@@ -48,6 +49,7 @@ namespace Gaffer
 {
 
 IE_CORE_FORWARDDECLARE( ParameterHandler );
+IE_CORE_FORWARDDECLARE( ValuePlug );
 
 /// ParameterHandlers manage a mapping between IECore::Parameter objects
 /// and Plugs on a Node.
@@ -71,6 +73,13 @@ class ParameterHandler : public IECore::RefCounted
 		
 		virtual void setParameterValue() = 0;
 		virtual void setPlugValue() = 0;
+		/// Returns the value that setParameterValue() would transfer to the parameter,
+		/// computed from the plug in the current context, without modifying the parameter.
+		/// Unlike setParameterValue(), this may be called concurrently from several threads,
+		/// and the result belongs to the caller, who may modify it freely. The default
+		/// implementation returns 0, meaning that the handler doesn't support this and
+		/// setParameterValue() must be used instead.
+		virtual IECore::ObjectPtr computeParameterValue() const;
 		
 		/// Returns a handler for the specified parameter.
 		static ParameterHandlerPtr create( IECore::ParameterPtr parameter );
@@ -87,6 +96,23 @@ class ParameterHandler : public IECore::RefCounted
 		/// Should be called by derived classes in setupPlug().
 		void setupPlugFlags( Plug *plug );
 		
+		/// May be used by derived classes to skip redundant transfers in setParameterValue().
+		/// Returns false if the plug value is known to match the one last transferred to the
+		/// parameter, which is determined cheaply from the plug's dirtyCount() and the current
+		/// context where possible, falling back to comparing the plug hash with the one
+		/// recorded by setParameterValueHash(). Otherwise returns true and fills hash with the
+		/// value to record once the transfer is complete. Skipping transfers assumes that the
+		/// parameter value isn't modified other than by the handler - derived classes must call
+		/// setParameterValueHash() with a default hash whenever the parameter may have been
+		/// modified by other means, as in setPlugValue().
+		///
+		/// The recorded state is unsynchronised, and so, like the parameter itself, must only be
+		/// accessed by one thread at a time. Code which may run concurrently should use
+		/// computeParameterValue() instead of setParameterValue().
+		bool plugValueChanged( const ValuePlug *plug, IECore::MurmurHash &hash );
+		/// Records the hash of the plug value last transferred to the parameter.
+		void setParameterValueHash( const IECore::MurmurHash &hash );
+		
 		/// Create a static instance of this to automatically register a derived class
 		/// with the factory mechanism. Derived class must have a constructor of the form
 		/// Derived( ParameterType::Ptr parameter, GraphComponentPtr plugParent ).
@@ -103,6 +129,13 @@ class ParameterHandler : public IECore::RefCounted
 		typedef std::map<IECore::TypeId, Creator> CreatorMap;
 		static CreatorMap &creators();
 		
+		IECore::MurmurHash m_parameterValueHash;
+		size_t m_parameterValueDirtyCount;
+		IECore::MurmurHash m_parameterValueContextHash;
+		// Observed by plugValueChanged(), to be recorded by setParameterValueHash().
+		size_t m_pendingDirtyCount;
+		IECore::MurmurHash m_pendingContextHash;
+		
 };
 
 } // namespace Gaffer
@@ -0,0 +1,207 @@
+//////////////////////////////////////////////////////////////////////////
+//  
+//  Copyright (c) 2013, Image Engine Design Inc. All rights reserved.
+//  
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//  
+//      * Redistributions of source code must retain the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer.
+//  
+//      * Redistributions in binary form must reproduce the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer in the documentation and/or other materials provided with
+//        the distribution.
+//  
+//      * Neither the name of John Haddon nor the names of
+//        any other contributors to this software may be used to endorse or
+//        promote products derived from this software without specific prior
+//        written permission.
+//  
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//  
+//////////////////////////////////////////////////////////////////////////
+
+
+#ifndef GAFFER_PERFORMANCEMONITOR_H
+#define GAFFER_PERFORMANCEMONITOR_H
+
+#include <map>
+#include <vector>
+
+#include "boost/noncopyable.hpp"
+
+#include "tbb/enumerable_thread_specific.h"
+#include "tbb/tick_count.h"
+#include "tbb/atomic.h"
+#include "tbb/spin_rw_mutex.h"
+
+#include "IECore/RefCounted.h"
+
+#include "Gaffer/ValuePlug.h"
+
+namespace Gaffer
+{
+
+IE_CORE_FORWARDDECLARE( PerformanceMonitor );
+
+/// The PerformanceMonitor class collects statistics about the hash and
+/// compute calls made for every plug evaluated while it is active. A monitor
+/// is made active using the nested Scope class, and remains active for
+/// all threads until the Scope is destroyed, so that work performed by TBB
+/// worker threads on behalf of the calling thread is monitored too.
+///
+/// Measurements hold a reference to the monitor which was active when they
+/// started, so work which outlives the Scope (for instance asynchronous
+/// computations launched within it) is still recorded safely, but clear()
+/// and the statistics accessors should only be used once such work has
+/// completed.
+///
+/// Timings are exclusive - the time spent in a hash or compute for one plug
+/// does not include the time spent evaluating upstream plugs within it. This
+/// makes it straightforward to identify the nodes which are expensive in
+/// their own right.
+class PerformanceMonitor : public IECore::RefCounted
+{
+
+	public :
+
+		PerformanceMonitor();
+		virtual ~PerformanceMonitor();
+
+		IE_CORE_DECLAREMEMBERPTR( PerformanceMonitor )
+
+		struct Statistics
+		{
+		
+			Statistics();
+			
+			/// The number of calls made to ComputeNode::hash().
+			size_t hashCount;
+			/// The number of calls made to ComputeNode::compute(),
+			/// or to ValuePlug::setFrom() for plugs with an input.
+			size_t computeCount;
+			/// The number of values retrieved from the cache rather than
+			/// being computed.
+			size_t cacheHitCount;
+			
+			/// Times are measured in seconds.
+			double hashWallTime;
+			double hashCPUTime;
+			double computeWallTime;
+			double computeCPUTime;
+			
+			Statistics &operator += ( const Statistics &rhs );
+			
+		};
+		
+		typedef std::map<ConstValuePlugPtr, Statistics> StatisticsMap;
+		
+		/// Returns the statistics gathered for all plugs.
+		StatisticsMap allStatistics() const;
+		/// Returns the statistics gathered for a single plug.
+		Statistics plugStatistics( const ValuePlug *plug ) const;
+		/// Returns the sum of the statistics for all plugs.
+		Statistics combinedStatistics() const;
+		
+		/// Discards all the statistics gathered so far.
+		/// Must not be called while the monitor is active.
+		void clear();
+
+		/// The Scope class is used to make a monitor active.
+		class Scope : boost::noncopyable
+		{
+			
+			public :
+			
+				/// Constructing the Scope makes the monitor active.
+				/// Passing a null monitor is permitted, and results
+				/// in no monitor being active.
+				Scope( PerformanceMonitorPtr monitor );
+				/// Destruction of the Scope makes the monitor of the
+				/// innermost remaining Scope active again. Scopes may be
+				/// destroyed in any order, including from threads other
+				/// than the one which constructed them.
+				~Scope();
+		
+		};
+
+	private :
+	
+		friend class ValuePlug;
+	
+		// Used by ValuePlug to time hash and compute calls for the
+		// active monitor. Does nothing if no monitor is active.
+		class Measurement : boost::noncopyable
+		{
+		
+			public :
+			
+				enum Type
+				{
+					Hash,
+					Compute
+				};
+			
+				Measurement( const ValuePlug *plug, Type type );
+				~Measurement();
+				
+			private :
+			
+				PerformanceMonitorPtr m_monitor;
+				const ValuePlug *m_plug;
+				Type m_type;
+				Measurement *m_parent;
+				tbb::tick_count m_startWallTime;
+				double m_startCPUTime;
+				double m_childWallTime;
+				double m_childCPUTime;
+			
+		};
+		
+		// Used by ValuePlug to record cache hits for the active monitor.
+		static void recordCacheHit( const ValuePlug *plug );
+	
+		// Returns the active monitor, or 0 if there is none. The reference
+		// returned keeps the monitor alive even if its Scope is destroyed.
+		static PerformanceMonitorPtr activeMonitor();
+	
+		// The monitors of all the live Scopes, in order of construction,
+		// holding a reference to each so that they remain valid however
+		// the Scopes are destroyed. The active monitor is the last one.
+		typedef std::vector<std::pair<const Scope *, PerformanceMonitorPtr> > Scopes;
+		static Scopes g_scopes;
+		// The active monitor is read by all threads, so is atomic. It is
+		// only modified with the mutex held for writing, and the mutex
+		// ensures that a monitor can't be removed from g_scopes and destroyed
+		// between reading the pointer and taking a reference to it.
+		static tbb::atomic<PerformanceMonitor *> g_activeMonitor;
+		static tbb::spin_rw_mutex g_activeMonitorMutex;
+		
+		// The innermost Measurement for each thread, used to
+		// exclude the time spent in upstream evaluations.
+		typedef tbb::enumerable_thread_specific<Measurement *> ThreadMeasurements;
+		static ThreadMeasurements g_currentMeasurements;
+	
+		Statistics &threadStatistics( const ValuePlug *plug );
+		
+		typedef tbb::enumerable_thread_specific<StatisticsMap> ThreadStatistics;
+		ThreadStatistics m_threadStatistics;
+		
+};
+
+} // namespace Gaffer
+
+#endif // GAFFER_PERFORMANCEMONITOR_H
@@ -176,17 +176,29 @@ class Plug : public GraphComponent
 	
 	protected :
 	
-		/// Emits the dirty signal for this plug, and all ancestor plugs up
-		/// to node(). The result of node() can be passed to avoid repeatedly
-		/// finding the node in the case of making repeated calls.
-		void emitDirtiness( Node *n = 0 );
-		/// Calls emitDirtiness() on affected plugs and output connections.
+		/// Emits the dirty signal for all plugs affected by this one, either
+		/// via DependencyNode::affects() or via output connections, and for
+		/// their ancestor plugs up to node(). The dependency graph is traversed
+		/// once up front, so that each plug is dirtied exactly once no matter
+		/// how many paths lead to it, and signals are then emitted in batches
+		/// grouped by node. If this plug has children then dirtiness is
+		/// propagated from each of its leaf level descendants instead.
 		void propagateDirtiness();
+		/// Called once for each plug dirtied by propagateDirtiness(), including
+		/// ancestor plugs. All plugs are dirtied before any plugDirtiedSignal()
+		/// is emitted, so that slots may safely pull on any of them. Derived
+		/// classes may implement this to invalidate any state which depends on
+		/// the upstream graph. The default implementation does nothing.
+		virtual void dirty();
 		
 		virtual void parentChanging( Gaffer::GraphComponent *newParent );
 		
 	private :
 
+		friend class DirtyPropagationScope;
+
+		class DirtyPlugs;
+
 		void setInputInternal( PlugPtr input, bool emit );
 		
 		static void parentChanged( GraphComponent *child, GraphComponent *previousParent );
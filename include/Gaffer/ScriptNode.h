@@ -40,6 +40,8 @@
 
 #include <stack>
 
+#include "boost/noncopyable.hpp"
+
 #include "Gaffer/Node.h"
 #include "Gaffer/TypedPlug.h"
 #include "Gaffer/NumericPlug.h"
@@ -57,6 +59,7 @@ IE_CORE_FORWARDDECLARE( ScriptNode );
 IE_CORE_FORWARDDECLARE( ApplicationRoot );
 IE_CORE_FORWARDDECLARE( Context );
 IE_CORE_FORWARDDECLARE( StandardSet );
+class DirtyPropagationScope;
 
 typedef Container<GraphComponent, ScriptNode> ScriptContainer;
 IE_CORE_DECLAREPTR( ScriptContainer );
@@ -113,6 +116,15 @@ class ScriptNode : public Node
 		/// actions were performed together undo a single UndoContext (I think
 		/// CompoundAction would replace ActionVector).
 		ActionSignal &actionSignal();
+		/// Limits the memory used by the undo history to the specified number
+		/// of bytes, as estimated by Action::memoryUsage(). When the limit is
+		/// exceeded the oldest entries are discarded, although the most recent
+		/// entry is always kept so that the last edit may be undone. A limit of
+		/// 0, which is the default, means the history is unlimited.
+		void setUndoMemoryLimit( size_t bytes );
+		size_t getUndoMemoryLimit() const;
+		/// Returns the estimated memory used by the undo history.
+		size_t undoMemoryUsage() const;
 		//@}
 		
 		//! @name Editing
@@ -162,6 +174,16 @@ class ScriptNode : public Node
 		/// use from the python side only.
 		virtual void execute( const std::string &pythonScript, Node *parent = 0 );
 		/// As above, but loads the python script from the specified file.
+		/// The contents of the file are cached in memory in compiled form,
+		/// keyed on the file's path, modification time and size, so that
+		/// repeated executions of the same file (as with many References
+		/// to the same asset) need read and compile it only once.
+		/// If the GAFFER_SCRIPT_CACHE environment variable is set to "1", the
+		/// compiled form of the script is stored in a sidecar file alongside
+		/// the original (with a "c" appended to the filename), and is reused
+		/// by subsequent executions to avoid parsing the script again. The
+		/// sidecar is keyed on the modification time and contents of the
+		/// original file, and is ignored and rewritten when stale.
 		virtual void executeFile( const std::string &pythonFile, Node *parent = 0 );
 		/// This signal is emitted following successful execution of a script.
 		ScriptExecutedSignal &scriptExecutedSignal();
@@ -173,6 +195,16 @@ class ScriptNode : public Node
 		/// is the result of the script evaluation - slots must increment the reference count on
 		/// this if they intend to keep the result.
 		ScriptEvaluatedSignal &scriptEvaluatedSignal();
+		/// Returns true while a script is being executed by execute(),
+		/// executeFile() or load(). During execution plugDirtiedSignal()
+		/// is deferred and coalesced using a DirtyPropagationScope, and
+		/// observers of the graph may use this to defer expensive
+		/// updates of their own until executionFinishedSignal() is
+		/// emitted, rather than responding to every individual edit.
+		bool isExecuting() const;
+		/// A signal emitted when the outermost execution is complete,
+		/// whether or not it was successful.
+		UnarySignal &executionFinishedSignal();
 		//@}
 		
 		//! @name Serialisation
@@ -199,7 +231,8 @@ class ScriptNode : public Node
 		/// made since the last call to save().
 		BoolPlug *unsavedChangesPlug();
 		const BoolPlug *unsavedChangesPlug() const;
-		/// Loads the script specified in the filename plug.
+		/// Loads the script specified in the filename plug. This uses the
+		/// same compiled script cache as executeFile().
 		virtual void load();
 		/// Saves the script to the file specified by the filename plug.
 		virtual void save() const;
@@ -226,6 +259,25 @@ class ScriptNode : public Node
 		const IntPlug *frameEndPlug() const;
 		//@}
 		
+	protected :
+	
+		/// Must be used by implementations of execute() to mark
+		/// the duration of the execution. See isExecuting().
+		class ExecutionScope : boost::noncopyable
+		{
+		
+			public :
+			
+				ExecutionScope( ScriptNode *script );
+				~ExecutionScope();
+				
+			private :
+			
+				ScriptNode *m_script;
+				DirtyPropagationScope *m_dirtyPropagationScope;
+				
+		};
+		
 	private :
 		
 		bool selectionSetAcceptor( const Set *s, const Set::Member *m );
@@ -245,9 +297,21 @@ class ScriptNode : public Node
 		ActionVectorPtr m_actionAccumulator; // Actions are accumulated here until the state stack hits 0 size
 		UndoList m_undoList; // then the accumulated actions are transferred to this list for storage
 		UndoIterator m_undoIterator; // points to the next thing to redo
+		std::string m_lastMergeGroup; // the merge group of the last entry in m_undoList
+		size_t m_undoMemoryLimit;
+		size_t m_undoMemoryUsage;
+		
+		// called by Action::enact() to add an action to m_actionAccumulator.
+		void addAction( ActionPtr action );
+		// called by ~UndoContext() to transfer m_actionAccumulator to m_undoList.
+		void commitActions( const std::string &mergeGroup );
+		void limitUndoMemory();
+		static size_t actionsMemoryUsage( const ActionVector &actions );
 			
 		ScriptExecutedSignal m_scriptExecutedSignal;
 		ScriptEvaluatedSignal m_scriptEvaluatedSignal;
+		size_t m_executionDepth;
+		UnarySignal m_executionFinishedSignal;
 			
 		ContextPtr m_context;
 		
@@ -72,6 +72,7 @@ class Set : public IECore::RunTimeTyped, public boost::signals::trackable
 		virtual bool contains( const Member *object ) const = 0;
 		
 		typedef boost::signal<void ( Set *, Member * )> MemberSignal;
+		typedef boost::signal<void ( Set * )> MembersChangedSignal;
 		
 		/// A signal emitted when a new member is added to the Set. It is
 		/// the responsibility of derived classes to emit this when appropriate.
@@ -79,11 +80,19 @@ class Set : public IECore::RunTimeTyped, public boost::signals::trackable
 		/// A signal emitted when a member is removed from the Set. It is
 		/// the responsibility of derived classes to emit this when appropriate.
 		MemberSignal &memberRemovedSignal();
+		/// A signal emitted once after any operation which adds or removes
+		/// members, following the individual memberAddedSignal() and
+		/// memberRemovedSignal() emissions. Operations which modify many members
+		/// at once emit it only once, so slots which just need to know that
+		/// membership has changed should prefer it to the per-member signals.
+		/// It is the responsibility of derived classes to emit this when appropriate.
+		MembersChangedSignal &membersChangedSignal();
 
 	private :
 
 		MemberSignal m_memberAddedSignal;
 		MemberSignal m_memberRemovedSignal;
+		MembersChangedSignal m_membersChangedSignal;
 		
 };
 
@@ -42,7 +42,8 @@
 
 #include "boost/multi_index_container.hpp"
 #include "boost/multi_index/random_access_index.hpp"
-#include "boost/multi_index/ordered_index.hpp"
+#include "boost/multi_index/hashed_index.hpp"
+#include "boost/multi_index/mem_fun.hpp"
 
 namespace Gaffer
 {
@@ -76,7 +77,8 @@ struct MemberAcceptanceCombiner
 } // namespace Detail
 
 /// The StandardSet provides a Set implementation where membership is explicitly set using add() and remove()
-/// methods. Membership may be restricted using the memberAcceptanceSignal().
+/// methods. Membership may be restricted using the memberAcceptanceSignal(). Membership queries are constant
+/// time, and the methods which add or remove many members at once emit the membersChangedSignal() only once.
 class StandardSet : public Gaffer::Set
 {
 
@@ -107,11 +109,13 @@ class StandardSet : public Gaffer::Set
 		/// and false otherwise.
 		bool add( MemberPtr member );
 		/// Adds all the objects in the specified range into this set, returning
-		/// the number of new members added.
+		/// the number of new members added. No members are added if any of them
+		/// fail the acceptance tests.
 		template<typename I>
 		size_t add( I first, I last );
 		/// Adds all the objects in the other set into this set, returning
-		/// the number of new members added.
+		/// the number of new members added. No members are added if any of them
+		/// fail the acceptance tests.
 		size_t add( const Set *other );
 		/// Removes a member from the set. Returns true if the member
 		/// is removed and false if it wasn't there in the first place.
@@ -138,17 +142,21 @@ class StandardSet : public Gaffer::Set
 
 	private :
 
+		/// Implementations for the bulk add() and remove() methods.
+		size_t addMembers( const std::vector<MemberPtr> &members );
+		size_t removeMembers( const std::vector<MemberPtr> &members );
+
 		MemberAcceptanceSignal m_memberAcceptanceSignal;
 
 		typedef boost::multi_index::multi_index_container<
 			MemberPtr,
 			boost::multi_index::indexed_by<
-				boost::multi_index::ordered_unique<boost::multi_index::identity<MemberPtr> >,
+				boost::multi_index::hashed_unique<boost::multi_index::const_mem_fun<MemberPtr, Member *, &MemberPtr::get> >,
 				boost::multi_index::random_access<>
 			>
 		> MemberContainer;
 
-		typedef const MemberContainer::nth_index<0>::type OrderedIndex;
+		typedef const MemberContainer::nth_index<0>::type HashedIndex;
 		typedef const MemberContainer::nth_index<1>::type SequencedIndex;		
 		
 		MemberContainer m_members;
@@ -44,23 +44,23 @@ namespace Gaffer
 template<typename I>
 size_t StandardSet::add( I first, I last )
 {
-	size_t numAdded = 0;
+	std::vector<MemberPtr> members;
 	for( I it=first; it!=last; it++ )
 	{
-		numAdded += add( *it );
+		members.push_back( *it );
 	}
-	return numAdded;
+	return addMembers( members );
 }
 
 template<typename I>
 size_t StandardSet::remove( I first, I last )
 {
-	size_t numRemoved = 0;
+	std::vector<MemberPtr> members;
 	for( I it=first; it!=last; it++ )
 	{
-		numRemoved += remove( *it );
+		members.push_back( *it );
 	}
-	return numRemoved;
+	return removeMembers( members );
 }
 
 template<typename T>
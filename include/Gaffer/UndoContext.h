@@ -37,6 +37,8 @@
 #ifndef GAFFER_UNDOCONTEXT_H
 #define GAFFER_UNDOCONTEXT_H
 
+#include <string>
+
 #include "IECore/RefCounted.h"
 
 namespace Gaffer
@@ -57,14 +59,20 @@ class UndoContext
 		};
 
 		/// Script can be 0, in which case the subsequent actions
-		/// will not be undoable.
-		UndoContext( ScriptNodePtr script, State state=Enabled );
+		/// will not be undoable. If mergeGroup is specified for the
+		/// outermost UndoContext, and matches that of the previous
+		/// UndoContext, the actions are merged into the previous
+		/// entry in the undo history. This allows a series of edits
+		/// made in a single interaction, such as dragging a slider,
+		/// to be undone in one step.
+		UndoContext( ScriptNodePtr script, State state=Enabled, const std::string &mergeGroup = "" );
 		~UndoContext();
 
 	private :
 	
 		ScriptNodePtr m_script;
 		unsigned m_stateStackSize;
+		std::string m_mergeGroup;
 
 };
 
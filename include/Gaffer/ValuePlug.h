@@ -38,13 +38,18 @@
 #ifndef GAFFER_VALUEPLUG_H
 #define GAFFER_VALUEPLUG_H
 
+#include "IECore/CompoundData.h"
+
 #include "Gaffer/Plug.h"
+#include "Gaffer/ComputeFuture.h"
 #include "Gaffer/PlugIterator.h"
 
 namespace Gaffer
 {
 
 IE_CORE_FORWARDDECLARE( DependencyNode )
+IE_CORE_FORWARDDECLARE( ComputeNode )
+IE_CORE_FORWARDDECLARE( Context )
 
 /// The Plug base class defines the concept of a connection
 /// point with direction. The ValuePlug class extends this concept
@@ -87,6 +92,27 @@ class ValuePlug : public Plug
 		virtual IECore::MurmurHash hash() const;
 		/// Convenience function to append the hash to h.
 		void hash( IECore::MurmurHash &h ) const;
+		/// Returns a count which changes whenever the plug is dirtied,
+		/// either directly or by a change upstream. Counts are never
+		/// shared between plugs, and are never 0. This may be used to
+		/// cheaply determine that a value is unchanged in a given context,
+		/// without computing its hash.
+		size_t dirtyCount() const;
+		
+		/// Launches the computation of the value in the current context on
+		/// a background thread, returning a future which may be used to retrieve
+		/// the result or to cancel the computation. The result is provided in
+		/// the form used internally for storage - an IntData for an IntPlug, for
+		/// instance. Alternatively, once the future is done, getValue() may be
+		/// called in the same context to retrieve the value from the cache.
+		ComputeFuturePtr getValueAsync() const;
+		/// Evaluates the plug in each of the specified contexts, performing
+		/// the computations in parallel, and places the results in values,
+		/// in the same order as the contexts. The results are provided in the
+		/// same form as for getValueAsync(). This is considerably quicker than
+		/// evaluating the contexts in turn, when sampling an expensive plug
+		/// across a frame range or a shutter interval for instance.
+		void getValues( const std::vector<ConstContextPtr> &contexts, std::vector<IECore::ConstObjectPtr> &values ) const;
 		
 		/// @name Cache management
 		/// ValuePlug optimises repeated computation by storing a cache of
@@ -98,6 +124,58 @@ class ValuePlug : public Plug
 		static size_t getCacheMemoryLimit();
 		/// Sets the maximum amount of memory the cache may use in bytes.
 		static void setCacheMemoryLimit( size_t bytes );
+		/// Returns the directory used for the second level disk cache.
+		static std::string getDiskCacheDirectory();
+		/// Values which are expensive to compute may also be stored on
+		/// disk, in a second level cache which is consulted before computing
+		/// any value missing from the memory cache. Because the files are
+		/// keyed on hash(), they may be shared between processes on the same
+		/// host and reused across sessions. An empty directory (the default)
+		/// disables the disk cache. The directory should be changed only while
+		/// no computations are in progress.
+		static void setDiskCacheDirectory( const std::string &directory );
+		/// Returns the maximum amount of disk space to use for the
+		/// disk cache, in bytes.
+		static size_t getDiskCacheLimit();
+		/// Sets the maximum amount of disk space the disk cache may
+		/// use in bytes. The least recently used files are removed
+		/// when the limit is exceeded.
+		static void setDiskCacheLimit( size_t bytes );
+		/// Removes all files from the disk cache.
+		static void clearDiskCache();
+		/// Returns statistics describing the usage of the cache, as CompoundData
+		/// with the following members :
+		///
+		/// - "hits" : the number of values retrieved from the cache.
+		/// - "misses" : the number of values which had to be computed.
+		/// - "evictions" : the number of values which have been computed but which
+		///   are no longer in the cache, either because they were evicted to make
+		///   space for others, or because they were too large to be cached.
+		/// - "currentCost" : the memory in bytes currently used by the cache.
+		/// - "maxCost" : the same as getCacheMemoryLimit().
+		/// - "costByNodeType" : CompoundData mapping from node type names to the
+		///   number of bytes used by values computed by nodes of that type.
+		/// - "costByNode" : CompoundData mapping from node names to the number of
+		///   bytes used by the values computed by that node.
+		/// - "diskHits" : the number of values loaded from the disk cache.
+		/// - "diskCurrentCost" : the number of bytes used by the disk cache.
+		/// - "diskMaxCost" : the same as getDiskCacheLimit().
+		///
+		/// The counts are accumulated since the last call to resetCacheStatistics().
+		static IECore::CompoundDataPtr cacheStatistics();
+		/// Resets the hits, misses, evictions and diskHits counts to zero.
+		static void resetCacheStatistics();
+		/// The results of hash() are also cached, so that repeated queries
+		/// on an unchanged graph needn't traverse the upstream network again.
+		/// The cached hashes are keyed only on the context variables that
+		/// were actually read during hashing, so they are shared between
+		/// contexts which differ only in unrelated variables.
+		/// Cached hashes are invalidated automatically when plugs are dirtied,
+		/// but this function may be used to clear them explicitly in the
+		/// rare case that a hash depends on something other than the values
+		/// of upstream plugs. It must not be called while computations are
+		/// in progress.
+		static void clearHashCache();
 		//@}
 
 	protected :
@@ -136,16 +214,32 @@ class ValuePlug : public Plug
 		/// Returns true if a computation is currently being performed on this thread -
 		/// if we are inside Node::compute().
 		bool inCompute() const;
+
+		/// Reimplemented to invalidate the cached results of hash().
+		virtual void dirty();
 						
 	private :
 	
 		class Computation;
 		friend class Computation;
+		
+		class SetValueAction;
 	
 		void setValueInternal( IECore::ConstObjectPtr value, bool propagateDirtiness );
+		/// Calls node->hash(), recording performance statistics and checking for errors.
+		void hashInternal( const ComputeNode *node, const Context *context, IECore::MurmurHash &h ) const;
+		/// Returns true if the result of the last call to hash() on this thread depended
+		/// only on nodes whose hashes are stable between sessions, so that the value may
+		/// be stored in the disk cache.
+		bool hashIsStableBetweenSessions() const;
 	
 		/// For holding the value of input plugs with no input connections.
 		IECore::ConstObjectPtr m_staticValue;
+		/// Assigned a new value from a global counter whenever the
+		/// plug is dirtied, and used to invalidate entries in the hash
+		/// cache. Using a global counter means that the value is never
+		/// shared with a plug that previously occupied the same address.
+		size_t m_dirtyCount;
 
 };
 
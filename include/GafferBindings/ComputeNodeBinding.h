@@ -47,6 +47,7 @@
 #include "Gaffer/ValuePlug.h"
 
 #include "GafferBindings/DependencyNodeBinding.h"
+#include "GafferBindings/TranslatePythonException.h"
 
 namespace GafferBindings
 {
@@ -63,6 +64,20 @@ class ComputeNodeWrapper : public DependencyNodeWrapper<WrappedType>
 		{
 		}		
 			
+		virtual bool hashIsStableBetweenSessions() const
+		{
+			IECorePython::ScopedGILLock gilLock;
+			if( PyObject_HasAttrString( GraphComponentWrapper<WrappedType>::m_pyObject, "hashIsStableBetweenSessions" ) )
+			{
+				boost::python::override f = this->get_override( "hashIsStableBetweenSessions" );
+				if( f )
+				{
+					return f();
+				}
+			}
+			return WrappedType::hashIsStableBetweenSessions();
+		}
+		
 		virtual void hash( const Gaffer::ValuePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const
 		{
 			WrappedType::hash( output, context, h );
@@ -72,13 +87,20 @@ class ComputeNodeWrapper : public DependencyNodeWrapper<WrappedType>
 				boost::python::override f = this->get_override( "hash" );
 				if( f )
 				{
-					boost::python::object pythonHash( h );
-					f(
-						Gaffer::ValuePlugPtr( const_cast<Gaffer::ValuePlug *>( output ) ),
-						Gaffer::ContextPtr( const_cast<Gaffer::Context *>( context ) ),
-						pythonHash
-					);
-					h = boost::python::extract<IECore::MurmurHash>( pythonHash );
+					try
+					{
+						boost::python::object pythonHash( h );
+						f(
+							Gaffer::ValuePlugPtr( const_cast<Gaffer::ValuePlug *>( output ) ),
+							Gaffer::ContextPtr( const_cast<Gaffer::Context *>( context ) ),
+							pythonHash
+						);
+						h = boost::python::extract<IECore::MurmurHash>( pythonHash );
+					}
+					catch( const boost::python::error_already_set &e )
+					{
+						translatePythonExceptionForFuture( context );
+					}
 				}
 			}
 		}
@@ -91,12 +113,36 @@ class ComputeNodeWrapper : public DependencyNodeWrapper<WrappedType>
 				boost::python::override f = this->get_override( "compute" );
 				if( f )
 				{
-					f( Gaffer::ValuePlugPtr( output ), Gaffer::ContextPtr( const_cast<Gaffer::Context *>( context ) ) );
+					try
+					{
+						f( Gaffer::ValuePlugPtr( output ), Gaffer::ContextPtr( const_cast<Gaffer::Context *>( context ) ) );
+					}
+					catch( const boost::python::error_already_set &e )
+					{
+						translatePythonExceptionForFuture( context );
+					}
 					return;
 				}
 			}
 			WrappedType::compute( output, context );
 		}
+		
+	private :
+	
+		// Must be called from a catch block for error_already_set. Ordinarily
+		// the python error is left in place so that it propagates unchanged to
+		// the python caller. But when computing on behalf of a ComputeFuture
+		// there is no python caller on this thread, and the error would be
+		// lost along with the thread state, so we translate it into an
+		// IECore::Exception which ComputeFuture::get() can report.
+		static void translatePythonExceptionForFuture( const Gaffer::Context *context )
+		{
+			if( context->computeFuture() )
+			{
+				translatePythonException();
+			}
+			throw;
+		}
 	
 };
 
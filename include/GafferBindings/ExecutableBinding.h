@@ -52,7 +52,9 @@ class ExecutableBinding
 	private :
 
 		static boost::python::list executionRequirements( NodeClass &n, Gaffer::ContextPtr context );
+		static IECore::MurmurHash executionHash( NodeClass &n, Gaffer::ContextPtr context );
 		static void execute( NodeClass &n, const boost::python::list &contextList );
+		static boost::python::list executionOutputs( NodeClass &n, Gaffer::ContextPtr context );
 };
 
 } // namespace GafferBindings
@@ -45,8 +45,10 @@ template< typename PythonClass, typename NodeClass >
 void ExecutableBinding<PythonClass,NodeClass>::bind( PythonClass &c )
 {
 	c.def( "executionRequirements", &ExecutableBinding<PythonClass,NodeClass>::executionRequirements )
-	 .def( "executionHash", &NodeClass::executionHash )
-	 .def( "execute", &ExecutableBinding<PythonClass,NodeClass>::execute );
+	 .def( "executionHash", &ExecutableBinding<PythonClass,NodeClass>::executionHash )
+	 .def( "execute", &ExecutableBinding<PythonClass,NodeClass>::execute )
+	 .def( "executionOutputs", &ExecutableBinding<PythonClass,NodeClass>::executionOutputs )
+	 .def( "executionIsThreadSafe", &NodeClass::executionIsThreadSafe );
 }
 
 template< typename PythonClass, typename NodeClass >
@@ -62,6 +64,13 @@ boost::python::list ExecutableBinding<PythonClass,NodeClass>::executionRequireme
 	return result;
 }
 
+template< typename PythonClass, typename NodeClass >
+IECore::MurmurHash ExecutableBinding<PythonClass,NodeClass>::executionHash( NodeClass &n, Gaffer::ContextPtr context )
+{
+	IECorePython::ScopedGILRelease gilRelease;
+	return n.executionHash( context );
+}
+
 template< typename PythonClass, typename NodeClass >
 void ExecutableBinding<PythonClass,NodeClass>::execute( NodeClass &n, const boost::python::list &contextList )
 {
@@ -76,4 +85,20 @@ void ExecutableBinding<PythonClass,NodeClass>::execute( NodeClass &n, const boos
 	n.execute( contexts );
 }
 
+template< typename PythonClass, typename NodeClass >
+boost::python::list ExecutableBinding<PythonClass,NodeClass>::executionOutputs( NodeClass &n, Gaffer::ContextPtr context )
+{
+	std::vector<std::string> fileNames;
+	{
+		IECorePython::ScopedGILRelease gilRelease;
+		n.executionOutputs( context, fileNames );
+	}
+	boost::python::list result;
+	for( std::vector<std::string>::const_iterator it = fileNames.begin(); it != fileNames.end(); it++ )
+	{
+		result.append( *it );
+	}
+	return result;
+}
+
 } // namespace GafferBindings
@@ -101,6 +101,9 @@ class ImagePlug : public Gaffer::CompoundPlug
 		IECore::ConstFloatVectorDataPtr channelData( const std::string &channelName, const Imath::V2i &tileOrigin ) const;
 		IECore::MurmurHash channelDataHash( const std::string &channelName, const Imath::V2i &tileOrigin ) const;
 		IECore::ImagePrimitivePtr image() const;
+		/// As for image(), but computes the image on a background thread.
+		/// See ValuePlug::getValueAsync().
+		Gaffer::ComputeFuturePtr imageAsync() const;
 		IECore::MurmurHash imageHash() const;
 		//@}
 		
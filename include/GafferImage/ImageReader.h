@@ -63,6 +63,9 @@ class ImageReader : public ImageNode
 
 		virtual void affects( const Gaffer::Plug *input, AffectedPlugsContainer &outputs ) const;
 		virtual bool enabled() const;
+		/// Returns true, as our hashes include the modification time
+		/// of the file.
+		virtual bool hashIsStableBetweenSessions() const;
 				
 	protected :
 		
@@ -78,6 +81,10 @@ class ImageReader : public ImageNode
 
 	private :
 	
+		// Appends the file name and the modification time of the file,
+		// so that hashes change when the file is rewritten.
+		void hashFileName( IECore::MurmurHash &h ) const;
+	
 		static size_t g_firstPlugIndex;
 		
 };
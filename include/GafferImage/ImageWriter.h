@@ -82,6 +82,13 @@ class ImageWriter : public Gaffer::ExecutableNode
 		/// Implemented to execute in all the specified contexts in sequence.
 		virtual void execute( const Executable::Contexts &contexts ) const;
 
+		/// Implemented to return the substituted file name.
+		virtual void executionOutputs( const Gaffer::Context *context, std::vector<std::string> &fileNames ) const;
+		
+		/// Implemented to return true, as execute() only computes
+		/// the image and writes it to its own file.
+		virtual bool executionIsThreadSafe() const;
+
 	private :
 		
 		void plugSet( Gaffer::Plug *plug );
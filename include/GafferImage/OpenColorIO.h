@@ -61,6 +61,9 @@ class OpenColorIO : public FilterProcessor
 		const Gaffer::StringPlug *outputSpacePlug() const;
 
 		virtual void affects( const Gaffer::Plug *input, AffectedPlugsContainer &outputs ) const;
+		/// Returns true, as our hashes include the cache id of the
+		/// current OpenColorIO config.
+		virtual bool hashIsStableBetweenSessions() const;
 
 	protected:
 
@@ -58,6 +58,8 @@ class Cube : public ObjectSource
 		const Gaffer::V3fPlug *dimensionsPlug() const;
 		
 		virtual void affects( const Gaffer::Plug *input, AffectedPlugsContainer &outputs ) const;
+		/// Returns true, as the mesh depends only on the plug values.
+		virtual bool hashIsStableBetweenSessions() const;
 		
 	protected :
 
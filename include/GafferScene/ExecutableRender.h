@@ -57,9 +57,15 @@ class ExecutableRender : public Render, public Gaffer::Executable
 		IE_CORE_DECLARERUNTIMETYPEDEXTENSION( GafferScene::ExecutableRender, ExecutableRenderTypeId, Render );
 		
 		virtual void executionRequirements( const Gaffer::Context *context, Tasks &requirements ) const;
+		/// Implemented to hash the node's settings, the frame and the display file names,
+		/// along with the entire input scene.
 		virtual IECore::MurmurHash executionHash( const Gaffer::Context *context ) const;
 		/// Implemented to perform the render.
 		virtual void execute( const Contexts &contexts ) const;
+		/// Implemented to return the file names of the displays specified in the globals,
+		/// unless command() returns a command, which is run in the background and may
+		/// not have written the displays by the time execute() returns.
+		virtual void executionOutputs( const Gaffer::Context *context, std::vector<std::string> &fileNames ) const;
 
 	protected :
 	
@@ -63,6 +63,8 @@ class MeshType : public SceneElementProcessor
 		const Gaffer::BoolPlug *overwriteExistingNormalsPlug() const;
 
 		virtual void affects( const Gaffer::Plug *input, AffectedPlugsContainer &outputs ) const;
+		/// Returns true, as the conversion depends only on the plug values.
+		virtual bool hashIsStableBetweenSessions() const;
 				
 	protected :
 		
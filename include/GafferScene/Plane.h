@@ -62,6 +62,8 @@ class Plane : public ObjectSource
 		const Gaffer::V2iPlug *divisionsPlug() const;
 		
 		virtual void affects( const Gaffer::Plug *input, AffectedPlugsContainer &outputs ) const;
+		/// Returns true, as the mesh depends only on the plug values.
+		virtual bool hashIsStableBetweenSessions() const;
 		
 	protected :
 
@@ -128,6 +128,9 @@ class ScenePlug : public Gaffer::CompoundPlug
 		IECore::CompoundObjectPtr fullAttributes( const ScenePath &scenePath ) const;
 		IECore::ConstObjectPtr object( const ScenePath &scenePath ) const;
 		IECore::ConstInternedStringVectorDataPtr childNames( const ScenePath &scenePath ) const;
+		/// As for object(), but computes the object on a background thread.
+		/// See ValuePlug::getValueAsync().
+		Gaffer::ComputeFuturePtr objectAsync( const ScenePath &scenePath ) const;
 		
 		IECore::MurmurHash boundHash( const ScenePath &scenePath ) const;
 		IECore::MurmurHash transformHash( const ScenePath &scenePath ) const;
@@ -136,6 +139,13 @@ class ScenePlug : public Gaffer::CompoundPlug
 		IECore::MurmurHash fullAttributesHash( const ScenePath &scenePath ) const;
 		IECore::MurmurHash objectHash( const ScenePath &scenePath ) const;
 		IECore::MurmurHash childNamesHash( const ScenePath &scenePath ) const;		
+		/// Returns a hash representing the entire hierarchy below (and including)
+		/// the specified location - the transforms, attributes, objects, bounds and
+		/// child names of every location, and the globals if scenePath is the root.
+		/// This requires a traversal of the hierarchy, but computes only hashes and
+		/// child names, so is considerably cheaper than computing the scene itself.
+		/// The children of each location are traversed in parallel.
+		IECore::MurmurHash hierarchyHash( const ScenePath &scenePath ) const;
 		//@}
 	
 		/// Utility function to convert a string into a path by splitting on '/'.
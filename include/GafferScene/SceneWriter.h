@@ -37,7 +37,7 @@
 #ifndef GAFFERSCENE_SCENEWRITER_H
 #define GAFFERSCENE_SCENEWRITER_H
 
-#include "Gaffer/Node.h"
+#include "Gaffer/ExecutableNode.h"
 #include "Gaffer/TypedPlug.h"
 #include "GafferScene/TypeIds.h"
 #include "GafferScene/ScenePlug.h"
@@ -47,7 +47,7 @@
 namespace GafferScene
 {
 
-class SceneWriter : public Gaffer::Node
+class SceneWriter : public Gaffer::ExecutableNode
 {
 
 	public :
@@ -55,7 +55,7 @@ class SceneWriter : public Gaffer::Node
 		SceneWriter( const std::string &name=defaultName<SceneWriter>() );
 		virtual ~SceneWriter();
 		
-		IE_CORE_DECLARERUNTIMETYPEDEXTENSION( GafferScene::SceneWriter, SceneWriterTypeId, Node );
+		IE_CORE_DECLARERUNTIMETYPEDEXTENSION( GafferScene::SceneWriter, SceneWriterTypeId, Gaffer::ExecutableNode );
 		
 		Gaffer::StringPlug *fileNamePlug();
 		const Gaffer::StringPlug *fileNamePlug() const;
@@ -63,11 +63,20 @@ class SceneWriter : public Gaffer::Node
 		ScenePlug *inPlug();
 		const ScenePlug *inPlug() const;
 		
-		void execute();
+		virtual void executionRequirements( const Gaffer::Context *context, Executable::Tasks &requirements ) const;
+		/// Implemented to hash the file name and frame along with the entire input scene.
+		virtual IECore::MurmurHash executionHash( const Gaffer::Context *context ) const;
+		/// Writes a file for each of the contexts in turn.
+		virtual void execute( const Executable::Contexts &contexts ) const;
+		/// Implemented to return the substituted file name.
+		virtual void executionOutputs( const Gaffer::Context *context, std::vector<std::string> &fileNames ) const;
+
+		/// Convenience function to execute in the context of the script.
+		void execute() const;
 		
 	private :
 	
-		void writeLocation( GafferScene::ScenePlug *scenePlug, const ScenePlug::ScenePath &scenePath, IECore::SceneInterface *output );
+		void writeLocation( const GafferScene::ScenePlug *scenePlug, const ScenePlug::ScenePath &scenePath, IECore::SceneInterface *output ) const;
 		
 		static size_t g_firstPlugIndex;
 		
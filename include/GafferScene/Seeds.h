@@ -60,6 +60,9 @@ class Seeds : public BranchCreator
 		const Gaffer::StringPlug *pointTypePlug() const;
 
 		virtual void affects( const Gaffer::Plug *input, AffectedPlugsContainer &outputs ) const;
+		/// Returns true, as the points are generated deterministically
+		/// from the plug values alone.
+		virtual bool hashIsStableBetweenSessions() const;
 
 	protected :
 	
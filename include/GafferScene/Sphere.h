@@ -79,6 +79,8 @@ class Sphere : public ObjectSource
 		const Gaffer::V2iPlug *divisionsPlug() const;
 		
 		virtual void affects( const Gaffer::Plug *input, AffectedPlugsContainer &outputs ) const;
+		/// Returns true, as the sphere depends only on the plug values.
+		virtual bool hashIsStableBetweenSessions() const;
 		
 	protected :
 
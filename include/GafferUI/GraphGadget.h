@@ -144,6 +144,7 @@ class GraphGadget : public ContainerGadget
 		void filterMemberRemoved( Gaffer::Set *set, IECore::RunTimeTyped *member );
 		void inputChanged( Gaffer::Plug *dstPlug );
 		void plugSet( Gaffer::Plug *plug );
+		void scriptExecutionFinished( Gaffer::GraphComponent *script );
 	
 		bool keyPressed( GadgetPtr gadget, const KeyEvent &event );
 		
@@ -176,6 +177,10 @@ class GraphGadget : public ContainerGadget
 		GraphGadgetSignal m_rootChangedSignal;
 		boost::signals::scoped_connection m_rootChildAddedConnection;
 		boost::signals::scoped_connection m_rootChildRemovedConnection;
+		// Nodes added while the script is executing are dealt with in
+		// a single call to updateGraph() when execution finishes.
+		bool m_graphUpdatePending;
+		boost::signals::scoped_connection m_scriptExecutionFinishedConnection;
 
 		Gaffer::SetPtr m_filter;
 		boost::signals::scoped_connection m_filterMemberAddedConnection;
@@ -92,7 +92,7 @@ class StandardNodeGadget : public NodeGadget
 		typedef std::map<const Gaffer::Plug *, Nodule *> NoduleMap;
 		NoduleMap m_nodules;
 				
-		void selectionChanged( Gaffer::Set *selection, IECore::RunTimeTyped *node );
+		void selectionChanged( Gaffer::Set *selection );
 		void childAdded( Gaffer::GraphComponent *parent, Gaffer::GraphComponent *child );
 		void childRemoved( Gaffer::GraphComponent *parent, Gaffer::GraphComponent *child );
 		
@@ -111,6 +111,7 @@ class StandardNodeGadget : public NodeGadget
 
 		bool m_nodeEnabled;
 		bool m_labelsVisibleOnHover;
+		bool m_selected;
 		// we accept drags from nodules and forward them to the
 		// closest compatible child nodule - m_dragDestinationProxy.
 		Nodule *m_dragDestinationProxy;
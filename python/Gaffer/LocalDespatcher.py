@@ -34,17 +34,90 @@
 #  
 ##########################################################################
 
+import sys
+import Queue
+import threading
+import traceback
+import collections
+
 import Gaffer
 import IECore
 
+## Executes tasks locally, in the current process. By default tasks are
+# executed serially, but setNumThreads() allows tasks whose requirements have
+# been met to be executed concurrently on a pool of worker threads, so that
+# independent branches of the requirement graph (and independent frames of
+# a sequence) can make use of several cores. Only tasks whose nodes return
+# True from executionIsThreadSafe() are executed alongside other tasks - all
+# others are executed on their own.
 class LocalDespatcher( Gaffer.Despatcher ) :
 
 	__despatcher = None
 
-	def __init__( self ) :
+	def __init__( self, numThreads = 1 ) :
 
 		Gaffer.Despatcher.__init__( self )
 
+		self.__numThreads = numThreads
+		self.__skipUpToDateTasks = False
+
+		self.__taskStartedSignal = Gaffer.Signal2()
+		self.__taskFinishedSignal = Gaffer.Signal2()
+		self.__taskFailedSignal = Gaffer.Signal3()
+		self.__taskSkippedSignal = Gaffer.Signal2()
+
+	## Sets the maximum number of tasks which may be executed
+	# concurrently. A value of 1, the default, executes all tasks
+	# serially on the calling thread. multiprocessing.cpu_count()
+	# is a reasonable choice when executing thread safe nodes.
+	def setNumThreads( self, numThreads ) :
+
+		if numThreads < 1 :
+			raise ValueError( "numThreads must be at least 1" )
+
+		self.__numThreads = numThreads
+
+	def getNumThreads( self ) :
+
+		return self.__numThreads
+
+	## When on, the executionHash of each task is recorded alongside its
+	# executionOutputs, and tasks whose outputs were recorded with the
+	# current hash are skipped, unless one of their requirements had to
+	# be executed. This gives make-style incremental execution.
+	def setSkipUpToDateTasks( self, skipUpToDateTasks ) :
+
+		self.__skipUpToDateTasks = skipUpToDateTasks
+
+	def getSkipUpToDateTasks( self ) :
+
+		return self.__skipUpToDateTasks
+
+	## Emitted with ( despatcher, task ) immediately before a task
+	# is executed.
+	def taskStartedSignal( self ) :
+
+		return self.__taskStartedSignal
+
+	## Emitted with ( despatcher, task ) when a task has been executed
+	# successfully.
+	def taskFinishedSignal( self ) :
+
+		return self.__taskFinishedSignal
+
+	## Emitted with ( despatcher, task, errorString ) when a task fails.
+	# No further tasks are started after a failure, and the despatch()
+	# call raises once all running tasks have completed.
+	def taskFailedSignal( self ) :
+
+		return self.__taskFailedSignal
+
+	## Emitted with ( despatcher, task ) when a task is skipped
+	# because its outputs are already up to date.
+	def taskSkippedSignal( self ) :
+
+		return self.__taskSkippedSignal
+
 	def _doDespatch( self, nodes ) :
 
 		if not nodes :
@@ -60,9 +133,27 @@ class LocalDespatcher( Gaffer.Despatcher ) :
 
 		allTasksAndRequirements = Gaffer.Despatcher._uniqueTasks( taskList )
 
-		for (task,requirements) in allTasksAndRequirements :
+		# Build the requirement graph. Tasks are only unique up to node and
+		# context, so a requirement may match several entries, in which case
+		# we conservatively wait for all of them.
 
-			task.node.execute( [ task.context ] )
+		tasks = [ t[0] for t in allTasksAndRequirements ]
+
+		taskIndices = {}
+		for index, task in enumerate( tasks ) :
+			taskIndices.setdefault( task, [] ).append( index )
+
+		requirementIndices = []
+		for index, ( task, requirements ) in enumerate( allTasksAndRequirements ) :
+			indices = set()
+			for requirement in requirements :
+				indices.update( i for i in taskIndices[requirement] if i != index )
+			requirementIndices.append( indices )
+
+		if self.__numThreads == 1 or len( tasks ) == 1 :
+			self.__executeSerially( tasks, requirementIndices )
+		else :
+			self.__executeInParallel( tasks, requirementIndices )
 
 	def _addPlugs( self, despatcherPlug ) :
 
@@ -77,6 +168,153 @@ class LocalDespatcher( Gaffer.Despatcher ) :
 
 		return LocalDespatcher.__despatcher
 
+	# Returns the hash to be recorded for the task once it has been executed,
+	# or None if the task is up to date and should be skipped. Must be called
+	# only once all the requirements of the task have been dealt with.
+	def __prepareTask( self, index, tasks, requirementIndices, executed ) :
+
+		if not self.__skipUpToDateTasks :
+			return IECore.MurmurHash()
+
+		task = tasks[index]
+		h = task.node.executionHash( task.context )
+		if executed.isdisjoint( requirementIndices[index] ) and Gaffer.Despatcher._upToDate( task, h ) :
+			return None
+
+		return h
+
+	def __taskExecuted( self, index, tasks, executed, h ) :
+
+		executed.add( index )
+		if self.__skipUpToDateTasks :
+			Gaffer.Despatcher._recordExecution( tasks[index], h )
+
+		self.__taskFinishedSignal( self, tasks[index] )
+
+	# _uniqueTasks() returns tasks in an order which already satisfies
+	# all requirements, so the serial case needs no scheduling.
+	def __executeSerially( self, tasks, requirementIndices ) :
+
+		executed = set()
+		for index, task in enumerate( tasks ) :
+
+			h = self.__prepareTask( index, tasks, requirementIndices, executed )
+			if h is None :
+				self.__taskSkippedSignal( self, task )
+				continue
+
+			self.__taskStartedSignal( self, task )
+			try :
+				task.node.execute( [ task.context ] )
+			except :
+				self.__taskFailedSignal( self, task, "".join( traceback.format_exception( *sys.exc_info() ) ) )
+				raise
+
+			self.__taskExecuted( index, tasks, executed, h )
+
+	# Tasks are handed to the workers as soon as their requirements have
+	# completed, except that tasks which aren't thread safe wait until no
+	# other tasks are running, and prevent any others from starting until
+	# they are done. All signals are emitted on the calling thread, so that
+	# slots may safely update the UI.
+	def __executeInParallel( self, tasks, requirementIndices ) :
+
+		numRequirements = [ len( r ) for r in requirementIndices ]
+		dependents = [ [] for t in tasks ]
+		for index, indices in enumerate( requirementIndices ) :
+			for requirementIndex in indices :
+				dependents[requirementIndex].append( index )
+
+		workQueue = Queue.Queue()
+		resultQueue = Queue.Queue()
+
+		workers = []
+		for i in range( 0, min( self.__numThreads, len( tasks ) ) ) :
+			worker = threading.Thread( target = self.__worker, args = ( workQueue, resultQueue ) )
+			worker.daemon = True
+			worker.start()
+			workers.append( worker )
+
+		ready = collections.deque( i for i, n in enumerate( numRequirements ) if n == 0 )
+		hashes = {}
+		executed = set()
+		numRunning = 0
+		exclusiveRunning = False
+		failures = []
+
+		def requirementComplete( index ) :
+			for dependent in dependents[index] :
+				numRequirements[dependent] -= 1
+				if numRequirements[dependent] == 0 :
+					ready.append( dependent )
+
+		try :
+
+			while ready or numRunning :
+
+				while ready and not failures and not exclusiveRunning :
+
+					index = ready[0]
+					exclusive = not tasks[index].node.executionIsThreadSafe()
+					if exclusive and numRunning :
+						# wait for the running tasks to finish
+						break
+
+					ready.popleft()
+
+					h = self.__prepareTask( index, tasks, requirementIndices, executed )
+					if h is None :
+						self.__taskSkippedSignal( self, tasks[index] )
+						requirementComplete( index )
+						continue
+
+					hashes[index] = h
+					self.__taskStartedSignal( self, tasks[index] )
+					workQueue.put( ( index, tasks[index] ) )
+					numRunning += 1
+					exclusiveRunning = exclusive
+
+				if not numRunning :
+					break
+
+				index, error = resultQueue.get()
+				numRunning -= 1
+				exclusiveRunning = False
+
+				if error is not None :
+					failures.append( ( tasks[index], error ) )
+					self.__taskFailedSignal( self, tasks[index], error )
+					continue
+
+				self.__taskExecuted( index, tasks, executed, hashes[index] )
+				requirementComplete( index )
+
+		finally :
+
+			for worker in workers :
+				workQueue.put( None )
+			for worker in workers :
+				worker.join()
+
+		if failures :
+			raise RuntimeError( "Failed to execute %d task(s) :\n\n%s" % ( len( failures ), failures[0][1] ) )
+
+	@staticmethod
+	def __worker( workQueue, resultQueue ) :
+
+		while True :
+
+			item = workQueue.get()
+			if item is None :
+				return
+
+			index, task = item
+			try :
+				task.node.execute( [ task.context ] )
+				resultQueue.put( ( index, None ) )
+			except :
+				resultQueue.put( ( index, "".join( traceback.format_exception( *sys.exc_info() ) ) ) )
+
 IECore.registerRunTimeTyped( LocalDespatcher )
 
 Gaffer.Despatcher._registerDespatcher( "local", LocalDespatcher._singleton() )
@@ -0,0 +1,94 @@
+##########################################################################
+#  
+#  Copyright (c) 2012-2013, Image Engine Design Inc. All rights reserved.
+#  
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are
+#  met:
+#  
+#      * Redistributions of source code must retain the above
+#        copyright notice, this list of conditions and the following
+#        disclaimer.
+#  
+#      * Redistributions in binary form must reproduce the above
+#        copyright notice, this list of conditions and the following
+#        disclaimer in the documentation and/or other materials provided with
+#        the distribution.
+#  
+#      * Neither the name of John Haddon nor the names of
+#        any other contributors to this software may be used to endorse or
+#        promote products derived from this software without specific prior
+#        written permission.
+#  
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+#  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+#  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+#  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+#  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+#  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+#  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+#  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+#  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+#  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+#  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#  
+##########################################################################
+
+
+import Gaffer
+
+# Add on methods to allow monitors to be used in "with" blocks,
+# in the same way as for Contexts.
+
+def __enter( self ) :
+
+	if not hasattr( self, "_scopes" ) :
+		self._scopes = []
+		
+	self._scopes.append( Gaffer.PerformanceMonitor._Scope( self ) )
+	return self
+	
+def __exit( self, type, value, traceBack ) :
+
+	del self._scopes[-1]
+
+## Returns a formatted string listing the plugs which were most
+# expensive to evaluate, ordered by the total time spent in their
+# hash and compute calls.
+def __formatStatistics( self, maxLines = 50 ) :
+
+	def total( s ) :
+		return s.hashWallTime + s.computeWallTime
+
+	statistics = sorted( self.allStatistics(), key = lambda x : total( x[1] ), reverse = True )
+	combined = self.combinedStatistics()
+
+	lines = [
+		"%-60s %8s %8s %8s %10s %10s %10s %10s" % (
+			"Plug", "Hashes", "Computes", "Hits",
+			"HashWall", "HashCPU", "ComputeWall", "ComputeCPU",
+		)
+	]
+	
+	def line( name, s ) :
+		return "%-60s %8d %8d %8d %10.4f %10.4f %10.4f %10.4f" % (
+			name, s.hashCount, s.computeCount, s.cacheHitCount,
+			s.hashWallTime, s.hashCPUTime, s.computeWallTime, s.computeCPUTime,
+		)
+		
+	for plug, s in statistics[:maxLines] :
+		lines.append( line( plug.fullName(), s ) )
+	
+	lines.append( line( "Total", combined ) )
+	
+	lookups = combined.computeCount + combined.cacheHitCount
+	if lookups :
+		lines.append( "Cache hit ratio : %.1f%%" % ( 100.0 * combined.cacheHitCount / lookups ) )
+	
+	return "\n".join( lines )
+
+Gaffer.PerformanceMonitor.__enter__ = __enter
+Gaffer.PerformanceMonitor.__exit__ = __exit
+Gaffer.PerformanceMonitor.formatStatistics = __formatStatistics
+
+PerformanceMonitor = Gaffer.PerformanceMonitor
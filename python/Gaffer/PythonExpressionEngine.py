@@ -56,7 +56,25 @@ class PythonExpressionEngine( Gaffer.Expression.Engine ) :
 		self.__inPlugs = parser.plugReads
 		self.__outPlug = parser.plugWrites[0]
 		self.__contextNames = parser.contextReads
-	
+		
+		# execute() may be called millions of times, so we do as much
+		# of the work as possible up front. the expression is compiled
+		# only once, and the plug paths are split into the parent path
+		# and the plug name, ready for building the plug dictionary.
+		
+		self.__code = compile( expression, "<string>", "exec" )
+		self.__inPlugPaths = [ self.__splitPath( p ) for p in self.__inPlugs ]
+		self.__outPlugPath = self.__splitPath( self.__outPlug )
+		
+		# expressions which read only from the context (typically just
+		# the frame) have no inputs, so the shape of the plug dictionary
+		# is known in advance. we store the path to the output plug inside
+		# out, so that execute() can build the dictionary without any
+		# lookups. the dictionaries themselves must still be created
+		# afresh for each execution, as execute() may be called
+		# concurrently from several threads.
+		self.__outPlugPathReversed = tuple( reversed( self.__outPlugPath[0] ) )
+		
 	def outPlug( self ) :
 	
 		return self.__outPlug
@@ -71,25 +89,47 @@ class PythonExpressionEngine( Gaffer.Expression.Engine ) :
 		
 	def execute( self, context, inputs, output ) :
 	
+		if not inputs :
+			self.__executeWithoutInputs( context, output )
+			return
+	
 		plugDict = {}
-		for plugPath, plug in zip( self.__inPlugs, inputs ) :
+		for ( parentPath, name ), plug in zip( self.__inPlugPaths, inputs ) :
 			parentDict = plugDict
-			plugPathSplit = plugPath.split( "." )
-			for p in plugPathSplit[:-1] :
+			for p in parentPath :
 				parentDict = parentDict.setdefault( p, {} )
-			parentDict[plugPathSplit[-1]] = plug.getValue()
+			parentDict[name] = plug.getValue()
 		
-		outputPlugPathSplit = self.__outPlug.split( "." )
+		outputParentPath, outputName = self.__outPlugPath
 		outputPlugDict = plugDict
-		for p in outputPlugPathSplit[:-1] :
+		for p in outputParentPath :
 			outputPlugDict = outputPlugDict.setdefault( p, {} )
 			
 		executionDict = { "parent" : plugDict, "context" : context }
 				
-		exec( self.__expression, executionDict, executionDict )
+		exec( self.__code, executionDict, executionDict )
+		
+		output.setValue( outputPlugDict[outputName] )
+	
+	def __executeWithoutInputs( self, context, output ) :
+	
+		outputPlugDict = {}
+		plugDict = outputPlugDict
+		for p in self.__outPlugPathReversed :
+			plugDict = { p : plugDict }
+		
+		executionDict = { "parent" : plugDict, "context" : context }
 		
-		output.setValue( outputPlugDict[outputPlugPathSplit[-1]] )
+		exec( self.__code, executionDict, executionDict )
+		
+		output.setValue( outputPlugDict[self.__outPlugPath[1]] )
+	
+	@staticmethod
+	def __splitPath( plugPath ) :
 	
+		plugPathSplit = plugPath.split( "." )
+		return ( tuple( plugPathSplit[:-1] ), plugPathSplit[-1] )
+		
 class _Parser( ast.NodeVisitor ) :
 
 	def __init__( self, expression ) :
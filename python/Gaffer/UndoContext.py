@@ -40,14 +40,15 @@ class UndoContext() :
 
 	State = _UndoContext.State
 
-	def __init__( self, script, state=_UndoContext.State.Enabled ) :
+	def __init__( self, script, state=_UndoContext.State.Enabled, mergeGroup="" ) :
 	
 		self.__script = script
 		self.__state = state
+		self.__mergeGroup = mergeGroup
 
 	def __enter__( self ) :
 
-		self.__context = _UndoContext( self.__script, self.__state )
+		self.__context = _UndoContext( self.__script, self.__state, self.__mergeGroup )
 		
 	def __exit__( self, type, value, traceBack ) :
 
@@ -65,4 +65,6 @@ from GraphComponentPath import GraphComponentPath
 from ParameterPath import ParameterPath
 from OutputRedirection import OutputRedirection
 from LocalDespatcher import LocalDespatcher
+from PerformanceMonitor import PerformanceMonitor
+from DirtyPropagationScope import DirtyPropagationScope
 
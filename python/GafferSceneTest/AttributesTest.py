@@ -41,6 +41,7 @@ import threading
 import IECore
 
 import Gaffer
+import GafferTest
 import GafferScene
 import GafferSceneTest
 
@@ -227,6 +228,49 @@ class AttributesTest( GafferSceneTest.SceneTestCase ) :
 			self.assertEqual( a["out"]["object"].hash(), input["out"]["object"].hash() )
 			self.assertNotEqual( a["out"]["attributes"].hash(), input["out"]["attributes"].hash() )
 	
+	def testAddAndRemoveMembersAfterHashing( self ) :
+	
+		input = GafferSceneTest.CompoundObjectSource()
+		input["in"].setValue(
+			IECore.CompoundObject( {
+				"bound" : IECore.Box3fData( IECore.Box3f( IECore.V3f( -1 ), IECore.V3f( 1 ) ) ),
+				"children" : {
+					"ball" : {
+						"bound" : IECore.Box3fData( IECore.Box3f( IECore.V3f( -1 ), IECore.V3f( 1 ) ) ),
+					},
+				},
+			} )
+		)
+	
+		a = GafferScene.Attributes()
+		a["in"].setInput( input["out"] )
+		
+		cs = GafferTest.CapturingSlot( a.plugDirtiedSignal() )
+		
+		c = Gaffer.Context()
+		c["scene:path"] = IECore.InternedStringVectorData( [ "ball" ] )
+		with c :
+		
+			h1 = a["out"]["attributes"].hash()
+			self.assertEqual( a["out"]["attributes"].getValue(), IECore.CompoundObject() )
+			
+			# adding a member must invalidate any hashes cached
+			# against the old structure.
+			a["attributes"].addMember( "user:test", IECore.IntData( 1 ) )
+			self.assertTrue( a["out"]["attributes"] in [ x[0] for x in cs ] )
+			
+			h2 = a["out"]["attributes"].hash()
+			self.assertNotEqual( h2, h1 )
+			self.assertEqual( a["out"]["attributes"].getValue(), IECore.CompoundObject( { "user:test" : IECore.IntData( 1 ) } ) )
+			
+			# as must removing one
+			del cs[:]
+			a["attributes"].removeChild( a["attributes"][0] )
+			self.assertTrue( a["out"]["attributes"] in [ x[0] for x in cs ] )
+			
+			self.assertEqual( a["out"]["attributes"].hash(), h1 )
+			self.assertEqual( a["out"]["attributes"].getValue(), IECore.CompoundObject() )
+	
 	def testSerialisation( self ) :
 	
 		s = Gaffer.ScriptNode()
@@ -166,6 +166,54 @@ class RenderTest( GafferSceneTest.SceneTestCase ) :
 		w = s["r"].world()
 		self.assertEqual( w.children()[0].state()[0].attributes["name"].value, "/group/light" )
 		self.assertEqual( w.children()[0].state()[1].handle, "/group/light" )
-					
+
+	def testExecutionHashAndOutputs( self ) :
+
+		s = Gaffer.ScriptNode()
+
+		s["p"] = GafferScene.Plane()
+		s["d"] = GafferScene.Displays()
+		s["d"]["in"].setInput( s["p"]["out"] )
+		s["d"].addDisplay( "beauty", IECore.Display( "/tmp/test.${frame}.exr", "exr", "rgba", {} ) )
+
+		s["r"] = GafferSceneTest.TestRender()
+		s["r"]["in"].setInput( s["d"]["out"] )
+
+		c1 = Gaffer.Context( s.context() )
+		c2 = Gaffer.Context( s.context() )
+		c2.setFrame( 2 )
+
+		# the scene doesn't vary with time, but the output file names
+		# do, so the tasks mustn't be considered identical.
+		self.assertNotEqual( s["r"].executionHash( c1 ), s["r"].executionHash( c2 ) )
+		self.assertEqual( s["r"].executionOutputs( c1 ), [ "/tmp/test.1.exr" ] )
+		self.assertEqual( s["r"].executionOutputs( c2 ), [ "/tmp/test.2.exr" ] )
+
+		h = s["r"].executionHash( c1 )
+		s["p"]["dimensions"]["x"].setValue( 10 )
+		self.assertNotEqual( s["r"].executionHash( c1 ), h )
+
+	def testBackgroundedRenderHasNoOutputs( self ) :
+
+		class CommandRender( GafferSceneTest.TestRender ) :
+
+			def _command( self ) :
+
+				return "true"
+
+		s = Gaffer.ScriptNode()
+
+		s["p"] = GafferScene.Plane()
+		s["d"] = GafferScene.Displays()
+		s["d"]["in"].setInput( s["p"]["out"] )
+		s["d"].addDisplay( "beauty", IECore.Display( "/tmp/test.exr", "exr", "rgba", {} ) )
+
+		s["r"] = CommandRender()
+		s["r"]["in"].setInput( s["d"]["out"] )
+
+		# the command runs in the background, so the outputs may not exist
+		# when execute() returns, and mustn't have an execution recorded.
+		self.assertEqual( s["r"].executionOutputs( s.context() ), [] )
+
 if __name__ == "__main__":
 	unittest.main()
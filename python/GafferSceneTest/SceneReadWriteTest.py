@@ -294,6 +294,51 @@ class SceneReadWriteTest( GafferSceneTest.SceneTestCase ) :
 		self.assertEqual( s["out"].attributes( "/" ), IECore.CompoundObject() )
 		self.assertEqual( s["out"].object( "/" ), IECore.NullObject() )
 
+	def testWriterExecutionHash( self ) :
+
+		script = Gaffer.ScriptNode()
+
+		script["plane"] = GafferScene.Plane()
+		script["group"] = GafferScene.Group()
+		script["group"]["in"].setInput( script["plane"]["out"] )
+
+		script["writer"] = GafferScene.SceneWriter()
+		script["writer"]["fileName"].setValue( "/tmp/test.${frame}.scc" )
+
+		c = Gaffer.Context( script.context() )
+
+		# no input means nothing to do
+		self.assertEqual( script["writer"].executionHash( c ), IECore.MurmurHash() )
+
+		script["writer"]["in"].setInput( script["group"]["out"] )
+		h = script["writer"].executionHash( c )
+		self.assertNotEqual( h, IECore.MurmurHash() )
+		self.assertEqual( script["writer"].executionHash( c ), h )
+		self.assertEqual( script["writer"].executionOutputs( c ), [ "/tmp/test.1.scc" ] )
+
+		# changes anywhere in the hierarchy must be reflected in the hash
+		script["plane"]["transform"]["translate"]["x"].setValue( 1 )
+		h2 = script["writer"].executionHash( c )
+		self.assertNotEqual( h2, h )
+
+		c.setFrame( 2 )
+		self.assertNotEqual( script["writer"].executionHash( c ), h2 )
+		self.assertEqual( script["writer"].executionOutputs( c ), [ "/tmp/test.2.scc" ] )
+
+	def testWriterExecuteWithContexts( self ) :
+
+		script = Gaffer.ScriptNode()
+
+		script["plane"] = GafferScene.Plane()
+		script["writer"] = GafferScene.SceneWriter()
+		script["writer"]["in"].setInput( script["plane"]["out"] )
+		script["writer"]["fileName"].setValue( self.__testFile )
+
+		script["writer"].execute( [ script.context() ] )
+
+		sc = IECore.SceneCache( self.__testFile, IECore.IndexedIO.OpenMode.Read )
+		self.assertTrue( sc.hasChild( "plane" ) )
+
 	def tearDown( self ) :
 		
 		if os.path.exists( self.__testFile ) :
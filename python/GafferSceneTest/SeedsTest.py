@@ -35,6 +35,9 @@
 #  
 ##########################################################################
 
+import os
+import glob
+import shutil
 import unittest
 import threading
 
@@ -111,6 +114,45 @@ class SeedsTest( GafferSceneTest.SceneTestCase ) :
 		
 		self.assertEqual( s["out"].childNames( "/plane" ), IECore.InternedStringVectorData() )
 		self.assertScenesEqual( s["out"], p["out"] )
-		 		
+	
+	def testDiskCache( self ) :
+	
+		p = GafferScene.Plane()
+		p["divisions"].setValue( IECore.V2i( 100 ) )
+		
+		s = GafferScene.Seeds()
+		s["in"].setInput( p["out"] )
+		s["parent"].setValue( "/plane" )
+		s["name"].setValue( "seeds" )
+		# enough points to make the computation worth storing on disk
+		s["density"].setValue( 100000 )
+		
+		originalCacheMemoryLimit = Gaffer.ValuePlug.getCacheMemoryLimit()
+		Gaffer.ValuePlug.setDiskCacheDirectory( self.__diskCacheDirectory )
+		try :
+		
+			Gaffer.ValuePlug.clearDiskCache()
+		
+			points = s["out"].object( "/plane/seeds" )
+			self.assertTrue( len( glob.glob( self.__diskCacheDirectory + "/*.gfc" ) ) > 0 )
+		
+			# clear the memory cache, so that the points must be
+			# loaded from disk rather than recomputed.
+			Gaffer.ValuePlug.resetCacheStatistics()
+			Gaffer.ValuePlug.setCacheMemoryLimit( 0 )
+			Gaffer.ValuePlug.setCacheMemoryLimit( originalCacheMemoryLimit )
+		
+			self.assertEqual( s["out"].object( "/plane/seeds" ), points )
+			self.assertTrue( Gaffer.ValuePlug.cacheStatistics()["diskHits"].value > 0 )
+		
+		finally :
+		
+			Gaffer.ValuePlug.setCacheMemoryLimit( originalCacheMemoryLimit )
+			Gaffer.ValuePlug.setDiskCacheDirectory( "" )
+			if os.path.exists( self.__diskCacheDirectory ) :
+				shutil.rmtree( self.__diskCacheDirectory )
+	
+	__diskCacheDirectory = "/tmp/gafferSeedsTestDiskCache"
+	
 if __name__ == "__main__":
 	unittest.main()
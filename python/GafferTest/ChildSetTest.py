@@ -85,6 +85,24 @@ class ChildSetTest( unittest.TestCase ) :
 		
 		self.assertEqual( len( s ), 0 )
 		self.assertEqual( mirrorSet, set( s ) )
+	
+	def testMembersChangedSignal( self ) :
+	
+		p = Gaffer.GraphComponent()
+		s = Gaffer.ChildSet( p )
+		
+		sizes = []
+		def membersChanged( s ) :
+		
+			sizes.append( len( s ) )
+			
+		c = s.membersChangedSignal().connect( membersChanged )
+		
+		p["one"] = Gaffer.GraphComponent()
+		self.assertEqual( sizes, [ 1 ] )
+		
+		del p["one"]
+		self.assertEqual( sizes, [ 1, 0 ] )
 		
 if __name__ == "__main__":
 	unittest.main()
@@ -0,0 +1,167 @@
+##########################################################################
+#  
+#  Copyright (c) 2012-2013, Image Engine Design Inc. All rights reserved.
+#  
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are
+#  met:
+#  
+#      * Redistributions of source code must retain the above
+#        copyright notice, this list of conditions and the following
+#        disclaimer.
+#  
+#      * Redistributions in binary form must reproduce the above
+#        copyright notice, this list of conditions and the following
+#        disclaimer in the documentation and/or other materials provided with
+#        the distribution.
+#  
+#      * Neither the name of John Haddon nor the names of
+#        any other contributors to this software may be used to endorse or
+#        promote products derived from this software without specific prior
+#        written permission.
+#  
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+#  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+#  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+#  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+#  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+#  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+#  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+#  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+#  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+#  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+#  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#  
+##########################################################################
+
+
+import time
+import threading
+import unittest
+
+import IECore
+
+import Gaffer
+import GafferTest
+
+class ComputeFutureTest( GafferTest.TestCase ) :
+
+	def testGetValueAsync( self ) :
+	
+		n = GafferTest.AddNode()
+		n["op1"].setValue( 1 )
+		n["op2"].setValue( 2 )
+		
+		f = n["sum"].getValueAsync()
+		self.assertEqual( f.get(), IECore.IntData( 3 ) )
+		self.assertTrue( f.done() )
+		self.assertFalse( f.cancelled() )
+		
+		# the value should now be cached, and
+		# available via the usual route.
+		self.assertEqual( n["sum"].getValue(), 3 )
+	
+	def testContext( self ) :
+	
+		n = GafferTest.FrameNode()
+		
+		with Gaffer.Context() as c :
+			c.setFrame( 10 )
+			f = n["output"].getValueAsync()
+		
+		self.assertEqual( f.get(), IECore.FloatData( 10 ) )
+	
+	def testCancellation( self ) :
+	
+		class LoopingNode( Gaffer.ComputeNode ) :
+		
+			def __init__( self, name="LoopingNode" ) :
+			
+				Gaffer.ComputeNode.__init__( self, name )
+				
+				self.addChild( Gaffer.IntPlug( "in" ) )
+				self.addChild( Gaffer.IntPlug( "out", Gaffer.Plug.Direction.Out ) )
+				
+				self.started = threading.Event()
+				self.iterations = 0
+				
+			def affects( self, input ) :
+			
+				if input.isSame( self["in"] ) :
+					return [ self["out"] ]
+					
+				return []
+				
+			def hash( self, output, context, h ) :
+			
+				self["in"].hash( h )
+				
+			def compute( self, plug, context ) :
+			
+				self.started.set()
+				for i in range( 0, 1000 ) :
+					Gaffer.ComputeFuture.checkCancellation()
+					self.iterations += 1
+					time.sleep( 0.01 )
+					
+				plug.setValue( self["in"].getValue() )
+		
+		IECore.registerRunTimeTyped( LoopingNode )
+		
+		n = LoopingNode()
+		n["in"].setValue( 1 )
+		
+		f = n["out"].getValueAsync()
+		n.started.wait()
+		f.cancel()
+		
+		self.assertTrue( f.cancelled() )
+		self.assertRaises( RuntimeError, f.get )
+		self.assertTrue( f.done() )
+		self.assertTrue( n.iterations < 1000 )
+		
+		# cancellation must not leave anything bad in the
+		# cache - a fresh request should compute the value.
+		iterations = n.iterations
+		f = n["out"].getValueAsync()
+		self.assertEqual( f.get(), IECore.IntData( 1 ) )
+		self.assertEqual( n.iterations, iterations + 1000 )
+	
+	def testCheckCancellationOutsideFuture( self ) :
+	
+		# should be a no-op
+		Gaffer.ComputeFuture.checkCancellation()
+	
+	def testErrors( self ) :
+	
+		class BadNode( Gaffer.ComputeNode ) :
+		
+			def __init__( self, name="BadNode" ) :
+			
+				Gaffer.ComputeNode.__init__( self, name )
+				self.addChild( Gaffer.IntPlug( "out", Gaffer.Plug.Direction.Out ) )
+				
+			def hash( self, output, context, h ) :
+			
+				pass
+				
+			def compute( self, plug, context ) :
+			
+				raise ValueError( "Something bad happened" )
+				
+		IECore.registerRunTimeTyped( BadNode )
+		
+		n = BadNode()
+		f = n["out"].getValueAsync()
+		
+		self.assertRaises( RuntimeError, f.get )
+		try :
+			f.get()
+		except RuntimeError, e :
+			self.assertTrue( "Something bad happened" in str( e ) )
+		
+		self.assertTrue( f.done() )
+		self.assertFalse( f.cancelled() )
+
+if __name__ == "__main__":
+	unittest.main()
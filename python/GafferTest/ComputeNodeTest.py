@@ -374,6 +374,116 @@ class ComputeNodeTest( GafferTest.TestCase ) :
 		
 		self.assertEqual( n["out"].getValue(), a["sum"].getValue() )
 		self.assertEqual( n["out"].hash(), a["sum"].hash() )
-							
+	
+	def testDiamondDirtyPropagation( self ) :
+	
+		# build a chain of diamonds, where each level has two
+		# paths to the next. without deduplication, plugs at the
+		# bottom would be dirtied 2^depth times.
+		
+		top = GafferTest.AddNode()
+		bottom = top
+		nodes = [ top ]
+		for i in range( 0, 10 ) :
+			left = GafferTest.AddNode()
+			right = GafferTest.AddNode()
+			left["op1"].setInput( bottom["sum"] )
+			right["op1"].setInput( bottom["sum"] )
+			bottom = GafferTest.AddNode()
+			bottom["op1"].setInput( left["sum"] )
+			bottom["op2"].setInput( right["sum"] )
+			nodes.extend( [ left, right, bottom ] )
+		
+		dirtied = []
+		connections = [
+			n.plugDirtiedSignal().connect( lambda plug : dirtied.append( plug.fullName() ) ) for n in nodes
+		]
+		
+		top["op1"].setValue( 1 )
+		
+		self.assertEqual( len( dirtied ), len( set( dirtied ) ) )
+		self.assertEqual( dirtied.count( bottom["sum"].fullName() ), 1 )
+		self.assertEqual( dirtied[0], top["sum"].fullName() )
+		
+		self.assertEqual( bottom["sum"].getValue(), 1024 )
+	
+	def testAllPlugsDirtiedBeforeSignalsEmitted( self ) :
+	
+		n1 = GafferTest.AddNode()
+		n2 = GafferTest.AddNode()
+		n2["op1"].setInput( n1["sum"] )
+		
+		# prime the caches
+		self.assertEqual( n2["sum"].getValue(), 0 )
+		
+		values = []
+		def f( plug ) :
+			if plug.isSame( n1["sum"] ) :
+				values.append( n2["sum"].getValue() )
+		
+		c = n1.plugDirtiedSignal().connect( f )
+		n1["op1"].setValue( 10 )
+		
+		self.assertEqual( values, [ 10 ] )
+
+	class IterationNode( Gaffer.ComputeNode ) :
+
+		def __init__( self, name="IterationNode" ) :
+
+			Gaffer.ComputeNode.__init__( self, name )
+
+			self.addChild( Gaffer.IntPlug( "in" ) )
+			self.addChild( Gaffer.IntPlug( "out", Gaffer.Plug.Direction.Out ) )
+
+			self.computed = []
+			self.__computedMutex = threading.Lock()
+
+		def affects( self, input ) :
+
+			return [ self["out"] ] if input.isSame( self["in"] ) else []
+
+		def hash( self, output, context, h ) :
+
+			assert( output.isSame( self["out"] ) )
+
+			self["in"].hash( h )
+			h.append( context["iteration"] )
+
+		def compute( self, plug, context ) :
+
+			assert( plug.isSame( self["out"] ) )
+
+			iteration = context["iteration"]
+			result = self["in"].getValue() + iteration
+			plug.setValue( result )
+
+			with self.__computedMutex :
+				self.computed.append( ( iteration, result ) )
+
+	IECore.registerRunTimeTyped( IterationNode )
+
+	def testPythonComputeInParallelThreads( self ) :
+
+		# Python computes are evaluated from many tbb threads at once, with
+		# the GIL being released by getValue() and reacquired by the python
+		# overrides. This would deadlock if any binding held onto the GIL.
+
+		a = self.IterationNode()
+		a["in"].setValue( 10 )
+
+		b = self.IterationNode()
+		b["in"].setInput( a["out"] )
+
+		GafferTest.parallelGetValue( b["out"], 1000, "iteration" )
+
+		self.assertEqual( sorted( a.computed ), [ ( i, 10 + i ) for i in range( 0, 1000 ) ] )
+		self.assertEqual( sorted( b.computed ), [ ( i, 10 + i * 2 ) for i in range( 0, 1000 ) ] )
+
+		for i in range( 0, 1000 ) :
+			c = Gaffer.Context()
+			c["iteration"] = i
+			with c :
+				self.assertEqual( b["out"].getValue(), 10 + i * 2 )
+
 if __name__ == "__main__":
 	unittest.main()
@@ -118,6 +118,65 @@ class ContextTest( unittest.TestCase ) :
 		self.assertEqual( c["i"], 1 )
 		self.assertEqual( c2["i"], 10 )
 	
+	def testCopyingSharesValues( self ) :
+	
+		c = Gaffer.Context()
+		c["v"] = IECore.IntVectorData( [ 1, 2, 3 ] )
+		c["i"] = 10
+		
+		c2 = Gaffer.Context( c )
+		c2["i"] = 20
+		c2.setFrame( 2 )
+		
+		self.assertEqual( c["i"], 10 )
+		self.assertEqual( c.getFrame(), 1 )
+		self.assertEqual( c2["i"], 20 )
+		self.assertEqual( c2.getFrame(), 2 )
+		
+		c["i"] = 30
+		c.setFrame( 3 )
+		self.assertEqual( c2["i"], 20 )
+		self.assertEqual( c2.getFrame(), 2 )
+		self.assertEqual( c2["v"], IECore.IntVectorData( [ 1, 2, 3 ] ) )
+	
+	def testHash( self ) :
+	
+		c = Gaffer.Context()
+		hashes = [ c.hash() ]
+		
+		c["a"] = 1
+		hashes.append( c.hash() )
+		
+		c["a"] = 2
+		hashes.append( c.hash() )
+		
+		c["b"] = "b"
+		hashes.append( c.hash() )
+		
+		c.setFrame( 10 )
+		hashes.append( c.hash() )
+		
+		self.assertEqual( len( set( [ str( h ) for h in hashes ] ) ), len( hashes ) )
+		
+		# setting to the current value shouldn't change anything
+		c["a"] = 2
+		self.assertEqual( c.hash(), hashes[-1] )
+		
+		# copies and equivalent contexts should have equal hashes
+		c2 = Gaffer.Context( c )
+		self.assertEqual( c2.hash(), c.hash() )
+		
+		c3 = Gaffer.Context()
+		c3.setFrame( 10 )
+		c3["b"] = "b"
+		c3["a"] = 2
+		self.assertEqual( c3.hash(), c.hash() )
+		self.assertEqual( c3, c )
+		
+		c2["a"] = 3
+		self.assertNotEqual( c2.hash(), c.hash() )
+		self.assertEqual( c.hash(), hashes[-1] )
+	
 	def testEquality( self ) :
 		
 		c = Gaffer.Context()
@@ -260,6 +319,37 @@ class ContextTest( unittest.TestCase ) :
 		self.assertEqual( set( c.names() ), set( [ "frame", "a" ] ) )
 		
 		self.assertEqual( cc.names(), cc.keys() )
+	
+	def testManyEntries( self ) :
+	
+		# enough entries to exercise the merging of overrides
+		# into storage shared between copies.
+		c = Gaffer.Context()
+		for i in range( 0, 50 ) :
+			c["v%d" % i] = i
+		
+		cc = Gaffer.Context( c )
+		self.assertEqual( cc, c )
+		self.assertEqual( cc.hash(), c.hash() )
+		self.assertEqual( set( cc.names() ), set( c.names() ) )
+		
+		for i in range( 0, 50, 2 ) :
+			cc["v%d" % i] = -i
+		
+		for i in range( 0, 50 ) :
+			self.assertEqual( c["v%d" % i], i )
+			self.assertEqual( cc["v%d" % i], -i if i % 2 == 0 else i )
+		
+		self.assertNotEqual( cc, c )
+		self.assertNotEqual( cc.hash(), c.hash() )
+		
+		# setting the values back should restore equality,
+		# even though the entries are now stored differently.
+		for i in range( 0, 50, 2 ) :
+			cc["v%d" % i] = i
+		
+		self.assertEqual( cc, c )
+		self.assertEqual( cc.hash(), c.hash() )
 		
 if __name__ == "__main__":
 	unittest.main()
@@ -34,6 +34,11 @@
 #  
 ##########################################################################
 
+import os
+import time
+import shutil
+import tempfile
+import threading
 import unittest
 
 import IECore
@@ -56,6 +61,102 @@ class TestOp (IECore.Op) :
 		self.executionOrder.append( self )
 		return IECore.IntData( self.counter )
 
+class FailingOp( IECore.Op ) :
+
+	def __init__( self ) :
+
+		IECore.Op.__init__( self, "Failing op", IECore.IntParameter( "result", "", 0 ) )
+
+	def doOperation( self, args ) :
+
+		raise Exception( "Failing on purpose" )
+
+class FileWritingNode( Gaffer.ExecutableNode ) :
+
+	def __init__( self, name = "FileWritingNode" ) :
+
+		Gaffer.ExecutableNode.__init__( self, name )
+
+		self["fileName"] = Gaffer.StringPlug()
+		self["text"] = Gaffer.StringPlug()
+
+		self.executionCount = 0
+
+	def execute( self, contexts ) :
+
+		for context in contexts :
+			with context :
+				f = open( self["fileName"].getValue(), "w" )
+				f.write( self["text"].getValue() )
+				f.close()
+
+		self.executionCount += 1
+
+	def executionRequirements( self, context ) :
+
+		return self._defaultRequirements( context )
+
+	def executionHash( self, context ) :
+
+		h = IECore.MurmurHash()
+		with context :
+			h.append( self["fileName"].getValue() )
+			h.append( self["text"].getValue() )
+
+		return h
+
+	def executionOutputs( self, context ) :
+
+		with context :
+			return [ self["fileName"].getValue() ]
+
+	def acceptsInput( self, plug, inputPlug ) :
+
+		return Gaffer.ExecutableNode._acceptsRequirementsInput( plug, inputPlug )
+
+# Records how many instances are executing at once.
+class ConcurrencyTestNode( Gaffer.ExecutableNode ) :
+
+	def __init__( self, name = "ConcurrencyTestNode", threadSafe = False ) :
+
+		Gaffer.ExecutableNode.__init__( self, name )
+
+		self.threadSafe = threadSafe
+
+	def execute( self, contexts ) :
+
+		with ConcurrencyTestNode.__lock :
+			ConcurrencyTestNode.running += 1
+			ConcurrencyTestNode.maxRunning = max( ConcurrencyTestNode.maxRunning, ConcurrencyTestNode.running )
+
+		# give the other tasks a chance to start
+		time.sleep( 0.1 )
+
+		with ConcurrencyTestNode.__lock :
+			ConcurrencyTestNode.running -= 1
+
+	def executionRequirements( self, context ) :
+
+		return self._defaultRequirements( context )
+
+	def executionHash( self, context ) :
+
+		h = IECore.MurmurHash()
+		h.append( self.getName() )
+		return h
+
+	def executionIsThreadSafe( self ) :
+
+		return self.threadSafe
+
+	def acceptsInput( self, plug, inputPlug ) :
+
+		return Gaffer.ExecutableNode._acceptsRequirementsInput( plug, inputPlug )
+
+	running = 0
+	maxRunning = 0
+	__lock = threading.Lock()
+
 class DespatcherTest( unittest.TestCase ) :
 
 	class MyDespatcher( Gaffer.Despatcher ) :
@@ -112,6 +213,168 @@ class DespatcherTest( unittest.TestCase ) :
 
 		self.assertEqual( op1.counter, 1 )
 
+	def testLocalDespatcherParallelRequirements( self ) :
+
+		# n1 requires n2a and n2b, which both require n3.
+
+		log = list()
+		ops = {}
+		nodes = {}
+		for name in ( "1", "2a", "2b", "3" ) :
+			ops[name] = TestOp( name, log )
+			nodes[name] = Gaffer.ExecutableOpHolder()
+			nodes[name].setParameterised( ops[name] )
+
+		for upstream, downstream in ( ( "2a", "1" ), ( "2b", "1" ), ( "3", "2a" ), ( "3", "2b" ) ) :
+			r = Gaffer.Plug( name = "r" + upstream )
+			nodes[downstream]["requirements"].addChild( r )
+			r.setInput( nodes[upstream]["requirement"] )
+
+		despatcher = Gaffer.LocalDespatcher( numThreads = 4 )
+		self.assertEqual( despatcher.getNumThreads(), 4 )
+
+		started = GafferTest.CapturingSlot( despatcher.taskStartedSignal() )
+		finished = GafferTest.CapturingSlot( despatcher.taskFinishedSignal() )
+		failed = GafferTest.CapturingSlot( despatcher.taskFailedSignal() )
+
+		despatcher.despatch( [ nodes["1"] ] )
+
+		for op in ops.values() :
+			self.assertEqual( op.counter, 1 )
+
+		self.assertEqual( len( log ), 4 )
+		self.assertTrue( log[0] is ops["3"] )
+		self.assertTrue( log[3] is ops["1"] )
+
+		self.assertEqual( len( started ), 4 )
+		self.assertEqual( len( finished ), 4 )
+		self.assertEqual( len( failed ), 0 )
+		self.assertTrue( finished[-1][1].node.isSame( nodes["1"] ) )
+
+	def testLocalDespatcherDefaultsToSerialExecution( self ) :
+
+		self.assertEqual( Gaffer.LocalDespatcher().getNumThreads(), 1 )
+
+	def testLocalDespatcherOnlyParallelisesThreadSafeNodes( self ) :
+
+		for threadSafe, expectedMaxRunning in ( ( False, 1 ), ( True, 3 ) ) :
+
+			s = Gaffer.ScriptNode()
+			s["n"] = ConcurrencyTestNode( threadSafe = threadSafe )
+			for i in range( 0, 3 ) :
+				name = "r%d" % i
+				s[name] = ConcurrencyTestNode( threadSafe = threadSafe )
+				r = Gaffer.Plug( name = name )
+				s["n"]["requirements"].addChild( r )
+				r.setInput( s[name]["requirement"] )
+
+			ConcurrencyTestNode.maxRunning = 0
+
+			despatcher = Gaffer.LocalDespatcher( numThreads = 4 )
+			despatcher.despatch( [ s["n"] ] )
+
+			self.assertEqual( ConcurrencyTestNode.maxRunning, expectedMaxRunning )
+
+	def testLocalDespatcherFailure( self ) :
+
+		log = list()
+		op1 = TestOp( "1", log )
+		n1 = Gaffer.ExecutableOpHolder()
+		n1.setParameterised( op1 )
+
+		n2 = Gaffer.ExecutableOpHolder()
+		n2.setParameterised( FailingOp() )
+
+		r = Gaffer.Plug( name = "r" )
+		n1["requirements"].addChild( r )
+		r.setInput( n2["requirement"] )
+
+		for numThreads in ( 1, 4 ) :
+
+			despatcher = Gaffer.LocalDespatcher( numThreads = numThreads )
+			failed = GafferTest.CapturingSlot( despatcher.taskFailedSignal() )
+
+			self.assertRaises( Exception, despatcher.despatch, [ n1 ] )
+
+			self.assertEqual( len( failed ), 1 )
+			self.assertTrue( failed[0][1].node.isSame( n2 ) )
+			self.assertTrue( "Failing on purpose" in failed[0][2] )
+
+			# requirement failed, so n1 must not have run
+			self.assertEqual( op1.counter, 0 )
+
+	def testLocalDespatcherSkipsUpToDateTasks( self ) :
+
+		directory = tempfile.mkdtemp()
+		self.addCleanup( shutil.rmtree, directory )
+
+		# n1 requires n2
+
+		n1 = FileWritingNode()
+		n1["fileName"].setValue( os.path.join( directory, "n1.txt" ) )
+		n1["text"].setValue( "a" )
+
+		n2 = FileWritingNode()
+		n2["fileName"].setValue( os.path.join( directory, "n2.txt" ) )
+		n2["text"].setValue( "b" )
+
+		r = Gaffer.Plug( name = "r" )
+		n1["requirements"].addChild( r )
+		r.setInput( n2["requirement"] )
+
+		for numThreads in ( 1, 4 ) :
+
+			for n in ( n1, n2 ) :
+				n.executionCount = 0
+				if os.path.exists( n["fileName"].getValue() ) :
+					os.remove( n["fileName"].getValue() )
+
+			despatcher = Gaffer.LocalDespatcher( numThreads = numThreads )
+			despatcher.setSkipUpToDateTasks( True )
+			self.assertTrue( despatcher.getSkipUpToDateTasks() )
+
+			skipped = GafferTest.CapturingSlot( despatcher.taskSkippedSignal() )
+
+			# nothing has been executed yet, so everything must run
+
+			despatcher.despatch( [ n1 ] )
+			self.assertEqual( ( n1.executionCount, n2.executionCount ), ( 1, 1 ) )
+			self.assertEqual( len( skipped ), 0 )
+
+			# now everything is up to date
+
+			despatcher.despatch( [ n1 ] )
+			self.assertEqual( ( n1.executionCount, n2.executionCount ), ( 1, 1 ) )
+			self.assertEqual( len( skipped ), 2 )
+
+			# changing the requirement must also rerun the dependent
+
+			n2["text"].setValue( "c" )
+			despatcher.despatch( [ n1 ] )
+			self.assertEqual( ( n1.executionCount, n2.executionCount ), ( 2, 2 ) )
+
+			# but changing the dependent needn't rerun the requirement
+
+			n1["text"].setValue( "d" )
+			despatcher.despatch( [ n1 ] )
+			self.assertEqual( ( n1.executionCount, n2.executionCount ), ( 3, 2 ) )
+
+			# missing outputs are never up to date
+
+			os.remove( n1["fileName"].getValue() )
+			despatcher.despatch( [ n1 ] )
+			self.assertEqual( ( n1.executionCount, n2.executionCount ), ( 4, 2 ) )
+
+			n1["text"].setValue( "a" )
+			n2["text"].setValue( "b" )
+
+		# skipping is off by default
+
+		despatcher = Gaffer.LocalDespatcher()
+		self.assertFalse( despatcher.getSkipUpToDateTasks() )
+		despatcher.despatch( [ n1 ] )
+		self.assertEqual( ( n1.executionCount, n2.executionCount ), ( 5, 3 ) )
+
 	def testDespatcherRegistration( self ) :
 
 		self.failUnless( "testDespatcher" in Gaffer.Despatcher.despatcherNames() )
@@ -0,0 +1,84 @@
+##########################################################################
+#  
+#  Copyright (c) 2012-2013, Image Engine Design Inc. All rights reserved.
+#  
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are
+#  met:
+#  
+#      * Redistributions of source code must retain the above
+#        copyright notice, this list of conditions and the following
+#        disclaimer.
+#  
+#      * Redistributions in binary form must reproduce the above
+#        copyright notice, this list of conditions and the following
+#        disclaimer in the documentation and/or other materials provided with
+#        the distribution.
+#  
+#      * Neither the name of John Haddon nor the names of
+#        any other contributors to this software may be used to endorse or
+#        promote products derived from this software without specific prior
+#        written permission.
+#  
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+#  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+#  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+#  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+#  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+#  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+#  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+#  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+#  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+#  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+#  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#  
+##########################################################################
+
+
+import unittest
+
+import Gaffer
+import GafferTest
+
+class DirtyPropagationScopeTest( GafferTest.TestCase ) :
+
+	def testSignalsDeferredAndCoalesced( self ) :
+	
+		n = GafferTest.AddNode()
+		
+		dirtied = GafferTest.CapturingSlot( n.plugDirtiedSignal() )
+		
+		with Gaffer.DirtyPropagationScope() :
+		
+			n["op1"].setValue( 1 )
+			n["op1"].setValue( 2 )
+			n["op2"].setValue( 3 )
+			
+			self.assertEqual( len( dirtied ), 0 )
+			# values must be up to date even though the signals
+			# haven't been emitted yet.
+			self.assertEqual( n["sum"].getValue(), 5 )
+			
+		self.assertEqual(
+			set( [ x[0].getName() for x in dirtied ] ),
+			set( [ "op1", "op2", "sum" ] )
+		)
+		self.assertEqual( len( dirtied ), 3 )
+		
+	def testNesting( self ) :
+	
+		n = GafferTest.AddNode()
+		
+		dirtied = GafferTest.CapturingSlot( n.plugDirtiedSignal() )
+		
+		with Gaffer.DirtyPropagationScope() :
+		
+			with Gaffer.DirtyPropagationScope() :
+				n["op1"].setValue( 1 )
+			
+			self.assertEqual( len( dirtied ), 0 )
+			
+		self.assertEqual( len( dirtied ), 2 )
+		
+if __name__ == "__main__":
+	unittest.main()
@@ -53,6 +53,19 @@ class TestOp (IECore.Op) :
 		self.counter += 1
 		return IECore.IntData( self.counter )
 
+class ValueRecordingOp( IECore.Op ) :
+
+	def __init__( self ) :
+
+		IECore.Op.__init__( self, "Records the values it was executed with", IECore.IntParameter( "result", "", 0 ) )
+		self.parameters().addParameter( IECore.IntParameter( "value", "", 0 ) )
+		self.values = []
+
+	def doOperation( self, args ) :
+
+		self.values.append( args["value"].value )
+		return IECore.IntData( args["value"].value )
+
 class ExecutableOpHolderTest( unittest.TestCase ) :
 
 	def testType( self ) :
@@ -106,6 +119,58 @@ class ExecutableOpHolderTest( unittest.TestCase ) :
 		n.execute( [ Gaffer.Context() ] )
 		self.assertEqual( op.counter, 1 )
 
+	def testExecuteMultipleContexts( self ) :
+
+		s = Gaffer.ScriptNode()
+
+		s["n"] = Gaffer.ExecutableOpHolder()
+		op = ValueRecordingOp()
+		s["n"].setParameterised( op )
+
+		s["e"] = Gaffer.Expression()
+		s["e"]["engine"].setValue( "python" )
+		s["e"]["expression"].setValue( "parent[\"n\"][\"parameters\"][\"value\"] = int( context[\"frame\"] )" )
+
+		contexts = []
+		for frame in range( 0, 100 ) :
+			c = Gaffer.Context( s.context() )
+			c.setFrame( frame )
+			contexts.append( c )
+
+		s["n"].execute( contexts )
+
+		# each context must have been executed with its own parameter values,
+		# although not necessarily in order.
+		self.assertEqual( sorted( op.values ), range( 0, 100 ) )
+
+	def testOpsModifyingInputsInPlace( self ) :
+
+		class AppendingOp( IECore.Op ) :
+
+			def __init__( self ) :
+
+				IECore.Op.__init__( self, "Appends to its input in place", IECore.IntParameter( "result", "", 0 ) )
+				self.parameters().addParameter( IECore.IntVectorParameter( "input", "", IECore.IntVectorData() ) )
+				self.lengths = []
+
+			def doOperation( self, args ) :
+
+				args["input"].append( 10 )
+				self.lengths.append( len( args["input"] ) )
+				return IECore.IntData( len( args["input"] ) )
+
+		n = Gaffer.ExecutableOpHolder()
+		op = AppendingOp()
+		n.setParameterised( op )
+		n["parameters"]["input"].setValue( IECore.IntVectorData( [ 1, 2 ] ) )
+
+		# neither the plug nor the values used by a previous
+		# execution may be modified by the op.
+		n.execute( [ Gaffer.Context() ] )
+		n.execute( [ Gaffer.Context() ] )
+		self.assertEqual( op.lengths, [ 3, 3 ] )
+		self.assertEqual( n["parameters"]["input"].getValue(), IECore.IntVectorData( [ 1, 2 ] ) )
+
 	def testRequirements( self ) :
 
 		n1 = Gaffer.ExecutableOpHolder()
@@ -46,6 +46,7 @@ class ExecuteApplicationTest( unittest.TestCase ) :
 
 	__scriptFileName = "/tmp/executeScript.gfr"
 	__outputFileName = "/tmp/sphere.cob"
+	__sequenceFileName = "/tmp/sphere.####.cob"
 
 	def testErrorReturnStatusForMissingScript( self ) :
 		
@@ -84,12 +85,57 @@ class ExecuteApplicationTest( unittest.TestCase ) :
 		self.failUnless( os.path.exists( self.__outputFileName ) )
 		self.failIf( p.returncode )
 	
+	def testMultipleProcesses( self ) :
+	
+		s = Gaffer.ScriptNode()
+		
+		s["sphere"] = GafferTest.SphereNode()
+		s["write"] = Gaffer.WriteNode()
+		s["write"]["in"].setInput( s["sphere"]["out"] )
+		s["write"]["fileName"].setValue( self.__sequenceFileName )
+			
+		s["fileName"].setValue( self.__scriptFileName )
+		s.save()
+		
+		p = subprocess.Popen(
+			"gaffer execute " + self.__scriptFileName + " -frames 1-10 -processes 4 -threads 2",
+			shell=True,
+			stderr = subprocess.PIPE,
+		)
+		p.wait()
+		
+		self.failIf( p.returncode )
+		for frame in range( 1, 11 ) :
+			self.failUnless( os.path.exists( self.__sequenceFileName.replace( "####", "%04d" % frame ) ) )
+	
+	def testFailedFramesReturnStatus( self ) :
+	
+		s = Gaffer.ScriptNode()
+		
+		s["sphere"] = GafferTest.SphereNode()
+		s["write"] = Gaffer.WriteNode()
+		s["write"]["in"].setInput( s["sphere"]["out"] )
+		s["write"]["fileName"].setValue( "/nonexistentDirectory/sphere.####.cob" )
+			
+		s["fileName"].setValue( self.__scriptFileName )
+		s.save()
+		
+		p = subprocess.Popen(
+			"gaffer execute " + self.__scriptFileName + " -frames 1-4 -processes 2",
+			shell=True,
+			stderr = subprocess.PIPE,
+		)
+		p.wait()
+		
+		self.failUnless( "Failed frames" in "".join( p.stderr.readlines() ) )
+		self.failUnless( p.returncode )
+	
 	def tearDown( self ) :
 	
 		for f in [
 			self.__scriptFileName,
 			self.__outputFileName,
-		] :
+		] + [ self.__sequenceFileName.replace( "####", "%04d" % frame ) for frame in range( 1, 11 ) ] :
 			if os.path.exists( f ) :
 				os.remove( f )
 	
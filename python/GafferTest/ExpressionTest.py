@@ -35,8 +35,11 @@
 #  
 ##########################################################################
 
+import sys
 import unittest
 
+import IECore
+
 import Gaffer
 import GafferTest
 
@@ -254,6 +257,222 @@ class ExpressionTest( unittest.TestCase ) :
 		s["e"]["expression"].setValue( "parent['n']['op2'] = context.get( 'iDontExist', 101 )" )
 		
 		self.assertEqual( s["n"]["sum"].getValue(), 101 )
+	
+	def testPerformance( self ) :
+	
+		# benchmarks the evaluation of a frame-only expression, and
+		# of an expression reading from plugs, over many frames. each
+		# frame is a separate evaluation because the output depends on
+		# the context. uncomment the prints to get useful information
+		# printed out.
+	
+		# count calls to compile(), so we can check that the expressions
+		# are compiled only once, and not per evaluation.
+		engineModule = sys.modules[Gaffer.PythonExpressionEngine.__module__]
+		compileCalls = []
+		def countingCompile( *args ) :
+			compileCalls.append( args )
+			return compile( *args )
+		
+		engineModule.compile = countingCompile
+		try :
+		
+			s = Gaffer.ScriptNode()
+			
+			s["n"] = GafferTest.AddNode()
+			s["n"]["op1"].setValue( 1 )
+			
+			s["e1"] = Gaffer.Expression()
+			s["e1"]["engine"].setValue( "python" )
+			s["e1"]["expression"].setValue( "parent['n']['op2'] = int( context.getFrame() )" )
+			
+			# the frame-only expression has no inputs, so takes the fast path.
+			self.assertEqual( len( s["e1"]["in"] ), 0 )
+			self.assertEqual( len( compileCalls ), 1 )
+			
+			t = IECore.Timer()
+			with Gaffer.Context() as c :
+				for i in range( 0, 10000 ) :
+					c.setFrame( i )
+					self.assertEqual( s["n"]["sum"].getValue(), i + 1 )
+			#print "FRAME ONLY", t.stop()
+			
+			self.assertEqual( len( compileCalls ), 1 )
+			
+			s["n2"] = GafferTest.AddNode()
+			s["e2"] = Gaffer.Expression()
+			s["e2"]["engine"].setValue( "python" )
+			s["e2"]["expression"].setValue( "parent['n2']['op1'] = parent['n']['sum'] + parent['n']['op1'] * int( context.getFrame() )" )
+			
+			self.assertEqual( len( compileCalls ), 2 )
+			
+			t = IECore.Timer()
+			with Gaffer.Context() as c :
+				for i in range( 0, 10000 ) :
+					c.setFrame( i )
+					self.assertEqual( s["n2"]["sum"].getValue(), 2 * i + 1 )
+			#print "PLUG READS", t.stop()
+			
+			self.assertEqual( len( compileCalls ), 2 )
+		
+		finally :
+		
+			del engineModule.compile
+		
+	def testArithmeticEngine( self ) :
+	
+		self.failUnless( "arithmetic" in Gaffer.Expression.Engine.registeredEngines() )
+	
+		s = Gaffer.ScriptNode()
+		
+		s["m1"] = GafferTest.MultiplyNode()
+		s["m1"]["op1"].setValue( 10 )
+		s["m1"]["op2"].setValue( 20 )
+		
+		s["m2"] = GafferTest.MultiplyNode()
+		s["m2"]["op2"].setValue( 1 )
+		
+		s["e"] = Gaffer.Expression()
+		s["e"]["engine"].setValue( "arithmetic" )
+		s["e"]["expression"].setValue( "parent[\"m2\"][\"op1\"] = parent[\"m1\"][\"product\"] * 2 + parent['m1']['op1']" )
+		
+		self.failUnless( s["m2"]["op1"].getInput().isSame( s["e"]["out"] ) )
+		# repeated reads of the same plug share an input
+		self.assertEqual( len( s["e"]["in"] ), 2 )
+		self.assertEqual( s["m2"]["product"].getValue(), 410 )
+		
+	def testArithmeticEngineOperators( self ) :
+	
+		s = Gaffer.ScriptNode()
+		s["n"] = GafferTest.AddNode()
+		
+		s["e"] = Gaffer.Expression()
+		s["e"]["engine"].setValue( "arithmetic" )
+		
+		for expression, result in [
+			( "1 + 2 * 3", 7 ),
+			( "( 1 + 2 ) * 3", 9 ),
+			( "-2 ** 2", -4 ),
+			( "2 ** 3 ** 2", 512 ),
+			( "7 % 3", 1 ),
+			( "-7 % 3", 2 ),
+			( "10 / 4 * 4", 8 ),
+			( "-7 / 2", -4 ),
+			( "10.0 / 4 * 4", 10 ),
+			( "10 / 4. * 4", 10 ),
+			( "7.5 % 2 * 2", 3 ),
+			( "2 ** -1 * 4", 2 ),
+			( "float( 3 ) / 2 * 2", 3 ),
+			( "int( 7.9 ) / 2", 3 ),
+			( "abs( -7 ) / 2", 3 ),
+			( "max( 1.0, 7 ) / 2", 3 ),
+			( "2 < 3", 1 ),
+			( "2 >= 3", 0 ),
+			( "( 1 == 1 ) + ( 1 != 1 )", 1 ),
+			( "int( 2.9 ) + int( -2.9 )", 0 ),
+			( "max( 1, 5 ) - min( 1, 5 )", 4 ),
+			( "clamp( 10, 0, 3 )", 3 ),
+			( "floor( 1.5 ) + ceil( 1.5 )", 3 ),
+			( "sqrt( 16 ) + abs( -2 )", 6 ),
+			( "pow( 2, 10 )", 1024 ),
+			( "floor( pi * 100 )", 314 ),
+		] :
+			s["e"]["expression"].setValue( "parent['n']['op1'] = " + expression )
+			self.assertEqual( s["n"]["sum"].getValue(), result )
+		
+		for expression in [
+			"parent['n']['op1'] = round( 1 ) + 1",
+			"parent['n']['op1'] = 1 +",
+			"parent['n']['op1'] = 1 1",
+			"parent['n']['op1'] = 010",
+			"parent['n']['op1'] = 0x10",
+			"parent['n']['op1'] = 'a'",
+			"parent['n']['op1'] = parent['n']",
+			"1 + 1",
+		] :
+			s["e2"] = Gaffer.Expression()
+			s["e2"]["engine"].setValue( "arithmetic" )
+			mh = IECore.CapturingMessageHandler()
+			with mh :
+				s["e2"]["expression"].setValue( expression )
+			self.assertEqual( len( mh.messages ), 1 )
+			self.assertEqual( mh.messages[0].level, IECore.Msg.Level.Error )
+			self.failIf( "out" in s["e2"] )
+	
+	def testArithmeticEngineDivisionByZero( self ) :
+	
+		s = Gaffer.ScriptNode()
+		s["n"] = GafferTest.AddNode()
+		
+		s["e"] = Gaffer.Expression()
+		s["e"]["engine"].setValue( "arithmetic" )
+		
+		for expression in [ "1 / 0", "1 % 0", "1.0 / 0", "0 ** -1" ] :
+			s["e"]["expression"].setValue( "parent['n']['op1'] = " + expression )
+			self.assertRaises( RuntimeError, s["n"]["sum"].getValue )
+	
+	def testArithmeticEngineContextAccess( self ) :
+	
+		s = Gaffer.ScriptNode()
+		
+		s["n"] = GafferTest.AddNode()
+		
+		s["e"] = Gaffer.Expression()
+		s["e"]["engine"].setValue( "arithmetic" )
+		s["e"]["expression"].setValue( "parent['n']['op1'] = context.getFrame() * 2 + context['a'] + context.get( 'b' ) + context.get( 'c', 100 )" )
+		
+		with Gaffer.Context() as c :
+			c["a"] = 1
+			c["b"] = 10.5
+			for i in range( 0, 10 ) :
+				c.setFrame( i )
+				self.assertEqual( s["n"]["sum"].getValue(), i * 2 + 111 )
+				
+			c["c"] = 1000
+			self.assertEqual( s["n"]["sum"].getValue(), 18 + 1011 )
+			
+	def testArithmeticEngineFloatAndBoolPlugs( self ) :
+	
+		s = Gaffer.ScriptNode()
+		
+		s["n"] = Gaffer.Node()
+		s["n"]["f"] = Gaffer.FloatPlug( flags = Gaffer.Plug.Flags.Default | Gaffer.Plug.Flags.Dynamic )
+		s["n"]["b"] = Gaffer.BoolPlug( flags = Gaffer.Plug.Flags.Default | Gaffer.Plug.Flags.Dynamic )
+		s["n"]["o"] = Gaffer.FloatPlug( flags = Gaffer.Plug.Flags.Default | Gaffer.Plug.Flags.Dynamic )
+		
+		s["e"] = Gaffer.Expression()
+		s["e"]["engine"].setValue( "arithmetic" )
+		s["e"]["expression"].setValue( "parent['n']['o'] = parent['n']['f'] * 0.5 + parent['n']['b']" )
+		
+		s["n"]["f"].setValue( 3 )
+		self.assertAlmostEqual( s["n"]["o"].getValue(), 1.5 )
+		s["n"]["b"].setValue( True )
+		self.assertAlmostEqual( s["n"]["o"].getValue(), 2.5 )
+	
+	def testArithmeticEngineParallelEvaluation( self ) :
+	
+		s = Gaffer.ScriptNode()
+		
+		s["n"] = GafferTest.AddNode()
+		s["n"]["op2"].setValue( 1 )
+		
+		s["e"] = Gaffer.Expression()
+		s["e"]["engine"].setValue( "arithmetic" )
+		s["e"]["expression"].setValue( "parent['n']['op1'] = context.getFrame() * parent['n']['op2']" )
+		
+		contexts = []
+		for i in range( 0, 10000 ) :
+			c = Gaffer.Context()
+			c.setFrame( i )
+			contexts.append( c )
+		
+		# the engine doesn't need the GIL, so these are
+		# evaluated concurrently.
+		t = IECore.Timer()
+		values = s["n"]["sum"].getValues( contexts )
+		#print "PARALLEL ARITHMETIC", t.stop()
+		
+		self.assertEqual( values, [ IECore.IntData( i + 1 ) for i in range( 0, 10000 ) ] )
 		
 if __name__ == "__main__":
 	unittest.main()
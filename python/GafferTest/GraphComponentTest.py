@@ -281,6 +281,58 @@ class GraphComponentTest( GafferTest.TestCase ) :
 		p.addChild( c4 )
 		self.assertEqual( c4.getName(), "a3" )
 		
+	def testUniqueNamingOnRename( self ) :
+	
+		p = Gaffer.GraphComponent()
+		p["a"] = Gaffer.GraphComponent()
+		p["b"] = Gaffer.GraphComponent()
+		p["b5"] = Gaffer.GraphComponent()
+		
+		c = p["b"]
+		self.assertEqual( c.setName( "a" ), "a1" )
+		self.failUnless( p["a1"].isSame( c ) )
+		self.failIf( "b" in p )
+		
+		# our own suffix shouldn't be taken into account
+		# when choosing a new one.
+		c = p["b5"]
+		self.assertEqual( c.setName( "a" ), "a2" )
+		self.assertEqual( c.setName( "a1" ), "a2" )
+		self.assertEqual( c.setName( "b" ), "b" )
+		
+		self.assertEqual( set( p.keys() ), set( [ "a", "a1", "b" ] ) )
+		
+	def testUniqueNamingAfterRemoval( self ) :
+	
+		p = Gaffer.GraphComponent()
+		for i in range( 0, 3 ) :
+			p.addChild( Gaffer.GraphComponent( "c" ) )
+		
+		self.assertEqual( p.keys(), [ "c", "c1", "c2" ] )
+		
+		p.removeChild( p["c2"] )
+		c = Gaffer.GraphComponent( "c" )
+		p.addChild( c )
+		self.assertEqual( c.getName(), "c2" )
+		
+		p.removeChild( p["c"] )
+		self.failUnless( p.getChild( "c" ) is None )
+		c = Gaffer.GraphComponent( "c" )
+		p.addChild( c )
+		self.assertEqual( c.getName(), "c" )
+		self.failUnless( p["c"].isSame( c ) )
+		
+	def testManyChildren( self ) :
+	
+		p = Gaffer.GraphComponent()
+		for i in range( 0, 10000 ) :
+			p.addChild( Gaffer.GraphComponent( "c" ) )
+		
+		self.assertEqual( len( p ), 10000 )
+		self.assertEqual( len( set( p.keys() ) ), 10000 )
+		self.assertEqual( p["c9999"].getName(), "c9999" )
+		self.failUnless( p.descendant( "c5000" ).isSame( p.children()[5000] ) )
+		
 	def testAncestor( self ) :
 	
 		a = Gaffer.ApplicationRoot()
@@ -125,6 +125,64 @@ class OpHolderTest( unittest.TestCase ) :
 		
 		self.assertEqual( holder["result"].getValue(), 3 )
 	
+	def testConcurrentComputes( self ) :
+
+		class DoublingOp( IECore.Op ) :
+
+			def __init__( self ) :
+
+				IECore.Op.__init__( self, "Doubles its input", IECore.IntParameter( "result", "", 0 ) )
+				self.parameters().addParameter( IECore.IntParameter( "value", "", 0 ) )
+
+			def doOperation( self, args ) :
+
+				return IECore.IntData( args["value"].value * 2 )
+
+		s = Gaffer.ScriptNode()
+
+		s["n"] = Gaffer.OpHolder()
+		s["n"].setParameterised( DoublingOp() )
+
+		s["e"] = Gaffer.Expression()
+		s["e"]["engine"].setValue( "python" )
+		s["e"]["expression"].setValue( "parent[\"n\"][\"parameters\"][\"value\"] = context[\"iteration\"]" )
+
+		# evaluate the op in many contexts at once. if the computations
+		# shared parameter state, results would be stored against the
+		# wrong contexts, and the serial checks below would fail.
+
+		GafferTest.parallelGetValue( s["n"]["result"], 1000, "iteration" )
+
+		c = Gaffer.Context( s.context() )
+		for i in range( 0, 1000 ) :
+			c["iteration"] = i
+			with c :
+				self.assertEqual( s["n"]["result"].getValue(), i * 2 )
+
+	def testOperandsAreCopiedFromPlugs( self ) :
+
+		class AppendingOp( IECore.Op ) :
+
+			def __init__( self ) :
+
+				IECore.Op.__init__( self, "Appends to its input in place", IECore.IntVectorParameter( "result", "", IECore.IntVectorData() ) )
+				self.parameters().addParameter( IECore.IntVectorParameter( "input", "", IECore.IntVectorData() ) )
+
+			def doOperation( self, args ) :
+
+				args["input"].append( 10 )
+				return args["input"]
+
+		n = Gaffer.OpHolder()
+		n.setParameterised( AppendingOp() )
+		n["parameters"]["input"].setValue( IECore.IntVectorData( [ 1, 2 ] ) )
+
+		self.assertEqual( n.parameterHandler().computeParameterValue(), IECore.CompoundObject( { "input" : IECore.IntVectorData( [ 1, 2 ] ) } ) )
+		self.assertEqual( n["result"].getValue(), IECore.IntVectorData( [ 1, 2, 10 ] ) )
+
+		# the op mustn't have been given the plug value itself
+		self.assertEqual( n["parameters"]["input"].getValue(), IECore.IntVectorData( [ 1, 2 ] ) )
+
 	def testRunTimeTyped( self ) :
 	
 		n = Gaffer.OpHolder()
@@ -187,6 +187,117 @@ class ParameterHandlerTest( unittest.TestCase ) :
 		h.setupPlug( n )
 		self.failUnless( h.plug().getFlags( Gaffer.Plug.Flags.ReadOnly ) )
 		
+	def testOnlyChangedValuesTransferred( self ) :
+	
+		p = IECore.IntParameter( "i", "d", 10 )
+		
+		n = Gaffer.Node()
+		h = Gaffer.ParameterHandler.create( p )
+		h.setupPlug( n )
+		
+		n["i"].setValue( 20 )
+		h.setParameterValue()
+		self.assertEqual( p.getNumericValue(), 20 )
+		
+		# the plug hasn't changed, so the parameter shouldn't
+		# be updated, even though it now holds a different value.
+		p.setNumericValue( 30 )
+		h.setParameterValue()
+		self.assertEqual( p.getNumericValue(), 30 )
+		
+		# but as soon as the plug changes, the transfer happens
+		n["i"].setValue( 40 )
+		h.setParameterValue()
+		self.assertEqual( p.getNumericValue(), 40 )
+		
+		# and setPlugValue() forces the next transfer
+		h.setPlugValue()
+		p.setNumericValue( 50 )
+		h.setParameterValue()
+		self.assertEqual( p.getNumericValue(), 40 )
+	
+	def testCompoundOnlyTransfersChangedValues( self ) :
+	
+		c = IECore.CompoundParameter(
+			
+			"c",
+			"",
+			
+			[
+				IECore.IntParameter( "i", "" ),
+				IECore.FloatParameter( "f", "" )			
+			]
+	
+		)
+		
+		n = Gaffer.Node()
+		
+		h = Gaffer.CompoundParameterHandler( c )
+		h.setupPlug( n )
+		
+		n["c"]["i"].setValue( 1 )
+		n["c"]["f"].setValue( 2 )
+		h.setParameterValue()
+		self.assertEqual( c["i"].getNumericValue(), 1 )
+		self.assertEqual( c["f"].getNumericValue(), 2 )
+		
+		c["i"].setNumericValue( 10 )
+		c["f"].setNumericValue( 20 )
+		
+		# only the changed plug should be transferred
+		n["c"]["f"].setValue( 3 )
+		h.setParameterValue()
+		self.assertEqual( c["i"].getNumericValue(), 10 )
+		self.assertEqual( c["f"].getNumericValue(), 3 )
+		
+	def testObjectValuesCopied( self ) :
+	
+		p = IECore.IntVectorParameter( "v", "d", IECore.IntVectorData() )
+		
+		n = Gaffer.Node()
+		h = Gaffer.ParameterHandler.create( p )
+		h.setupPlug( n )
+		
+		n["v"].setValue( IECore.IntVectorData( [ 1, 2, 3 ] ) )
+		h.setParameterValue()
+		
+		self.assertEqual( p.getValue(), IECore.IntVectorData( [ 1, 2, 3 ] ) )
+		self.failIf( p.getValue().isSame( n["v"].getValue( _copy = False ) ) )
+		
+		# modifying the parameter value mustn't affect the plug
+		p.getValue().append( 4 )
+		self.assertEqual( n["v"].getValue(), IECore.IntVectorData( [ 1, 2, 3 ] ) )
+	
+	def testContextChangesOnlyTransferChangedValues( self ) :
+	
+		p = IECore.IntParameter( "i", "d", 10 )
+		
+		n = Gaffer.Node()
+		h = Gaffer.ParameterHandler.create( p )
+		h.setupPlug( n )
+		
+		n["i"].setValue( 20 )
+		h.setParameterValue()
+		self.assertEqual( p.getNumericValue(), 20 )
+		
+		# the plug value doesn't depend on the frame, so
+		# a new frame shouldn't cause a transfer.
+		p.setNumericValue( 30 )
+		c = Gaffer.Context()
+		c.setFrame( 10 )
+		with c :
+			h.setParameterValue()
+		self.assertEqual( p.getNumericValue(), 30 )
+		
+		n["i"].setValue( 40 )
+		with c :
+			h.setParameterValue()
+		self.assertEqual( p.getNumericValue(), 40 )
+		
+		p.setNumericValue( 50 )
+		h.setParameterValue()
+		self.assertEqual( p.getNumericValue(), 50 )
+		
 if __name__ == "__main__":
 	unittest.main()
 	
@@ -0,0 +1,136 @@
+##########################################################################
+#  
+#  Copyright (c) 2012-2013, Image Engine Design Inc. All rights reserved.
+#  
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are
+#  met:
+#  
+#      * Redistributions of source code must retain the above
+#        copyright notice, this list of conditions and the following
+#        disclaimer.
+#  
+#      * Redistributions in binary form must reproduce the above
+#        copyright notice, this list of conditions and the following
+#        disclaimer in the documentation and/or other materials provided with
+#        the distribution.
+#  
+#      * Neither the name of John Haddon nor the names of
+#        any other contributors to this software may be used to endorse or
+#        promote products derived from this software without specific prior
+#        written permission.
+#  
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+#  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+#  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+#  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+#  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+#  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+#  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+#  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+#  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+#  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+#  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#  
+##########################################################################
+
+
+import unittest
+
+import IECore
+
+import Gaffer
+import GafferTest
+
+class PerformanceMonitorTest( unittest.TestCase ) :
+
+	def testStatistics( self ) :
+	
+		n = GafferTest.AddNode()
+		# use values unlikely to be in the cache already,
+		# so that we can be sure a compute is required.
+		n["op1"].setValue( 12345 )
+		n["op2"].setValue( 67890 )
+		
+		with Gaffer.PerformanceMonitor() as m :
+			self.assertEqual( n["sum"].getValue(), 12345 + 67890 )
+			self.assertEqual( n["sum"].getValue(), 12345 + 67890 )
+		
+		s = m.plugStatistics( n["sum"] )
+		self.assertEqual( s.hashCount, 1 )
+		self.assertEqual( s.computeCount, 1 )
+		self.assertEqual( s.cacheHitCount, 1 )
+		self.failUnless( s.computeWallTime >= 0 )
+		self.failUnless( s.computeCPUTime >= 0 )
+		
+		statistics = m.allStatistics()
+		self.assertEqual( len( statistics ), 1 )
+		self.failUnless( statistics[0][0].isSame( n["sum"] ) )
+		
+		c = m.combinedStatistics()
+		self.assertEqual( c.computeCount, 1 )
+		self.assertEqual( c.cacheHitCount, 1 )
+		
+		self.failUnless( "sum" in m.formatStatistics() )
+		
+		m.clear()
+		self.assertEqual( m.allStatistics(), [] )
+		self.assertEqual( m.combinedStatistics().computeCount, 0 )
+	
+	def testInactiveOutsideScope( self ) :
+	
+		m = Gaffer.PerformanceMonitor()
+		with m :
+			pass
+			
+		n = GafferTest.AddNode()
+		n["op1"].setValue( 2468 )
+		n["sum"].getValue()
+		
+		self.assertEqual( m.allStatistics(), [] )
+	
+	def testNesting( self ) :
+	
+		n = GafferTest.AddNode()
+		n["op1"].setValue( 13579 )
+		
+		m1 = Gaffer.PerformanceMonitor()
+		m2 = Gaffer.PerformanceMonitor()
+		
+		with m1 :
+			with m2 :
+				n["sum"].getValue()
+			n["op2"].setValue( 1 )
+			n["sum"].getValue()
+		
+		self.assertEqual( m2.plugStatistics( n["sum"] ).computeCount, 1 )
+		self.assertEqual( m1.plugStatistics( n["sum"] ).computeCount, 1 )
+	
+	def testOutOfOrderScopes( self ) :
+	
+		n = GafferTest.AddNode()
+		n["op1"].setValue( 24680 )
+		
+		m1 = Gaffer.PerformanceMonitor()
+		m2 = Gaffer.PerformanceMonitor()
+		
+		# as might happen with scopes on different threads,
+		# the outer scope is destroyed first.
+		s1 = Gaffer.PerformanceMonitor._Scope( m1 )
+		s2 = Gaffer.PerformanceMonitor._Scope( m2 )
+		del s1
+		del m1
+		
+		n["sum"].getValue()
+		self.assertEqual( m2.plugStatistics( n["sum"] ).computeCount, 1 )
+		
+		# destroying the inner scope must not reactivate
+		# the monitor whose scope has already gone.
+		del s2
+		
+		n["op2"].setValue( 1 )
+		n["sum"].getValue()
+		self.assertEqual( m2.plugStatistics( n["sum"] ).computeCount, 1 )
+		
+if __name__ == "__main__":
+	unittest.main()
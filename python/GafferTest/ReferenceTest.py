@@ -257,6 +257,44 @@ class ReferenceTest( unittest.TestCase ) :
 		
 		self.assertTrue( "myCustomPlug" not in s2["r"] )
 		
+	def testManyReferencesToSameFile( self ) :
+	
+		s = Gaffer.ScriptNode()
+		
+		s["n1"] = GafferTest.AddNode()
+		s["n2"] = GafferTest.AddNode()
+		s["n2"]["op1"].setInput( s["n1"]["sum"] )
+		b = Gaffer.Box.create( s, Gaffer.StandardSet( [ s["n1"] ] ) )
+		b.promotePlug( b["n1"]["op1"] )
+		
+		b.exportForReference( "/tmp/test.grf" )
+		
+		s2 = Gaffer.ScriptNode()
+		references = []
+		for i in range( 0, 100 ) :
+			r = Gaffer.Reference()
+			s2.addChild( r )
+			r.load( "/tmp/test.grf" )
+			r["user"]["n1_op1"].setValue( i )
+			references.append( r )
+		
+		for i, r in enumerate( references ) :
+			self.assertTrue( "n1" in r )
+			self.assertEqual( r["out"].getValue(), i )
+		
+		# modifying the file and reloading a single reference
+		# must pick up the changes.
+		
+		b["n1"]["op2"].setValue( 1000 )
+		b.exportForReference( "/tmp/test.grf" )
+		
+		references[0].load( "/tmp/test.grf" )
+		self.assertEqual( references[0]["out"].getValue(), 1000 )
+		
+		# but shouldn't affect the references that weren't reloaded
+		
+		self.assertEqual( references[1]["out"].getValue(), 1 )
+		
 	def tearDown( self ) :
 	
 		for f in (
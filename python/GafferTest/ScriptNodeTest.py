@@ -54,6 +54,8 @@ class ScriptNodeTest( unittest.TestCase ) :
 		ScriptNodeTest.lastNode = None
 		ScriptNodeTest.lastScript = None
 		ScriptNodeTest.lastResult = None
+		
+		self.__scriptCache = os.environ.get( "GAFFER_SCRIPT_CACHE", None )
 
 	def test( self ) :
 	
@@ -905,12 +907,159 @@ a = A()"""
 		s2.executeFile( "/tmp/test.gfr" )
 		
 		self.assertTrue( s2["n2"]["op1"].getInput().isSame( s2["n1"]["sum"] ) )
-				
+	
+	def testIsExecuting( self ) :
+	
+		s = Gaffer.ScriptNode()
+		self.assertFalse( s.isExecuting() )
+		
+		executingWhenAdded = []
+		def childAdded( parent, child ) :
+			executingWhenAdded.append( parent.isExecuting() )
+		c1 = s.childAddedSignal().connect( childAdded )
+		
+		finished = []
+		def executionFinished( script ) :
+			finished.append( script.isExecuting() )
+		c2 = s.executionFinishedSignal().connect( executionFinished )
+		
+		s.execute( "parent.addChild( Gaffer.Node() )\nparent.addChild( Gaffer.Node() )" )
+		
+		self.assertEqual( executingWhenAdded, [ True, True ] )
+		self.assertEqual( finished, [ False ] )
+		self.assertFalse( s.isExecuting() )
+		
+		# the signal should be emitted even if execution fails,
+		# and the original exception should be propagated.
+		self.assertRaises( ValueError, s.execute, "raise ValueError" )
+		self.assertEqual( finished, [ False, False ] )
+		self.assertFalse( s.isExecuting() )
+		
+	def testDirtyPropagationDeferredDuringExecution( self ) :
+	
+		s = Gaffer.ScriptNode()
+		s["n1"] = GafferTest.AddNode()
+		s["n2"] = GafferTest.AddNode()
+		s["n2"]["op1"].setInput( s["n1"]["sum"] )
+		
+		dirtied = []
+		def plugDirtied( plug ) :
+			dirtied.append( ( plug.relativeName( s ), s.isExecuting() ) )
+		c = s["n2"].plugDirtiedSignal().connect( plugDirtied )
+		
+		s.execute( "\n".join( [ "parent['n1']['op1'].setValue( %d )" % i for i in range( 1, 10 ) ] ) )
+		
+		self.assertEqual( dirtied, [ ( "n2.op1", False ), ( "n2.sum", False ) ] )
+		self.assertEqual( s["n2"]["sum"].getValue(), 9 )
+	
+	def testLoadPerformance( self ) :
+	
+		# make a large script with many nodes and connections, as
+		# found in production. uncomment the timers to get useful
+		# information printed out.
+		
+		s = Gaffer.ScriptNode()
+		previous = None
+		for i in range( 0, 2000 ) :
+			n = GafferTest.AddNode()
+			s.addChild( n )
+			n["op2"].setValue( 1 )
+			if previous is not None :
+				n["op1"].setInput( previous["sum"] )
+			previous = n
+		
+		s["fileName"].setValue( "/tmp/test.gfr" )
+		s.save()
+		
+		s2 = Gaffer.ScriptNode()
+		s2["fileName"].setValue( "/tmp/test.gfr" )
+		
+		added = []
+		c = s2.childAddedSignal().connect( lambda parent, child : added.append( child.getName() ) )
+		
+		t = IECore.Timer()
+		s2.load()
+		#print "LOAD", t.stop()
+		
+		self.assertEqual( len( added ), 2000 )
+		self.assertEqual( s2[previous.getName()]["sum"].getValue(), 2000 )
+		self.assertFalse( s2.undoAvailable() )
+		self.assertFalse( s2["unsavedChanges"].getValue() )
+		
+	def testScriptCache( self ) :
+	
+		os.environ["GAFFER_SCRIPT_CACHE"] = "1"
+		
+		s = Gaffer.ScriptNode()
+		s["n"] = GafferTest.AddNode()
+		s["n"]["op1"].setValue( 10 )
+		s["fileName"].setValue( "/tmp/test.gfr" )
+		s.save()
+		
+		self.assertFalse( os.path.exists( "/tmp/test.gfrc" ) )
+		
+		s2 = Gaffer.ScriptNode()
+		s2["fileName"].setValue( "/tmp/test.gfr" )
+		s2.load()
+		self.assertEqual( s2["n"]["op1"].getValue(), 10 )
+		self.assertTrue( os.path.exists( "/tmp/test.gfrc" ) )
+		
+		# second load should use the cache
+		
+		s3 = Gaffer.ScriptNode()
+		s3["fileName"].setValue( "/tmp/test.gfr" )
+		s3.load()
+		self.assertEqual( s3["n"]["op1"].getValue(), 10 )
+		
+		# changing the file must invalidate the cache, even if the
+		# modification time is unchanged.
+		
+		s["n"]["op1"].setValue( 20 )
+		s.save()
+		
+		s4 = Gaffer.ScriptNode()
+		s4["fileName"].setValue( "/tmp/test.gfr" )
+		s4.load()
+		self.assertEqual( s4["n"]["op1"].getValue(), 20 )
+		
+		# a corrupt cache must be ignored
+		
+		with open( "/tmp/test.gfrc", "r+" ) as f :
+			f.seek( 0, os.SEEK_END )
+			f.truncate( f.tell() / 2 )
+		
+		s5 = Gaffer.ScriptNode()
+		s5.executeFile( "/tmp/test.gfr" )
+		self.assertEqual( s5["n"]["op1"].getValue(), 20 )
+		
+	def testScriptCacheDisabled( self ) :
+	
+		os.environ["GAFFER_SCRIPT_CACHE"] = "0"
+		
+		s = Gaffer.ScriptNode()
+		s["n"] = GafferTest.AddNode()
+		s["fileName"].setValue( "/tmp/test.gfr" )
+		s.save()
+		
+		s2 = Gaffer.ScriptNode()
+		s2["fileName"].setValue( "/tmp/test.gfr" )
+		s2.load()
+		
+		self.assertTrue( "n" in s2 )
+		self.assertFalse( os.path.exists( "/tmp/test.gfrc" ) )
+	
 	def tearDown( self ) :
 	
+		if self.__scriptCache is not None :
+			os.environ["GAFFER_SCRIPT_CACHE"] = self.__scriptCache
+		elif "GAFFER_SCRIPT_CACHE" in os.environ :
+			del os.environ["GAFFER_SCRIPT_CACHE"]
+	
 		for f in (
 			"/tmp/test.gfr",
 			"/tmp/test2.gfr",
+			"/tmp/test.gfrc",
+			"/tmp/test2.gfrc",
 		) :
 			if os.path.exists( f ) :
 				os.remove( f )
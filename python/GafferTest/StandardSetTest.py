@@ -308,6 +308,75 @@ class StandardSetTest( unittest.TestCase ) :
 		self.assertEqual( l[:40], s[:40] )
 		self.assertEqual( l[1:-20], s[1:-20] )
 			
+	def testMembersChangedSignal( self ) :
+	
+		s = Gaffer.StandardSet()
+		
+		changes = []
+		def membersChanged( set ) :
+		
+			self.failUnless( set.isSame( s ) )
+			changes.append( len( set ) )
+			
+		c = s.membersChangedSignal().connect( membersChanged )
+		
+		n = [ Gaffer.Node() for i in range( 0, 10 ) ]
+		
+		s.add( n[0] )
+		self.assertEqual( changes, [ 1 ] )
+		
+		# adding an existing member changes nothing
+		s.add( n[0] )
+		self.assertEqual( changes, [ 1 ] )
+		
+		# bulk operations signal only once
+		self.assertEqual( s.add( n ), 9 )
+		self.assertEqual( changes, [ 1, 10 ] )
+		
+		self.assertEqual( s.remove( n[:5] ), 5 )
+		self.assertEqual( changes, [ 1, 10, 5 ] )
+		
+		self.assertEqual( s.remove( n[:5] ), 0 )
+		self.assertEqual( changes, [ 1, 10, 5 ] )
+		
+		s.clear()
+		self.assertEqual( changes, [ 1, 10, 5, 0 ] )
+		
+		s.clear()
+		self.assertEqual( changes, [ 1, 10, 5, 0 ] )
+	
+	def testBulkRemovePreservesOrder( self ) :
+	
+		l = [ IECore.IntData( i ) for i in range( 0, 10 ) ]
+		s = Gaffer.StandardSet( l )
+		
+		removed = []
+		def memberRemoved( set, member ) :
+		
+			self.failIf( member in set )
+			removed.append( member )
+			
+		c = s.memberRemovedSignal().connect( memberRemoved )
+		
+		# duplicates and non-members should be ignored
+		self.assertEqual( s.remove( [ l[7], l[2], l[7], IECore.IntData( 20 ) ] ), 2 )
+		self.assertEqual( removed, [ l[7], l[2] ] )
+		self.failUnless( removed[0].isSame( l[7] ) )
+		self.assertEqual( s[:], [ x for x in l if x.value not in ( 2, 7 ) ] )
+	
+	def testBulkAddIsAtomic( self ) :
+	
+		s = Gaffer.StandardSet()
+		
+		def f( s, m ) :
+				
+			return m.isInstanceOf( Gaffer.Plug.staticTypeId() )
+			
+		c = s.memberAcceptanceSignal().connect(	f )
+		
+		self.assertRaises( Exception, s.add, [ Gaffer.Plug(), Gaffer.Node() ] )
+		self.assertEqual( len( s ), 0 )
+	
 if __name__ == "__main__":
 	unittest.main()
 	
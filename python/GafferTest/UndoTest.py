@@ -180,6 +180,120 @@ class UndoTest( unittest.TestCase ) :
 				s["n"]["op1"].setValue( 20 )
 			
 		self.assertFalse( s.undoAvailable() )
+	
+	def testMergeConsecutiveSetValues( self ) :
+	
+		s = Gaffer.ScriptNode()
+		s["n"] = GafferTest.AddNode()
+		
+		with Gaffer.UndoContext( s ) :
+			for i in range( 1, 100 ) :
+				s["n"]["op1"].setValue( i )
+			
+		self.assertEqual( s["n"]["op1"].getValue(), 99 )
+		
+		s.undo()
+		self.assertEqual( s["n"]["op1"].getValue(), 0 )
+		self.assertFalse( s.undoAvailable() )
+		
+		s.redo()
+		self.assertEqual( s["n"]["op1"].getValue(), 99 )
+		
+		# values on different plugs mustn't be merged
+		
+		with Gaffer.UndoContext( s ) :
+			s["n"]["op1"].setValue( 1 )
+			s["n"]["op2"].setValue( 2 )
+			s["n"]["op1"].setValue( 3 )
+		
+		s.undo()
+		self.assertEqual( s["n"]["op1"].getValue(), 99 )
+		self.assertEqual( s["n"]["op2"].getValue(), 0 )
+		
+	def testMergeGroup( self ) :
+	
+		s = Gaffer.ScriptNode()
+		s["n"] = GafferTest.AddNode()
+		
+		# simulate a slider drag, with a separate UndoContext
+		# for each value, but all in the same merge group.
+		
+		for i in range( 1, 10 ) :
+			with Gaffer.UndoContext( s, mergeGroup = "drag1" ) :
+				s["n"]["op1"].setValue( i )
+		
+		# followed by a second drag
+		
+		for i in range( 10, 20 ) :
+			with Gaffer.UndoContext( s, mergeGroup = "drag2" ) :
+				s["n"]["op1"].setValue( i )
+		
+		self.assertEqual( s["n"]["op1"].getValue(), 19 )
+		
+		s.undo()
+		self.assertEqual( s["n"]["op1"].getValue(), 9 )
+		
+		s.undo()
+		self.assertEqual( s["n"]["op1"].getValue(), 0 )
+		self.assertFalse( s.undoAvailable() )
+		
+		# undo must interrupt merging, even if the same group
+		# is used again.
+		
+		s.redo()
+		with Gaffer.UndoContext( s, mergeGroup = "drag1" ) :
+			s["n"]["op1"].setValue( 100 )
+		
+		s.undo()
+		self.assertEqual( s["n"]["op1"].getValue(), 9 )
+		
+	def testMemoryLimit( self ) :
+	
+		s = Gaffer.ScriptNode()
+		s["p"] = Gaffer.IntVectorDataPlug( "p", Gaffer.Plug.Direction.In, IECore.IntVectorData(), flags = Gaffer.Plug.Flags.Default | Gaffer.Plug.Flags.Dynamic )
+		
+		self.assertEqual( s.getUndoMemoryLimit(), 0 )
+		self.assertEqual( s.undoMemoryUsage(), 0 )
+		
+		for i in range( 0, 10 ) :
+			with Gaffer.UndoContext( s ) :
+				s["p"].setValue( IECore.IntVectorData( [ i ] * 100000 ) )
+		
+		usage = s.undoMemoryUsage()
+		self.assertTrue( usage > 10 * 100000 * 4 )
+		
+		s.setUndoMemoryLimit( usage / 2 )
+		self.assertEqual( s.getUndoMemoryLimit(), usage / 2 )
+		self.assertTrue( s.undoMemoryUsage() <= usage / 2 )
+		
+		# the oldest entries should have been discarded
+		
+		numUndos = 0
+		while s.undoAvailable() :
+			s.undo()
+			numUndos += 1
+		
+		self.assertTrue( numUndos > 0 )
+		self.assertTrue( numUndos < 10 )
+		self.assertEqual( s["p"].getValue(), IECore.IntVectorData( [ 9 - numUndos ] * 100000 ) )
+		
+		# redo entries must not be discarded
+		
+		s.setUndoMemoryLimit( 1 )
+		for i in range( 0, numUndos ) :
+			s.redo()
+		self.assertEqual( s["p"].getValue(), IECore.IntVectorData( [ 9 ] * 100000 ) )
+		
+		# but the most recent entry is always kept, even
+		# if it exceeds the limit.
+		
+		with Gaffer.UndoContext( s ) :
+			s["p"].setValue( IECore.IntVectorData( [ 20 ] * 100000 ) )
+		
+		self.assertTrue( s.undoAvailable() )
+		s.undo()
+		self.assertEqual( s["p"].getValue(), IECore.IntVectorData( [ 9 ] * 100000 ) )
+		self.assertFalse( s.undoAvailable() )
 		
 if __name__ == "__main__":
 	unittest.main()
@@ -35,6 +35,13 @@
 #  
 ##########################################################################
 
+import os
+import time
+import glob
+import shutil
+import threading
+import subprocess
+
 import IECore
 
 import Gaffer
@@ -123,13 +130,441 @@ class ValuePlugTest( GafferTest.TestCase ) :
 		self.assertEqual( o3, IECore.StringData( "pig" ) )
 		self.failIf( o2.isSame( o3 ) ) # they shouldn't share cache entries
 		
+	def testComputationSharedBetweenThreads( self ) :
+	
+		# a node which takes a long time to compute, and
+		# records how many times it has been asked to do so.
+		class SlowNode( Gaffer.ComputeNode ) :
+		
+			def __init__( self, name="SlowNode" ) :
+			
+				Gaffer.ComputeNode.__init__( self, name )
+				
+				self.addChild( Gaffer.IntPlug( "in" ) )
+				self.addChild( Gaffer.IntPlug( "out", Gaffer.Plug.Direction.Out ) )
+				
+				self.numComputeCalls = 0
+				self.__lock = threading.Lock()
+				
+			def affects( self, input ) :
+			
+				if input.isSame( self["in"] ) :
+					return [ self["out"] ]
+					
+				return []
+				
+			def hash( self, output, context, h ) :
+			
+				self["in"].hash( h )
+				
+			def compute( self, plug, context ) :
+			
+				with self.__lock :
+					self.numComputeCalls += 1
+				
+				# sleeping releases the GIL, giving other threads
+				# plenty of opportunity to request the same value.
+				time.sleep( 0.1 )
+				plug.setValue( self["in"].getValue() * 2 )
+		
+		IECore.registerRunTimeTyped( SlowNode )
+		
+		n = SlowNode()
+		n["in"].setValue( 10 )
+		
+		GafferTest.parallelGetValue( n["out"], 100 )
+		self.assertEqual( n.numComputeCalls, 1 )
+		self.assertEqual( n["out"].getValue(), 20 )
+		self.assertEqual( n.numComputeCalls, 1 )
+		
+		n["in"].setValue( 11 )
+		
+		GafferTest.parallelGetValue( n["out"], 100 )
+		self.assertEqual( n.numComputeCalls, 2 )
+		self.assertEqual( n["out"].getValue(), 22 )
+		
+	def testHashCaching( self ) :
+	
+		class HashCountingNode( Gaffer.ComputeNode ) :
+		
+			def __init__( self, name="HashCountingNode" ) :
+			
+				Gaffer.ComputeNode.__init__( self, name )
+				
+				self.addChild( Gaffer.IntPlug( "in" ) )
+				self.addChild( Gaffer.IntPlug( "out", Gaffer.Plug.Direction.Out ) )
+				
+				self.numHashCalls = 0
+				
+			def affects( self, input ) :
+			
+				if input.isSame( self["in"] ) :
+					return [ self["out"] ]
+					
+				return []
+				
+			def hash( self, output, context, h ) :
+			
+				self.numHashCalls += 1
+				self["in"].hash( h )
+				
+			def compute( self, plug, context ) :
+			
+				plug.setValue( self["in"].getValue() )
+		
+		IECore.registerRunTimeTyped( HashCountingNode )
+		
+		n1 = HashCountingNode()
+		n2 = HashCountingNode()
+		n2["in"].setInput( n1["out"] )
+		
+		h = n2["out"].hash()
+		self.assertEqual( n1.numHashCalls, 1 )
+		self.assertEqual( n2.numHashCalls, 1 )
+		
+		# repeated queries on a clean graph should reuse the cached hashes
+		self.assertEqual( n2["out"].hash(), h )
+		self.assertEqual( n2["out"].getValue(), 0 )
+		self.assertEqual( n1.numHashCalls, 1 )
+		self.assertEqual( n2.numHashCalls, 1 )
+		
+		# but dirtying upstream should invalidate them
+		n1["in"].setValue( 10 )
+		self.assertNotEqual( n2["out"].hash(), h )
+		self.assertEqual( n2["out"].getValue(), 10 )
+		self.assertEqual( n1.numHashCalls, 2 )
+		self.assertEqual( n2.numHashCalls, 2 )
+		
+		# a change of context only matters if the node
+		# reads the variable that changed, and the nodes
+		# never read the frame.
+		with Gaffer.Context() as c :
+			c.setFrame( 2 )
+			self.assertEqual( n2["out"].hash(), n2["out"].hash() )
+		
+		self.assertEqual( n1.numHashCalls, 2 )
+		self.assertEqual( n2.numHashCalls, 2 )
+		
+		# but an explicit clear should invalidate them
+		Gaffer.ValuePlug.clearHashCache()
+		n2["out"].hash()
+		self.assertEqual( n1.numHashCalls, 3 )
+		self.assertEqual( n2.numHashCalls, 3 )
+		
+	def testHashCachingWithContextReads( self ) :
+	
+		class FrameHashingNode( Gaffer.ComputeNode ) :
+		
+			def __init__( self, name="FrameHashingNode" ) :
+			
+				Gaffer.ComputeNode.__init__( self, name )
+				
+				self.addChild( Gaffer.FloatPlug( "out", Gaffer.Plug.Direction.Out ) )
+				
+				self.numHashCalls = 0
+				
+			def hash( self, output, context, h ) :
+			
+				self.numHashCalls += 1
+				h.append( context.getFrame() )
+				
+			def compute( self, plug, context ) :
+			
+				plug.setValue( context.getFrame() )
+		
+		IECore.registerRunTimeTyped( FrameHashingNode )
+		
+		n = FrameHashingNode()
+		
+		c1 = Gaffer.Context()
+		c1.setFrame( 1 )
+		c2 = Gaffer.Context()
+		c2.setFrame( 2 )
+		
+		with c1 :
+			h1 = n["out"].hash()
+		self.assertEqual( n.numHashCalls, 1 )
+		
+		# the node reads the frame, so a new frame is a cache miss
+		with c2 :
+			h2 = n["out"].hash()
+		self.assertNotEqual( h1, h2 )
+		self.assertEqual( n.numHashCalls, 2 )
+		
+		# but other variables don't matter
+		c3 = Gaffer.Context( c1 )
+		c3["unread"] = 10
+		with c3 :
+			self.assertEqual( n["out"].hash(), h1 )
+		self.assertEqual( n.numHashCalls, 2 )
+		
+
+	def testCacheStatistics( self ) :
+	
+		# clear the cache so we start from a known state
+		Gaffer.ValuePlug.setCacheMemoryLimit( 0 )
+		Gaffer.ValuePlug.setCacheMemoryLimit( self.__originalCacheMemoryLimit )
+		Gaffer.ValuePlug.cacheStatistics()
+		Gaffer.ValuePlug.resetCacheStatistics()
+		
+		s = Gaffer.ScriptNode()
+		s["n"] = GafferTest.CachingTestNode()
+		s["n"]["in"].setValue( "testCacheStatistics" )
+		
+		s["n"]["out"].getValue()
+		s["n"]["out"].getValue()
+		
+		statistics = Gaffer.ValuePlug.cacheStatistics()
+		self.assertEqual( statistics["hits"].value, 1 )
+		self.assertEqual( statistics["misses"].value, 1 )
+		self.assertEqual( statistics["evictions"].value, 0 )
+		self.assertEqual( statistics["maxCost"].value, Gaffer.ValuePlug.getCacheMemoryLimit() )
+		self.assertTrue( statistics["currentCost"].value > 0 )
+		
+		cost = IECore.StringData( "testCacheStatistics" ).memoryUsage()
+		self.assertEqual( statistics["costByNodeType"][s["n"].typeName()].value, cost )
+		self.assertEqual( statistics["costByNode"][s["n"].fullName()].value, cost )
+		
+		Gaffer.ValuePlug.setCacheMemoryLimit( 0 )
+		
+		statistics = Gaffer.ValuePlug.cacheStatistics()
+		self.assertTrue( statistics["evictions"].value >= 1 )
+		self.failIf( s["n"].fullName() in statistics["costByNode"].keys() )
+		
+		Gaffer.ValuePlug.resetCacheStatistics()
+		
+		statistics = Gaffer.ValuePlug.cacheStatistics()
+		self.assertEqual( statistics["hits"].value, 0 )
+		self.assertEqual( statistics["misses"].value, 0 )
+		self.assertEqual( statistics["evictions"].value, 0 )
+		
+	def testDiskCache( self ) :
+	
+		# a node which is slow enough to compute that its
+		# values are worth storing in the disk cache.
+		class SlowCachingNode( GafferTest.CachingTestNode ) :
+		
+			def __init__( self, name="SlowCachingNode" ) :
+			
+				GafferTest.CachingTestNode.__init__( self, name )
+				self.numComputeCalls = 0
+				
+			def compute( self, plug, context ) :
+			
+				self.numComputeCalls += 1
+				time.sleep( 0.05 )
+				GafferTest.CachingTestNode.compute( self, plug, context )
+		
+			def hashIsStableBetweenSessions( self ) :
+			
+				return self.stable
+				
+			stable = True
+		
+		IECore.registerRunTimeTyped( SlowCachingNode )
+		
+		Gaffer.ValuePlug.setDiskCacheDirectory( self.__diskCacheDirectory )
+		Gaffer.ValuePlug.clearDiskCache()
+		self.assertEqual( Gaffer.ValuePlug.getDiskCacheDirectory(), self.__diskCacheDirectory )
+		
+		n = SlowCachingNode()
+		n["in"].setValue( "testDiskCache" )
+		
+		self.assertEqual( n["out"].getValue(), IECore.StringData( "testDiskCache" ) )
+		self.assertEqual( n.numComputeCalls, 1 )
+		self.assertEqual( len( glob.glob( self.__diskCacheDirectory + "/*.gfc" ) ), 1 )
+		self.assertTrue( Gaffer.ValuePlug.cacheStatistics()["diskCurrentCost"].value > 0 )
+		
+		# clear the memory cache, so that the value must
+		# be loaded from disk rather than recomputed.
+		Gaffer.ValuePlug.resetCacheStatistics()
+		Gaffer.ValuePlug.setCacheMemoryLimit( 0 )
+		Gaffer.ValuePlug.setCacheMemoryLimit( self.__originalCacheMemoryLimit )
+		
+		self.assertEqual( n["out"].getValue(), IECore.StringData( "testDiskCache" ) )
+		self.assertEqual( n.numComputeCalls, 1 )
+		self.assertEqual( Gaffer.ValuePlug.cacheStatistics()["diskHits"].value, 1 )
+		
+		# a new session should adopt the files written previously.
+		Gaffer.ValuePlug.setDiskCacheDirectory( "" )
+		Gaffer.ValuePlug.setDiskCacheDirectory( self.__diskCacheDirectory )
+		self.assertTrue( Gaffer.ValuePlug.cacheStatistics()["diskCurrentCost"].value > 0 )
+		
+		# reducing the limit should remove files.
+		Gaffer.ValuePlug.setDiskCacheLimit( 0 )
+		self.assertEqual( len( glob.glob( self.__diskCacheDirectory + "/*.gfc" ) ), 0 )
+		self.assertEqual( Gaffer.ValuePlug.cacheStatistics()["diskCurrentCost"].value, 0 )
+		
+		Gaffer.ValuePlug.setCacheMemoryLimit( 0 )
+		Gaffer.ValuePlug.setCacheMemoryLimit( self.__originalCacheMemoryLimit )
+		
+		self.assertEqual( n["out"].getValue(), IECore.StringData( "testDiskCache" ) )
+		self.assertEqual( n.numComputeCalls, 2 )
+		
+		# values must not be stored on disk if the node
+		# isn't stable between sessions.
+		Gaffer.ValuePlug.setDiskCacheLimit( 1024 * 1024 )
+		
+		n2 = SlowCachingNode()
+		n2.stable = False
+		n2["in"].setValue( "testDiskCacheUnstable" )
+		
+		self.assertEqual( n2["out"].getValue(), IECore.StringData( "testDiskCacheUnstable" ) )
+		self.assertEqual( n2.numComputeCalls, 1 )
+		self.assertEqual( len( glob.glob( self.__diskCacheDirectory + "/*.gfc" ) ), 0 )
+		
+	def testDiskCacheRemovesOrphanedTemporaryFiles( self ) :
+	
+		# make temporary files as if left by a process which
+		# exited while writing, and by one which is still running.
+		deadProcess = subprocess.Popen( [ "true" ] )
+		deadProcess.wait()
+		
+		os.makedirs( self.__diskCacheDirectory )
+		orphanedFile = self.__diskCacheDirectory + "/a.gfc.%d.1.tmp" % deadProcess.pid
+		activeFile = self.__diskCacheDirectory + "/b.gfc.%d.1.tmp" % os.getppid()
+		for f in ( orphanedFile, activeFile ) :
+			open( f, "w" ).write( "partial" )
+		
+		Gaffer.ValuePlug.setDiskCacheDirectory( self.__diskCacheDirectory )
+		self.assertFalse( os.path.exists( orphanedFile ) )
+		self.assertTrue( os.path.exists( activeFile ) )
+		
+		open( orphanedFile, "w" ).write( "partial" )
+		Gaffer.ValuePlug.clearDiskCache()
+		self.assertFalse( os.path.exists( orphanedFile ) )
+		self.assertTrue( os.path.exists( activeFile ) )
+		
+	def testGetValues( self ) :
+	
+		n = GafferTest.FrameNode()
+		
+		contexts = []
+		for frame in range( 1, 11 ) :
+			c = Gaffer.Context()
+			c.setFrame( frame )
+			contexts.append( c )
+		
+		values = n["output"].getValues( contexts )
+		self.assertEqual( values, [ IECore.FloatData( f ) for f in range( 1, 11 ) ] )
+		
+		# the values should now be in the cache, and
+		# match those computed one context at a time.
+		for c, v in zip( contexts, values ) :
+			with c :
+				self.assertEqual( n["output"].getValue(), v.value )
+		
+		self.assertEqual( n["output"].getValues( [] ), [] )
+		
+	def testGetValuesErrors( self ) :
+	
+		class ErroringNode( GafferTest.FrameNode ) :
+		
+			def compute( self, plug, context ) :
+			
+				if context.getFrame() == 5 :
+					raise Exception( "Frame 5 is bad" )
+				
+				GafferTest.FrameNode.compute( self, plug, context )
+		
+		IECore.registerRunTimeTyped( ErroringNode )
+		
+		n = ErroringNode()
+		
+		contexts = []
+		for frame in range( 1, 11 ) :
+			c = Gaffer.Context()
+			c.setFrame( frame )
+			contexts.append( c )
+		
+		self.assertRaises( RuntimeError, n["output"].getValues, contexts )
+		
+	def testHashCacheIgnoresUnusedContextVariables( self ) :
+	
+		n = GafferTest.AddNode()
+		n["op1"].setValue( 11223 )
+		
+		c1 = Gaffer.Context()
+		c1.setFrame( 1 )
+		c2 = Gaffer.Context()
+		c2.setFrame( 2 )
+		c2["unused"] = "unused"
+		
+		with Gaffer.PerformanceMonitor() as m :
+			with c1 :
+				h1 = n["sum"].hash()
+			with c2 :
+				h2 = n["sum"].hash()
+		
+		self.assertEqual( h1, h2 )
+		self.assertEqual( m.plugStatistics( n["sum"] ).hashCount, 1 )
+	
+	def testHashCacheTracksUpstreamContextVariables( self ) :
+	
+		# a node which doesn't read the context itself,
+		# but depends on an upstream node which does.
+		class PassThroughNode( Gaffer.ComputeNode ) :
+		
+			def __init__( self, name="PassThroughNode" ) :
+			
+				Gaffer.ComputeNode.__init__( self, name )
+				
+				self.addChild( Gaffer.FloatPlug( "in" ) )
+				self.addChild( Gaffer.FloatPlug( "out", Gaffer.Plug.Direction.Out ) )
+			
+			def affects( self, input ) :
+			
+				if input.isSame( self["in"] ) :
+					return [ self["out"] ]
+				
+				return []
+			
+			def hash( self, output, context, h ) :
+			
+				self["in"].hash( h )
+			
+			def compute( self, plug, context ) :
+			
+				plug.setValue( self["in"].getValue() )
+		
+		IECore.registerRunTimeTyped( PassThroughNode )
+		
+		f = GafferTest.FrameNode()
+		n = PassThroughNode()
+		n["in"].setInput( f["output"] )
+		
+		with Gaffer.PerformanceMonitor() as m :
+			for frame in ( 1, 2, 1, 2 ) :
+				c = Gaffer.Context()
+				c.setFrame( frame )
+				c["unused"] = frame * 10
+				with c :
+					self.assertEqual( n["out"].getValue(), frame )
+			
+			c = Gaffer.Context()
+			c.setFrame( 2 )
+			c["unused"] = 1000
+			with c :
+				self.assertEqual( n["out"].getValue(), 2 )
+		
+		self.assertEqual( m.plugStatistics( n["out"] ).hashCount, 2 )
+		self.assertEqual( m.plugStatistics( f["output"] ).hashCount, 2 )
+		
 	def setUp( self ) :
 	
 		self.__originalCacheMemoryLimit = Gaffer.ValuePlug.getCacheMemoryLimit()
+		self.__originalDiskCacheLimit = Gaffer.ValuePlug.getDiskCacheLimit()
 		
 	def tearDown( self ) :
 	
 		Gaffer.ValuePlug.setCacheMemoryLimit( self.__originalCacheMemoryLimit )
+		Gaffer.ValuePlug.setDiskCacheLimit( self.__originalDiskCacheLimit )
+		Gaffer.ValuePlug.setDiskCacheDirectory( "" )
+		
+		if os.path.exists( self.__diskCacheDirectory ) :
+			shutil.rmtree( self.__diskCacheDirectory )
+	
+	__diskCacheDirectory = "/tmp/gafferValuePlugTestDiskCache"
 		
 if __name__ == "__main__":
 	unittest.main()
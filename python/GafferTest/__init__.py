@@ -123,6 +123,9 @@ from DespatcherTest import DespatcherTest
 from RecursiveChildIteratorTest import RecursiveChildIteratorTest
 from FilteredRecursiveChildIteratorTest import FilteredRecursiveChildIteratorTest
 from ReferenceTest import ReferenceTest
+from PerformanceMonitorTest import PerformanceMonitorTest
+from ComputeFutureTest import ComputeFutureTest
+from DirtyPropagationScopeTest import DirtyPropagationScopeTest
 
 if __name__ == "__main__":
 	import unittest
@@ -152,8 +152,7 @@ class NodeSetEditor( GafferUI.EditorWidget ) :
 	
 		prevSet = self.__nodeSet
 		self.__nodeSet = nodeSet
-		self.__memberAddedConnection = self.__nodeSet.memberAddedSignal().connect( Gaffer.WeakMethod( self.__membersChanged ) )
-		self.__memberRemovedConnection = self.__nodeSet.memberRemovedSignal().connect( Gaffer.WeakMethod( self.__membersChanged ) )
+		self.__membersChangedConnection = self.__nodeSet.membersChangedSignal().connect( Gaffer.WeakMethod( self.__membersChanged ) )
 		
 		if callUpdateFromSet :
 			# only update if the nodes being held have actually changed,
@@ -173,7 +172,7 @@ class NodeSetEditor( GafferUI.EditorWidget ) :
 	
 		self.titleChangedSignal()( self )
 	
-	def __membersChanged( self, set, member ) :
+	def __membersChanged( self, set ) :
 		
 		if self.__updateScheduled :
 			return
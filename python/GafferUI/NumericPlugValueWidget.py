@@ -103,7 +103,13 @@ class NumericPlugValueWidget( GafferUI.PlugValueWidget ) :
 	
 	def __setPlugValue( self ) :
 			
-		with Gaffer.UndoContext( self.getPlug().ancestor( Gaffer.ScriptNode.staticTypeId() ) ) :
+		# values set during a single drag are merged so that they
+		# can be undone in one step.
+		mergeGroup = ""
+		if self.__numericWidget.currentDrag() is not None :
+			mergeGroup = "NumericPlugValueWidget:%d:%d" % ( id( self ), self.__numericWidget.currentDrag() )
+			
+		with Gaffer.UndoContext( self.getPlug().ancestor( Gaffer.ScriptNode.staticTypeId() ), mergeGroup = mergeGroup ) :
 
 			with Gaffer.BlockedConnection( self._plugConnections() ) :
 				try :
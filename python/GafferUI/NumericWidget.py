@@ -65,6 +65,7 @@ class NumericWidget( GafferUI.TextWidget ) :
 		
 		self.__dragValue = None
 		self.__dragStart = None
+		self.__dragCount = 0
 		
 		self.__keyPressConnection = self.keyPressSignal().connect( Gaffer.WeakMethod( self.__keyPress ) )
 		self.__buttonPressConnection = self.buttonPressSignal().connect( Gaffer.WeakMethod( self.__buttonPress ) )
@@ -98,6 +99,16 @@ class NumericWidget( GafferUI.TextWidget ) :
 			
 		return self.__valueChangedSignal
 	
+	## Returns a number uniquely identifying the drag currently in
+	# progress, or None if the value is not being dragged. This can be
+	# used to group all the changes made during a single drag.
+	def currentDrag( self ) :
+	
+		if self.__dragStart is None :
+			return None
+			
+		return self.__dragCount
+	
 	def __valueToText( self, value ) :
 	
 		value = self.__numericType( value )
@@ -173,6 +184,7 @@ class NumericWidget( GafferUI.TextWidget ) :
 			return None
 		
 		self.__dragStart = event.line.p0.x
+		self.__dragCount += 1
 		# IECore.NullObject is the convention for data for drags which are intended
 		# only for the purposes of the originating widget.
 		return IECore.NullObject.defaultNullObject()
@@ -49,8 +49,7 @@ class SplineEditor( GafferUI.EditorWidget ) :
 		GafferUI.EditorWidget.__init__( self, self.__column, scriptNode, **kw )
 		
 		self.__splineGadget = GafferUI.SplinePlugGadget()
-		self.__selectionAddedConnection = self.__splineGadget.selection().memberAddedSignal().connect( Gaffer.WeakMethod( self.__selectionChanged ) )
-		self.__selectionRemovedConnection = self.__splineGadget.selection().memberRemovedSignal().connect( Gaffer.WeakMethod( self.__selectionChanged ) )
+		self.__selectionChangedConnection = self.__splineGadget.selection().membersChangedSignal().connect( Gaffer.WeakMethod( self.__selectionChanged ) )
 		
 		self.__gadgetWidget = GafferUI.GadgetWidget( self.__splineGadget, cameraMode=GafferUI.GadgetWidget.CameraMode.Mode2D )
 		self.__gadgetWidget.setBackgroundColor( IECore.Color3f( 0.07 ) )
@@ -69,7 +68,7 @@ class SplineEditor( GafferUI.EditorWidget ) :
 	
 		return self.__splineGadget.splines()
 
-	def __selectionChanged( self, selection, member ) :
+	def __selectionChanged( self, selection ) :
 			
 		if not selection.size() :
 			self.__xPlugWidget.setPlug( None )
@@ -64,12 +64,7 @@ void Action::enact( GraphComponentPtr subject, const Function &doFn, const Funct
 	{
 		ActionPtr a = new Action( doFn, undoFn );
 		a->doAction();
-		s->m_actionAccumulator->push_back( a );
-		{
-			UndoContext undoDisabled( s, UndoContext::Disabled );
-			s->unsavedChangesPlug()->setValue( true );
-		}
-		s->actionSignal()( s, a.get(), Do );
+		s->addAction( a );
 	}
 	else
 	{
@@ -81,6 +76,26 @@ void Action::enact( GraphComponentPtr subject, const Function &doFn, const Funct
 	}
 	
 }
+
+void Action::enact( GraphComponentPtr subject, ActionPtr action )
+{
+	ScriptNodePtr s = IECore::runTimeCast<ScriptNode>( subject );
+	if( !s )
+	{
+		s = subject->ancestor<ScriptNode>();
+	}
+	
+	action->doAction();
+	
+	if( s && s->m_actionAccumulator && s->m_undoStateStack.top() == UndoContext::Enabled )
+	{
+		s->addAction( action );
+	}
+	else if( s && subject != s->unsavedChangesPlug() )
+	{
+		s->unsavedChangesPlug()->setValue( true );
+	}
+}
 	
 void Action::doAction()
 {
@@ -101,3 +116,18 @@ void Action::undoAction()
 	m_undoFn();
 	m_done = false;
 }
+
+size_t Action::memoryUsage() const
+{
+	return sizeof( Action );
+}
+
+bool Action::canMerge( const Action *other ) const
+{
+	return false;
+}
+
+void Action::merge( const Action *other )
+{
+	m_doFn = other->m_doFn;
+}
@@ -0,0 +1,1003 @@
+//////////////////////////////////////////////////////////////////////////
+//  
+//  Copyright (c) 2013, Image Engine Design Inc. All rights reserved.
+//  
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//  
+//      * Redistributions of source code must retain the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer.
+//  
+//      * Redistributions in binary form must reproduce the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer in the documentation and/or other materials provided with
+//        the distribution.
+//  
+//      * Neither the name of John Haddon nor the names of
+//        any other contributors to this software may be used to endorse or
+//        promote products derived from this software without specific prior
+//        written permission.
+//  
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//  
+//////////////////////////////////////////////////////////////////////////
+
+
+#include <cmath>
+#include <cstdlib>
+#include <cstring>
+#include <cctype>
+#include <algorithm>
+
+#include "boost/format.hpp"
+
+#include "IECore/Exception.h"
+#include "IECore/SimpleTypedData.h"
+
+#include "Gaffer/ArithmeticExpressionEngine.h"
+#include "Gaffer/Context.h"
+#include "Gaffer/NumericPlug.h"
+#include "Gaffer/TypedPlug.h"
+
+using namespace Gaffer;
+
+//////////////////////////////////////////////////////////////////////////
+// Functions
+//////////////////////////////////////////////////////////////////////////
+
+namespace
+{
+
+double integer( double x )
+{
+	return x < 0.0 ? std::ceil( x ) : std::floor( x );
+}
+
+// matches the python modulo operator, where the result
+// takes the sign of the divisor.
+double modulo( double a, double b )
+{
+	double r = std::fmod( a, b );
+	if( r != 0.0 && ( ( r < 0.0 ) != ( b < 0.0 ) ) )
+	{
+		r += b;
+	}
+	return r;
+}
+
+int64_t modulo( int64_t a, int64_t b )
+{
+	int64_t r = a % b;
+	if( r != 0 && ( ( r < 0 ) != ( b < 0 ) ) )
+	{
+		r += b;
+	}
+	return r;
+}
+
+// matches the python 2 division operator for integers,
+// which rounds towards negative infinity.
+int64_t floorDivide( int64_t a, int64_t b )
+{
+	int64_t q = a / b;
+	if( a % b != 0 && ( ( a < 0 ) != ( b < 0 ) ) )
+	{
+		q--;
+	}
+	return q;
+}
+
+int64_t power( int64_t a, int64_t b )
+{
+	int64_t result = 1;
+	while( b )
+	{
+		if( b & 1 )
+		{
+			result *= a;
+		}
+		b >>= 1;
+		a *= a;
+	}
+	return result;
+}
+
+struct UnaryFunctionDescription
+{
+	const char *name;
+	double (*function)( double );
+};
+
+struct BinaryFunctionDescription
+{
+	const char *name;
+	double (*function)( double, double );
+};
+
+double ceiling( double x ) { return std::ceil( x ); }
+double roundDown( double x ) { return std::floor( x ); }
+double squareRoot( double x ) { return std::sqrt( x ); }
+double exponential( double x ) { return std::exp( x ); }
+double logarithm( double x ) { return std::log( x ); }
+double sine( double x ) { return std::sin( x ); }
+double cosine( double x ) { return std::cos( x ); }
+double tangent( double x ) { return std::tan( x ); }
+double arcSine( double x ) { return std::asin( x ); }
+double arcCosine( double x ) { return std::acos( x ); }
+double arcTangent( double x ) { return std::atan( x ); }
+double arcTangent2( double a, double b ) { return std::atan2( a, b ); }
+
+const UnaryFunctionDescription g_unaryFunctions[] = {
+	{ "ceil", ceiling },
+	{ "floor", roundDown },
+	{ "sqrt", squareRoot },
+	{ "exp", exponential },
+	{ "log", logarithm },
+	{ "sin", sine },
+	{ "cos", cosine },
+	{ "tan", tangent },
+	{ "asin", arcSine },
+	{ "acos", arcCosine },
+	{ "atan", arcTangent },
+	{ 0, 0 }
+};
+
+const BinaryFunctionDescription g_binaryFunctions[] = {
+	{ "atan2", arcTangent2 },
+	{ 0, 0 }
+};
+
+} // namespace
+
+//////////////////////////////////////////////////////////////////////////
+// Parser implementation. This is a simple recursive descent parser,
+// which emits instructions for a stack machine as it goes.
+//////////////////////////////////////////////////////////////////////////
+
+class ArithmeticExpressionEngine::Parser
+{
+
+	public :
+	
+		Parser( const std::string &expression, ArithmeticExpressionEngine *engine )
+			:	m_expression( expression ), m_position( 0 ), m_engine( engine ), m_stackSize( 0 )
+		{
+			nextToken();
+			statement();
+		}
+		
+	private :
+	
+		enum TokenType
+		{
+			End,
+			Number,
+			String,
+			Identifier,
+			Operator
+		};
+	
+		struct Token
+		{
+			TokenType type;
+			std::string text;
+			Value number;
+			size_t position;
+		};
+		
+		void nextToken()
+		{
+			while( m_position < m_expression.size() && isspace( m_expression[m_position] ) )
+			{
+				m_position++;
+			}
+			
+			m_token.position = m_position;
+			m_token.text.clear();
+			m_token.number = Value();
+			
+			if( m_position >= m_expression.size() )
+			{
+				m_token.type = End;
+				return;
+			}
+			
+			const char c = m_expression[m_position];
+			const char next = m_position + 1 < m_expression.size() ? m_expression[m_position+1] : 0;
+			if( isdigit( c ) || ( c == '.' && isdigit( next ) ) )
+			{
+				const char *start = m_expression.c_str() + m_position;
+				char *end = 0;
+				m_token.type = Number;
+				const double number = strtod( start, &end );
+				m_token.text = std::string( start, end );
+				if( m_token.text.find_first_not_of( "0123456789" ) == std::string::npos )
+				{
+					if( m_token.text.size() > 1 && m_token.text[0] == '0' )
+					{
+						syntaxError( "Octal literals are not supported" );
+					}
+					m_token.number = Value( (int64_t)strtoll( start, 0, 10 ) );
+				}
+				else if( m_token.text.find_first_not_of( "0123456789.eE+-" ) != std::string::npos )
+				{
+					// strtod() accepts hexadecimal and other
+					// forms which python doesn't.
+					syntaxError( boost::str( boost::format( "Unsupported number \"%s\"" ) % m_token.text ) );
+				}
+				else
+				{
+					m_token.number = Value( number );
+				}
+				m_position += end - start;
+			}
+			else if( isalpha( c ) || c == '_' )
+			{
+				m_token.type = Identifier;
+				while( m_position < m_expression.size() && ( isalnum( m_expression[m_position] ) || m_expression[m_position] == '_' ) )
+				{
+					m_token.text += m_expression[m_position++];
+				}
+			}
+			else if( c == '"' || c == '\'' )
+			{
+				m_token.type = String;
+				size_t end = m_expression.find( c, m_position + 1 );
+				if( end == std::string::npos )
+				{
+					syntaxError( "Unterminated string" );
+				}
+				m_token.text = m_expression.substr( m_position + 1, end - m_position - 1 );
+				m_position = end + 1;
+			}
+			else
+			{
+				m_token.type = Operator;
+				static const char *twoCharacterOperators[] = { "**", "<=", ">=", "==", "!=", 0 };
+				for( const char **o = twoCharacterOperators; *o; ++o )
+				{
+					if( c == (*o)[0] && next == (*o)[1] )
+					{
+						m_token.text = *o;
+						m_position += 2;
+						return;
+					}
+				}
+				if( !strchr( "+-*/%<>=()[],.", c ) )
+				{
+					syntaxError( boost::str( boost::format( "Unexpected character '%c'" ) % c ) );
+				}
+				m_token.text = c;
+				m_position++;
+			}
+		}
+		
+		bool accept( const char *op )
+		{
+			if( m_token.type == Operator && m_token.text == op )
+			{
+				nextToken();
+				return true;
+			}
+			return false;
+		}
+		
+		void expect( const char *op )
+		{
+			if( !accept( op ) )
+			{
+				syntaxError( boost::str( boost::format( "Expected \"%s\"" ) % op ) );
+			}
+		}
+		
+		std::string expectString()
+		{
+			if( m_token.type != String )
+			{
+				syntaxError( "Expected string" );
+			}
+			std::string result = m_token.text;
+			nextToken();
+			return result;
+		}
+		
+		std::string expectIdentifier()
+		{
+			if( m_token.type != Identifier )
+			{
+				syntaxError( "Expected name" );
+			}
+			std::string result = m_token.text;
+			nextToken();
+			return result;
+		}
+		
+		void syntaxError( const std::string &message )
+		{
+			throw IECore::Exception( boost::str( boost::format( "Syntax error at position %d : %s" ) % m_token.position % message ) );
+		}
+		
+		// statement := parent plugPath "=" expression
+		void statement()
+		{
+			if( m_token.type != Identifier || m_token.text != "parent" )
+			{
+				syntaxError( "Expression does not write to a plug" );
+			}
+			nextToken();
+			m_engine->m_outPlug = plugPath();
+			expect( "=" );
+			expression();
+			if( m_token.type != End )
+			{
+				syntaxError( boost::str( boost::format( "Unexpected \"%s\"" ) % m_token.text ) );
+			}
+		}
+		
+		// expression := sum [ comparison sum ]
+		void expression()
+		{
+			sum();
+			static const char *comparisons[] = { "<", ">", "<=", ">=", "==", "!=", 0 };
+			static const Opcode comparisonOpcodes[] = { Less, Greater, LessEqual, GreaterEqual, Equal, NotEqual };
+			for( int i = 0; comparisons[i]; ++i )
+			{
+				if( accept( comparisons[i] ) )
+				{
+					sum();
+					emit( comparisonOpcodes[i] );
+					break;
+				}
+			}
+		}
+		
+		// sum := product { ( "+" | "-" ) product }
+		void sum()
+		{
+			product();
+			while( true )
+			{
+				if( accept( "+" ) )
+				{
+					product();
+					emit( Add );
+				}
+				else if( accept( "-" ) )
+				{
+					product();
+					emit( Subtract );
+				}
+				else
+				{
+					break;
+				}
+			}
+		}
+		
+		// product := unary { ( "*" | "/" | "%" ) unary }
+		void product()
+		{
+			unary();
+			while( true )
+			{
+				if( accept( "*" ) )
+				{
+					unary();
+					emit( Multiply );
+				}
+				else if( accept( "/" ) )
+				{
+					unary();
+					emit( Divide );
+				}
+				else if( accept( "%" ) )
+				{
+					unary();
+					emit( Modulo );
+				}
+				else
+				{
+					break;
+				}
+			}
+		}
+		
+		// unary := ( "-" | "+" ) unary | power
+		void unary()
+		{
+			if( accept( "-" ) )
+			{
+				unary();
+				emit( Negate );
+			}
+			else if( accept( "+" ) )
+			{
+				unary();
+			}
+			else
+			{
+				power();
+			}
+		}
+		
+		// power := primary [ "**" unary ]
+		void power()
+		{
+			primary();
+			if( accept( "**" ) )
+			{
+				unary();
+				emit( Power );
+			}
+		}
+		
+		// primary := number | "(" expression ")" | parent plugPath | contextAccess | function | "pi"
+		void primary()
+		{
+			if( m_token.type == Number )
+			{
+				emit( Instruction( PushConstant, m_token.number ) );
+				nextToken();
+				return;
+			}
+			
+			if( accept( "(" ) )
+			{
+				expression();
+				expect( ")" );
+				return;
+			}
+			
+			if( m_token.type != Identifier )
+			{
+				syntaxError( m_token.type == End ? "Unexpected end of expression" : boost::str( boost::format( "Unexpected \"%s\"" ) % m_token.text ) );
+			}
+			
+			const std::string name = expectIdentifier();
+			if( name == "parent" )
+			{
+				emit( Instruction( PushInput, Value(), inputIndex( plugPath() ) ) );
+			}
+			else if( name == "context" )
+			{
+				contextAccess();
+			}
+			else if( name == "pi" )
+			{
+				emit( Instruction( PushConstant, Value( M_PI ) ) );
+			}
+			else
+			{
+				function( name );
+			}
+		}
+		
+		// plugPath := "[" string "]" { "[" string "]" }
+		std::string plugPath()
+		{
+			std::string result;
+			do
+			{
+				expect( "[" );
+				if( result.size() )
+				{
+					result += ".";
+				}
+				result += expectString();
+				expect( "]" );
+			} while( m_token.type == Operator && m_token.text == "[" );
+			return result;
+		}
+		
+		// contextAccess := "[" string "]" | "." "getFrame" "(" ")" | "." "get" "(" string [ "," number ] ")"
+		void contextAccess()
+		{
+			if( accept( "[" ) )
+			{
+				const std::string name = expectString();
+				expect( "]" );
+				emit( Instruction( PushContextVariable, Value(), contextIndex( name ) ) );
+				return;
+			}
+			
+			expect( "." );
+			const std::string method = expectIdentifier();
+			expect( "(" );
+			if( method == "getFrame" )
+			{
+				contextIndex( "frame" );
+				emit( PushFrame );
+			}
+			else if( method == "get" )
+			{
+				const std::string name = expectString();
+				Instruction instruction( PushContextVariable, Value(), contextIndex( name ) );
+				if( accept( "," ) )
+				{
+					instruction.hasDefault = true;
+					instruction.value = signedNumber();
+				}
+				emit( instruction );
+			}
+			else
+			{
+				syntaxError( boost::str( boost::format( "Unknown context method \"%s\"" ) % method ) );
+			}
+			expect( ")" );
+		}
+		
+		Value signedNumber()
+		{
+			const bool negative = accept( "-" );
+			if( m_token.type != Number )
+			{
+				syntaxError( "Expected number" );
+			}
+			Value result = m_token.number;
+			nextToken();
+			if( negative )
+			{
+				if( result.isInteger )
+				{
+					result.i = -result.i;
+				}
+				else
+				{
+					result.f = -result.f;
+				}
+			}
+			return result;
+		}
+		
+		// function := name "(" expression { "," expression } ")"
+		void function( const std::string &name )
+		{
+			expect( "(" );
+			size_t numArguments = 0;
+			if( !accept( ")" ) )
+			{
+				do
+				{
+					expression();
+					numArguments++;
+				} while( accept( "," ) );
+				expect( ")" );
+			}
+			
+			// functions which preserve integers have
+			// their own opcodes.
+			static const char *specialFunctions[] = { "abs", "int", "float", "pow", "min", "max", "clamp", 0 };
+			static const size_t specialFunctionArguments[] = { 1, 1, 1, 2, 2, 2, 3 };
+			static const Opcode specialFunctionOpcodes[] = { Absolute, ToInteger, ToFloat, Power, Minimum, Maximum, Clamp };
+			for( int i = 0; specialFunctions[i]; ++i )
+			{
+				if( name == specialFunctions[i] && numArguments == specialFunctionArguments[i] )
+				{
+					emit( specialFunctionOpcodes[i] );
+					return;
+				}
+			}
+			
+			if( numArguments == 1 )
+			{
+				for( const UnaryFunctionDescription *f = g_unaryFunctions; f->name; ++f )
+				{
+					if( name == f->name )
+					{
+						Instruction instruction( CallUnary );
+						instruction.unaryFunction = f->function;
+						emit( instruction );
+						return;
+					}
+				}
+			}
+			else if( numArguments == 2 )
+			{
+				for( const BinaryFunctionDescription *f = g_binaryFunctions; f->name; ++f )
+				{
+					if( name == f->name )
+					{
+						Instruction instruction( CallBinary );
+						instruction.binaryFunction = f->function;
+						emit( instruction );
+						return;
+					}
+				}
+			}
+			
+			throw IECore::Exception( boost::str( boost::format( "Unknown function \"%s\" taking %d arguments" ) % name % numArguments ) );
+		}
+		
+		size_t inputIndex( const std::string &plugPath )
+		{
+			std::vector<std::string> &inPlugs = m_engine->m_inPlugs;
+			std::vector<std::string>::const_iterator it = std::find( inPlugs.begin(), inPlugs.end(), plugPath );
+			if( it != inPlugs.end() )
+			{
+				return it - inPlugs.begin();
+			}
+			inPlugs.push_back( plugPath );
+			return inPlugs.size() - 1;
+		}
+		
+		size_t contextIndex( const std::string &name )
+		{
+			std::vector<IECore::InternedString> &names = m_engine->m_contextNames;
+			std::vector<IECore::InternedString>::const_iterator it = std::find( names.begin(), names.end(), IECore::InternedString( name ) );
+			if( it != names.end() )
+			{
+				return it - names.begin();
+			}
+			names.push_back( name );
+			return names.size() - 1;
+		}
+		
+		void emit( const Instruction &instruction )
+		{
+			switch( instruction.opcode )
+			{
+				case PushConstant :
+				case PushInput :
+				case PushContextVariable :
+				case PushFrame :
+					m_stackSize++;
+					break;
+				case Negate :
+				case Absolute :
+				case ToInteger :
+				case ToFloat :
+				case CallUnary :
+					break;
+				case Clamp :
+					m_stackSize -= 2;
+					break;
+				default :
+					// binary operators
+					m_stackSize--;
+			}
+			m_engine->m_maxStackSize = std::max( m_engine->m_maxStackSize, m_stackSize );
+			m_engine->m_program.push_back( instruction );
+		}
+		
+		const std::string &m_expression;
+		size_t m_position;
+		Token m_token;
+		ArithmeticExpressionEngine *m_engine;
+		size_t m_stackSize;
+
+};
+
+//////////////////////////////////////////////////////////////////////////
+// Evaluation utilities
+//////////////////////////////////////////////////////////////////////////
+
+struct ArithmeticExpressionEngine::Evaluation
+{
+
+	static Value plugValue( const ValuePlug *plug )
+	{
+		switch( (Gaffer::TypeId)plug->typeId() )
+		{
+			case FloatPlugTypeId :
+				return Value( (double)static_cast<const FloatPlug *>( plug )->getValue() );
+			case IntPlugTypeId :
+				return Value( (int64_t)static_cast<const IntPlug *>( plug )->getValue() );
+			case BoolPlugTypeId :
+				return Value( (int64_t)static_cast<const BoolPlug *>( plug )->getValue() );
+			default :
+				throw IECore::Exception( boost::str( boost::format( "Unsupported plug type \"%s\"" ) % plug->typeName() ) );
+		}
+	}
+	
+	static void setPlugValue( ValuePlug *plug, const Value &value )
+	{
+		switch( (Gaffer::TypeId)plug->typeId() )
+		{
+			case FloatPlugTypeId :
+				static_cast<FloatPlug *>( plug )->setValue( value.toFloat() );
+				break;
+			case IntPlugTypeId :
+				static_cast<IntPlug *>( plug )->setValue( value.isInteger ? (int)value.i : (int)integer( value.f ) );
+				break;
+			case BoolPlugTypeId :
+				static_cast<BoolPlug *>( plug )->setValue( value.isInteger ? value.i != 0 : value.f != 0.0 );
+				break;
+			default :
+				throw IECore::Exception( boost::str( boost::format( "Unsupported plug type \"%s\"" ) % plug->typeName() ) );
+		}
+	}
+	
+	static Value contextValue( const Context *context, const IECore::InternedString &name, bool hasDefault, const Value &defaultValue )
+	{
+		const IECore::Data *d = context->get<IECore::Data>( name, 0 );
+		if( !d )
+		{
+			if( hasDefault )
+			{
+				return defaultValue;
+			}
+			throw IECore::Exception( boost::str( boost::format( "Context has no entry named \"%s\"" ) % name.value() ) );
+		}
+		
+		switch( d->typeId() )
+		{
+			case IECore::FloatDataTypeId :
+				return Value( (double)static_cast<const IECore::FloatData *>( d )->readable() );
+			case IECore::DoubleDataTypeId :
+				return Value( static_cast<const IECore::DoubleData *>( d )->readable() );
+			case IECore::IntDataTypeId :
+				return Value( (int64_t)static_cast<const IECore::IntData *>( d )->readable() );
+			case IECore::BoolDataTypeId :
+				return Value( (int64_t)static_cast<const IECore::BoolData *>( d )->readable() );
+			default :
+				throw IECore::Exception( boost::str( boost::format( "Context entry \"%s\" is not numeric" ) % name.value() ) );
+		}
+	}
+	
+	static void unary( const Instruction &instruction, Value &a )
+	{
+		switch( instruction.opcode )
+		{
+			case Negate :
+				a = a.isInteger ? Value( -a.i ) : Value( -a.f );
+				break;
+			case Absolute :
+				a = a.isInteger ? Value( a.i < 0 ? -a.i : a.i ) : Value( std::fabs( a.f ) );
+				break;
+			case ToInteger :
+				a = a.isInteger ? a : Value( (int64_t)integer( a.f ) );
+				break;
+			case ToFloat :
+				a = Value( a.toFloat() );
+				break;
+			case CallUnary :
+				a = Value( instruction.unaryFunction( a.toFloat() ) );
+				break;
+			default :
+				throw IECore::Exception( "Unexpected opcode" );
+		}
+	}
+	
+	// Performs a binary operation, storing the result in a.
+	static void binary( const Instruction &instruction, Value &a, const Value &b )
+	{
+		const bool integers = a.isInteger && b.isInteger;
+		switch( instruction.opcode )
+		{
+			case Add :
+				a = integers ? Value( a.i + b.i ) : Value( a.toFloat() + b.toFloat() );
+				break;
+			case Subtract :
+				a = integers ? Value( a.i - b.i ) : Value( a.toFloat() - b.toFloat() );
+				break;
+			case Multiply :
+				a = integers ? Value( a.i * b.i ) : Value( a.toFloat() * b.toFloat() );
+				break;
+			case Divide :
+				checkDivisor( b );
+				a = integers ? Value( floorDivide( a.i, b.i ) ) : Value( a.toFloat() / b.toFloat() );
+				break;
+			case Modulo :
+				checkDivisor( b );
+				a = integers ? Value( modulo( a.i, b.i ) ) : Value( modulo( a.toFloat(), b.toFloat() ) );
+				break;
+			case Power :
+				if( integers && b.i >= 0 )
+				{
+					a = Value( power( a.i, b.i ) );
+				}
+				else
+				{
+					if( a.toFloat() == 0.0 && b.toFloat() < 0.0 )
+					{
+						throw IECore::Exception( "Zero cannot be raised to a negative power" );
+					}
+					a = Value( std::pow( a.toFloat(), b.toFloat() ) );
+				}
+				break;
+			case Less :
+				a = Value( (int64_t)( integers ? a.i < b.i : a.toFloat() < b.toFloat() ) );
+				break;
+			case Greater :
+				a = Value( (int64_t)( integers ? a.i > b.i : a.toFloat() > b.toFloat() ) );
+				break;
+			case LessEqual :
+				a = Value( (int64_t)( integers ? a.i <= b.i : a.toFloat() <= b.toFloat() ) );
+				break;
+			case GreaterEqual :
+				a = Value( (int64_t)( integers ? a.i >= b.i : a.toFloat() >= b.toFloat() ) );
+				break;
+			case Equal :
+				a = Value( (int64_t)( integers ? a.i == b.i : a.toFloat() == b.toFloat() ) );
+				break;
+			case NotEqual :
+				a = Value( (int64_t)( integers ? a.i != b.i : a.toFloat() != b.toFloat() ) );
+				break;
+			case Minimum :
+				// like python, we return the first of equal
+				// values, preserving its type.
+				if( b.toFloat() < a.toFloat() )
+				{
+					a = b;
+				}
+				break;
+			case Maximum :
+				if( b.toFloat() > a.toFloat() )
+				{
+					a = b;
+				}
+				break;
+			case CallBinary :
+				a = Value( instruction.binaryFunction( a.toFloat(), b.toFloat() ) );
+				break;
+			default :
+				throw IECore::Exception( "Unexpected opcode" );
+		}
+	}
+	
+	static void checkDivisor( const Value &divisor )
+	{
+		if( divisor.isInteger ? divisor.i == 0 : divisor.f == 0.0 )
+		{
+			throw IECore::Exception( "Division by zero" );
+		}
+	}
+
+};
+
+//////////////////////////////////////////////////////////////////////////
+// ArithmeticExpressionEngine implementation
+//////////////////////////////////////////////////////////////////////////
+
+ArithmeticExpressionEngine::Value::Value()
+	:	isInteger( true ), i( 0 )
+{
+}
+
+ArithmeticExpressionEngine::Value::Value( int64_t i )
+	:	isInteger( true ), i( i )
+{
+}
+
+ArithmeticExpressionEngine::Value::Value( double f )
+	:	isInteger( false ), f( f )
+{
+}
+
+double ArithmeticExpressionEngine::Value::toFloat() const
+{
+	return isInteger ? (double)i : f;
+}
+
+ArithmeticExpressionEngine::Instruction::Instruction( Opcode o, const Value &v, size_t i )
+	:	opcode( o ), value( v ), index( i ), hasDefault( false ), unaryFunction( 0 ), binaryFunction( 0 )
+{
+}
+
+ArithmeticExpressionEngine::ArithmeticExpressionEngine( const std::string &expression )
+	:	m_maxStackSize( 0 )
+{
+	Parser parser( expression, this );
+}
+
+ArithmeticExpressionEngine::~ArithmeticExpressionEngine()
+{
+}
+
+std::string ArithmeticExpressionEngine::outPlug()
+{
+	return m_outPlug;
+}
+
+void ArithmeticExpressionEngine::inPlugs( std::vector<std::string> &plugPaths )
+{
+	plugPaths.insert( plugPaths.end(), m_inPlugs.begin(), m_inPlugs.end() );
+}
+
+void ArithmeticExpressionEngine::contextNames( std::vector<std::string> &names )
+{
+	for( std::vector<IECore::InternedString>::const_iterator it = m_contextNames.begin(), eIt = m_contextNames.end(); it != eIt; ++it )
+	{
+		names.push_back( it->value() );
+	}
+}
+
+void ArithmeticExpressionEngine::execute( const Context *context, const std::vector<const ValuePlug *> &proxyInputs, ValuePlug *proxyOutput )
+{
+	if( proxyInputs.size() != m_inPlugs.size() )
+	{
+		throw IECore::Exception( "Unexpected number of inputs" );
+	}
+
+	std::vector<Value> inputs( proxyInputs.size() );
+	for( size_t i = 0, e = proxyInputs.size(); i < e; ++i )
+	{
+		inputs[i] = Evaluation::plugValue( proxyInputs[i] );
+	}
+	
+	// use a stack allocated buffer for all but the most
+	// complex of expressions.
+	Value localStack[32];
+	std::vector<Value> heapStack;
+	Value *stack = localStack;
+	if( m_maxStackSize > 32 )
+	{
+		heapStack.resize( m_maxStackSize );
+		stack = &heapStack[0];
+	}
+	
+	Value *top = stack;
+	for( Program::const_iterator it = m_program.begin(), eIt = m_program.end(); it != eIt; ++it )
+	{
+		switch( it->opcode )
+		{
+			case PushConstant :
+				*top++ = it->value;
+				break;
+			case PushInput :
+				*top++ = inputs[it->index];
+				break;
+			case PushContextVariable :
+				*top++ = Evaluation::contextValue( context, m_contextNames[it->index], it->hasDefault, it->value );
+				break;
+			case PushFrame :
+				*top++ = Value( (double)context->getFrame() );
+				break;
+			case Negate :
+			case Absolute :
+			case ToInteger :
+			case ToFloat :
+			case CallUnary :
+				Evaluation::unary( *it, top[-1] );
+				break;
+			case Clamp :
+				// clamp( x, low, high ) == max( low, min( x, high ) )
+				top -= 2;
+				Evaluation::binary( Instruction( Minimum ), top[-1], top[1] );
+				Evaluation::binary( Instruction( Maximum ), top[-1], top[0] );
+				break;
+			default :
+				--top;
+				Evaluation::binary( *it, top[-1], top[0] );
+				break;
+		}
+	}
+	
+	Evaluation::setPlugValue( proxyOutput, stack[0] );
+}
+
+//////////////////////////////////////////////////////////////////////////
+// Registration with Expression
+//////////////////////////////////////////////////////////////////////////
+
+namespace
+{
+
+Expression::EnginePtr createEngine( const std::string &expression )
+{
+	return new ArithmeticExpressionEngine( expression );
+}
+
+struct Registration
+{
+	Registration()
+	{
+		Expression::Engine::registerEngine( "arithmetic", createEngine );
+	}
+};
+
+Registration g_registration;
+
+} // namespace
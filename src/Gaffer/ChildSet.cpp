@@ -81,9 +81,11 @@ size_t ChildSet::size() const
 void ChildSet::childAdded( GraphComponent *parent, GraphComponent *child )
 {
 	memberAddedSignal()( this, child );
+	membersChangedSignal()( this );
 }
 
 void ChildSet::childRemoved( GraphComponent *parent, GraphComponent *child )
 {
 	memberRemovedSignal()( this, child );
+	membersChangedSignal()( this );
 }
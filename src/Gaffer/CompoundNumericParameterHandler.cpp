@@ -100,13 +100,26 @@ Gaffer::ConstPlugPtr CompoundNumericParameterHandler<T>::plug() const
 template<typename T>
 void CompoundNumericParameterHandler<T>::setParameterValue()
 {
+	IECore::MurmurHash h;
+	if( !plugValueChanged( m_plug.get(), h ) )
+	{
+		return;
+	}
 	m_parameter->setTypedValue( m_plug->getValue() );
+	setParameterValueHash( h );
 }
 
 template<typename T>
 void CompoundNumericParameterHandler<T>::setPlugValue()
 {
 	m_plug->setValue( m_parameter->getTypedValue() );
+	setParameterValueHash( IECore::MurmurHash() );
+}
+
+template<typename T>
+IECore::ObjectPtr CompoundNumericParameterHandler<T>::computeParameterValue() const
+{
+	return new typename ParameterType::ObjectType( m_plug->getValue() );
 }
 		
 // explicit instantiations
@@ -153,6 +153,10 @@ Gaffer::PlugPtr CompoundParameterHandler::setupPlug( GraphComponent *plugParent,
 		it = nextIt;
 	}
 	
+	// our children may have changed, so we can no longer assume
+	// that they're up to date with the plug.
+	setParameterValueHash( IECore::MurmurHash() );
+	
 	return m_plug;
 }
 
@@ -168,6 +172,14 @@ Gaffer::ConstPlugPtr CompoundParameterHandler::plug() const
 
 void CompoundParameterHandler::setParameterValue()
 {
+	// if nothing at all has changed, we can skip all the children
+	// in one go. otherwise each child skips itself if unchanged.
+	IECore::MurmurHash hash;
+	if( m_plug && !plugValueChanged( m_plug.get(), hash ) )
+	{
+		return;
+	}
+
 	const CompoundParameter::ParameterVector &children = m_parameter->orderedParameters();
 	for( CompoundParameter::ParameterVector::const_iterator it = children.begin(); it!=children.end(); it++ )
 	{
@@ -177,6 +189,8 @@ void CompoundParameterHandler::setParameterValue()
 			h->setParameterValue();
 		}
 	}
+	
+	setParameterValueHash( hash );
 }
 
 void CompoundParameterHandler::setPlugValue()
@@ -190,6 +204,36 @@ void CompoundParameterHandler::setPlugValue()
 			h->setPlugValue();
 		}
 	}
+	
+	setParameterValueHash( IECore::MurmurHash() );
+}
+
+IECore::ObjectPtr CompoundParameterHandler::computeParameterValue() const
+{
+	CompoundObjectPtr result = new CompoundObject;
+	const CompoundParameter::ParameterVector &children = m_parameter->orderedParameters();
+	for( CompoundParameter::ParameterVector::const_iterator it = children.begin(); it!=children.end(); it++ )
+	{
+		// we don't use handler() because it may modify m_handlers,
+		// and we must be safe to call concurrently.
+		HandlerMap::const_iterator hIt = m_handlers.find( *it );
+		if( hIt != m_handlers.end() && hIt->second )
+		{
+			ObjectPtr value = hIt->second->computeParameterValue();
+			if( !value )
+			{
+				return 0;
+			}
+			result->members()[(*it)->name()] = value;
+		}
+		else
+		{
+			// no plug to take a value from, so we use the parameter value
+			// as setParameterValue() would.
+			result->members()[(*it)->name()] = (*it)->getValue()->copy();
+		}
+	}
+	return result;
 }
 
 std::string CompoundParameterHandler::plugName() const
@@ -235,6 +235,15 @@ void CompoundPlug::childAddedOrRemoved()
 	if( n )
 	{
 		n->plugSetSignal()( this );
+		// anything computed from us must also be dirtied, otherwise
+		// hashes cached against the old structure would be reused. we
+		// skip this while the node is still being constructed, when
+		// DependencyNode::affects() can't yet be called safely. removed
+		// children dirty their own dependents in Plug::parentChanging().
+		if( n->refCount() )
+		{
+			propagateDirtiness();
+		}
 	}
 }
 
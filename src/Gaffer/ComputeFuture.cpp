@@ -0,0 +1,285 @@
+//////////////////////////////////////////////////////////////////////////
+//  
+//  Copyright (c) 2013, Image Engine Design Inc. All rights reserved.
+//  
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//  
+//      * Redistributions of source code must retain the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer.
+//  
+//      * Redistributions in binary form must reproduce the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer in the documentation and/or other materials provided with
+//        the distribution.
+//  
+//      * Neither the name of John Haddon nor the names of
+//        any other contributors to this software may be used to endorse or
+//        promote products derived from this software without specific prior
+//        written permission.
+//  
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//  
+//////////////////////////////////////////////////////////////////////////
+
+
+#include <deque>
+
+#include "boost/thread/thread.hpp"
+#include "boost/bind.hpp"
+
+#include "tbb/task.h"
+
+#include "Gaffer/ComputeFuture.h"
+#include "Gaffer/Context.h"
+
+using namespace Gaffer;
+
+//////////////////////////////////////////////////////////////////////////
+// Dispatcher implementation
+//////////////////////////////////////////////////////////////////////////
+
+#if TBB_INTERFACE_VERSION >= 5000
+
+// Runs launched futures as enqueued tasks in the TBB thread pool,
+// so that they share the machine with all other TBB work rather
+// than competing with it.
+class ComputeFuture::Dispatcher
+{
+
+	public :
+	
+		static void push( ComputeFuturePtr future )
+		{
+			tbb::task::enqueue( *new( tbb::task::allocate_root() ) Task( future ) );
+		}
+		
+	private :
+	
+		class Task : public tbb::task
+		{
+		
+			public :
+			
+				Task( ComputeFuturePtr future )
+					:	m_future( future )
+				{
+				}
+				
+				virtual tbb::task *execute()
+				{
+					m_future->run();
+					return 0;
+				}
+				
+			private :
+			
+				ComputeFuturePtr m_future;
+		
+		};
+
+};
+
+#else
+
+// Versions of TBB prior to 3.0 have no way of running a task without
+// the caller waiting for it, so we fall back to a single thread of our
+// own which runs the futures in the order they were launched. Any
+// parallel work performed by the futures themselves still runs in the
+// TBB thread pool.
+class ComputeFuture::Dispatcher
+{
+
+	public :
+	
+		static void push( ComputeFuturePtr future )
+		{
+			instance().pushInternal( future );
+		}
+		
+	private :
+	
+		static Dispatcher &instance()
+		{
+			// deliberately leaked, as the thread lives for as
+			// long as the process does.
+			static Dispatcher *d = new Dispatcher;
+			return *d;
+		}
+		
+		Dispatcher()
+		{
+			boost::thread thread( boost::bind( &Dispatcher::work, this ) );
+			thread.detach();
+		}
+		
+		void pushInternal( ComputeFuturePtr future )
+		{
+			{
+				boost::mutex::scoped_lock lock( m_mutex );
+				m_queue.push_back( future );
+			}
+			m_condition.notify_one();
+		}
+		
+		void work()
+		{
+			while( true )
+			{
+				ComputeFuturePtr future;
+				{
+					boost::mutex::scoped_lock lock( m_mutex );
+					while( m_queue.empty() )
+					{
+						m_condition.wait( lock );
+					}
+					future = m_queue.front();
+					m_queue.pop_front();
+				}
+				future->run();
+			}
+		}
+		
+		boost::mutex m_mutex;
+		boost::condition_variable m_condition;
+		std::deque<ComputeFuturePtr> m_queue;
+
+};
+
+#endif
+
+//////////////////////////////////////////////////////////////////////////
+// ComputeFuture implementation
+//////////////////////////////////////////////////////////////////////////
+
+ComputeFuture::Cancelled::Cancelled()
+	:	IECore::Exception( "Computation cancelled" )
+{
+}
+
+ComputeFuture::ComputeFuture( Function f )
+	:	m_function( f ), m_done( false )
+{
+	m_cancelled = false;
+}
+
+ComputeFuture::~ComputeFuture()
+{
+}
+
+ComputeFuturePtr ComputeFuture::launch( Function f )
+{
+	ComputeFuturePtr result = new ComputeFuture( f );
+	
+	// the context refers to the future, so that computations can
+	// find it in checkCancellation(), and copies of the context made
+	// during computation will refer to it too.
+	ContextPtr context = new Context( *Context::current() );
+	context->m_computeFuture = result;
+	result->m_context = context;
+	
+	Dispatcher::push( result );
+	return result;
+}
+
+bool ComputeFuture::done() const
+{
+	boost::mutex::scoped_lock lock( m_mutex );
+	return m_done;
+}
+
+IECore::ConstObjectPtr ComputeFuture::get()
+{
+	boost::mutex::scoped_lock lock( m_mutex );
+	while( !m_done )
+	{
+		m_condition.wait( lock );
+	}
+	
+	if( m_result )
+	{
+		return m_result;
+	}
+	
+	if( m_cancelled )
+	{
+		throw Cancelled();
+	}
+	
+	throw IECore::Exception( m_error );
+}
+
+void ComputeFuture::cancel()
+{
+	m_cancelled = true;
+}
+
+bool ComputeFuture::cancelled() const
+{
+	return m_cancelled;
+}
+
+void ComputeFuture::checkCancellation()
+{
+	const ComputeFuture *future = Context::current()->computeFuture();
+	if( future && future->m_cancelled )
+	{
+		throw Cancelled();
+	}
+}
+
+void ComputeFuture::run()
+{
+	IECore::ConstObjectPtr result;
+	std::string error;
+	if( !m_cancelled )
+	{
+		try
+		{
+			Context::Scope scope( m_context.get() );
+			result = m_function();
+		}
+		catch( const std::exception &e )
+		{
+			// an exception is to be expected following cancellation,
+			// but it may not be of type Cancelled if it has passed
+			// through python code on the way.
+			if( !m_cancelled )
+			{
+				error = e.what();
+			}
+		}
+		catch( ... )
+		{
+			if( !m_cancelled )
+			{
+				error = "Unknown error";
+			}
+		}
+	}
+	
+	// release everything referenced by the computation, including
+	// the context, which references us in turn.
+	m_function = Function();
+	m_context = 0;
+	
+	{
+		boost::mutex::scoped_lock lock( m_mutex );
+		m_result = result;
+		m_error = error;
+		m_done = true;
+	}
+	m_condition.notify_all();
+}
@@ -52,6 +52,11 @@ ComputeNode::~ComputeNode()
 {
 }
 
+bool ComputeNode::hashIsStableBetweenSessions() const
+{
+	return false;
+}
+
 void ComputeNode::hash( const ValuePlug *output, const Context *context, IECore::MurmurHash &h ) const
 {
 	h.append( typeId() );
@@ -35,6 +35,7 @@
 //////////////////////////////////////////////////////////////////////////
 
 #include <stack>
+#include <cstdlib>
 
 #include "tbb/enumerable_thread_specific.h"
 
@@ -43,6 +44,7 @@
 #include "IECore/SimpleTypedData.h"
 
 #include "Gaffer/Context.h"
+#include "Gaffer/ComputeFuture.h"
 
 using namespace Gaffer;
 using namespace IECore;
@@ -53,15 +55,35 @@ using namespace IECore;
 
 static InternedString g_frame( "frame" );
 
+// when a context has more than this number of overrides, they
+// are merged into new shared storage.
+static const size_t g_maxOverrides = 8;
+
+// MurmurHash doesn't provide access to its raw value, so we
+// extract it from the string representation.
+static void hashValue( const MurmurHash &h, uint64_t *value )
+{
+	const std::string s = h.toString();
+	const size_t halfLength = s.size() / 2;
+	value[0] = strtoull( s.substr( 0, halfLength ).c_str(), 0, 16 );
+	value[1] = strtoull( s.substr( halfLength ).c_str(), 0, 16 );
+}
+
 Context::Context()
-	:	m_data( new CompoundData() ), m_changedSignal( 0 )
+	:	m_changedSignal( 0 )
 {
+	m_hashSum[0] = m_hashSum[1] = 0;
 	set( g_frame, 1.0f );
 }
 
 Context::Context( const Context &other )
-	:	m_data( other.m_data->copy() ), m_changedSignal( 0 )
+	:	m_sharedMap( other.m_sharedMap ), m_overrides( other.m_overrides ), m_hash( other.m_hash ), m_changedSignal( 0 ), m_computeFuture( other.m_computeFuture ), m_dependencyTracker( other.m_dependencyTracker )
 {
+	// we share the storage and values with the other context rather than
+	// copying them. this is safe because set() never modifies either when
+	// they are shared.
+	m_hashSum[0] = other.m_hashSum[0];
+	m_hashSum[1] = other.m_hashSum[1];
 }
 
 Context::~Context()
@@ -71,10 +93,16 @@ Context::~Context()
 
 void Context::names( std::vector<IECore::InternedString> &names ) const
 {
-	const CompoundDataMap &m = m_data->readable();
-	for( CompoundDataMap::const_iterator it = m.begin(), eIt = m.end(); it != eIt; it++ )
+	if( m_dependencyTracker )
 	{
-		names.push_back( it->first );
+		m_dependencyTracker->addAll();
+	}
+	
+	std::vector<const Map::value_type *> e;
+	entries( e );
+	for( std::vector<const Map::value_type *>::const_iterator it = e.begin(), eIt = e.end(); it != eIt; it++ )
+	{
+		names.push_back( (*it)->first );
 	}
 }
 
@@ -105,17 +133,171 @@ Context::ChangedSignal &Context::changedSignal()
 
 IECore::MurmurHash Context::hash() const
 {
-	return ((Object *)( m_data.get() ))->hash();
+	if( m_dependencyTracker )
+	{
+		m_dependencyTracker->addAll();
+	}
+	return m_hash;
+}
+
+IECore::MurmurHash Context::variablesHash( const DependencyTracker::Names &names ) const
+{
+	IECore::MurmurHash result;
+	for( DependencyTracker::Names::const_iterator it = names.begin(), eIt = names.end(); it != eIt; ++it )
+	{
+		if( const Storage *s = storage( *it ) )
+		{
+			result.append( s->hash[0] );
+			result.append( s->hash[1] );
+		}
+		else
+		{
+			// the absence of a variable is as significant
+			// as its value.
+			result.append( it->value() );
+		}
+	}
+	return result;
+}
+
+const Context::Storage *Context::storage( const IECore::InternedString &name ) const
+{
+	Map::const_iterator it = m_overrides.find( name );
+	if( it != m_overrides.end() )
+	{
+		return &(it->second);
+	}
+	
+	if( m_sharedMap )
+	{
+		it = m_sharedMap->map.find( name );
+		if( it != m_sharedMap->map.end() )
+		{
+			return &(it->second);
+		}
+	}
+	
+	return 0;
+}
+
+void Context::entries( std::vector<const Map::value_type *> &entries ) const
+{
+	// merge the sorted overrides and shared entries, with
+	// overrides taking precedence.
+	Map::const_iterator oIt = m_overrides.begin(), oEIt = m_overrides.end();
+	if( m_sharedMap )
+	{
+		const Map::key_compare less = m_overrides.key_comp();
+		for( Map::const_iterator sIt = m_sharedMap->map.begin(), sEIt = m_sharedMap->map.end(); sIt != sEIt; ++sIt )
+		{
+			while( oIt != oEIt && less( oIt->first, sIt->first ) )
+			{
+				entries.push_back( &(*oIt++) );
+			}
+			if( oIt != oEIt && !less( sIt->first, oIt->first ) )
+			{
+				entries.push_back( &(*oIt++) );
+			}
+			else
+			{
+				entries.push_back( &(*sIt) );
+			}
+		}
+	}
+	
+	for( ; oIt != oEIt; ++oIt )
+	{
+		entries.push_back( &(*oIt) );
+	}
+}
+
+void Context::entryChanged( const IECore::InternedString &name, Storage &storage, const uint64_t *previousHash )
+{
+	// rather than rehash all the values, we remove the
+	// previous hash of the entry from the sum and add the
+	// new one. note that previousHash may point into storage.
+	if( previousHash )
+	{
+		m_hashSum[0] -= previousHash[0];
+		m_hashSum[1] -= previousHash[1];
+	}
+	
+	const Object *value = storage.data.get();
+	MurmurHash entryHash;
+	entryHash.append( name.value() );
+	entryHash.append( value->hash() );
+	hashValue( entryHash, storage.hash );
+	
+	m_hashSum[0] += storage.hash[0];
+	m_hashSum[1] += storage.hash[1];
+	
+	m_hash = MurmurHash();
+	m_hash.append( m_hashSum[0] );
+	m_hash.append( m_hashSum[1] );
+	
+	if( m_overrides.size() > g_maxOverrides )
+	{
+		SharedMapPtr sharedMap = new SharedMap;
+		if( m_sharedMap )
+		{
+			sharedMap->map = m_sharedMap->map;
+		}
+		for( Map::const_iterator it = m_overrides.begin(), eIt = m_overrides.end(); it != eIt; ++it )
+		{
+			sharedMap->map[it->first] = it->second;
+		}
+		m_sharedMap = sharedMap;
+		m_overrides.clear();
+	}
+	
+	if( m_changedSignal )
+	{
+		(*m_changedSignal)( this, name );
+	}
 }
 
 bool Context::operator == ( const Context &other ) const
 {
-	return m_data->isEqualTo( other.m_data.get() );
+	if( m_dependencyTracker )
+	{
+		m_dependencyTracker->addAll();
+	}
+	if( other.m_dependencyTracker )
+	{
+		other.m_dependencyTracker->addAll();
+	}
+	
+	if( m_hash != other.m_hash )
+	{
+		return false;
+	}
+	
+	std::vector<const Map::value_type *> entries, otherEntries;
+	this->entries( entries );
+	other.entries( otherEntries );
+	if( entries.size() != otherEntries.size() )
+	{
+		return false;
+	}
+	
+	for( std::vector<const Map::value_type *>::const_iterator it = entries.begin(), oIt = otherEntries.begin(), eIt = entries.end(); it != eIt; ++it, ++oIt )
+	{
+		if( (*it)->first != (*oIt)->first )
+		{
+			return false;
+		}
+		if( (*it)->second.data != (*oIt)->second.data && !(*it)->second.data->isEqualTo( (*oIt)->second.data.get() ) )
+		{
+			return false;
+		}
+	}
+	
+	return true;
 }
 
 bool Context::operator != ( const Context &other ) const
 {
-	return m_data->isNotEqualTo( other.m_data.get() );
+	return !( *this == other );
 }
 
 std::string Context::substitute( const std::string &s ) const
@@ -203,6 +385,67 @@ std::string Context::substitute( const std::string &s ) const
 	return result;
 }
 
+const ComputeFuture *Context::computeFuture() const
+{
+	return m_computeFuture.get();
+}
+
+//////////////////////////////////////////////////////////////////////////
+// DependencyTracker implementation
+//////////////////////////////////////////////////////////////////////////
+
+Context::DependencyTracker::DependencyTracker()
+	:	m_all( false ), m_unstable( false )
+{
+}
+
+void Context::DependencyTracker::add( const IECore::InternedString &name )
+{
+	tbb::spin_mutex::scoped_lock lock( m_mutex );
+	m_names.insert( name );
+}
+
+void Context::DependencyTracker::add( const DependencyTracker *other )
+{
+	tbb::spin_mutex::scoped_lock lock( m_mutex );
+	if( other->m_all )
+	{
+		m_all = true;
+	}
+	if( other->m_unstable )
+	{
+		m_unstable = true;
+	}
+	m_names.insert( other->m_names.begin(), other->m_names.end() );
+}
+
+void Context::DependencyTracker::addAll()
+{
+	tbb::spin_mutex::scoped_lock lock( m_mutex );
+	m_all = true;
+}
+
+void Context::DependencyTracker::addUnstable()
+{
+	tbb::spin_mutex::scoped_lock lock( m_mutex );
+	m_unstable = true;
+}
+
+const Context::DependencyTracker::Names &Context::DependencyTracker::names() const
+{
+	return m_names;
+}
+
+bool Context::DependencyTracker::all() const
+{
+	return m_all;
+}
+
+bool Context::DependencyTracker::unstable() const
+{
+	return m_unstable;
+}
+
 //////////////////////////////////////////////////////////////////////////
 // Scope and current context implementation
 //////////////////////////////////////////////////////////////////////////
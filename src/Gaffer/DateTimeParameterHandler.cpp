@@ -91,10 +91,22 @@ Gaffer::ConstPlugPtr DateTimeParameterHandler::plug() const
 		
 void DateTimeParameterHandler::setParameterValue()
 {
+	IECore::MurmurHash h;
+	if( !plugValueChanged( m_plug.get(), h ) )
+	{
+		return;
+	}
 	m_parameter->setTypedValue( boost::posix_time::from_iso_string( m_plug->getValue() ) );
+	setParameterValueHash( h );
 }
 
 void DateTimeParameterHandler::setPlugValue()
 {
 	m_plug->setValue( boost::posix_time::to_iso_string( m_parameter->getTypedValue() ) );
+	setParameterValueHash( IECore::MurmurHash() );
+}
+
+IECore::ObjectPtr DateTimeParameterHandler::computeParameterValue() const
+{
+	return new IECore::DateTimeData( boost::posix_time::from_iso_string( m_plug->getValue() ) );
 }
@@ -34,6 +34,10 @@
 //  
 //////////////////////////////////////////////////////////////////////////
 
+#include <fstream>
+
+#include "boost/filesystem.hpp"
+
 #include "Gaffer/Node.h"
 #include "Gaffer/CompoundPlug.h"
 #include "Gaffer/Context.h"
@@ -196,3 +200,87 @@ void Despatcher::uniqueTasks( const Executable::Tasks &tasks, std::vector< Despa
 		uniqueTask( *tit, uniqueTasks, seenTasks );
 	}
 }
+
+const Executable *Despatcher::executable( const Executable::Task &task )
+{
+	const Executable *result = dynamic_cast<const Executable *>( task.node.get() );
+	if( !result )
+	{
+		throw Exception( "Non Executable node found!" );
+	}
+	return result;
+}
+
+// The record for "/path/image.0001.exr" lives in "/path/.image.0001.exr.gafferExecutionHash",
+// so that it doesn't get in the way of file sequences and directory listings.
+std::string Despatcher::executionRecordFileName( const std::string &outputFileName )
+{
+	const size_t slash = outputFileName.rfind( '/' );
+	if( slash == std::string::npos )
+	{
+		return "." + outputFileName + ".gafferExecutionHash";
+	}
+	return outputFileName.substr( 0, slash + 1 ) + "." + outputFileName.substr( slash + 1 ) + ".gafferExecutionHash";
+}
+
+bool Despatcher::upToDate( const Executable::Task &task, const IECore::MurmurHash &hash )
+{
+	if( hash == IECore::MurmurHash() )
+	{
+		return false;
+	}
+
+	std::vector<std::string> outputs;
+	executable( task )->executionOutputs( task.context, outputs );
+	if( outputs.empty() )
+	{
+		return false;
+	}
+
+	const std::string hashString = hash.toString();
+	for( std::vector<std::string>::const_iterator it = outputs.begin(), eIt = outputs.end(); it != eIt; ++it )
+	{
+		if( !boost::filesystem::exists( *it ) )
+		{
+			return false;
+		}
+
+		std::ifstream f( executionRecordFileName( *it ).c_str() );
+		std::string recordedHash;
+		if( !( f >> recordedHash ) || recordedHash != hashString )
+		{
+			return false;
+		}
+	}
+
+	return true;
+}
+
+void Despatcher::recordExecution( const Executable::Task &task, const IECore::MurmurHash &hash )
+{
+	if( hash == IECore::MurmurHash() )
+	{
+		return;
+	}
+
+	std::vector<std::string> outputs;
+	executable( task )->executionOutputs( task.context, outputs );
+
+	for( std::vector<std::string>::const_iterator it = outputs.begin(), eIt = outputs.end(); it != eIt; ++it )
+	{
+		if( !boost::filesystem::exists( *it ) )
+		{
+			// the task didn't actually produce this output, so
+			// there's nothing to record it against.
+			continue;
+		}
+
+		const std::string fileName = executionRecordFileName( *it );
+		std::ofstream f( fileName.c_str() );
+		f << hash.toString() << "\n";
+		if( !f )
+		{
+			throw Exception( boost::str( boost::format( "Unable to write execution record \"%s\"" ) % fileName ) );
+		}
+	}
+}
@@ -0,0 +1,496 @@
+//////////////////////////////////////////////////////////////////////////
+//  
+//  Copyright (c) 2013, Image Engine Design Inc. All rights reserved.
+//  
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//  
+//      * Redistributions of source code must retain the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer.
+//  
+//      * Redistributions in binary form must reproduce the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer in the documentation and/or other materials provided with
+//        the distribution.
+//  
+//      * Neither the name of John Haddon nor the names of
+//        any other contributors to this software may be used to endorse or
+//        promote products derived from this software without specific prior
+//        written permission.
+//  
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//  
+//////////////////////////////////////////////////////////////////////////
+
+
+#include <sys/types.h>
+#include <sys/stat.h>
+#include <fcntl.h>
+#include <unistd.h>
+#include <utime.h>
+#include <signal.h>
+
+#include <cerrno>
+#include <cstdio>
+#include <ctime>
+#include <fstream>
+#include <vector>
+#include <algorithm>
+
+#include "boost/filesystem.hpp"
+#include "boost/lexical_cast.hpp"
+
+#include "tbb/atomic.h"
+
+#include "IECore/MemoryIndexedIO.h"
+#include "IECore/VectorTypedData.h"
+#include "IECore/MessageHandler.h"
+
+#include "Gaffer/DiskCache.h"
+
+using namespace IECore;
+using namespace Gaffer;
+
+//////////////////////////////////////////////////////////////////////////
+// Internal utilities
+//////////////////////////////////////////////////////////////////////////
+
+namespace
+{
+
+const std::string g_extension = ".gfc";
+const std::string g_tmpExtension = ".tmp";
+const IndexedIO::EntryID g_objectEntry( "object" );
+
+// Used to make unique temporary file names for writing.
+tbb::atomic<size_t> g_tmpFileCount;
+
+// Appended to every key, so that files written by incompatible
+// versions are never read. This must be incremented whenever the
+// serialisation format changes, or whenever a change to the hashing
+// of values means that equal keys may no longer mean equal values.
+const unsigned g_formatVersion = 1;
+
+// Reads the entire contents of a file, returning 0 if the
+// file doesn't exist.
+CharVectorDataPtr readFile( const std::string &fileName )
+{
+	int fd = open( fileName.c_str(), O_RDONLY );
+	if( fd == -1 )
+	{
+		return 0;
+	}
+	
+	CharVectorDataPtr result = 0;
+	struct stat s;
+	if( fstat( fd, &s ) == 0 && s.st_size > 0 )
+	{
+		result = new CharVectorData;
+		std::vector<char> &buffer = result->writable();
+		buffer.resize( s.st_size );
+		size_t offset = 0;
+		while( offset < buffer.size() )
+		{
+			const ssize_t n = read( fd, &(buffer[offset]), buffer.size() - offset );
+			if( n <= 0 )
+			{
+				if( n == -1 && errno == EINTR )
+				{
+					continue;
+				}
+				// error, or the file was truncated
+				// since we called fstat().
+				result = 0;
+				break;
+			}
+			offset += n;
+		}
+	}
+	
+	close( fd );
+	return result;
+}
+
+bool hasExtension( const std::string &path, const std::string &extension )
+{
+	return path.size() >= extension.size() && !path.compare( path.size() - extension.size(), extension.size(), extension );
+}
+
+// Returns true if the path is a temporary file left behind by a
+// process which no longer exists - see writeFile() for the naming
+// scheme.
+bool isOrphanedTmpFile( const std::string &path )
+{
+	if( !hasExtension( path, g_tmpExtension ) )
+	{
+		return false;
+	}
+	
+	const size_t countStart = path.rfind( '.', path.size() - g_tmpExtension.size() - 1 );
+	if( countStart == std::string::npos || countStart == 0 )
+	{
+		return false;
+	}
+	const size_t pidStart = path.rfind( '.', countStart - 1 );
+	if( pidStart == std::string::npos )
+	{
+		return false;
+	}
+	
+	pid_t pid = 0;
+	try
+	{
+		pid = boost::lexical_cast<pid_t>( path.substr( pidStart + 1, countStart - pidStart - 1 ) );
+	}
+	catch( const boost::bad_lexical_cast & )
+	{
+		// not one of ours.
+		return false;
+	}
+	
+	if( pid == getpid() )
+	{
+		// we may be writing it right now.
+		return false;
+	}
+	
+	return kill( pid, 0 ) == -1 && errno == ESRCH;
+}
+
+// Writes the buffer to the file, via a temporary file which is then
+// renamed, so that other threads and processes never see partially
+// written files.
+bool writeFile( const std::string &fileName, const std::vector<char> &buffer )
+{
+	const std::string tmpFileName = fileName + "." +
+		boost::lexical_cast<std::string>( getpid() ) + "." +
+		boost::lexical_cast<std::string>( ++g_tmpFileCount ) + g_tmpExtension;
+	
+	{
+		std::ofstream f( tmpFileName.c_str(), std::ios::binary );
+		f.write( &(buffer[0]), buffer.size() );
+		if( !f.good() )
+		{
+			f.close();
+			std::remove( tmpFileName.c_str() );
+			return false;
+		}
+	}
+	
+	if( std::rename( tmpFileName.c_str(), fileName.c_str() ) != 0 )
+	{
+		std::remove( tmpFileName.c_str() );
+		return false;
+	}
+	
+	return true;
+}
+
+} // namespace
+
+//////////////////////////////////////////////////////////////////////////
+// DiskCache
+//////////////////////////////////////////////////////////////////////////
+
+DiskCache::DiskCache( const std::string &directory, size_t maxCost )
+	:	m_maxCost( maxCost ), m_currentCost( 0 )
+{
+	setDirectory( directory );
+}
+
+DiskCache::~DiskCache()
+{
+}
+
+void DiskCache::setDirectory( const std::string &directory )
+{
+	tbb::mutex::scoped_lock lock( m_mutex );
+	
+	m_entries.clear();
+	m_lruList.clear();
+	m_currentCost = 0;
+	m_directory = directory;
+	
+	if( m_directory.empty() )
+	{
+		return;
+	}
+	
+	boost::filesystem::create_directories( m_directory );
+	
+	// adopt the files left by previous sessions, treating the
+	// least recently modified as the least recently used.
+	typedef std::pair<std::time_t, std::pair<std::string, size_t> > ExistingFile;
+	std::vector<ExistingFile> existingFiles;
+	boost::filesystem::directory_iterator end;
+	for( boost::filesystem::directory_iterator it( m_directory ); it != end; ++it )
+	{
+		const std::string path = it->path().string();
+		if( isOrphanedTmpFile( path ) )
+		{
+			std::remove( path.c_str() );
+			continue;
+		}
+		if( !hasExtension( path, g_extension ) )
+		{
+			continue;
+		}
+		if( !boost::filesystem::is_regular_file( it->status() ) )
+		{
+			continue;
+		}
+		
+		const size_t nameStart = path.find_last_of( '/' ) + 1;
+		const std::string entryName = path.substr( nameStart, path.size() - nameStart - g_extension.size() );
+		existingFiles.push_back(
+			ExistingFile(
+				boost::filesystem::last_write_time( it->path() ),
+				std::make_pair( entryName, boost::filesystem::file_size( it->path() ) )
+			)
+		);
+	}
+	
+	std::sort( existingFiles.begin(), existingFiles.end() );
+	for( std::vector<ExistingFile>::const_iterator it = existingFiles.begin(), eIt = existingFiles.end(); it != eIt; ++it )
+	{
+		addEntry( it->second.first, it->second.second );
+	}
+	
+	limitCost();
+}
+
+std::string DiskCache::getDirectory() const
+{
+	tbb::mutex::scoped_lock lock( m_mutex );
+	return m_directory;
+}
+
+bool DiskCache::enabled() const
+{
+	tbb::mutex::scoped_lock lock( m_mutex );
+	return !m_directory.empty();
+}
+
+void DiskCache::setMaxCost( size_t maxCost )
+{
+	tbb::mutex::scoped_lock lock( m_mutex );
+	m_maxCost = maxCost;
+	limitCost();
+}
+
+size_t DiskCache::getMaxCost() const
+{
+	tbb::mutex::scoped_lock lock( m_mutex );
+	return m_maxCost;
+}
+
+size_t DiskCache::currentCost() const
+{
+	tbb::mutex::scoped_lock lock( m_mutex );
+	return m_currentCost;
+}
+
+IECore::ObjectPtr DiskCache::get( const IECore::MurmurHash &key )
+{
+	// we take a copy of the directory, because setDirectory()
+	// may be called concurrently while we're reading the file.
+	const std::string directory = getDirectory();
+	if( directory.empty() )
+	{
+		return 0;
+	}
+	
+	const std::string entryName = this->entryName( key );
+	const std::string fileName = this->fileName( directory, entryName );
+	
+	// we always try to read the file, even if we have no entry
+	// for it, because another process sharing the directory
+	// may have written it since we scanned the directory.
+	ObjectPtr result = 0;
+	CharVectorDataPtr buffer = readFile( fileName );
+	if( buffer )
+	{
+		try
+		{
+			MemoryIndexedIOPtr io = new MemoryIndexedIO( buffer, IndexedIO::rootPath, IndexedIO::Read );
+			result = Object::load( io, g_objectEntry );
+		}
+		catch( const std::exception &e )
+		{
+			// the file is unreadable, so we get rid of it rather
+			// than failing every time it is requested.
+			msg( Msg::Warning, "DiskCache::get", boost::format( "Removing unreadable file \"%s\" (%s)" ) % fileName % e.what() );
+			std::remove( fileName.c_str() );
+		}
+	}
+	
+	tbb::mutex::scoped_lock lock( m_mutex );
+	if( directory != m_directory )
+	{
+		// setDirectory() was called while we were reading, so
+		// the entries no longer refer to our file.
+		return result;
+	}
+	
+	if( result )
+	{
+		// record the access both for ourselves and for
+		// any other processes sharing the directory.
+		utime( fileName.c_str(), 0 );
+		EntryMap::iterator it = m_entries.find( entryName );
+		if( it != m_entries.end() )
+		{
+			m_lruList.splice( m_lruList.end(), m_lruList, it->second.lruPosition );
+		}
+		else
+		{
+			addEntry( entryName, buffer->readable().size() );
+			limitCost();
+		}
+	}
+	else
+	{
+		removeEntry( entryName );
+	}
+	
+	return result;
+}
+
+bool DiskCache::set( const IECore::MurmurHash &key, const IECore::Object *value )
+{
+	std::string directory;
+	size_t maxCost;
+	{
+		tbb::mutex::scoped_lock lock( m_mutex );
+		directory = m_directory;
+		maxCost = m_maxCost;
+	}
+	
+	if( directory.empty() )
+	{
+		return false;
+	}
+	
+	ConstCharVectorDataPtr buffer;
+	try
+	{
+		MemoryIndexedIOPtr io = new MemoryIndexedIO( ConstCharVectorDataPtr(), IndexedIO::rootPath, IndexedIO::Exclusive | IndexedIO::Write );
+		value->save( io, g_objectEntry );
+		buffer = io->buffer();
+	}
+	catch( const std::exception &e )
+	{
+		msg( Msg::Warning, "DiskCache::set", boost::format( "Unable to serialise %s (%s)" ) % value->typeName() % e.what() );
+		return false;
+	}
+	
+	const size_t cost = buffer->readable().size();
+	if( !cost || cost > maxCost )
+	{
+		return false;
+	}
+	
+	const std::string entryName = this->entryName( key );
+	const std::string fileName = this->fileName( directory, entryName );
+	if( !writeFile( fileName, buffer->readable() ) )
+	{
+		return false;
+	}
+	
+	tbb::mutex::scoped_lock lock( m_mutex );
+	if( directory != m_directory )
+	{
+		// setDirectory() was called while we were writing. the
+		// file remains for adoption by a future session, but it
+		// isn't an entry in the current directory.
+		return true;
+	}
+	
+	removeEntry( entryName );
+	addEntry( entryName, cost );
+	limitCost();
+	return true;
+}
+
+bool DiskCache::cached( const IECore::MurmurHash &key ) const
+{
+	tbb::mutex::scoped_lock lock( m_mutex );
+	return m_entries.find( entryName( key ) ) != m_entries.end();
+}
+
+void DiskCache::clear()
+{
+	tbb::mutex::scoped_lock lock( m_mutex );
+	if( !m_directory.empty() && boost::filesystem::is_directory( m_directory ) )
+	{
+		// we remove all the cache files in the directory, not just
+		// our entries, because other processes sharing the directory
+		// may have written files since we scanned it.
+		boost::filesystem::directory_iterator end;
+		for( boost::filesystem::directory_iterator it( m_directory ); it != end; ++it )
+		{
+			const std::string path = it->path().string();
+			if( hasExtension( path, g_extension ) || isOrphanedTmpFile( path ) )
+			{
+				std::remove( path.c_str() );
+			}
+		}
+	}
+	m_entries.clear();
+	m_lruList.clear();
+	m_currentCost = 0;
+}
+
+std::string DiskCache::entryName( const IECore::MurmurHash &key ) const
+{
+	IECore::MurmurHash h = key;
+	h.append( g_formatVersion );
+	return h.toString();
+}
+
+std::string DiskCache::fileName( const std::string &directory, const std::string &entryName ) const
+{
+	return directory + "/" + entryName + g_extension;
+}
+
+void DiskCache::addEntry( const std::string &entryName, size_t cost )
+{
+	Entry &entry = m_entries[entryName];
+	entry.cost = cost;
+	entry.lruPosition = m_lruList.insert( m_lruList.end(), entryName );
+	m_currentCost += cost;
+}
+
+void DiskCache::removeEntry( const std::string &entryName )
+{
+	EntryMap::iterator it = m_entries.find( entryName );
+	if( it == m_entries.end() )
+	{
+		return;
+	}
+	m_currentCost -= it->second.cost;
+	m_lruList.erase( it->second.lruPosition );
+	m_entries.erase( it );
+}
+
+void DiskCache::limitCost()
+{
+	while( m_currentCost > m_maxCost && m_lruList.size() )
+	{
+		const std::string entryName = m_lruList.front();
+		std::remove( fileName( m_directory, entryName ).c_str() );
+		removeEntry( entryName );
+	}
+}
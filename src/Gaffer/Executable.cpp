@@ -109,6 +109,15 @@ Executable::~Executable()
 {
 }
 
+void Executable::executionOutputs( const Context *context, std::vector<std::string> &fileNames ) const
+{
+}
+
+bool Executable::executionIsThreadSafe() const
+{
+	return false;
+}
+
 /*
  * Static functions
  */
@@ -34,7 +34,12 @@
 //  
 //////////////////////////////////////////////////////////////////////////
 
+#include "tbb/parallel_for.h"
+#include "tbb/blocked_range.h"
+
 #include "IECore/Op.h"
+#include "IECore/CompoundObject.h"
+#include "IECore/CompoundParameter.h"
 #include "IECore/MurmurHash.h"
 #include "Gaffer/Context.h"
 #include "Gaffer/ExecutableOpHolder.h"
@@ -107,14 +112,62 @@ IECore::MurmurHash ExecutableOpHolder::executionHash( const Context *context ) c
 	return h;
 }
 
+namespace
+{
+
+class OperateTask
+{
+
+	public :
+
+		OperateTask( Op *op, const Executable::Contexts &contexts, const std::vector<CompoundObjectPtr> &operands )
+			:	m_op( op ), m_contexts( contexts ), m_operands( operands )
+		{
+		}
+
+		void operator()( const tbb::blocked_range<size_t> &r ) const
+		{
+			for( size_t i=r.begin(); i!=r.end(); ++i )
+			{
+				Context::Scope scope( m_contexts[i].get() );
+				m_op->operate( m_operands[i].get() );
+			}
+		}
+
+	private :
+
+		Op *m_op;
+		const Executable::Contexts &m_contexts;
+		const std::vector<CompoundObjectPtr> &m_operands;
+
+};
+
+} // namespace
+
 void ExecutableOpHolder::execute( const Contexts &contexts ) const
 {
-	for ( Contexts::const_iterator cit = contexts.begin(); cit != contexts.end(); cit++ )
+	Op *op = constPointerCast<Op>( getOp() ).get();
+	CompoundParameterHandler *handler = constPointerCast<CompoundParameterHandler>( parameterHandler() ).get();
+
+	// We compute a private copy of the values for each context, and pass them
+	// explicitly to operate(), so that the operations can run in parallel. This
+	// also means that ops which modify their inputs in place can't modify the op's
+	// parameters, which the handler assumes hold the values it last transferred.
+	// The op's parameters are only used by handlers which can't compute values
+	// directly, in which case they must be set serially.
+	std::vector<CompoundObjectPtr> operands;
+	operands.reserve( contexts.size() );
+	for( Contexts::const_iterator cit = contexts.begin(); cit != contexts.end(); cit++ )
 	{
-		// \todo Implement a way to get the CompoundObject for a given context without modifying the Op's parameter
-		// and passing it explicitly in the operate call. Than multi-thread this loop.
-		Context::Scope scope( *cit );
-		constPointerCast<CompoundParameterHandler>( parameterHandler() )->setParameterValue();
-		constPointerCast<Op>( getOp() )->operate();
+		Context::Scope scope( cit->get() );
+		CompoundObjectPtr contextOperands = runTimeCast<CompoundObject>( handler->computeParameterValue() );
+		if( !contextOperands )
+		{
+			handler->setParameterValue();
+			contextOperands = staticPointerCast<CompoundObject>( op->parameters()->getValue()->copy() );
+		}
+		operands.push_back( contextOperands );
 	}
+
+	tbb::parallel_for( tbb::blocked_range<size_t>( 0, contexts.size(), 1 ), OperateTask( op, contexts, operands ) );
 }
@@ -36,11 +36,13 @@
 //////////////////////////////////////////////////////////////////////////
 
 #include <set>
+#include <map>
 
 #include "boost/format.hpp"
 #include "boost/bind.hpp"
-#include "boost/regex.hpp"
 #include "boost/lexical_cast.hpp"
+#include "boost/unordered_map.hpp"
+#include "boost/functional/hash.hpp"
 
 #include "IECore/Exception.h"
 
@@ -53,8 +55,93 @@ using namespace std;
 
 IE_CORE_DEFINERUNTIMETYPED( GraphComponent );
 
+//////////////////////////////////////////////////////////////////////////
+// Naming utilities
+//////////////////////////////////////////////////////////////////////////
+
+namespace
+{
+
+bool validName( const std::string &name )
+{
+	if( name.empty() )
+	{
+		return false;
+	}
+	
+	for( size_t i = 0, e = name.size(); i < e; ++i )
+	{
+		const char c = name[i];
+		if( ( c >= 'A' && c <= 'Z' ) || ( c >= 'a' && c <= 'z' ) || c == '_' )
+		{
+			continue;
+		}
+		if( i > 0 && c >= '0' && c <= '9' )
+		{
+			continue;
+		}
+		return false;
+	}
+	
+	return true;
+}
+
+// Splits a name into a prefix and a numeric suffix. If there is no suffix
+// then false is returned and suffix is set to 0.
+bool splitName( const std::string &name, std::string &prefix, long &suffix )
+{
+	size_t i = name.size();
+	while( i > 0 && name[i-1] >= '0' && name[i-1] <= '9' )
+	{
+		i--;
+	}
+	
+	prefix = name.substr( 0, i );
+	if( i == name.size() )
+	{
+		suffix = 0;
+		return false;
+	}
+	
+	suffix = strtol( name.c_str() + i, 0, 10 );
+	return true;
+}
+
+} // namespace
+
+//////////////////////////////////////////////////////////////////////////
+// ChildIndex
+//////////////////////////////////////////////////////////////////////////
+
+struct GraphComponent::ChildIndex
+{
+
+	// Equal InternedStrings share storage, so we
+	// can hash them by address.
+	struct NameHash
+	{
+		size_t operator()( const InternedString &name ) const
+		{
+			return boost::hash<const char *>()( name.c_str() );
+		}
+	};
+
+	typedef boost::unordered_map<InternedString, GraphComponent *, NameHash> NameMap;
+	// The numeric suffixes in use by the children, grouped by
+	// prefix. A name without a suffix is represented as 0.
+	typedef std::map<std::string, std::multiset<long> > SuffixMap;
+	
+	NameMap names;
+	SuffixMap suffixes;
+
+};
+
+//////////////////////////////////////////////////////////////////////////
+// GraphComponent implementation
+//////////////////////////////////////////////////////////////////////////
+
 GraphComponent::GraphComponent( const std::string &name )
-	: m_name( name ), m_parent( 0 )
+	: m_name( name ), m_parent( 0 ), m_childIndex( 0 )
 {
 }
 
@@ -68,14 +155,15 @@ GraphComponent::~GraphComponent()
 		(*it)->m_parent = 0;
 		(*it)->parentChanging( 0 );
 		(*it)->parentChangedSignal()( (*it).get(), 0 );
-	}	
+	}
+	
+	delete m_childIndex;
 }
 
 const IECore::InternedString &GraphComponent::setName( const IECore::InternedString &name )
 {
 	// make sure the name is valid
-	static boost::regex validator( "^[A-Za-z_]+[A-Za-z_0-9]*" );
-	if( !regex_match( name.c_str(), validator ) )
+	if( !validName( name.string() ) )
 	{
 		std::string what = boost::str( boost::format( "Invalid name \"%s\"" ) % name.string() );
 		throw IECore::Exception( what );
@@ -85,51 +173,39 @@ const IECore::InternedString &GraphComponent::setName( const IECore::InternedStr
 	IECore::InternedString newName = name;
 	if( m_parent )
 	{
-		bool uniqueAlready = true;
-		for( ChildContainer::const_iterator it=m_parent->m_children.begin(), eIt=m_parent->m_children.end(); it != eIt; it++ )
-		{
-			if( *it != this && (*it)->m_name == m_name )
-			{
-				uniqueAlready = false;
-				break;
-			}
-		}
-	
-		if( !uniqueAlready )
+		const GraphComponent *existingChild = m_parent->getChildInternal( newName );
+		if( existingChild && existingChild != this )
 		{
 			// split name into a prefix and a numeric suffix. if no suffix
 			// exists then it defaults to 1.
-			std::string prefix = newName.value();
-			int suffix = 1;
-
-			static boost::regex g_prefixSuffixRegex( "^(.*[^0-9]+)([0-9]+)$" );
-			boost::cmatch match;
-			if( regex_match( newName.value().c_str(), match, g_prefixSuffixRegex ) )
+			std::string prefix;
+			long suffix;
+			if( !splitName( newName.value(), prefix, suffix ) )
 			{
-				prefix = match[1];
-				suffix = boost::lexical_cast<int>( match[2] );
+				suffix = 1;
 			}
-
-			// iterate over all the siblings to find the minimum value for the suffix which
-			// will be greater than any existing suffix.
-			for( ChildContainer::const_iterator it=m_parent->m_children.begin(), eIt=m_parent->m_children.end(); it != eIt; it++ )
+			
+			// find the minimum value for the suffix which will be greater
+			// than any existing suffix. we're about to be renamed, so our
+			// own current suffix mustn't be taken into account.
+			const bool indexed = m_parent->isIndexed( this );
+			if( indexed )
+			{
+				m_parent->unindexChild( this );
+			}
+			
+			ChildIndex::SuffixMap::const_iterator it = m_parent->m_childIndex->suffixes.find( prefix );
+			if( it != m_parent->m_childIndex->suffixes.end() && it->second.size() )
+			{
+				suffix = max( suffix, *(it->second.rbegin()) + 1 );
+			}
+			
+			if( indexed )
 			{
-				if( *it == this )
-				{
-					continue;
-				}
-				if( (*it)->m_name.value().compare( 0, prefix.size(), prefix ) == 0 )
-				{
-					char *endPtr = 0;
-					long siblingSuffix = strtol( (*it)->m_name.value().c_str() + prefix.size(), &endPtr, 10 );
-					if( *endPtr == '\0' )
-					{
-						suffix = max( suffix, (int)siblingSuffix + 1 );
-					}
-				}
+				m_parent->indexChild( this );
 			}
-			static boost::format formatter( "%s%d" );
-			newName = boost::str( formatter % prefix % suffix );
+			
+			newName = prefix + boost::lexical_cast<std::string>( suffix );
 		}
 	}
 	
@@ -150,7 +226,15 @@ const IECore::InternedString &GraphComponent::setName( const IECore::InternedStr
 
 void GraphComponent::setNameInternal( const IECore::InternedString &name )
 {
+	if( m_parent )
+	{
+		m_parent->unindexChild( this );
+	}
 	m_name = name;
+	if( m_parent )
+	{
+		m_parent->indexChild( this );
+	}
 	nameChangedSignal()( this );
 }
 
@@ -295,6 +379,7 @@ void GraphComponent::addChildInternal( GraphComponentPtr child )
 	m_children.push_back( child );
 	child->m_parent = this;
 	child->setName( child->m_name.value() ); // to force uniqueness
+	indexChild( child.get() ); // in case setName() didn't need to rename
 	childAddedSignal()( this, child.get() );
 	child->parentChangedSignal()( child.get(), previousParent );
 }
@@ -331,6 +416,7 @@ void GraphComponent::removeChildInternal( GraphComponentPtr child, bool emitPare
 	{
 		child->parentChanging( 0 );
 	}
+	unindexChild( child.get() );
 	m_children.erase( std::find( m_children.begin(), m_children.end(), child ) );
 	child->m_parent = 0;
 	childRemovedSignal()( this, child.get() );
@@ -345,6 +431,69 @@ const GraphComponent::ChildContainer &GraphComponent::children() const
 	return m_children;
 }
 
+void GraphComponent::indexChild( GraphComponent *child )
+{
+	if( !m_childIndex )
+	{
+		m_childIndex = new ChildIndex;
+	}
+	
+	GraphComponent *&indexed = m_childIndex->names[child->m_name];
+	if( indexed == child )
+	{
+		return;
+	}
+	indexed = child;
+	
+	std::string prefix;
+	long suffix;
+	splitName( child->m_name.value(), prefix, suffix );
+	m_childIndex->suffixes[prefix].insert( suffix );
+}
+
+void GraphComponent::unindexChild( GraphComponent *child )
+{
+	if( !isIndexed( child ) )
+	{
+		return;
+	}
+	
+	m_childIndex->names.erase( child->m_name );
+	
+	std::string prefix;
+	long suffix;
+	splitName( child->m_name.value(), prefix, suffix );
+	ChildIndex::SuffixMap::iterator it = m_childIndex->suffixes.find( prefix );
+	if( it != m_childIndex->suffixes.end() )
+	{
+		std::multiset<long>::iterator sIt = it->second.find( suffix );
+		if( sIt != it->second.end() )
+		{
+			it->second.erase( sIt );
+		}
+		if( it->second.empty() )
+		{
+			m_childIndex->suffixes.erase( it );
+		}
+	}
+}
+
+bool GraphComponent::isIndexed( const GraphComponent *child ) const
+{
+	return getChildInternal( child->m_name ) == child;
+}
+
+const GraphComponent *GraphComponent::getChildInternal( const IECore::InternedString &name ) const
+{
+	if( !m_childIndex )
+	{
+		return 0;
+	}
+	
+	ChildIndex::NameMap::const_iterator it = m_childIndex->names.find( name );
+	return it != m_childIndex->names.end() ? it->second : 0;
+}
+
 GraphComponent *GraphComponent::ancestor( IECore::TypeId type )
 {
 	GraphComponent *a = m_parent;
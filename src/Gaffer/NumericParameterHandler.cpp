@@ -103,13 +103,26 @@ Gaffer::ConstPlugPtr NumericParameterHandler<T>::plug() const
 template<typename T>
 void NumericParameterHandler<T>::setParameterValue()
 {
+	IECore::MurmurHash h;
+	if( !plugValueChanged( m_plug.get(), h ) )
+	{
+		return;
+	}
 	m_parameter->setNumericValue( m_plug->getValue() );
+	setParameterValueHash( h );
 }
 
 template<typename T>
 void NumericParameterHandler<T>::setPlugValue()
 {
 	m_plug->setValue( m_parameter->getNumericValue() );
+	setParameterValueHash( IECore::MurmurHash() );
+}
+
+template<typename T>
+IECore::ObjectPtr NumericParameterHandler<T>::computeParameterValue() const
+{
+	return new typename ParameterType::ObjectType( m_plug->getValue() );
 }
 		
 // explicit instantiations
@@ -92,12 +92,25 @@ Gaffer::ConstPlugPtr ObjectParameterHandler::plug() const
 		
 void ObjectParameterHandler::setParameterValue()
 {
+	IECore::MurmurHash h;
+	if( !plugValueChanged( m_plug.get(), h ) )
+	{
+		return;
+	}
+
 	IECore::ConstObjectPtr o = m_plug->getValue();	
 	m_parameter->setValue( o->copy() );
+	setParameterValueHash( h );
 }
 
 void ObjectParameterHandler::setPlugValue()
 {
 	m_plug->setValue( m_parameter->getValue() );
+	setParameterValueHash( IECore::MurmurHash() );
+}
+
+IECore::ObjectPtr ObjectParameterHandler::computeParameterValue() const
+{
+	return m_plug->getValue()->copy();
 }
 
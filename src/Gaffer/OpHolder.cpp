@@ -35,6 +35,8 @@
 //////////////////////////////////////////////////////////////////////////
 
 #include "IECore/Op.h"
+#include "IECore/CompoundObject.h"
+#include "IECore/CompoundParameter.h"
 #include "IECore/MurmurHash.h"
 
 #include "Gaffer/OpHolder.h"
@@ -126,9 +128,31 @@ void OpHolder::compute( ValuePlug *output, const Context *context ) const
 {
 	if( output->getName()=="result" )
 	{	
-		constPointerCast<CompoundParameterHandler>( parameterHandler() )->setParameterValue();
-		constPointerCast<Op>( getOp() )->operate();
-		m_resultParameterHandler->setPlugValue();
+		Op *op = constPointerCast<Op>( getOp() ).get();
+		
+		// The values are computed from the plugs without holding the lock,
+		// because computing them may cause TBB to schedule another compute
+		// on this thread while we wait for the upstream results, and that
+		// compute would then deadlock trying to acquire the lock itself.
+		CompoundObjectPtr operands = runTimeCast<CompoundObject>( parameterHandler()->computeParameterValue() );
+		if( !operands )
+		{
+			// A handler which doesn't support computeParameterValue() leaves us no
+			// choice but to transfer the values via the shared parameters.
+			tbb::mutex::scoped_lock lock( m_parametersMutex );
+			constPointerCast<CompoundParameterHandler>( parameterHandler() )->setParameterValue();
+			operands = staticPointerCast<CompoundObject>( op->parameters()->getValue()->copy() );
+		}
+		
+		ObjectPtr result = op->operate( operands.get() );
+		
+		{
+			// transferring the result doesn't compute anything,
+			// so it's safe to hold the lock while we do it.
+			tbb::mutex::scoped_lock lock( m_parametersMutex );
+			op->resultParameter()->setValue( result );
+			m_resultParameterHandler->setPlugValue();
+		}
 		return;
 	}
 	
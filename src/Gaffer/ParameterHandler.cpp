@@ -39,11 +39,14 @@
 
 #include "Gaffer/ParameterHandler.h"
 #include "Gaffer/GraphComponent.h"
+#include "Gaffer/Context.h"
+#include "Gaffer/ValuePlug.h"
 
 using namespace Gaffer;
 using namespace IECore;
 
 ParameterHandler::ParameterHandler()
+	:	m_parameterValueDirtyCount( 0 ), m_pendingDirtyCount( 0 )
 {
 }
 
@@ -51,6 +54,52 @@ ParameterHandler::~ParameterHandler()
 {
 }
 
+IECore::ObjectPtr ParameterHandler::computeParameterValue() const
+{
+	return 0;
+}
+
+bool ParameterHandler::plugValueChanged( const ValuePlug *plug, IECore::MurmurHash &hash )
+{
+	// The dirty count changes whenever the plug or anything upstream of it is
+	// dirtied, so if neither it nor the context has changed since the last
+	// transfer, we know the value is the same without computing a hash.
+	m_pendingDirtyCount = plug->dirtyCount();
+	m_pendingContextHash = Context::current()->hash();
+	if( m_pendingDirtyCount == m_parameterValueDirtyCount && m_pendingContextHash == m_parameterValueContextHash )
+	{
+		return false;
+	}
+
+	// Otherwise the hash tells us whether the value really changed - it may
+	// not have, if the context changed only in ways the plug doesn't use.
+	hash = plug->hash();
+	if( hash == m_parameterValueHash )
+	{
+		m_parameterValueDirtyCount = m_pendingDirtyCount;
+		m_parameterValueContextHash = m_pendingContextHash;
+		return false;
+	}
+
+	return true;
+}
+
+void ParameterHandler::setParameterValueHash( const IECore::MurmurHash &hash )
+{
+	m_parameterValueHash = hash;
+	if( hash == IECore::MurmurHash() )
+	{
+		// dirty counts are never 0, so this can't match in plugValueChanged().
+		m_parameterValueDirtyCount = 0;
+		m_parameterValueContextHash = IECore::MurmurHash();
+	}
+	else
+	{
+		m_parameterValueDirtyCount = m_pendingDirtyCount;
+		m_parameterValueContextHash = m_pendingContextHash;
+	}
+}
+
 void ParameterHandler::setupPlugFlags( Plug *plug )
 {
 	plug->setFlags( Plug::Dynamic, true );
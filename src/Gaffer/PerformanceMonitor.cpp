@@ -0,0 +1,289 @@
+//////////////////////////////////////////////////////////////////////////
+//  
+//  Copyright (c) 2013, Image Engine Design Inc. All rights reserved.
+//  
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//  
+//      * Redistributions of source code must retain the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer.
+//  
+//      * Redistributions in binary form must reproduce the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer in the documentation and/or other materials provided with
+//        the distribution.
+//  
+//      * Neither the name of John Haddon nor the names of
+//        any other contributors to this software may be used to endorse or
+//        promote products derived from this software without specific prior
+//        written permission.
+//  
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//  
+//////////////////////////////////////////////////////////////////////////
+
+
+#include <sys/time.h>
+#include <sys/resource.h>
+
+#ifdef __APPLE__
+#include <mach/mach.h>
+#endif
+
+#include "Gaffer/PerformanceMonitor.h"
+
+using namespace Gaffer;
+
+//////////////////////////////////////////////////////////////////////////
+// Internal utilities
+//////////////////////////////////////////////////////////////////////////
+
+namespace
+{
+
+// Returns the CPU time used by the calling thread, in seconds.
+double threadCPUTime()
+{
+#ifdef __APPLE__
+	mach_port_t thread = mach_thread_self();
+	thread_basic_info_data_t info;
+	mach_msg_type_number_t count = THREAD_BASIC_INFO_COUNT;
+	kern_return_t status = thread_info( thread, THREAD_BASIC_INFO, (thread_info_t)&info, &count );
+	mach_port_deallocate( mach_task_self(), thread );
+	if( status != KERN_SUCCESS )
+	{
+		return 0.0;
+	}
+	return
+		info.user_time.seconds + info.user_time.microseconds * 1e-6 +
+		info.system_time.seconds + info.system_time.microseconds * 1e-6;
+#else
+	rusage usage;
+	if( getrusage( RUSAGE_THREAD, &usage ) != 0 )
+	{
+		return 0.0;
+	}
+	return
+		usage.ru_utime.tv_sec + usage.ru_utime.tv_usec * 1e-6 +
+		usage.ru_stime.tv_sec + usage.ru_stime.tv_usec * 1e-6;
+#endif
+}
+
+} // namespace
+
+//////////////////////////////////////////////////////////////////////////
+// Statistics
+//////////////////////////////////////////////////////////////////////////
+
+PerformanceMonitor::Statistics::Statistics()
+	:	hashCount( 0 ), computeCount( 0 ), cacheHitCount( 0 ),
+		hashWallTime( 0 ), hashCPUTime( 0 ), computeWallTime( 0 ), computeCPUTime( 0 )
+{
+}
+
+PerformanceMonitor::Statistics &PerformanceMonitor::Statistics::operator += ( const Statistics &rhs )
+{
+	hashCount += rhs.hashCount;
+	computeCount += rhs.computeCount;
+	cacheHitCount += rhs.cacheHitCount;
+	hashWallTime += rhs.hashWallTime;
+	hashCPUTime += rhs.hashCPUTime;
+	computeWallTime += rhs.computeWallTime;
+	computeCPUTime += rhs.computeCPUTime;
+	return *this;
+}
+
+//////////////////////////////////////////////////////////////////////////
+// PerformanceMonitor
+//////////////////////////////////////////////////////////////////////////
+
+PerformanceMonitor::Scopes PerformanceMonitor::g_scopes;
+tbb::atomic<PerformanceMonitor *> PerformanceMonitor::g_activeMonitor;
+tbb::spin_rw_mutex PerformanceMonitor::g_activeMonitorMutex;
+PerformanceMonitor::ThreadMeasurements PerformanceMonitor::g_currentMeasurements( (PerformanceMonitor::Measurement *)0 );
+
+PerformanceMonitor::PerformanceMonitor()
+{
+}
+
+PerformanceMonitor::~PerformanceMonitor()
+{
+}
+
+PerformanceMonitor::StatisticsMap PerformanceMonitor::allStatistics() const
+{
+	StatisticsMap result;
+	for( ThreadStatistics::const_iterator it = m_threadStatistics.begin(), eIt = m_threadStatistics.end(); it != eIt; ++it )
+	{
+		for( StatisticsMap::const_iterator sIt = it->begin(), sEIt = it->end(); sIt != sEIt; ++sIt )
+		{
+			result[sIt->first] += sIt->second;
+		}
+	}
+	return result;
+}
+
+PerformanceMonitor::Statistics PerformanceMonitor::plugStatistics( const ValuePlug *plug ) const
+{
+	Statistics result;
+	for( ThreadStatistics::const_iterator it = m_threadStatistics.begin(), eIt = m_threadStatistics.end(); it != eIt; ++it )
+	{
+		StatisticsMap::const_iterator sIt = it->find( plug );
+		if( sIt != it->end() )
+		{
+			result += sIt->second;
+		}
+	}
+	return result;
+}
+
+PerformanceMonitor::Statistics PerformanceMonitor::combinedStatistics() const
+{
+	Statistics result;
+	for( ThreadStatistics::const_iterator it = m_threadStatistics.begin(), eIt = m_threadStatistics.end(); it != eIt; ++it )
+	{
+		for( StatisticsMap::const_iterator sIt = it->begin(), sEIt = it->end(); sIt != sEIt; ++sIt )
+		{
+			result += sIt->second;
+		}
+	}
+	return result;
+}
+
+void PerformanceMonitor::clear()
+{
+	m_threadStatistics.clear();
+}
+
+PerformanceMonitor::Statistics &PerformanceMonitor::threadStatistics( const ValuePlug *plug )
+{
+	// each thread has its own map of statistics, so
+	// we needn't do any locking here.
+	return m_threadStatistics.local()[plug];
+}
+
+void PerformanceMonitor::recordCacheHit( const ValuePlug *plug )
+{
+	if( PerformanceMonitorPtr monitor = activeMonitor() )
+	{
+		monitor->threadStatistics( plug ).cacheHitCount++;
+	}
+}
+
+PerformanceMonitorPtr PerformanceMonitor::activeMonitor()
+{
+	// avoid locking in the common case of there being no monitor.
+	if( !g_activeMonitor )
+	{
+		return 0;
+	}
+	tbb::spin_rw_mutex::scoped_lock lock( g_activeMonitorMutex, /* write = */ false );
+	return g_activeMonitor;
+}
+
+//////////////////////////////////////////////////////////////////////////
+// Scope
+//////////////////////////////////////////////////////////////////////////
+
+PerformanceMonitor::Scope::Scope( PerformanceMonitorPtr monitor )
+{
+	tbb::spin_rw_mutex::scoped_lock lock( g_activeMonitorMutex, /* write = */ true );
+	g_scopes.push_back( Scopes::value_type( this, monitor ) );
+	g_activeMonitor = monitor.get();
+}
+
+PerformanceMonitor::Scope::~Scope()
+{
+	// we may not be the innermost scope, if scopes on different
+	// threads overlap, so we search for our entry rather than
+	// assuming it is last. the entry holds our reference to the
+	// monitor, so the active monitor must be updated before the
+	// lock is released.
+	PerformanceMonitorPtr monitor;
+	{
+		tbb::spin_rw_mutex::scoped_lock lock( g_activeMonitorMutex, /* write = */ true );
+		for( Scopes::iterator it = g_scopes.end(); it != g_scopes.begin(); )
+		{
+			--it;
+			if( it->first == this )
+			{
+				monitor = it->second;
+				g_scopes.erase( it );
+				break;
+			}
+		}
+		g_activeMonitor = g_scopes.size() ? g_scopes.back().second.get() : 0;
+	}
+	// the monitor is released here, outside the lock, so that
+	// a destructor can't deadlock by calling activeMonitor().
+}
+
+//////////////////////////////////////////////////////////////////////////
+// Measurement
+//////////////////////////////////////////////////////////////////////////
+
+PerformanceMonitor::Measurement::Measurement( const ValuePlug *plug, Type type )
+	:	m_monitor( activeMonitor() )
+{
+	if( !m_monitor )
+	{
+		return;
+	}
+	
+	m_plug = plug;
+	m_type = type;
+	m_childWallTime = m_childCPUTime = 0.0;
+	
+	Measurement *&current = g_currentMeasurements.local();
+	m_parent = current;
+	current = this;
+	
+	m_startCPUTime = threadCPUTime();
+	m_startWallTime = tbb::tick_count::now();
+}
+
+PerformanceMonitor::Measurement::~Measurement()
+{
+	if( !m_monitor )
+	{
+		return;
+	}
+	
+	const double wallTime = ( tbb::tick_count::now() - m_startWallTime ).seconds();
+	const double cpuTime = threadCPUTime() - m_startCPUTime;
+	
+	g_currentMeasurements.local() = m_parent;
+	if( m_parent )
+	{
+		// our time is included in our parent's time, but we don't
+		// want to count it twice, so we tell the parent to subtract it.
+		m_parent->m_childWallTime += wallTime;
+		m_parent->m_childCPUTime += cpuTime;
+	}
+	
+	Statistics &statistics = m_monitor->threadStatistics( m_plug );
+	if( m_type == Hash )
+	{
+		statistics.hashCount++;
+		statistics.hashWallTime += wallTime - m_childWallTime;
+		statistics.hashCPUTime += cpuTime - m_childCPUTime;
+	}
+	else
+	{
+		statistics.computeCount++;
+		statistics.computeWallTime += wallTime - m_childWallTime;
+		statistics.computeCPUTime += cpuTime - m_childCPUTime;
+	}
+}
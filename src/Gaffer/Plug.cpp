@@ -35,18 +35,300 @@
 //  
 //////////////////////////////////////////////////////////////////////////
 
+#include <set>
+#include <map>
+#include <vector>
+#include <algorithm>
+
 #include "Gaffer/Plug.h"
 #include "Gaffer/DependencyNode.h"
 #include "Gaffer/Action.h"
 #include "Gaffer/ScriptNode.h"
+#include "Gaffer/DirtyPropagationScope.h"
+#include "Gaffer/PlugIterator.h"
 
 #include "IECore/Exception.h"
 
+#include "tbb/enumerable_thread_specific.h"
+
 #include "boost/format.hpp"
 #include "boost/bind.hpp"
 
 using namespace Gaffer;
 
+//////////////////////////////////////////////////////////////////////////
+// DirtyPlugs implementation
+//////////////////////////////////////////////////////////////////////////
+
+// Collects the set of plugs which must be dirtied as the result of a change,
+// visiting each plug only once. Without this, graphs with diamond shaped
+// dependencies would dirty the same downstream plugs once for every path
+// leading to them, which grows exponentially with the depth of the graph.
+class Plug::DirtyPlugs
+{
+
+	public :
+	
+		// Adds the plug itself, and all plugs affected by it.
+		void insert( Plug *plug )
+		{
+			if( !m_visited.insert( plug ).second )
+			{
+				return;
+			}
+			m_plugs.push_back( plug );
+			insertDependents( plug );
+		}
+		
+		// As for insertDependents(), but for compound plugs visits
+		// all the leaf level descendants of the plug instead.
+		void insertLeafDependents( Plug *plug )
+		{
+			if( !plug->children().size() )
+			{
+				insertDependents( plug );
+				return;
+			}
+			
+			for( PlugIterator it( plug ); it!=it.end(); it++ )
+			{
+				insertLeafDependents( it->get() );
+			}
+		}
+		
+		// Adds only the plugs affected by the plug, and not the
+		// plug itself.
+		void insertDependents( Plug *plug )
+		{
+			if( plug->children().size() ) /// \todo This would be isInstanceOf( CompoundPlugTypeId ) if it didn't cause crashes somehow
+			{
+				// we only propagate dirtiness along leaf level plugs, because
+				// they are the only plugs which can be the target of the affects(),
+				// and compute() methods.
+				return;
+			}
+		
+			if( plug->direction() == In )
+			{
+				if( const DependencyNode *n = plug->ancestor<DependencyNode>() )
+				{
+					DependencyNode::AffectedPlugsContainer affected;
+					n->affects( plug, affected );
+					for( DependencyNode::AffectedPlugsContainer::const_iterator it=affected.begin(); it!=affected.end(); it++ )
+					{
+						if( ( *it )->isInstanceOf( (IECore::TypeId)Gaffer::CompoundPlugTypeId ) )
+						{
+							// DependencyNode::affects() implementations are only allowed to place leaf plugs in the outputs,
+							// so we helpfully report any mistakes.
+							throw IECore::Exception( "Non-leaf plug " + (*it)->fullName() + " cannot be returned by affects()" );
+						}
+						insert( const_cast<Plug *>( *it ) );
+					}
+				}
+			}
+			
+			for( OutputContainer::const_iterator it=plug->outputs().begin(); it!=plug->outputs().end(); it++ )
+			{
+				insert( *it );
+			}
+		}
+		
+		// Dirties all the collected plugs along with their ancestor plugs, and
+		// then emits plugDirtiedSignal() for each, batched by node. If a
+		// DirtyPropagationScope is active then the plugs are dirtied immediately,
+		// so that caches are never stale, but the signals are deferred until
+		// the scope is closed, and emitted only once per plug.
+		void emit()
+		{
+			std::vector<Batch> batches;
+			makeBatches( batches );
+			dirty( batches );
+			
+			DeferredPlugs &deferred = g_deferredPlugs.local();
+			if( deferred.scopeCount )
+			{
+				for( std::vector<PlugPtr>::const_iterator it = m_plugs.begin(), eIt = m_plugs.end(); it != eIt; ++it )
+				{
+					if( deferred.visited.insert( it->get() ).second )
+					{
+						deferred.plugs.push_back( *it );
+					}
+				}
+				return;
+			}
+			
+			emitSignals( batches );
+		}
+		
+		static void pushScope()
+		{
+			g_deferredPlugs.local().scopeCount++;
+		}
+		
+		static void popScope()
+		{
+			DeferredPlugs &deferred = g_deferredPlugs.local();
+			if( --deferred.scopeCount )
+			{
+				return;
+			}
+			
+			// take ownership of the deferred plugs before emitting, in
+			// case the slots we call make further changes.
+			DirtyPlugs plugs;
+			std::swap( plugs.m_visited, deferred.visited );
+			std::swap( plugs.m_plugs, deferred.plugs );
+			plugs.emit();
+		}
+		
+	private :
+	
+		struct Batch
+		{
+			Batch( Node *n )
+				:	node( n )
+			{
+			}
+			
+			Node *node;
+			std::vector<Plug *> plugs;
+			std::vector<Plug *> ancestors;
+		};
+		
+		// Groups the plugs by node, preserving the order in which
+		// the nodes were first encountered.
+		void makeBatches( std::vector<Batch> &batches ) const
+		{
+			std::map<Node *, size_t> batchIndices;
+			std::set<Plug *> added;
+			for( std::vector<PlugPtr>::const_iterator it = m_plugs.begin(), eIt = m_plugs.end(); it != eIt; ++it )
+			{
+				Node *node = (*it)->node();
+				if( !node )
+				{
+					continue;
+				}
+				
+				std::map<Node *, size_t>::const_iterator bIt = batchIndices.find( node );
+				if( bIt == batchIndices.end() )
+				{
+					bIt = batchIndices.insert( std::make_pair( node, batches.size() ) ).first;
+					batches.push_back( Batch( node ) );
+				}
+				Batch &batch = batches[bIt->second];
+				
+				if( added.insert( it->get() ).second )
+				{
+					batch.plugs.push_back( it->get() );
+				}
+				
+				for( Plug *p = (*it)->parent<Plug>(); p; p = p->parent<Plug>() )
+				{
+					if( added.insert( p ).second )
+					{
+						batch.ancestors.push_back( p );
+					}
+				}
+			}
+			
+			for( std::vector<Batch>::iterator it = batches.begin(), eIt = batches.end(); it != eIt; ++it )
+			{
+				// emit for children before their parents.
+				std::stable_sort( it->ancestors.begin(), it->ancestors.end(), deeper );
+			}
+		}
+		
+		// Dirties everything before emitting any signals, so that
+		// slots which pull on other plugs can never see stale state
+		// belonging to a plug we have yet to reach.
+		static void dirty( const std::vector<Batch> &batches )
+		{
+			for( std::vector<Batch>::const_iterator it = batches.begin(), eIt = batches.end(); it != eIt; ++it )
+			{
+				for( std::vector<Plug *>::const_iterator pIt = it->plugs.begin(), pEIt = it->plugs.end(); pIt != pEIt; ++pIt )
+				{
+					(*pIt)->dirty();
+				}
+				for( std::vector<Plug *>::const_iterator pIt = it->ancestors.begin(), pEIt = it->ancestors.end(); pIt != pEIt; ++pIt )
+				{
+					(*pIt)->dirty();
+				}
+			}
+		}
+		
+		static void emitSignals( const std::vector<Batch> &batches )
+		{
+			for( std::vector<Batch>::const_iterator it = batches.begin(), eIt = batches.end(); it != eIt; ++it )
+			{
+				Node::UnaryPlugSignal &signal = it->node->plugDirtiedSignal();
+				for( std::vector<Plug *>::const_iterator pIt = it->plugs.begin(), pEIt = it->plugs.end(); pIt != pEIt; ++pIt )
+				{
+					signal( *pIt );
+				}
+				for( std::vector<Plug *>::const_iterator pIt = it->ancestors.begin(), pEIt = it->ancestors.end(); pIt != pEIt; ++pIt )
+				{
+					signal( *pIt );
+				}
+			}
+		}
+		
+		static size_t depth( const Plug *plug )
+		{
+			size_t result = 0;
+			while( ( plug = plug->parent<Plug>() ) )
+			{
+				result++;
+			}
+			return result;
+		}
+		
+		static bool deeper( const Plug *a, const Plug *b )
+		{
+			return depth( a ) > depth( b );
+		}
+		
+		// We hold references to the plugs, so that they remain valid
+		// even if they are removed while emission is deferred.
+		std::set<const Plug *> m_visited;
+		std::vector<PlugPtr> m_plugs;
+		
+		struct DeferredPlugs
+		{
+			DeferredPlugs()
+				:	scopeCount( 0 )
+			{
+			}
+			
+			size_t scopeCount;
+			std::set<const Plug *> visited;
+			std::vector<PlugPtr> plugs;
+		};
+		
+		typedef tbb::enumerable_thread_specific<DeferredPlugs> ThreadSpecificDeferredPlugs;
+		static ThreadSpecificDeferredPlugs g_deferredPlugs;
+		
+};
+
+Plug::DirtyPlugs::ThreadSpecificDeferredPlugs Plug::DirtyPlugs::g_deferredPlugs;
+
+//////////////////////////////////////////////////////////////////////////
+// DirtyPropagationScope implementation
+//////////////////////////////////////////////////////////////////////////
+
+DirtyPropagationScope::DirtyPropagationScope()
+{
+	Plug::DirtyPlugs::pushScope();
+}
+
+DirtyPropagationScope::~DirtyPropagationScope()
+{
+	Plug::DirtyPlugs::popScope();
+}
+
+//////////////////////////////////////////////////////////////////////////
+// Plug implementation
+//////////////////////////////////////////////////////////////////////////
+
 IE_CORE_DEFINERUNTIMETYPED( Plug );
 
 Plug::Plug( const std::string &name, Direction direction, unsigned flags )
@@ -203,8 +485,9 @@ void Plug::setInputInternal( PlugPtr input, bool emit )
 		{
 			n->plugInputChangedSignal()( this );
 		}
-		emitDirtiness();
-		propagateDirtiness();
+		DirtyPlugs dirtyPlugs;
+		dirtyPlugs.insert( this );
+		dirtyPlugs.emit();
 	}
 }
 
@@ -227,58 +510,15 @@ PlugPtr Plug::createCounterpart( const std::string &name, Direction direction )
 	return new Plug( name, direction, getFlags() );
 }
 
-void Plug::emitDirtiness( Node *n )
+void Plug::dirty()
 {
-	n = n ? n : ancestor<Node>();
-	if( !n )
-	{
-		return;
-	}
-	
-	Plug *p = this;
-	while( p )
-	{
-		n->plugDirtiedSignal()( p );
-		p = p->parent<Plug>();
-	}
 }
 
 void Plug::propagateDirtiness()
 {
-	if( children().size() ) /// \todo This would be isInstanceOf( CompoundPlugTypeId ) if it didn't cause crashes somehow
-	{
-		// we only propagate dirtiness along leaf level plugs, because
-		// they are the only plugs which can be the target of the affects(),
-		// and compute() methods.
-		return;
-	}
-
-	DependencyNode *n = ancestor<DependencyNode>();
-	if( n )
-	{
-		if( direction()==In )
-		{
-			DependencyNode::AffectedPlugsContainer affected;
-			n->affects( this, affected );
-			for( DependencyNode::AffectedPlugsContainer::const_iterator it=affected.begin(); it!=affected.end(); it++ )
-			{
-				if( ( *it )->isInstanceOf( (IECore::TypeId)Gaffer::CompoundPlugTypeId ) )
-				{
-					// DependencyNode::affects() implementations are only allowed to place leaf plugs in the outputs,
-					// so we helpfully report any mistakes.
-					throw IECore::Exception( "Non-leaf plug " + (*it)->fullName() + " cannot be returned by affects()" );
-				}
-				const_cast<Plug *>( *it )->emitDirtiness( n );
-				const_cast<Plug *>( *it )->propagateDirtiness();
-			}
-		}
-	}
-	
-	for( OutputContainer::const_iterator it=outputs().begin(); it!=outputs().end(); it++ )
-	{
-		(*it)->emitDirtiness();
-		(*it)->propagateDirtiness();
-	}
+	DirtyPlugs dirtyPlugs;
+	dirtyPlugs.insertLeafDependents( this );
+	dirtyPlugs.emit();
 }
 
 void Plug::parentChanging( Gaffer::GraphComponent *newParent )
@@ -293,5 +533,18 @@ void Plug::parentChanging( Gaffer::GraphComponent *newParent )
 		removeOutputs();
 	}
 
+	// if we're being removed from a compound plug then the value of
+	// the compound changes, so anything computed from it must be dirtied.
+	// this must also be done while we're still parented, so that
+	// DependencyNode::affects() can find us.
+	if( newParent != parent<GraphComponent>() && parent<Plug>() )
+	{
+		const Node *n = node();
+		if( n && n->refCount() )
+		{
+			propagateDirtiness();
+		}
+	}
+
 }
 
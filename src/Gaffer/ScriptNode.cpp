@@ -49,6 +49,7 @@
 #include "Gaffer/CompoundPlug.h"
 #include "Gaffer/StandardSet.h"
 #include "Gaffer/DependencyNode.h"
+#include "Gaffer/DirtyPropagationScope.h"
 
 using namespace Gaffer;
 
@@ -64,7 +65,7 @@ IE_CORE_DEFINERUNTIMETYPED( ScriptNode );
 size_t ScriptNode::g_firstPlugIndex = 0;
 
 ScriptNode::ScriptNode( const std::string &name )
-	:	Node( name ), m_selection( new StandardSet ), m_undoIterator( m_undoList.end() ), m_context( new Context )
+	:	Node( name ), m_selection( new StandardSet ), m_undoIterator( m_undoList.end() ), m_undoMemoryLimit( 0 ), m_undoMemoryUsage( 0 ), m_executionDepth( 0 ), m_context( new Context )
 {
 	storeIndexOfNextChild( g_firstPlugIndex );
 
@@ -135,6 +136,7 @@ void ScriptNode::undo()
 		throw IECore::Exception( "Nothing to undo" );
 	}
 	m_undoIterator--;
+	m_lastMergeGroup = "";
 	for( ActionVector::reverse_iterator it=(*m_undoIterator)->rbegin(); it!=(*m_undoIterator)->rend(); it++ )
 	{
 		(*it)->undoAction();
@@ -157,6 +159,7 @@ void ScriptNode::redo()
 	{
 		throw IECore::Exception( "Nothing to redo" );
 	}
+	m_lastMergeGroup = "";
 	for( ActionVector::iterator it=(*m_undoIterator)->begin(); it!=(*m_undoIterator)->end(); it++ )
 	{
 		(*it)->doAction();
@@ -174,6 +177,117 @@ ScriptNode::ActionSignal &ScriptNode::actionSignal()
 	return m_actionSignal;
 }
 
+void ScriptNode::setUndoMemoryLimit( size_t bytes )
+{
+	m_undoMemoryLimit = bytes;
+	limitUndoMemory();
+}
+
+size_t ScriptNode::getUndoMemoryLimit() const
+{
+	return m_undoMemoryLimit;
+}
+
+size_t ScriptNode::undoMemoryUsage() const
+{
+	return m_undoMemoryUsage;
+}
+
+void ScriptNode::addAction( ActionPtr action )
+{
+	if( m_actionAccumulator->size() && m_actionAccumulator->back()->canMerge( action.get() ) )
+	{
+		m_actionAccumulator->back()->merge( action.get() );
+	}
+	else
+	{
+		m_actionAccumulator->push_back( action );
+	}
+	
+	{
+		UndoContext undoDisabled( this, UndoContext::Disabled );
+		unsavedChangesPlug()->setValue( true );
+	}
+	actionSignal()( this, action.get(), Action::Do );
+}
+
+void ScriptNode::commitActions( const std::string &mergeGroup )
+{
+	ActionVectorPtr actions = m_actionAccumulator;
+	m_actionAccumulator = ActionVectorPtr();
+	if( !actions->size() )
+	{
+		return;
+	}
+	
+	// new actions invalidate anything which could have been redone
+	for( UndoIterator it = m_undoIterator; it != m_undoList.end(); ++it )
+	{
+		m_undoMemoryUsage -= actionsMemoryUsage( **it );
+	}
+	m_undoList.erase( m_undoIterator, m_undoList.end() );
+	
+	if( mergeGroup.size() && mergeGroup == m_lastMergeGroup && !m_undoList.empty() )
+	{
+		// merge with the previous entry, so that a series of edits
+		// made in a single interaction can be undone in one go.
+		ActionVector &previous = *m_undoList.back();
+		m_undoMemoryUsage -= actionsMemoryUsage( previous );
+		for( ActionVector::const_iterator it = actions->begin(), eIt = actions->end(); it != eIt; ++it )
+		{
+			if( previous.size() && previous.back()->canMerge( it->get() ) )
+			{
+				previous.back()->merge( it->get() );
+			}
+			else
+			{
+				previous.push_back( *it );
+			}
+		}
+		m_undoMemoryUsage += actionsMemoryUsage( previous );
+	}
+	else
+	{
+		m_undoList.push_back( actions );
+		m_undoMemoryUsage += actionsMemoryUsage( *actions );
+	}
+	
+	m_undoIterator = m_undoList.end();
+	m_lastMergeGroup = mergeGroup;
+	
+	limitUndoMemory();
+}
+
+void ScriptNode::limitUndoMemory()
+{
+	if( !m_undoMemoryLimit )
+	{
+		return;
+	}
+	
+	// discard the oldest entries first, but never the most recent one,
+	// and never one which is waiting to be redone.
+	while(
+		m_undoMemoryUsage > m_undoMemoryLimit &&
+		m_undoList.front() != m_undoList.back() &&
+		m_undoIterator != m_undoList.begin()
+	)
+	{
+		m_undoMemoryUsage -= actionsMemoryUsage( *m_undoList.front() );
+		m_undoList.pop_front();
+	}
+}
+
+size_t ScriptNode::actionsMemoryUsage( const ActionVector &actions )
+{
+	size_t result = 0;
+	for( ActionVector::const_iterator it = actions.begin(), eIt = actions.end(); it != eIt; ++it )
+	{
+		result += (*it)->memoryUsage();
+	}
+	return result;
+}
+
 void ScriptNode::copy( const Node *parent, const Set *filter )
 {
 	ApplicationRoot *app = applicationRoot();
@@ -322,6 +436,34 @@ ScriptNode::ScriptEvaluatedSignal &ScriptNode::scriptEvaluatedSignal()
 	return m_scriptEvaluatedSignal;
 }
 
+bool ScriptNode::isExecuting() const
+{
+	return m_executionDepth;
+}
+
+ScriptNode::UnarySignal &ScriptNode::executionFinishedSignal()
+{
+	return m_executionFinishedSignal;
+}
+
+ScriptNode::ExecutionScope::ExecutionScope( ScriptNode *script )
+	:	m_script( script ), m_dirtyPropagationScope( new DirtyPropagationScope )
+{
+	m_script->m_executionDepth++;
+}
+
+ScriptNode::ExecutionScope::~ExecutionScope()
+{
+	m_script->m_executionDepth--;
+	// emit the deferred dirty signals before announcing
+	// that execution is finished.
+	delete m_dirtyPropagationScope;
+	if( !m_script->m_executionDepth )
+	{
+		m_script->executionFinishedSignal()( m_script );
+	}
+}
+
 std::string ScriptNode::serialise( const Node *parent, const Set *filter ) const
 {
 	throw IECore::Exception( "Cannot serialise scripts on a ScriptNode not created in Python." );
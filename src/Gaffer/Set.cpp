@@ -56,4 +56,9 @@ Set::MemberSignal &Set::memberRemovedSignal()
 {
 	return m_memberRemovedSignal;
 }
+
+Set::MembersChangedSignal &Set::membersChangedSignal()
+{
+	return m_membersChangedSignal;
+}
 				
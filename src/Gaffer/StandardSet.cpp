@@ -35,12 +35,39 @@
 //  
 //////////////////////////////////////////////////////////////////////////
 
+#include "boost/unordered_set.hpp"
+
 #include "Gaffer/StandardSet.h"
 
 #include "IECore/Exception.h"
 
 using namespace Gaffer;
 
+namespace
+{
+
+typedef boost::unordered_set<const Set::Member *> MemberPointerSet;
+
+struct InMemberPointerSet
+{
+	InMemberPointerSet( const MemberPointerSet &members )
+		:	m_members( members )
+	{
+	}
+
+	bool operator()( const Set::MemberPtr &member ) const
+	{
+		return m_members.find( member.get() ) != m_members.end();
+	}
+	
+	private :
+	
+		const MemberPointerSet &m_members;
+	
+};
+
+} // namespace
+
 StandardSet::StandardSet()
 {
 }
@@ -65,16 +92,47 @@ bool StandardSet::add( MemberPtr member )
 	if( result )
 	{
 		memberAddedSignal()( this, member );
+		membersChangedSignal()( this );
 	}
 	return result;
 }
 
 size_t StandardSet::add( const Set *other )
 {
-	size_t result = 0;
+	std::vector<MemberPtr> members;
+	members.reserve( other->size() );
 	for( size_t i = 0, e = other->size(); i < e; i++ )
 	{
-		result += add( const_cast<Member *>( other->member( i ) ) );
+		members.push_back( const_cast<Member *>( other->member( i ) ) );
+	}
+	return addMembers( members );
+}
+
+size_t StandardSet::addMembers( const std::vector<MemberPtr> &members )
+{
+	// check everything up front, so that we either add
+	// all the members or none of them.
+	for( std::vector<MemberPtr>::const_iterator it = members.begin(), eIt = members.end(); it != eIt; it++ )
+	{
+		if( !m_memberAcceptanceSignal( this, it->get() ) )
+		{
+			throw IECore::Exception( "Member is not eligible for inclusion in StandardSet." );
+		}
+	}
+	
+	size_t result = 0;
+	for( std::vector<MemberPtr>::const_iterator it = members.begin(), eIt = members.end(); it != eIt; it++ )
+	{
+		if( m_members.insert( *it ).second )
+		{
+			result++;
+			memberAddedSignal()( this, it->get() );
+		}
+	}
+	
+	if( result )
+	{
+		membersChangedSignal()( this );
 	}
 	return result;
 }
@@ -93,6 +151,7 @@ bool StandardSet::remove( Member *member )
 		MemberPtr lifePreserver = member;
 		m_members.erase( it );
 		memberRemovedSignal()( this, member );
+		membersChangedSignal()( this );
 		return true;
 	}
 
@@ -101,20 +160,65 @@ bool StandardSet::remove( Member *member )
 
 size_t StandardSet::remove( const Set *other )
 {
-	size_t result = 0;
+	std::vector<MemberPtr> members;
+	members.reserve( other->size() );
 	for( size_t i = 0, e = other->size(); i < e; i++ )
 	{
-		result += remove( const_cast<Member *>( other->member( i ) ) );
+		members.push_back( const_cast<Member *>( other->member( i ) ) );
 	}
-	return result;
+	return removeMembers( members );
+}
+
+size_t StandardSet::removeMembers( const std::vector<MemberPtr> &members )
+{
+	// find the members we actually need to remove. holding them in
+	// toRemove also keeps them alive until we've emitted the signals
+	// below, in the same way as the lifePreserver in remove().
+	MemberPointerSet toRemovePointers;
+	std::vector<MemberPtr> toRemove;
+	for( std::vector<MemberPtr>::const_iterator it = members.begin(), eIt = members.end(); it != eIt; it++ )
+	{
+		if( contains( it->get() ) && toRemovePointers.insert( it->get() ).second )
+		{
+			toRemove.push_back( *it );
+		}
+	}
+	
+	if( toRemove.empty() )
+	{
+		return 0;
+	}
+	
+	// erasing from the random access index one member at a time would
+	// be quadratic, so instead we remove everything in a single pass.
+	m_members.get<1>().remove_if( InMemberPointerSet( toRemovePointers ) );
+	
+	for( std::vector<MemberPtr>::const_iterator it = toRemove.begin(), eIt = toRemove.end(); it != eIt; it++ )
+	{
+		memberRemovedSignal()( this, it->get() );
+	}
+	membersChangedSignal()( this );
+	
+	return toRemove.size();
 }
 
 void StandardSet::clear()
 {
-	while( m_members.size() )
+	if( m_members.empty() )
+	{
+		return;
+	}
+	
+	// keep the members alive until we've emitted the signals.
+	SequencedIndex &index = m_members.get<1>();
+	std::vector<MemberPtr> removed( index.begin(), index.end() );
+	m_members.clear();
+	
+	for( std::vector<MemberPtr>::const_iterator it = removed.begin(), eIt = removed.end(); it != eIt; it++ )
 	{
-		remove( m_members.begin()->get() );
+		memberRemovedSignal()( this, it->get() );
 	}
+	membersChangedSignal()( this );
 }
 
 bool StandardSet::contains( const Member *object ) const
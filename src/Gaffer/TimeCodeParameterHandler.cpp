@@ -119,6 +119,12 @@ Gaffer::ConstPlugPtr TimeCodeParameterHandler::plug() const
 		
 void TimeCodeParameterHandler::setParameterValue()
 {
+	IECore::MurmurHash h;
+	if( !plugValueChanged( m_plug.get(), h ) )
+	{
+		return;
+	}
+
 	// start with parameter value to preserve information we don't put in plugs
 	Imf::TimeCode tc = m_parameter->getTypedValue();
 	tc.setHours( m_plug->getChild<IntPlug>( "hours" )->getValue() );
@@ -126,6 +132,7 @@ void TimeCodeParameterHandler::setParameterValue()
 	tc.setSeconds( m_plug->getChild<IntPlug>( "seconds" )->getValue() );
 	tc.setFrame( m_plug->getChild<IntPlug>( "frame" )->getValue() );
 	m_parameter->setTypedValue( tc );
+	setParameterValueHash( h );
 }
 
 void TimeCodeParameterHandler::setPlugValue()
@@ -135,4 +142,17 @@ void TimeCodeParameterHandler::setPlugValue()
 	m_plug->getChild<IntPlug>( "minutes" )->setValue( tc.minutes() );
 	m_plug->getChild<IntPlug>( "seconds" )->setValue( tc.seconds() );
 	m_plug->getChild<IntPlug>( "frame" )->setValue( tc.frame() );
+	setParameterValueHash( IECore::MurmurHash() );
+}
+
+IECore::ObjectPtr TimeCodeParameterHandler::computeParameterValue() const
+{
+	// as for setParameterValue(), but starting from the default value, because
+	// the parameter value may be changed by setParameterValue() at any time.
+	Imf::TimeCode tc = m_parameter->typedDefaultValue();
+	tc.setHours( m_plug->getChild<IntPlug>( "hours" )->getValue() );
+	tc.setMinutes( m_plug->getChild<IntPlug>( "minutes" )->getValue() );
+	tc.setSeconds( m_plug->getChild<IntPlug>( "seconds" )->getValue() );
+	tc.setFrame( m_plug->getChild<IntPlug>( "frame" )->getValue() );
+	return new IECore::TimeCodeData( tc );
 }
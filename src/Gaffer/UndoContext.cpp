@@ -42,8 +42,8 @@
 
 using namespace Gaffer;
 
-UndoContext::UndoContext( ScriptNodePtr script, State state )
-	:	m_script( script )
+UndoContext::UndoContext( ScriptNodePtr script, State state, const std::string &mergeGroup )
+	:	m_script( script ), m_mergeGroup( mergeGroup )
 {
 	if( state==Invalid )
 	{
@@ -72,13 +72,7 @@ UndoContext::~UndoContext()
 		}
 		if( m_script->m_undoStateStack.size()==0 )
 		{
-			if( m_script->m_actionAccumulator->size() )
-			{
-				m_script->m_undoList.erase( m_script->m_undoIterator, m_script->m_undoList.end() );
-				m_script->m_undoList.insert( m_script->m_undoList.end(), m_script->m_actionAccumulator );
-				m_script->m_undoIterator = m_script->m_undoList.end();
-			}
-			m_script->m_actionAccumulator = ScriptNode::ActionVectorPtr();
+			m_script->commitActions( m_mergeGroup );
 		}
 	}
 }
@@ -36,18 +36,30 @@
 //////////////////////////////////////////////////////////////////////////
 
 #include <stack>
+#include <map>
 
 #include "tbb/enumerable_thread_specific.h"
+#include "tbb/atomic.h"
+#include "tbb/mutex.h"
+#include "tbb/tbb_thread.h"
+#include "tbb/spin_rw_mutex.h"
+#include "tbb/tick_count.h"
+#include "tbb/parallel_for.h"
+#include "tbb/blocked_range.h"
 
 #include "boost/bind.hpp"
 #include "boost/format.hpp"
 
 #include "IECore/LRUCache.h"
+#include "IECore/SimpleTypedData.h"
 
 #include "Gaffer/ValuePlug.h"
 #include "Gaffer/ComputeNode.h"
 #include "Gaffer/Context.h"
 #include "Gaffer/Action.h"
+#include "Gaffer/PerformanceMonitor.h"
+#include "Gaffer/DiskCache.h"
+#include "Gaffer/ComputeFuture.h"
 
 using namespace Gaffer;
 
@@ -66,7 +78,7 @@ class ValuePlug::Computation
 	public :
 	
 		Computation( const ValuePlug *resultPlug )
-			:	m_resultPlug( resultPlug ), m_resultWritten( false )
+			:	m_resultPlug( resultPlug ), m_resultWritten( false ), m_persistent( false )
 		{
 			g_threadComputations.local().push( this );
 		}
@@ -99,25 +111,21 @@ class ValuePlug::Computation
 				p = p->getInput<ValuePlug>();
 			}
 						
-			// do the cache lookup/computation.						
+			// do the cache lookup/computation.
 			if( cacheable )
 			{
 				IECore::MurmurHash hash = m_resultPlug->hash();
-				if( g_valueCache.cached( hash ) )
+				m_resultValue = cachedValue( hash );
+				if( m_resultValue )
 				{
-					/// \todo This is not threadsafe!
-					/// Can we resolve this by doing the compute in the getter
-					/// or having the getter return 0 for failure?
-					return g_valueCache.get( hash );
-				}
-				else
-				{
-					computeOrSetFromInput();
-					if( m_resultWritten )
-					{
-						g_valueCache.set( hash, m_resultValue, m_resultValue->memoryUsage() );
-					}
+					++g_cacheHits;
+					PerformanceMonitor::recordCacheHit( m_resultPlug );
+					return m_resultValue;
 				}
+				// the value isn't cached, so we must compute it, unless
+				// another thread is already doing so.
+				m_persistent = g_diskCache.enabled() && m_resultPlug->hashIsStableBetweenSessions();
+				computeOrWaitForComputation( hash );
 			}
 			else
 			{
@@ -172,11 +180,265 @@ class ValuePlug::Computation
 		{
 			return g_valueCache.setMaxCost( bytes );
 		}
+		
+		static DiskCache &diskCache()
+		{
+			return g_diskCache;
+		}
+		
+		static IECore::CompoundDataPtr cacheStatistics()
+		{
+			IECore::CompoundDataPtr costByNodeTypeData = new IECore::CompoundData;
+			IECore::CompoundDataPtr costByNodeData = new IECore::CompoundData;
+			costs( g_nodeTypeCosts, g_nodeTypeCostsMutex, costByNodeTypeData->writable() );
+			costs( g_nodeCosts, g_nodeCostsMutex, costByNodeData->writable() );
+			
+			IECore::CompoundDataPtr result = new IECore::CompoundData;
+			result->writable()["hits"] = new IECore::UInt64Data( g_cacheHits );
+			result->writable()["misses"] = new IECore::UInt64Data( g_cacheMisses );
+			result->writable()["evictions"] = new IECore::UInt64Data( g_cacheEvictions );
+			result->writable()["currentCost"] = new IECore::UInt64Data( g_valueCache.currentCost() );
+			result->writable()["maxCost"] = new IECore::UInt64Data( g_valueCache.getMaxCost() );
+			result->writable()["costByNodeType"] = costByNodeTypeData;
+			result->writable()["costByNode"] = costByNodeData;
+			result->writable()["diskHits"] = new IECore::UInt64Data( g_diskCacheHits );
+			result->writable()["diskCurrentCost"] = new IECore::UInt64Data( g_diskCache.currentCost() );
+			result->writable()["diskMaxCost"] = new IECore::UInt64Data( g_diskCache.getMaxCost() );
+			return result;
+		}
+		
+		static void resetCacheStatistics()
+		{
+			g_cacheHits = 0;
+			g_cacheMisses = 0;
+			g_cacheEvictions = 0;
+			g_diskCacheHits = 0;
+		}
 	
 	private :
 	
+		// Records a computation which is currently being performed for a
+		// particular hash, so that other threads requesting the same value
+		// can wait for it to complete rather than duplicating the work.
+		// The mutex is held by the computing thread for the duration
+		// of the computation.
+		//
+		// A thread may own several in-flight computations at once, nested
+		// on its stack, and may also be waiting for a computation owned by
+		// another thread. Blocking is only safe if the owner we'd wait for
+		// isn't itself waiting, directly or via other threads, on something
+		// this thread owns - otherwise neither could proceed. We record
+		// which computation each waiting thread is waiting for, and refuse
+		// to wait where doing so would complete a cycle, computing the value
+		// redundantly instead. See canWait(). Waits made inside TBB algorithms,
+		// such as an owner waiting in parallel_for for a task which this thread
+		// has stolen, aren't recorded - but a cycle through one of those would
+		// require a value which depends on itself, which a valid graph can't
+		// contain.
+		struct InFlightComputation : public IECore::RefCounted
+		{
+			tbb::tbb_thread::id threadId;
+			tbb::mutex mutex;
+		};
+		
+		IE_CORE_DECLAREPTR( InFlightComputation )
+		
+		typedef std::map<IECore::MurmurHash, InFlightComputationPtr> InFlightComputations;
+		typedef std::map<tbb::tbb_thread::id, InFlightComputationPtr> WaitingThreads;
+		
+		// Removes an InFlightComputation from g_inFlightComputations
+		// and unlocks it, on destruction.
+		class InFlightComputationScope
+		{
+		
+			public :
+			
+				InFlightComputationScope( const IECore::MurmurHash &hash, InFlightComputation *inFlightComputation )
+					:	m_hash( hash ), m_inFlightComputation( inFlightComputation )
+				{
+				}
+				
+				~InFlightComputationScope()
+				{
+					{
+						tbb::mutex::scoped_lock lock( g_inFlightComputationsMutex );
+						g_inFlightComputations.erase( m_hash );
+					}
+					m_inFlightComputation->mutex.unlock();
+				}
+				
+			private :
+			
+				IECore::MurmurHash m_hash;
+				InFlightComputationPtr m_inFlightComputation;
+		
+		};
+		
+		// Returns true if the thread may wait for the computation without
+		// risking deadlock. We follow the chain of owners and the computations
+		// they are waiting for - if it leads back to this thread, waiting
+		// would complete a cycle. Because waits are only ever registered when
+		// this returns true, the chain can't itself contain a cycle, and the
+		// walk always terminates. Must be called with g_inFlightComputationsMutex
+		// held.
+		static bool canWait( const InFlightComputation *inFlightComputation, const tbb::tbb_thread::id &threadId )
+		{
+			while( inFlightComputation )
+			{
+				if( inFlightComputation->threadId == threadId )
+				{
+					return false;
+				}
+				WaitingThreads::const_iterator it = g_waitingThreads.find( inFlightComputation->threadId );
+				inFlightComputation = it != g_waitingThreads.end() ? it->second.get() : 0;
+			}
+			return true;
+		}
+		
+		void computeOrWaitForComputation( const IECore::MurmurHash &hash )
+		{
+			const tbb::tbb_thread::id threadId = tbb::this_tbb_thread::get_id();
+			
+			InFlightComputationPtr inFlightComputation;
+			bool owner = false;
+			{
+				tbb::mutex::scoped_lock lock( g_inFlightComputationsMutex );
+				InFlightComputations::const_iterator it = g_inFlightComputations.find( hash );
+				if( it == g_inFlightComputations.end() )
+				{
+					// noone else is computing this value, so we claim
+					// responsibility for it.
+					inFlightComputation = new InFlightComputation;
+					inFlightComputation->threadId = threadId;
+					inFlightComputation->mutex.lock();
+					g_inFlightComputations[hash] = inFlightComputation;
+					owner = true;
+				}
+				else if( canWait( it->second.get(), threadId ) )
+				{
+					// another thread is computing this value, so we'll wait for it.
+					inFlightComputation = it->second;
+					g_waitingThreads[threadId] = inFlightComputation;
+				}
+				// otherwise we are already computing this value further up
+				// the stack on this thread, or the owner is waiting on us.
+				// the former is typical of pass-through computations which
+				// share the hash of their input. in both cases we must just
+				// compute directly - waiting would deadlock.
+			}
+			
+			if( owner )
+			{
+				InFlightComputationScope inFlightComputationScope( hash, inFlightComputation.get() );
+				computeAndStore( hash );
+				return;
+			}
+			
+			if( inFlightComputation )
+			{
+				// wait for the other thread to finish, and then
+				// use the value it stored in the cache.
+				{
+					tbb::mutex::scoped_lock lock( inFlightComputation->mutex );
+				}
+				{
+					tbb::mutex::scoped_lock lock( g_inFlightComputationsMutex );
+					g_waitingThreads.erase( threadId );
+				}
+				m_resultValue = cachedValue( hash );
+				if( m_resultValue )
+				{
+					++g_cacheHits;
+					PerformanceMonitor::recordCacheHit( m_resultPlug );
+					m_resultWritten = true;
+					return;
+				}
+				// the value may not be in the cache if the other computation
+				// failed, if the value was too large to be cached, or if it
+				// has already been evicted. in all cases we fall through and
+				// compute it ourselves.
+			}
+			
+			computeAndStore( hash );
+		}
+		
+		void computeAndStore( const IECore::MurmurHash &hash )
+		{
+			// before computing, see if a previous computation
+			// stored the value on disk. we only use the disk cache
+			// for values whose hashes are stable between sessions,
+			// because otherwise we might load a value written for
+			// a different computation with a coincidentally equal hash.
+			if( m_persistent )
+			{
+				if( IECore::ConstObjectPtr value = g_diskCache.get( hash ) )
+				{
+					++g_diskCacheHits;
+					PerformanceMonitor::recordCacheHit( m_resultPlug );
+					m_resultValue = value;
+					m_resultWritten = true;
+					store( hash );
+					return;
+				}
+			}
+			
+			++g_cacheMisses;
+			const tbb::tick_count startTime = tbb::tick_count::now();
+			computeOrSetFromInput();
+			if( !m_resultWritten )
+			{
+				return;
+			}
+			
+			store( hash );
+			
+			// the disk cache only pays for itself with values which
+			// are slower to compute than to load, so we don't bother
+			// writing values which were quick to compute.
+			if( m_persistent && ( tbb::tick_count::now() - startTime ).seconds() >= g_diskCacheMinimumComputeTime )
+			{
+				g_diskCache.set( hash, m_resultValue.get() );
+			}
+		}
+		
+		// Stores m_resultValue in the in-memory cache.
+		void store( const IECore::MurmurHash &hash )
+		{
+			if( g_valueCache.cached( hash ) )
+			{
+				// another thread computed the same value redundantly
+				// and got there first.
+				return;
+			}
+		
+			const Node *node = m_resultPlug->node();
+			CacheEntryPtr entry = new CacheEntry(
+				m_resultValue,
+				m_resultValue->memoryUsage(),
+				node ? nodeCost( node ) : 0,
+				node ? nodeTypeCost( node ) : 0
+			);
+			g_valueCache.set( hash, entry, entry->cost );
+		}
+		
+		// Returns the value cached for the hash, or 0 if there is none.
+		static IECore::ConstObjectPtr cachedValue( const IECore::MurmurHash &hash )
+		{
+			// the value could be evicted between the call to cached()
+			// and the call to get(), in which case our getter returns
+			// 0 and we treat it as a cache miss.
+			if( !g_valueCache.cached( hash ) )
+			{
+				return 0;
+			}
+			ConstCacheEntryPtr entry = g_valueCache.get( hash );
+			return entry ? entry->value : 0;
+		}
+		
 		void computeOrSetFromInput()
 		{
+			ComputeFuture::checkCancellation();
+			PerformanceMonitor::Measurement measurement( m_resultPlug, PerformanceMonitor::Measurement::Compute );
 			if( const ValuePlug *input = m_resultPlug->getInput<ValuePlug>() )
 			{
 				// cast is ok, because we know that the resulting setValue() call won't
@@ -198,23 +460,385 @@ class ValuePlug::Computation
 		const ValuePlug *m_resultPlug;
 		IECore::ConstObjectPtr m_resultValue;
 		bool m_resultWritten;
+		// true if the result may be loaded from and
+		// stored in the disk cache.
+		bool m_persistent;
 
 		typedef std::stack<Computation *> ComputationStack;
 		typedef tbb::enumerable_thread_specific<ComputationStack> ThreadSpecificComputationStack;
 		static ThreadSpecificComputationStack g_threadComputations;
 		
-		static IECore::ObjectPtr nullGetter( const IECore::MurmurHash &h, size_t &cost )
+		// The memory used by the cached values computed by
+		// a particular node or type of node, for the benefit of
+		// cacheStatistics().
+		struct CacheCost : public IECore::RefCounted
 		{
-			throw IECore::Exception( "Getter not implemented." );
+			CacheCost( const std::string &name )
+				:	name( name )
+			{
+				cost = 0;
+			}
+			
+			const std::string name;
+			tbb::atomic<size_t> cost;
+		};
+		
+		IE_CORE_DECLAREPTR( CacheCost )
+		
+		// The entries stored in g_valueCache. Because only the cache holds
+		// a reference to an entry once it has been stored, the destructor
+		// is run when the cache evicts it, allowing us to keep the
+		// statistics up to date incrementally.
+		struct CacheEntry : public IECore::RefCounted
+		{
+		
+			CacheEntry( IECore::ConstObjectPtr value, size_t cost, CacheCostPtr nodeCost, CacheCostPtr nodeTypeCost )
+				:	value( value ), cost( cost ), nodeCost( nodeCost ), nodeTypeCost( nodeTypeCost )
+			{
+				if( nodeCost )
+				{
+					nodeCost->cost += cost;
+				}
+				if( nodeTypeCost )
+				{
+					nodeTypeCost->cost += cost;
+				}
+			}
+			
+			virtual ~CacheEntry()
+			{
+				if( nodeCost )
+				{
+					nodeCost->cost -= cost;
+				}
+				if( nodeTypeCost )
+				{
+					nodeTypeCost->cost -= cost;
+				}
+				++g_cacheEvictions;
+			}
+			
+			const IECore::ConstObjectPtr value;
+			const size_t cost;
+			const CacheCostPtr nodeCost;
+			const CacheCostPtr nodeTypeCost;
+			
+		};
+		
+		IE_CORE_DECLAREPTR( CacheEntry )
+		
+		static ConstCacheEntryPtr nullGetter( const IECore::MurmurHash &h, size_t &cost )
+		{
+			cost = 0;
+			return 0;
 		}
 		
-		typedef IECore::LRUCache<IECore::MurmurHash, IECore::ConstObjectPtr> ValueCache;
+		typedef IECore::LRUCache<IECore::MurmurHash, ConstCacheEntryPtr> ValueCache;
 		static ValueCache g_valueCache;
 		
+		// The CacheCosts for each node, keyed by pointer. Because a node may
+		// be renamed, or destroyed and another created at the same address,
+		// we also record the name of the node the cost was created for, and
+		// make a fresh CacheCost if it doesn't match.
+		struct NodeCost
+		{
+			IECore::InternedString nodeName;
+			CacheCostPtr cost;
+		};
+		
+		typedef std::map<const Node *, NodeCost> NodeCosts;
+		static NodeCosts g_nodeCosts;
+		static tbb::spin_rw_mutex g_nodeCostsMutex;
+		
+		typedef std::map<IECore::TypeId, CacheCostPtr> NodeTypeCosts;
+		static NodeTypeCosts g_nodeTypeCosts;
+		static tbb::spin_rw_mutex g_nodeTypeCostsMutex;
+		
+		static CacheCostPtr nodeCost( const Node *node )
+		{
+			{
+				tbb::spin_rw_mutex::scoped_lock lock( g_nodeCostsMutex, /* write = */ false );
+				NodeCosts::const_iterator it = g_nodeCosts.find( node );
+				if( it != g_nodeCosts.end() && it->second.nodeName == node->getName() )
+				{
+					return it->second.cost;
+				}
+			}
+			
+			tbb::spin_rw_mutex::scoped_lock lock( g_nodeCostsMutex, /* write = */ true );
+			NodeCost &entry = g_nodeCosts[node];
+			if( !entry.cost || entry.nodeName != node->getName() )
+			{
+				entry.nodeName = node->getName();
+				entry.cost = new CacheCost( node->fullName() );
+			}
+			return entry.cost;
+		}
+		
+		static CacheCostPtr nodeTypeCost( const Node *node )
+		{
+			{
+				tbb::spin_rw_mutex::scoped_lock lock( g_nodeTypeCostsMutex, /* write = */ false );
+				NodeTypeCosts::const_iterator it = g_nodeTypeCosts.find( node->typeId() );
+				if( it != g_nodeTypeCosts.end() )
+				{
+					return it->second;
+				}
+			}
+			
+			tbb::spin_rw_mutex::scoped_lock lock( g_nodeTypeCostsMutex, /* write = */ true );
+			CacheCostPtr &cost = g_nodeTypeCosts[node->typeId()];
+			if( !cost )
+			{
+				cost = new CacheCost( node->typeName() );
+			}
+			return cost;
+		}
+		
+		// Fills result with the non-zero costs from the map, and removes
+		// the entries with zero cost.
+		template<typename Map>
+		static void costs( Map &map, tbb::spin_rw_mutex &mutex, IECore::CompoundDataMap &result )
+		{
+			tbb::spin_rw_mutex::scoped_lock lock( mutex, /* write = */ true );
+			for( typename Map::iterator it = map.begin(); it != map.end(); )
+			{
+				const CacheCost *cacheCost = costPtr( it->second );
+				if( !cacheCost->cost )
+				{
+					map.erase( it++ );
+					continue;
+				}
+				// costs may share a name, for instance if
+				// a node has been deleted and another given
+				// its name, so we accumulate them.
+				IECore::DataPtr &d = result[cacheCost->name];
+				if( d )
+				{
+					static_cast<IECore::UInt64Data *>( d.get() )->writable() += cacheCost->cost;
+				}
+				else
+				{
+					d = new IECore::UInt64Data( cacheCost->cost );
+				}
+				++it;
+			}
+		}
+		
+		static const CacheCost *costPtr( const CacheCostPtr &cost )
+		{
+			return cost.get();
+		}
+		
+		static const CacheCost *costPtr( const NodeCost &nodeCost )
+		{
+			return nodeCost.cost.get();
+		}
+		
+		static InFlightComputations g_inFlightComputations;
+		static tbb::mutex g_inFlightComputationsMutex;
+		static WaitingThreads g_waitingThreads;
+		
+		static tbb::atomic<size_t> g_cacheHits;
+		static tbb::atomic<size_t> g_cacheMisses;
+		static tbb::atomic<size_t> g_cacheEvictions;
+		
+		// Second level cache, for values evicted from
+		// g_valueCache, or computed in previous sessions.
+		static DiskCache g_diskCache;
+		static const double g_diskCacheMinimumComputeTime;
+		static tbb::atomic<size_t> g_diskCacheHits;
+		
 };
 
 ValuePlug::Computation::ThreadSpecificComputationStack ValuePlug::Computation::g_threadComputations;
 ValuePlug::Computation::ValueCache ValuePlug::Computation::g_valueCache( nullGetter, 1024 * 1024 * 500 );
+ValuePlug::Computation::InFlightComputations ValuePlug::Computation::g_inFlightComputations;
+tbb::mutex ValuePlug::Computation::g_inFlightComputationsMutex;
+ValuePlug::Computation::WaitingThreads ValuePlug::Computation::g_waitingThreads;
+ValuePlug::Computation::NodeCosts ValuePlug::Computation::g_nodeCosts;
+tbb::spin_rw_mutex ValuePlug::Computation::g_nodeCostsMutex;
+ValuePlug::Computation::NodeTypeCosts ValuePlug::Computation::g_nodeTypeCosts;
+tbb::spin_rw_mutex ValuePlug::Computation::g_nodeTypeCostsMutex;
+tbb::atomic<size_t> ValuePlug::Computation::g_cacheHits;
+tbb::atomic<size_t> ValuePlug::Computation::g_cacheMisses;
+tbb::atomic<size_t> ValuePlug::Computation::g_cacheEvictions;
+DiskCache ValuePlug::Computation::g_diskCache;
+const double ValuePlug::Computation::g_diskCacheMinimumComputeTime = 0.01;
+tbb::atomic<size_t> ValuePlug::Computation::g_diskCacheHits;
+
+//////////////////////////////////////////////////////////////////////////
+// Hash cache implementation
+// Computing a hash requires a traversal of the entire upstream graph, which
+// can become more expensive than the computation the hash is protecting. We
+// therefore cache hashes per-thread, keyed on the plug, the dirty count of the
+// plug and the hash of the context. Because dirtying a plug assigns it a new
+// dirty count, stale entries are never returned, and are simply discarded
+// when the cache is next cleared.
+//
+// Rather than hash the entire context, we hash only the variables which were
+// read when the hash was last computed for the plug - see Context. This is
+// safe because computing the hash again would necessarily read the same
+// variables, and allows the cached hashes to be shared between frames for
+// static parts of the graph.
+//////////////////////////////////////////////////////////////////////////
+
+namespace
+{
+
+struct HashCacheKey
+{
+
+	HashCacheKey( const ValuePlug *plug, size_t dirtyCount, const IECore::MurmurHash &contextHash )
+		:	plug( plug ), dirtyCount( dirtyCount ), contextHash( contextHash )
+	{
+	}
+
+	bool operator < ( const HashCacheKey &other ) const
+	{
+		if( plug != other.plug )
+		{
+			return plug < other.plug;
+		}
+		if( dirtyCount != other.dirtyCount )
+		{
+			return dirtyCount < other.dirtyCount;
+		}
+		return contextHash < other.contextHash;
+	}
+
+	const ValuePlug *plug;
+	size_t dirtyCount;
+	IECore::MurmurHash contextHash;
+
+};
+
+struct HashCache
+{
+
+	// The context variables a plug's hash was found to depend on,
+	// the last time it was computed. The tracker is a Context::DependencyTracker,
+	// which is private to the ValuePlug class.
+	struct Dependencies
+	{
+		size_t dirtyCount;
+		IECore::ConstRefCountedPtr tracker;
+	};
+
+	typedef std::map<HashCacheKey, IECore::MurmurHash> Hashes;
+	typedef std::map<const ValuePlug *, Dependencies> DependenciesMap;
+	
+	Hashes hashes;
+	DependenciesMap dependencies;
+
+	void clear()
+	{
+		hashes.clear();
+		dependencies.clear();
+	}
+
+};
+
+typedef tbb::enumerable_thread_specific<HashCache> ThreadSpecificHashCache;
+
+ThreadSpecificHashCache g_hashCache;
+// once a per-thread cache reaches this size it is cleared, to
+// discard stale entries and keep memory usage bounded.
+const size_t g_hashCacheSizeLimit = 100000;
+
+tbb::atomic<size_t> g_dirtyCount;
+
+} // namespace
+
+//////////////////////////////////////////////////////////////////////////
+// Parallel evaluation implementation
+//////////////////////////////////////////////////////////////////////////
+
+namespace
+{
+
+// Used by ValuePlug::getValues() to evaluate a plug in
+// many contexts in parallel.
+class ParallelGetValues
+{
+
+	public :
+	
+		typedef IECore::ConstObjectPtr (ValuePlug::*Getter)() const;
+	
+		ParallelGetValues( const ValuePlug *plug, Getter getter, const std::vector<ConstContextPtr> &contexts, std::vector<IECore::ConstObjectPtr> &values )
+			:	m_plug( plug ), m_getter( getter ), m_contexts( contexts ), m_values( values )
+		{
+		}
+		
+		void operator()( const tbb::blocked_range<size_t> &r ) const
+		{
+			for( size_t i = r.begin(); i != r.end(); ++i )
+			{
+				Context::Scope scope( m_contexts[i].get() );
+				m_values[i] = (m_plug->*m_getter)();
+			}
+		}
+		
+	private :
+	
+		const ValuePlug *m_plug;
+		Getter m_getter;
+		const std::vector<ConstContextPtr> &m_contexts;
+		std::vector<IECore::ConstObjectPtr> &m_values;
+
+};
+
+} // namespace
+
+//////////////////////////////////////////////////////////////////////////
+// SetValueAction implementation
+//////////////////////////////////////////////////////////////////////////
+
+/// An Action for setting the value of a plug. Consecutive SetValueActions
+/// on the same plug are merged, so that only the original and final values
+/// are held in the undo history.
+class ValuePlug::SetValueAction : public Action
+{
+
+	public :
+	
+		SetValueAction( ValuePlugPtr plug, IECore::ConstObjectPtr newValue, IECore::ConstObjectPtr oldValue )
+			:	Action(
+					boost::bind( &ValuePlug::setValueInternal, plug, newValue, true ),
+					boost::bind( &ValuePlug::setValueInternal, plug, oldValue, true )
+				),
+				m_plug( plug.get() ), m_newValue( newValue ), m_oldValue( oldValue )
+		{
+		}
+	
+	protected :
+	
+		virtual size_t memoryUsage() const
+		{
+			return sizeof( SetValueAction ) + m_newValue->memoryUsage() + m_oldValue->memoryUsage();
+		}
+		
+		virtual bool canMerge( const Action *other ) const
+		{
+			const SetValueAction *setValueAction = dynamic_cast<const SetValueAction *>( other );
+			return setValueAction && setValueAction->m_plug == m_plug;
+		}
+		
+		virtual void merge( const Action *other )
+		{
+			Action::merge( other );
+			m_newValue = static_cast<const SetValueAction *>( other )->m_newValue;
+		}
+		
+	private :
+	
+		// the plug is kept alive by the bound functions
+		const ValuePlug *m_plug;
+		IECore::ConstObjectPtr m_newValue;
+		IECore::ConstObjectPtr m_oldValue;
+
+};
 
 //////////////////////////////////////////////////////////////////////////
 // ValuePlug implementation
@@ -228,13 +852,13 @@ IE_CORE_DEFINERUNTIMETYPED( ValuePlug );
 /// even creating the values before figuring out if we've already got them somewhere).
 ValuePlug::ValuePlug( const std::string &name, Direction direction,
 	IECore::ConstObjectPtr initialValue, unsigned flags )
-	:	Plug( name, direction, flags ), m_staticValue( initialValue )
+	:	Plug( name, direction, flags ), m_staticValue( initialValue ), m_dirtyCount( ++g_dirtyCount )
 {
 	assert( m_staticValue );
 }
 
 ValuePlug::ValuePlug( const std::string &name, Direction direction, unsigned flags )
-	:	Plug( name, direction, flags ), m_staticValue( 0 )
+	:	Plug( name, direction, flags ), m_staticValue( 0 ), m_dirtyCount( ++g_dirtyCount )
 {
 }
 
@@ -337,23 +961,146 @@ IECore::MurmurHash ValuePlug::hash() const
 			{
 				throw IECore::Exception( boost::str( boost::format( "Unable to compute hash for Plug \"%s\" as it has no ComputeNode." ) % fullName() ) );			
 			}
-			IECore::MurmurHash emptyHash;
-			n->hash( this, Context::current(), h );
-			if( h == emptyHash )
+			
+			const Context *context = Context::current();
+			if( !getFlags( Plug::Cacheable ) )
 			{
-				throw IECore::Exception( boost::str( boost::format( "ComputeNode::hash() not implemented for Plug \"%s\"." ) % fullName() ) );			
+				hashInternal( n, context, h );
+				return h;
 			}
+			
+			HashCache &hashCache = g_hashCache.local();
+			HashCacheKey cacheKey( this, m_dirtyCount, IECore::MurmurHash() );
+			bool previouslyUnstable = false;
+			HashCache::DependenciesMap::const_iterator dIt = hashCache.dependencies.find( this );
+			if( dIt != hashCache.dependencies.end() && dIt->second.dirtyCount == m_dirtyCount )
+			{
+				const Context::DependencyTracker *dependencies = static_cast<const Context::DependencyTracker *>( dIt->second.tracker.get() );
+				previouslyUnstable = dependencies->unstable();
+				cacheKey.contextHash = dependencies->all() ? context->m_hash : context->variablesHash( dependencies->names() );
+				HashCache::Hashes::const_iterator it = hashCache.hashes.find( cacheKey );
+				if( it != hashCache.hashes.end() )
+				{
+					if( context->m_dependencyTracker )
+					{
+						// pass our dependencies on to the downstream hash we're
+						// being called from, just as if we had recomputed.
+						context->m_dependencyTracker->add( dependencies );
+					}
+					return it->second;
+				}
+			}
+			
+			// compute the hash in a copy of the context which records
+			// the variables that are read.
+			Context::DependencyTrackerPtr dependencies = new Context::DependencyTracker;
+			ContextPtr trackingContext = new Context( *context );
+			trackingContext->m_dependencyTracker = dependencies;
+			{
+				Context::Scope scopedContext( trackingContext.get() );
+				hashInternal( n, trackingContext.get(), h );
+			}
+			
+			if( previouslyUnstable )
+			{
+				// the cached hashes for other contexts share our tracker,
+				// and may have been computed via unstable nodes which
+				// weren't visited this time, so instability is sticky.
+				dependencies->addUnstable();
+			}
+			
+			if( context->m_dependencyTracker )
+			{
+				context->m_dependencyTracker->add( dependencies.get() );
+			}
+			
+			if( hashCache.hashes.size() >= g_hashCacheSizeLimit )
+			{
+				hashCache.clear();
+			}
+			
+			HashCache::Dependencies &d = hashCache.dependencies[this];
+			d.dirtyCount = m_dirtyCount;
+			d.tracker = dependencies;
+			
+			cacheKey.contextHash = dependencies->all() ? context->m_hash : context->variablesHash( dependencies->names() );
+			hashCache.hashes[cacheKey] = h;
 		}
 	}
 	
 	return h;
 }
 
+void ValuePlug::hashInternal( const ComputeNode *node, const Context *context, IECore::MurmurHash &h ) const
+{
+	ComputeFuture::checkCancellation();
+	{
+		PerformanceMonitor::Measurement measurement( this, PerformanceMonitor::Measurement::Hash );
+		node->hash( this, context, h );
+	}
+	
+	if( h == IECore::MurmurHash() )
+	{
+		throw IECore::Exception( boost::str( boost::format( "ComputeNode::hash() not implemented for Plug \"%s\"." ) % fullName() ) );			
+	}
+	
+	if( context->m_dependencyTracker && !node->hashIsStableBetweenSessions() )
+	{
+		context->m_dependencyTracker->addUnstable();
+	}
+}
+
+bool ValuePlug::hashIsStableBetweenSessions() const
+{
+	const ValuePlug *source = this;
+	while( const ValuePlug *input = source->getInput<ValuePlug>() )
+	{
+		source = input;
+	}
+	
+	if( source->direction() == Plug::In )
+	{
+		// the hash is just that of the static value.
+		return true;
+	}
+	
+	// we rely on hash() having just been called on this thread,
+	// so that the dependencies for the source are in the hash cache.
+	// if they're not then we can't tell, and must assume the worst.
+	const HashCache &hashCache = g_hashCache.local();
+	HashCache::DependenciesMap::const_iterator it = hashCache.dependencies.find( source );
+	if( it == hashCache.dependencies.end() || it->second.dirtyCount != source->m_dirtyCount )
+	{
+		return false;
+	}
+	
+	return !static_cast<const Context::DependencyTracker *>( it->second.tracker.get() )->unstable();
+}
+
 void ValuePlug::hash( IECore::MurmurHash &h ) const
 {
 	h.append( hash() );
 }
 
+size_t ValuePlug::dirtyCount() const
+{
+	return m_dirtyCount;
+}
+
+ComputeFuturePtr ValuePlug::getValueAsync() const
+{
+	return ComputeFuture::launch( boost::bind( &ValuePlug::getObjectValue, ConstValuePlugPtr( this ) ) );
+}
+
+void ValuePlug::getValues( const std::vector<ConstContextPtr> &contexts, std::vector<IECore::ConstObjectPtr> &values ) const
+{
+	values.resize( contexts.size() );
+	tbb::parallel_for(
+		tbb::blocked_range<size_t>( 0, contexts.size(), 1 ),
+		ParallelGetValues( this, &ValuePlug::getObjectValue, contexts, values )
+	);
+}
+
 IECore::ConstObjectPtr ValuePlug::getObjectValue() const
 {
 	bool haveInput = getInput<Plug>();
@@ -387,11 +1134,7 @@ void ValuePlug::setObjectValue( IECore::ConstObjectPtr value )
 		// plugDirtiedSignal.
 		if( value->isNotEqualTo( m_staticValue ) )
 		{
-			Action::enact( 
-				this,
-				boost::bind( &ValuePlug::setValueInternal, Ptr( this ), value, true ),
-				boost::bind( &ValuePlug::setValueInternal, Ptr( this ), m_staticValue, true )
-			);
+			Action::enact( this, new SetValueAction( this, value, m_staticValue ) );
 		}		
 		return;
 	}
@@ -407,6 +1150,11 @@ bool ValuePlug::inCompute() const
 	return Computation::current();
 }
 
+void ValuePlug::dirty()
+{
+	m_dirtyCount = ++g_dirtyCount;
+}
+
 void ValuePlug::setValueInternal( IECore::ConstObjectPtr value, bool propagateDirtiness )
 {
 	m_staticValue = value;
@@ -440,3 +1188,46 @@ void ValuePlug::setCacheMemoryLimit( size_t bytes )
 {
 	Computation::setCacheMemoryLimit( bytes );
 }
+
+std::string ValuePlug::getDiskCacheDirectory()
+{
+	return Computation::diskCache().getDirectory();
+}
+
+void ValuePlug::setDiskCacheDirectory( const std::string &directory )
+{
+	Computation::diskCache().setDirectory( directory );
+}
+
+size_t ValuePlug::getDiskCacheLimit()
+{
+	return Computation::diskCache().getMaxCost();
+}
+
+void ValuePlug::setDiskCacheLimit( size_t bytes )
+{
+	Computation::diskCache().setMaxCost( bytes );
+}
+
+void ValuePlug::clearDiskCache()
+{
+	Computation::diskCache().clear();
+}
+
+IECore::CompoundDataPtr ValuePlug::cacheStatistics()
+{
+	return Computation::cacheStatistics();
+}
+
+void ValuePlug::resetCacheStatistics()
+{
+	Computation::resetCacheStatistics();
+}
+
+void ValuePlug::clearHashCache()
+{
+	for( ThreadSpecificHashCache::iterator it = g_hashCache.begin(), eIt = g_hashCache.end(); it != eIt; ++it )
+	{
+		it->clear();
+	}
+}
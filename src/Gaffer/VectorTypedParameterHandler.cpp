@@ -102,6 +102,12 @@ Gaffer::ConstPlugPtr VectorTypedParameterHandler<ParameterType>::plug() const
 template<typename ParameterType>
 void VectorTypedParameterHandler<ParameterType>::setParameterValue()
 {
+	IECore::MurmurHash h;
+	if( !plugValueChanged( m_plug.get(), h ) )
+	{
+		return;
+	}
+
 	IECore::ConstObjectPtr o = m_plug->getValue();
 	if( o )
 	{
@@ -111,12 +117,25 @@ void VectorTypedParameterHandler<ParameterType>::setParameterValue()
 	{
 		m_parameter->setValue( m_parameter->defaultValue()->copy() );
 	}
+	setParameterValueHash( h );
 }
 
 template<typename ParameterType>
 void VectorTypedParameterHandler<ParameterType>::setPlugValue()
 {
 	m_plug->setValue( static_cast<const DataType *>( m_parameter->getValue() ) );
+	setParameterValueHash( IECore::MurmurHash() );
+}
+
+template<typename ParameterType>
+IECore::ObjectPtr VectorTypedParameterHandler<ParameterType>::computeParameterValue() const
+{
+	IECore::ConstObjectPtr o = m_plug->getValue();
+	if( o )
+	{
+		return o->copy();
+	}
+	return m_parameter->defaultValue()->copy();
 }
 		
 // explicit instantiations
@@ -38,6 +38,7 @@
 #include "boost/python.hpp"
 
 #include "IECorePython/RunTimeTypedBinding.h"
+#include "IECorePython/ScopedGILRelease.h"
 
 #include "Gaffer/BoxPlug.h"
 
@@ -48,6 +49,24 @@ using namespace boost::python;
 using namespace GafferBindings;
 using namespace Gaffer;
 
+template<typename T>
+static void setValue( T *plug, const typename T::ValueType &value )
+{
+	// we use a GIL release here to prevent a lock in the case where this triggers a graph
+	// evaluation which decides to go back into python on another thread:
+	IECorePython::ScopedGILRelease r;
+	plug->setValue( value );
+}
+
+template<typename T>
+static typename T::ValueType getValue( const T *plug )
+{
+	// must release the GIL in case the computation spawns threads
+	// which need to reenter python.
+	IECorePython::ScopedGILRelease r;
+	return plug->getValue();
+}
+
 template<typename T>
 static void bind()
 {
@@ -65,8 +84,8 @@ static void bind()
 		)
 		.GAFFERBINDINGS_DEFPLUGWRAPPERFNS( T )
 		.def( "defaultValue", &T::defaultValue )
-		.def( "setValue", &T::setValue )
-		.def( "getValue", &T::getValue )
+		.def( "setValue", setValue<T> )
+		.def( "getValue", getValue<T> )
 	;
 }
 
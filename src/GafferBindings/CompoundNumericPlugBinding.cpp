@@ -39,6 +39,7 @@
 
 #include "IECorePython/IECoreBinding.h"
 #include "IECorePython/RunTimeTypedBinding.h"
+#include "IECorePython/ScopedGILRelease.h"
 
 #include "Gaffer/CompoundNumericPlug.h"
 
@@ -88,6 +89,24 @@ static std::string compoundNumericPlugRepr( const T *plug )
 	return result;
 }
 
+template<typename T>
+static void setValue( T *plug, const typename T::ValueType &value )
+{
+	// we use a GIL release here to prevent a lock in the case where this triggers a graph
+	// evaluation which decides to go back into python on another thread:
+	IECorePython::ScopedGILRelease r;
+	plug->setValue( value );
+}
+
+template<typename T>
+static typename T::ValueType getValue( const T *plug )
+{
+	// must release the GIL in case the computation spawns threads
+	// which need to reenter python.
+	IECorePython::ScopedGILRelease r;
+	return plug->getValue();
+}
+
 template<typename T>
 static void bind()
 {
@@ -111,8 +130,8 @@ static void bind()
 		.def( "hasMaxValue", &T::hasMaxValue )
 		.def( "minValue", &T::minValue )
 		.def( "maxValue", &T::maxValue )
-		.def( "setValue", &T::setValue )
-		.def( "getValue", &T::getValue )
+		.def( "setValue", setValue<T> )
+		.def( "getValue", getValue<T> )
 		.def( "__repr__", &compoundNumericPlugRepr<T> )
 	;
 
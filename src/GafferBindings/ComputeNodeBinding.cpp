@@ -48,5 +48,7 @@ void GafferBindings::bindComputeNode()
 	typedef ComputeNodeWrapper<ComputeNode> Wrapper;
 	IE_CORE_DECLAREPTR( Wrapper );
 
-	DependencyNodeClass<ComputeNode, WrapperPtr>();	
+	DependencyNodeClass<ComputeNode, WrapperPtr>()
+		.def( "hashIsStableBetweenSessions", &ComputeNode::hashIsStableBetweenSessions )
+	;
 }
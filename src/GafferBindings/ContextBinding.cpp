@@ -152,6 +152,7 @@ void bindContext()
 		.def( "names", &names )
 		.def( "keys", &names )
 		.def( "changedSignal", &Context::changedSignal, return_internal_reference<1>() )
+		.def( "hash", &Context::hash )
 		.def( self == self )
 		.def( self != self )
 		.def( "substitute", &Context::substitute )
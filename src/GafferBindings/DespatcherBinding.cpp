@@ -37,6 +37,7 @@
 #include "boost/python.hpp"
 #include "IECorePython/RunTimeTypedBinding.h"
 #include "IECorePython/Wrapper.h"
+#include "IECorePython/ScopedGILRelease.h"
 #include "GafferBindings/DespatcherBinding.h"
 #include "GafferBindings/SignalBinding.h"
 #include "Gaffer/Node.h"
@@ -125,7 +126,12 @@ class DespatcherWrap : public Despatcher, public Wrapper<Despatcher>
 			}
 
 			std::vector< Despatcher::TaskDescription > uniqueTasks;
-			Despatcher::uniqueTasks( tasks, uniqueTasks );
+			{
+				// executionHash() may compute in parallel, so we must release
+				// the GIL in case the computations require it.
+				ScopedGILRelease gilRelease;
+				Despatcher::uniqueTasks( tasks, uniqueTasks );
+			}
 			
 			list result;
 			for( std::vector< TaskDescription >::const_iterator fIt = uniqueTasks.begin(); fIt != uniqueTasks.end(); fIt++ )
@@ -140,6 +146,18 @@ class DespatcherWrap : public Despatcher, public Wrapper<Despatcher>
 			return result;
 		}
 
+		static bool upToDate( const Executable::Task &task, const IECore::MurmurHash &hash )
+		{
+			ScopedGILRelease gilRelease;
+			return Despatcher::upToDate( task, hash );
+		}
+
+		static void recordExecution( const Executable::Task &task, const IECore::MurmurHash &hash )
+		{
+			ScopedGILRelease gilRelease;
+			Despatcher::recordExecution( task, hash );
+		}
+
 		static void registerDespatcher( std::string name, Despatcher *despatcher )
 		{
 			Despatcher::registerDespatcher( name, despatcher );
@@ -187,6 +205,8 @@ void GafferBindings::bindDespatcher()
 		.def( "despatcherNames", &DespatcherWrap::despatcherNames ).staticmethod( "despatcherNames" )
 		.def( "_registerDespatcher", &DespatcherWrap::registerDespatcher ).staticmethod( "_registerDespatcher" )
 		.def( "_uniqueTasks", &DespatcherWrap::uniqueTasks ).staticmethod( "_uniqueTasks" )
+		.def( "_upToDate", &DespatcherWrap::upToDate ).staticmethod( "_upToDate" )
+		.def( "_recordExecution", &DespatcherWrap::recordExecution ).staticmethod( "_recordExecution" )
 		.def( "preDespatchSignal", &Despatcher::preDespatchSignal, return_value_policy<reference_existing_object>() ).staticmethod( "preDespatchSignal" )
 		.def( "postDespatchSignal", &Despatcher::postDespatchSignal, return_value_policy<reference_existing_object>() ).staticmethod( "postDespatchSignal" )
 	;
@@ -153,6 +153,36 @@ class ExecutableNodeWrapper : public NodeWrapper< ExecutableNode >
 				throw Exception( "executionHash() python method not defined" );
 			}
 		}
+
+		virtual void executionOutputs( const Context *context, std::vector<std::string> &fileNames ) const
+		{
+			ScopedGILLock gilLock;
+			override o = this->get_override( "executionOutputs" );
+			if( !o )
+			{
+				ExecutableNode::executionOutputs( context, fileNames );
+				return;
+			}
+
+			list outputList = o( ContextPtr( const_cast<Context *>( context ) ) );
+			size_t len = boost::python::len( outputList );
+			fileNames.reserve( fileNames.size() + len );
+			for( size_t i = 0; i < len; i++ )
+			{
+				fileNames.push_back( extract<std::string>( outputList[i] ) );
+			}
+		}
+
+		virtual bool executionIsThreadSafe() const
+		{
+			ScopedGILLock gilLock;
+			override o = this->get_override( "executionIsThreadSafe" );
+			if( !o )
+			{
+				return ExecutableNode::executionIsThreadSafe();
+			}
+			return o();
+		}
 		
 };
 
@@ -96,6 +96,15 @@ static void setValue( T *plug, const typename T::ValueType value )
 	plug->setValue( value );
 }
 
+template<typename T>
+static typename T::ValueType getValue( const T *plug )
+{
+	// must release the GIL in case the computation spawns threads
+	// which need to reenter python.
+	IECorePython::ScopedGILRelease r;
+	return plug->getValue();
+}
+
 
 template<typename T>
 static void bind()
@@ -121,7 +130,7 @@ static void bind()
 		.def( "minValue", &T::minValue )
 		.def( "maxValue", &T::maxValue )
 		.def( "setValue", setValue<T> )
-		.def( "getValue", &T::getValue )
+		.def( "getValue", getValue<T> )
 		.def( "__repr__", &repr<T> )
 	;
 
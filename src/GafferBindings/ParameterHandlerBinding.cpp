@@ -39,6 +39,7 @@
 
 #include "IECorePython/RefCountedBinding.h"
 #include "IECorePython/ScopedGILLock.h"
+#include "IECorePython/ScopedGILRelease.h"
 #include "IECorePython/Wrapper.h"
 
 #include "Gaffer/ParameterHandler.h"
@@ -144,6 +145,12 @@ static void registerParameterHandler( IECore::TypeId parameterType, object creat
 	ParameterHandler::registerParameterHandler( parameterType, ParameterHandlerCreator( creator ) );
 }
 
+static IECore::ObjectPtr computeParameterValue( const ParameterHandler &parameterHandler )
+{
+	IECorePython::ScopedGILRelease gilRelease;
+	return parameterHandler.computeParameterValue();
+}
+
 void GafferBindings::bindParameterHandler()
 {
 	
@@ -155,6 +162,7 @@ void GafferBindings::bindParameterHandler()
 		.def( "plug", (PlugPtr (ParameterHandler::*)())&ParameterHandler::plug )
 		.def( "setParameterValue", &ParameterHandler::setParameterValue )
 		.def( "setPlugValue", &ParameterHandler::setPlugValue )
+		.def( "computeParameterValue", &computeParameterValue )
 		.def( "create", &ParameterHandler::create ).staticmethod( "create" )
 		.def( "registerParameterHandler", &registerParameterHandler ).staticmethod( "registerParameterHandler" )
 	;
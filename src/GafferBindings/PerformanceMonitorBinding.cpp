@@ -0,0 +1,85 @@
+//////////////////////////////////////////////////////////////////////////
+//  
+//  Copyright (c) 2013, Image Engine Design Inc. All rights reserved.
+//  
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//  
+//      * Redistributions of source code must retain the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer.
+//  
+//      * Redistributions in binary form must reproduce the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer in the documentation and/or other materials provided with
+//        the distribution.
+//  
+//      * Neither the name of John Haddon nor the names of
+//        any other contributors to this software may be used to endorse or
+//        promote products derived from this software without specific prior
+//        written permission.
+//  
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//  
+//////////////////////////////////////////////////////////////////////////
+
+
+#include "boost/python.hpp"
+
+#include "IECorePython/RefCountedBinding.h"
+
+#include "Gaffer/PerformanceMonitor.h"
+
+#include "GafferBindings/PerformanceMonitorBinding.h"
+
+using namespace boost::python;
+using namespace GafferBindings;
+using namespace Gaffer;
+
+// plugs aren't hashable in python, so rather than return a dict
+// we return a list of ( plug, statistics ) tuples.
+static list allStatistics( const PerformanceMonitor &monitor )
+{
+	list result;
+	const PerformanceMonitor::StatisticsMap statistics = monitor.allStatistics();
+	for( PerformanceMonitor::StatisticsMap::const_iterator it = statistics.begin(), eIt = statistics.end(); it != eIt; ++it )
+	{
+		result.append( make_tuple( ValuePlugPtr( const_cast<ValuePlug *>( it->first.get() ) ), it->second ) );
+	}
+	return result;
+}
+
+void GafferBindings::bindPerformanceMonitor()
+{
+	scope s = IECorePython::RefCountedClass<PerformanceMonitor, IECore::RefCounted>( "PerformanceMonitor" )
+		.def( init<>() )
+		.def( "allStatistics", &allStatistics )
+		.def( "plugStatistics", &PerformanceMonitor::plugStatistics )
+		.def( "combinedStatistics", &PerformanceMonitor::combinedStatistics )
+		.def( "clear", &PerformanceMonitor::clear )
+	;
+	
+	class_<PerformanceMonitor::Statistics>( "Statistics" )
+		.def_readonly( "hashCount", &PerformanceMonitor::Statistics::hashCount )
+		.def_readonly( "computeCount", &PerformanceMonitor::Statistics::computeCount )
+		.def_readonly( "cacheHitCount", &PerformanceMonitor::Statistics::cacheHitCount )
+		.def_readonly( "hashWallTime", &PerformanceMonitor::Statistics::hashWallTime )
+		.def_readonly( "hashCPUTime", &PerformanceMonitor::Statistics::hashCPUTime )
+		.def_readonly( "computeWallTime", &PerformanceMonitor::Statistics::computeWallTime )
+		.def_readonly( "computeCPUTime", &PerformanceMonitor::Statistics::computeCPUTime )
+	;
+	
+	class_<PerformanceMonitor::Scope, boost::noncopyable>( "_Scope", init<PerformanceMonitorPtr>() )
+	;
+}
@@ -38,6 +38,18 @@
 #include "boost/python.hpp" // must be the first include
 
 #include <fstream>
+#include <sstream>
+#include <iterator>
+#include <cstdio>
+#include <ctime>
+#include <map>
+
+#include <sys/stat.h>
+#include <unistd.h>
+
+#include "marshal.h"
+
+#include "IECore/MurmurHash.h"
 
 #include "IECorePython/Wrapper.h"
 #include "IECorePython/RunTimeTypedBinding.h"
@@ -58,6 +70,36 @@ using namespace Gaffer;
 namespace GafferBindings
 {
 
+namespace
+{
+
+// files executed with executeFile() are cached in memory along with
+// their compiled code, so that the many References to the same file
+// typically found in a script need read and compile it only once.
+// access is protected by the GIL.
+struct CachedFile
+{
+	time_t modificationTime;
+	off_t size;
+	// the time at which the entry was made, used to detect
+	// modifications made within the resolution of modificationTime.
+	time_t cacheTime;
+	std::string pythonScript;
+	object code;
+};
+
+typedef std::map<std::string, CachedFile> CachedFiles;
+
+CachedFiles &cachedFiles()
+{
+	// deliberately leaked, so that the python objects within are
+	// not destroyed after the interpreter has been shut down.
+	static CachedFiles *c = new CachedFiles;
+	return *c;
+}
+
+} // namespace
+
 /// The ScriptNodeWrapper class implements the scripting
 /// components of the ScriptNode base class. In this way
 /// scripting is available provided that the ScriptNode was
@@ -79,15 +121,16 @@ class ScriptNodeWrapper : public NodeWrapper<ScriptNode>
 		virtual void execute( const std::string &pythonScript, Node *parent = 0 )
 		{
 			IECorePython::ScopedGILLock gilLock;
-			object e = executionDict( parent );
-			exec( pythonScript.c_str(), e, e );
-			scriptExecutedSignal()( this, pythonScript );
+			executeInternal( pythonScript, object(), parent );
 		}
 
 		void executeFile( const std::string &pythonFile, Node *parent = 0 )
 		{
-			const std::string pythonScript = readFile( pythonFile );
-			execute( pythonScript, parent );
+			IECorePython::ScopedGILLock gilLock;
+			// we take a copy because execution may recursively
+			// execute the same file, modifying the cache.
+			const CachedFile file = cachedFile( pythonFile );
+			executeInternal( file.pythonScript, file.code, parent );
 		}
 		
 		virtual PyObject *evaluate( const std::string &pythonExpression, Node *parent = 0 )
@@ -129,12 +172,19 @@ class ScriptNodeWrapper : public NodeWrapper<ScriptNode>
 		
 		virtual void load()
 		{
-			const std::string s = readFile( fileNamePlug()->getValue() );
+			const std::string fileName = fileNamePlug()->getValue();
+			const std::string s = readFile( fileName );
+			
+			// loading isn't undoable, so there's no point
+			// in creating actions for every edit made.
+			UndoContext undoDisabled( this, UndoContext::Disabled );
 			
 			deleteNodes();			
-			execute( s );
 			
-			UndoContext undoDisabled( this, UndoContext::Disabled );
+			IECorePython::ScopedGILLock gilLock;
+			object code = compiledScript( fileName, s );
+			executeInternal( s, code, 0 );
+			
 			unsavedChangesPlug()->setValue( false );
 		}
 		
@@ -147,6 +197,198 @@ class ScriptNodeWrapper : public NodeWrapper<ScriptNode>
 				
 	private :
 	
+		// executes the precompiled code if it is provided,
+		// and the python script otherwise.
+		void executeInternal( const std::string &pythonScript, object code, Node *parent )
+		{
+			object e = executionDict( parent );
+			
+			PyObject *errorType = 0, *errorValue = 0, *errorTraceback = 0;
+			{
+				ExecutionScope executionScope( this );
+				try
+				{
+					if( code.ptr() != Py_None )
+					{
+						PyObject *result = PyEval_EvalCode( (PyCodeObject *)code.ptr(), e.ptr(), e.ptr() );
+						if( !result )
+						{
+							throw_error_already_set();
+						}
+						Py_DECREF( result );
+					}
+					else
+					{
+						exec( pythonScript.c_str(), e, e );
+					}
+				}
+				catch( const error_already_set & )
+				{
+					// the execution scope emits signals when it is destroyed,
+					// and python slots mustn't be called while an exception is
+					// pending, so we stash the exception until afterwards.
+					PyErr_Fetch( &errorType, &errorValue, &errorTraceback );
+				}
+			}
+			
+			if( errorType )
+			{
+				PyErr_Restore( errorType, errorValue, errorTraceback );
+				throw_error_already_set();
+			}
+			
+			scriptExecutedSignal()( this, pythonScript );
+		}
+		
+		// returns a code object for the contents of the specified file, using
+		// the sidecar cache if it is enabled, or None if it is not. must be
+		// called with the GIL held.
+		object compiledScript( const std::string &fileName, const std::string &pythonScript )
+		{
+			const char *enabled = getenv( "GAFFER_SCRIPT_CACHE" );
+			if( !enabled || std::string( enabled ) != "1" )
+			{
+				return object();
+			}
+			
+			struct stat fileStat;
+			if( stat( fileName.c_str(), &fileStat ) != 0 )
+			{
+				return object();
+			}
+			
+			// the header identifies both the source file and the version of
+			// python which wrote the cache, as the marshal format isn't stable
+			// across versions.
+			IECore::MurmurHash h;
+			h.append( pythonScript );
+			std::ostringstream header;
+			header << "GFRC " << PyImport_GetMagicNumber() << " " << fileStat.st_mtime << " " << h.toString() << "\n";
+			
+			const std::string cacheFileName = fileName + "c";
+			
+			// try to reuse the existing cache
+			std::ifstream cacheFile( cacheFileName.c_str(), std::ios::in | std::ios::binary );
+			if( cacheFile.good() )
+			{
+				std::string cacheHeader;
+				std::getline( cacheFile, cacheHeader );
+				if( cacheFile.good() && cacheHeader + "\n" == header.str() )
+				{
+					std::string data( ( std::istreambuf_iterator<char>( cacheFile ) ), std::istreambuf_iterator<char>() );
+					PyObject *code = PyMarshal_ReadObjectFromString( const_cast<char *>( data.c_str() ), data.size() );
+					if( code && PyCode_Check( code ) )
+					{
+						return object( handle<>( code ) );
+					}
+					// the cache is corrupt - fall through and rewrite it.
+					Py_XDECREF( code );
+					PyErr_Clear();
+				}
+			}
+			cacheFile.close();
+			
+			// compile the script and write a new cache. compilation errors are
+			// left to be reported by the regular execution of the script.
+			PyObject *code = Py_CompileString( pythonScript.c_str(), fileName.c_str(), Py_file_input );
+			if( !code )
+			{
+				PyErr_Clear();
+				return object();
+			}
+			object result( handle<>( code ) );
+			
+			PyObject *data = PyMarshal_WriteObjectToString( code, Py_MARSHAL_VERSION );
+			if( !data )
+			{
+				PyErr_Clear();
+				return result;
+			}
+			
+			// write to a temporary file and rename it into place, so that
+			// other processes loading the same script concurrently never see
+			// a partially written cache. failure to write the cache is not an
+			// error - the script is still executed.
+			std::ostringstream tmpFileName;
+			tmpFileName << cacheFileName << "." << getpid() << ".tmp";
+			{
+				std::ofstream f( tmpFileName.str().c_str(), std::ios::out | std::ios::binary );
+				f << header.str();
+				f.write( PyString_AS_STRING( data ), PyString_GET_SIZE( data ) );
+				if( f.good() )
+				{
+					f.close();
+					if( rename( tmpFileName.str().c_str(), cacheFileName.c_str() ) != 0 )
+					{
+						remove( tmpFileName.str().c_str() );
+					}
+				}
+				else
+				{
+					f.close();
+					remove( tmpFileName.str().c_str() );
+				}
+			}
+			Py_DECREF( data );
+			
+			return result;
+		}
+		
+		// returns the cached contents of the specified file, updating the
+		// cache first if the file has been modified. must be called with
+		// the GIL held.
+		const CachedFile &cachedFile( const std::string &fileName )
+		{
+			struct stat fileStat;
+			if( stat( fileName.c_str(), &fileStat ) != 0 )
+			{
+				throw IECore::IOException( "Unable to open file \"" + fileName + "\"" );
+			}
+		
+			CachedFiles &files = cachedFiles();
+			CachedFiles::iterator it = files.find( fileName );
+			if( it != files.end() && it->second.modificationTime == fileStat.st_mtime && it->second.size == fileStat.st_size )
+			{
+				if( it->second.modificationTime < it->second.cacheTime )
+				{
+					return it->second;
+				}
+				// the file may have been modified again within the same
+				// second as the entry was made, without the modification time
+				// changing, so we must check the contents.
+				const std::string pythonScript = readFile( fileName );
+				if( pythonScript == it->second.pythonScript )
+				{
+					it->second.cacheTime = time( 0 );
+					return it->second;
+				}
+			}
+			
+			CachedFile &file = files[fileName];
+			file.modificationTime = fileStat.st_mtime;
+			file.size = fileStat.st_size;
+			file.cacheTime = time( 0 );
+			file.pythonScript = readFile( fileName );
+			file.code = compiledScript( fileName, file.pythonScript );
+			if( file.code.ptr() == Py_None )
+			{
+				PyObject *code = Py_CompileString( file.pythonScript.c_str(), fileName.c_str(), Py_file_input );
+				if( code )
+				{
+					file.code = object( handle<>( code ) );
+				}
+				else
+				{
+					// leave the error to be reported by the regular
+					// execution of the script, and don't cache it.
+					PyErr_Clear();
+					file.cacheTime = file.modificationTime;
+				}
+			}
+			
+			return file;
+		}
+		
 		std::string readFile( const std::string &fileName )
 		{
 			std::ifstream f( fileName.c_str() );
@@ -279,6 +521,9 @@ void bindScriptNode()
 		.def( "redoAvailable", &ScriptNode::redoAvailable )
 		.def( "redo", &ScriptNode::redo )
 		.def( "actionSignal", &ScriptNode::actionSignal, return_internal_reference<1>() )
+		.def( "setUndoMemoryLimit", &ScriptNode::setUndoMemoryLimit )
+		.def( "getUndoMemoryLimit", &ScriptNode::getUndoMemoryLimit )
+		.def( "undoMemoryUsage", &ScriptNode::undoMemoryUsage )
 		.def( "copy", &ScriptNode::copy, ( arg_( "parent" ) = object(), arg_( "filter" ) = object() ) )
 		.def( "cut", &ScriptNode::cut, ( arg_( "parent" ) = object(), arg_( "filter" ) = object() ) )
 		.def( "paste", &ScriptNode::paste, ( arg_( "parent" ) = object() ) )
@@ -288,6 +533,8 @@ void bindScriptNode()
 		.def( "evaluate", &ScriptNode::evaluate, ( arg_( "parent" ) = object() ) )
 		.def( "scriptExecutedSignal", &ScriptNode::scriptExecutedSignal, return_internal_reference<1>() )
 		.def( "scriptEvaluatedSignal", &ScriptNode::scriptEvaluatedSignal, return_internal_reference<1>() )
+		.def( "isExecuting", &ScriptNode::isExecuting )
+		.def( "executionFinishedSignal", &ScriptNode::executionFinishedSignal, return_internal_reference<1>() )
 		.def( "serialise", &ScriptNode::serialise, ( arg_( "parent" ) = object(), arg_( "filter" ) = object() ) )
 		.def( "serialiseToFile", &ScriptNode::serialiseToFile, ( arg_( "fileName" ), arg_( "parent" ) = object(), arg_( "filter" ) = object() ) )
 		.def( "save", &ScriptNode::save )
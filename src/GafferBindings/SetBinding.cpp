@@ -103,6 +103,24 @@ struct MemberSignalSlotCaller
 
 };
 
+struct MembersChangedSlotCaller
+{
+	
+	boost::signals::detail::unusable operator()( boost::python::object slot, SetPtr s )
+	{
+		try
+		{
+			slot( s );
+		}
+		catch( const boost::python::error_already_set &e )
+		{
+			PyErr_PrintEx( 0 ); // clears the error status
+		}
+		return boost::signals::detail::unusable();
+	}
+
+};
+
 void bindSet()
 {
 	
@@ -120,9 +138,11 @@ void bindSet()
 		.def( "__getitem__", &getItem )
 		.def( "memberAddedSignal", &Set::memberAddedSignal, boost::python::return_internal_reference<1>() )
 		.def( "memberRemovedSignal", &Set::memberRemovedSignal, boost::python::return_internal_reference<1>() )
+		.def( "membersChangedSignal", &Set::membersChangedSignal, boost::python::return_internal_reference<1>() )
 	;	
 
 	SignalBinder<Set::MemberSignal, DefaultSignalCaller<Set::MemberSignal>, MemberSignalSlotCaller>::bind( "MemberSignal" );
+	SignalBinder<Set::MembersChangedSignal, DefaultSignalCaller<Set::MembersChangedSignal>, MembersChangedSlotCaller>::bind( "MembersChangedSignal" );
 	
 }
 
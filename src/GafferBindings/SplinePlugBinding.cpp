@@ -38,6 +38,7 @@
 #include "boost/python.hpp"
 
 #include "IECorePython/RunTimeTypedBinding.h"
+#include "IECorePython/ScopedGILRelease.h"
 
 #include "Gaffer/Node.h"
 #include "Gaffer/SplinePlug.h"
@@ -51,6 +52,24 @@ using namespace boost::python;
 using namespace GafferBindings;
 using namespace Gaffer;
 
+template<typename T>
+static void setValue( T *plug, const typename T::ValueType &value )
+{
+	// we use a GIL release here to prevent a lock in the case where this triggers a graph
+	// evaluation which decides to go back into python on another thread:
+	IECorePython::ScopedGILRelease r;
+	plug->setValue( value );
+}
+
+template<typename T>
+static typename T::ValueType getValue( const T *plug )
+{
+	// must release the GIL in case the computation spawns threads
+	// which need to reenter python.
+	IECorePython::ScopedGILRelease r;
+	return plug->getValue();
+}
+
 template<typename T>
 static void bind()
 {
@@ -68,8 +87,8 @@ static void bind()
 		)
 		.GAFFERBINDINGS_DEFPLUGWRAPPERFNS( T )
 		.def( "defaultValue", &T::defaultValue, return_value_policy<copy_const_reference>() )
-		.def( "setValue", &T::setValue )
-		.def( "getValue", &T::getValue )
+		.def( "setValue", setValue<T> )
+		.def( "getValue", getValue<T> )
 		.def( "numPoints", &T::numPoints )
 		.def( "addPoint", &T::addPoint )
 		.def( "removePoint", &T::removePoint )
@@ -40,6 +40,7 @@
 #include "IECore/MessageHandler.h"
 #include "IECore/NullObject.h"
 #include "IECorePython/RunTimeTypedBinding.h"
+#include "IECorePython/ScopedGILRelease.h"
 
 #include "Gaffer/TypedObjectPlug.h"
 #include "Gaffer/Node.h"
@@ -66,6 +67,10 @@ static void setValue( typename T::Ptr p, typename T::ValuePtr v, bool copy=true
 	{
 		v = v->copy();
 	}
+	
+	// we use a GIL release here to prevent a lock in the case where this triggers a graph
+	// evaluation which decides to go back into python on another thread:
+	IECorePython::ScopedGILRelease r;
 	p->setValue( v );
 }
 
@@ -80,7 +85,14 @@ static void setValue( typename T::Ptr p, typename T::ValuePtr v, bool copy=true
 template<typename T>
 static IECore::ObjectPtr getValue( typename T::Ptr p, bool copy=true )
 {
-	typename IECore::ConstObjectPtr v = p->getValue();
+	typename IECore::ConstObjectPtr v;
+	{
+		// must release the GIL in case the computation spawns threads
+		// which need to reenter python.
+		IECorePython::ScopedGILRelease r;
+		v = p->getValue();
+	}
+	
 	if( v )
 	{
 		if( copy )
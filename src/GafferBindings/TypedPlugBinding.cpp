@@ -38,6 +38,7 @@
 #include "boost/python.hpp"
 
 #include "IECorePython/RunTimeTypedBinding.h"
+#include "IECorePython/ScopedGILRelease.h"
 #include "IECorePython/IECoreBinding.h"
 
 #include "Gaffer/TypedPlug.h"
@@ -76,6 +77,24 @@ static std::string typedPlugRepr( const T *plug )
 	return result;
 }
 
+template<typename T>
+static void setValue( T *plug, const typename T::ValueType &value )
+{
+	// we use a GIL release here to prevent a lock in the case where this triggers a graph
+	// evaluation which decides to go back into python on another thread:
+	IECorePython::ScopedGILRelease r;
+	plug->setValue( value );
+}
+
+template<typename T>
+static typename T::ValueType getValue( const T *plug )
+{
+	// must release the GIL in case the computation spawns threads
+	// which need to reenter python.
+	IECorePython::ScopedGILRelease r;
+	return plug->getValue();
+}
+
 template<typename T>
 static void bind()
 {
@@ -93,8 +112,8 @@ static void bind()
 		)
 		.GAFFERBINDINGS_DEFPLUGWRAPPERFNS( T )
 		.def( "defaultValue", &T::defaultValue, return_value_policy<copy_const_reference>() )
-		.def( "setValue", &T::setValue )
-		.def( "getValue", &T::getValue )
+		.def( "setValue", setValue<T> )
+		.def( "getValue", getValue<T> )
 		.def( "repr", &typedPlugRepr<T> )
 	;
 	
@@ -51,6 +51,7 @@ void bindUndoContext()
 {	
 	scope s = class_<UndoContext>( "_UndoContext", init<ScriptNodePtr>() )
 		.def( init<ScriptNodePtr, UndoContext::State>() )
+		.def( init<ScriptNodePtr, UndoContext::State, const std::string &>() )
 	;
 
 	enum_<UndoContext::State>( "State" )
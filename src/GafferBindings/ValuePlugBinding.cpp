@@ -41,9 +41,11 @@
 #include "IECore/MurmurHash.h"
 #include "IECorePython/Wrapper.h"
 #include "IECorePython/RunTimeTypedBinding.h"
+#include "IECorePython/ScopedGILRelease.h"
 
 #include "Gaffer/ValuePlug.h"
 #include "Gaffer/Node.h"
+#include "Gaffer/Context.h"
 
 #include "GafferBindings/ValuePlugBinding.h"
 #include "GafferBindings/PlugBinding.h"
@@ -129,18 +131,74 @@ std::string ValuePlugSerialiser::postConstructor( const Gaffer::GraphComponent *
 	return "";
 }
 
+static list getValues( const ValuePlug &plug, object pythonContexts, bool copy )
+{
+	std::vector<ConstContextPtr> contexts;
+	for( long i = 0, e = len( pythonContexts ); i < e; ++i )
+	{
+		contexts.push_back( extract<ContextPtr>( pythonContexts[i] )() );
+	}
+	
+	std::vector<IECore::ConstObjectPtr> values;
+	{
+		// release the GIL so that python computes can
+		// run on the worker threads.
+		IECorePython::ScopedGILRelease gilRelease;
+		plug.getValues( contexts, values );
+	}
+	
+	list result;
+	for( std::vector<IECore::ConstObjectPtr>::const_iterator it = values.begin(), eIt = values.end(); it != eIt; ++it )
+	{
+		result.append( copy ? (*it)->copy() : IECore::constPointerCast<IECore::Object>( *it ) );
+	}
+	return result;
+}
+
+static IECore::MurmurHash hash( const ValuePlug &plug )
+{
+	// must release the GIL in case the computation spawns threads
+	// which need to reenter python.
+	IECorePython::ScopedGILRelease gilRelease;
+	return plug.hash();
+}
+
+static void hashInto( const ValuePlug &plug, IECore::MurmurHash &h )
+{
+	IECorePython::ScopedGILRelease gilRelease;
+	plug.hash( h );
+}
+
 void GafferBindings::bindValuePlug()
 {
 	IECorePython::RunTimeTypedClass<ValuePlug>()
 		.GAFFERBINDINGS_DEFPLUGWRAPPERFNS( ValuePlug )
 		.def( "settable", &ValuePlug::settable )
 		.def( "setToDefault", &ValuePlug::setToDefault )
-		.def( "hash", (IECore::MurmurHash (ValuePlug::*)() const)&ValuePlug::hash )
-		.def( "hash", (void (ValuePlug::*)( IECore::MurmurHash & ) const)&ValuePlug::hash )
+		.def( "hash", &hash )
+		.def( "hash", &hashInto )
+		.def( "getValueAsync", &ValuePlug::getValueAsync )
+		.def( "getValues", &getValues, ( arg_( "contexts" ), arg_( "_copy" ) = true ) )
 		.def( "getCacheMemoryLimit", &ValuePlug::getCacheMemoryLimit )
 		.staticmethod( "getCacheMemoryLimit" )
 		.def( "setCacheMemoryLimit", &ValuePlug::setCacheMemoryLimit )
 		.staticmethod( "setCacheMemoryLimit" )
+		.def( "getDiskCacheDirectory", &ValuePlug::getDiskCacheDirectory )
+		.staticmethod( "getDiskCacheDirectory" )
+		.def( "setDiskCacheDirectory", &ValuePlug::setDiskCacheDirectory )
+		.staticmethod( "setDiskCacheDirectory" )
+		.def( "getDiskCacheLimit", &ValuePlug::getDiskCacheLimit )
+		.staticmethod( "getDiskCacheLimit" )
+		.def( "setDiskCacheLimit", &ValuePlug::setDiskCacheLimit )
+		.staticmethod( "setDiskCacheLimit" )
+		.def( "clearDiskCache", &ValuePlug::clearDiskCache )
+		.staticmethod( "clearDiskCache" )
+		.def( "cacheStatistics", &ValuePlug::cacheStatistics )
+		.staticmethod( "cacheStatistics" )
+		.def( "resetCacheStatistics", &ValuePlug::resetCacheStatistics )
+		.staticmethod( "resetCacheStatistics" )
+		.def( "clearHashCache", &ValuePlug::clearHashCache )
+		.staticmethod( "clearHashCache" )
 		.def( "__repr__", &repr )
 	;
 
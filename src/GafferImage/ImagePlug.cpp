@@ -36,6 +36,7 @@
 //////////////////////////////////////////////////////////////////////////
 
 #include "tbb/tbb.h"
+#include "boost/bind.hpp"
 #include "IECore/Exception.h"
 #include "IECore/BoxOps.h"
 #include "IECore/BoxAlgo.h"
@@ -324,6 +325,11 @@ IECore::ImagePrimitivePtr ImagePlug::image() const
 	return result;
 }
 
+Gaffer::ComputeFuturePtr ImagePlug::imageAsync() const
+{
+	return ComputeFuture::launch( boost::bind( &ImagePlug::image, ConstImagePlugPtr( this ) ) );
+}
+
 IECore::MurmurHash ImagePlug::imageHash() const
 {
 	const Box2i dataWindow = dataWindowPlug()->getValue();
@@ -338,19 +344,16 @@ IECore::MurmurHash ImagePlug::imageHash() const
 	V2i maxTileOrigin = tileOrigin( dataWindow.max );
 
 	ContextPtr context = new Context( *Context::current() );
-	for( vector<string>::const_iterator it = channelNames.begin(), eIt = channelNames.end(); it!=eIt; it++ )
+	for( int tileOriginY = minTileOrigin.y; tileOriginY<=maxTileOrigin.y; tileOriginY += tileSize() )
 	{
-		for( int tileOriginY = minTileOrigin.y; tileOriginY<=maxTileOrigin.y; tileOriginY += tileSize() )
+		for( int tileOriginX = minTileOrigin.x; tileOriginX<=maxTileOrigin.x; tileOriginX += tileSize() )
 		{
-			for( int tileOriginX = minTileOrigin.x; tileOriginX<=maxTileOrigin.x; tileOriginX += tileSize() )
+			for( vector<string>::const_iterator it = channelNames.begin(), eIt = channelNames.end(); it!=eIt; it++ )
 			{
-				for( vector<string>::const_iterator it = channelNames.begin(), eIt = channelNames.end(); it!=eIt; it++ )
-				{
-					context->set( ImagePlug::channelNameContextName, *it );
-					context->set( ImagePlug::tileOriginContextName, V2i( tileOriginX, tileOriginY ) );
-					Context::Scope scope( context );
-					channelDataPlug()->hash( result );
-				}
+				context->set( ImagePlug::channelNameContextName, *it );
+				context->set( ImagePlug::tileOriginContextName, V2i( tileOriginX, tileOriginY ) );
+				Context::Scope scope( context );
+				channelDataPlug()->hash( result );
 			}
 		}
 	}
@@ -35,6 +35,8 @@
 //  
 //////////////////////////////////////////////////////////////////////////
 
+#include <sys/stat.h>
+
 #include "OpenImageIO/imagecache.h"
 OIIO_NAMESPACE_USING
 
@@ -126,19 +128,36 @@ void ImageReader::affects( const Gaffer::Plug *input, AffectedPlugsContainer &ou
 	}
 }
 
-void ImageReader::hashFormatPlug( const GafferImage::ImagePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const
+bool ImageReader::hashIsStableBetweenSessions() const
+{
+	return true;
+}
+
+void ImageReader::hashFileName( IECore::MurmurHash &h ) const
 {
 	fileNamePlug()->hash( h );
+	
+	const std::string fileName = fileNamePlug()->getValue();
+	struct stat s;
+	if( stat( fileName.c_str(), &s ) == 0 )
+	{
+		h.append( (uint64_t)s.st_mtime );
+	}
+}
+
+void ImageReader::hashFormatPlug( const GafferImage::ImagePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const
+{
+	hashFileName( h );
 }
 
 void ImageReader::hashChannelNamesPlug( const GafferImage::ImagePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const
 {
-	fileNamePlug()->hash( h );
+	hashFileName( h );
 }
 
 void ImageReader::hashDataWindowPlug( const GafferImage::ImagePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const
 {
-	fileNamePlug()->hash( h );
+	hashFileName( h );
 }
 
 void ImageReader::hashChannelDataPlug( const GafferImage::ImagePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const
@@ -147,7 +166,7 @@ void ImageReader::hashChannelDataPlug( const GafferImage::ImagePlug *output, con
 	h.append( context->get<V2i>( ImagePlug::tileOriginContextName ) );
 	
 	// ... along with the file name.
-	fileNamePlug()->hash( h );
+	hashFileName( h );
 }
 
 GafferImage::Format ImageReader::computeFormat( const Gaffer::Context *context, const ImagePlug *parent ) const
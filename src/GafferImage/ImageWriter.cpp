@@ -162,11 +162,32 @@ void ImageWriter::executionRequirements( const Context *context, Tasks &requirem
 		
 IECore::MurmurHash ImageWriter::executionHash( const Context *context ) const
 {
-	IECore::MurmurHash h = fileNamePlug()->hash();
+	Context::Scope scopedContext( context );
+
+	IECore::MurmurHash h;
+	h.append( typeId() );
+	h.append( context->substitute( fileNamePlug()->getValue() ) );
+	writeModePlug()->hash( h );
+	channelsPlug()->hash( h );
 	h.append( inPlug()->imageHash() );
 	return h;
 }
 
+void ImageWriter::executionOutputs( const Context *context, std::vector<std::string> &fileNames ) const
+{
+	Context::Scope scopedContext( context );
+	const std::string fileName = context->substitute( fileNamePlug()->getValue() );
+	if( fileName.size() )
+	{
+		fileNames.push_back( fileName );
+	}
+}
+
+bool ImageWriter::executionIsThreadSafe() const
+{
+	return true;
+}
+
 ///\todo: We are currently computing all of the channels regardless of whether or not we are outputting them.
 /// Change the execute() method to only compute the channels that are masked by the channelsPlug().
 
@@ -109,6 +109,11 @@ void OpenColorIO::affects( const Gaffer::Plug *input, AffectedPlugsContainer &ou
 	}
 }
 
+bool OpenColorIO::hashIsStableBetweenSessions() const
+{
+	return true;
+}
+
 void OpenColorIO::hashChannelDataPlug( const GafferImage::ImagePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const
 {
 	const std::string &channelName = context->get<std::string>( ImagePlug::channelNameContextName );
@@ -128,6 +133,9 @@ void OpenColorIO::hashChannelDataPlug( const GafferImage::ImagePlug *output, con
 		
 		inputSpacePlug()->hash( h );
 		outputSpacePlug()->hash( h );
+		
+		// the config may change between sessions, so we must account for it.
+		h.append( ::OpenColorIO::GetCurrentConfig()->getCacheID() );
 	}
 }
 
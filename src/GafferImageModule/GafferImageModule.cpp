@@ -97,6 +97,7 @@ BOOST_PYTHON_MODULE( _GafferImage )
 		.def( "channelData", &channelData )
 		.def( "channelDataHash", &ImagePlug::channelDataHash )
 		.def( "image", &image )
+		.def( "imageAsync", &ImagePlug::imageAsync )
 		.def( "imageHash", &ImagePlug::imageHash )
 		.def( "tileSize", &ImagePlug::tileSize ).staticmethod( "tileSize" )
 		.def( "tileBound", &ImagePlug::tileBound ).staticmethod( "tileBound" )
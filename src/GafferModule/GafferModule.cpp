@@ -77,6 +77,9 @@
 #include "GafferBindings/ExecutableNodeBinding.h"
 #include "GafferBindings/DespatcherBinding.h"
 #include "GafferBindings/ReferenceBinding.h"
+#include "GafferBindings/PerformanceMonitorBinding.h"
+#include "GafferBindings/ComputeFutureBinding.h"
+#include "GafferBindings/DirtyPropagationScopeBinding.h"
 
 using namespace Gaffer;
 using namespace GafferBindings;
@@ -123,6 +126,9 @@ BOOST_PYTHON_MODULE( _Gaffer )
 	bindDespatcher();
 	bindExecutableOpHolder();
 	bindReference();
+	bindPerformanceMonitor();
+	bindComputeFuture();
+	bindDirtyPropagationScope();
 			
 	DependencyNodeClass<ContextProcessorComputeNode>();
 	DependencyNodeClass<TimeWarpComputeNode>();
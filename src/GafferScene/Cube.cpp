@@ -78,6 +78,11 @@ void Cube::affects( const Plug *input, AffectedPlugsContainer &outputs ) const
 	}
 }
 
+bool Cube::hashIsStableBetweenSessions() const
+{
+	return true;
+}
+
 void Cube::hashSource( const Gaffer::Context *context, IECore::MurmurHash &h ) const
 {
 	dimensionsPlug()->hash( h );	
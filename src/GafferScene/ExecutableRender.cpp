@@ -36,6 +36,7 @@
 
 #include "IECore/SimpleTypedData.h"
 #include "IECore/WorldBlock.h"
+#include "IECore/Display.h"
 
 #include "IECoreGL/IECoreGL.h"
 #include "IECoreGL/Renderer.h"
@@ -67,11 +68,85 @@ void ExecutableRender::executionRequirements( const Gaffer::Context *context, Ta
 	Executable::defaultRequirements( this, context, requirements );
 }
 
+namespace
+{
+
+void displayFileNames( const ScenePlug *scene, const Gaffer::Context *context, std::vector<std::string> &fileNames )
+{
+	ConstCompoundObjectPtr globals = scene->globalsPlug()->getValue();
+	for( CompoundObject::ObjectMap::const_iterator it = globals->members().begin(), eIt = globals->members().end(); it != eIt; it++ )
+	{
+		if( const Display *display = runTimeCast<const Display>( it->second.get() ) )
+		{
+			const std::string fileName = context->substitute( display->getName() );
+			if( fileName.size() )
+			{
+				fileNames.push_back( fileName );
+			}
+		}
+	}
+}
+
+} // namespace
+
 IECore::MurmurHash ExecutableRender::executionHash( const Gaffer::Context *context ) const
 {
-	/// \todo How do we cheaply hash something representing the whole scene?
-	/// Do we just hash the identity of the input node?
-	return IECore::MurmurHash();
+	const ScenePlug *scene = inPlug()->getInput<ScenePlug>();
+	if( !scene )
+	{
+		return IECore::MurmurHash();
+	}
+
+	Context::Scope scopedContext( context );
+
+	IECore::MurmurHash h;
+	h.append( typeId() );
+	h.append( command() );
+	h.append( context->getFrame() );
+	for( InputValuePlugIterator it( this ); it!=it.end(); it++ )
+	{
+		if( it->get() != inPlug() )
+		{
+			(*it)->hash( h );
+		}
+	}
+
+	// The display names are substituted with the context, so must be
+	// hashed to distinguish tasks which render to different files, even
+	// when the scene itself doesn't vary between them.
+	std::vector<std::string> fileNames;
+	displayFileNames( scene, context, fileNames );
+	for( std::vector<std::string>::const_iterator it = fileNames.begin(), eIt = fileNames.end(); it != eIt; it++ )
+	{
+		h.append( *it );
+	}
+
+	// We can't cheaply hash the whole scene, but a traversal computing
+	// only hashes is still much cheaper than rendering it unnecessarily.
+	h.append( scene->hierarchyHash( ScenePlug::ScenePath() ) );
+
+	return h;
+}
+
+void ExecutableRender::executionOutputs( const Gaffer::Context *context, std::vector<std::string> &fileNames ) const
+{
+	const ScenePlug *scene = inPlug()->getInput<ScenePlug>();
+	if( !scene )
+	{
+		return;
+	}
+
+	Context::Scope scopedContext( context );
+
+	// When there is a command, execute() returns before it has completed,
+	// so the outputs can't be considered to have been written by the
+	// time the despatcher records the execution.
+	if( command().size() )
+	{
+		return;
+	}
+
+	displayFileNames( scene, context, fileNames );
 }
 
 void ExecutableRender::execute( const Contexts &contexts ) const
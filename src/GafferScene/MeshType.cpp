@@ -100,6 +100,11 @@ void MeshType::affects( const Gaffer::Plug *input, AffectedPlugsContainer &outpu
 	}
 }
 
+bool MeshType::hashIsStableBetweenSessions() const
+{
+	return true;
+}
+
 bool MeshType::processesObject() const
 {
 	return true;
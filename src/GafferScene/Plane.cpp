@@ -90,6 +90,11 @@ void Plane::affects( const Plug *input, AffectedPlugsContainer &outputs ) const
 	}
 }
 
+bool Plane::hashIsStableBetweenSessions() const
+{
+	return true;
+}
+
 void Plane::hashSource( const Gaffer::Context *context, IECore::MurmurHash &h ) const
 {
 	dimensionsPlug()->hash( h );	
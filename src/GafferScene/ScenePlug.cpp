@@ -36,6 +36,9 @@
 //////////////////////////////////////////////////////////////////////////
 
 #include "boost/tokenizer.hpp"
+#include "boost/bind.hpp"
+
+#include "tbb/parallel_for.h"
 
 #include "IECore/Exception.h"
 #include "IECore/NullObject.h"
@@ -278,6 +281,11 @@ IECore::ConstObjectPtr ScenePlug::object( const ScenePath &scenePath ) const
 	return objectPlug()->getValue();
 }
 
+Gaffer::ComputeFuturePtr ScenePlug::objectAsync( const ScenePath &scenePath ) const
+{
+	return ComputeFuture::launch( boost::bind( &ScenePlug::object, ConstScenePlugPtr( this ), scenePath ) );
+}
+
 IECore::ConstInternedStringVectorDataPtr ScenePlug::childNames( const ScenePath &scenePath ) const
 {
 	ContextPtr tmpContext = new Context( *Context::current() );
@@ -361,6 +369,87 @@ IECore::MurmurHash ScenePlug::childNamesHash( const ScenePath &scenePath ) const
 	return childNamesPlug()->hash();
 }
 
+namespace
+{
+
+void hierarchyHashWalk( const ScenePlug *plug, const Context *parentContext, const ScenePlug::ScenePath &scenePath, IECore::MurmurHash &h );
+
+// Hashes the children of a location in parallel. Each child is hashed
+// into its own MurmurHash, so that the results can be combined in order
+// and the final hash doesn't depend on the scheduling of the tasks.
+class ChildHashTask
+{
+
+	public :
+
+		ChildHashTask( const ScenePlug *plug, const Context *parentContext, const ScenePlug::ScenePath &parentPath, const std::vector<IECore::InternedString> &childNames, std::vector<IECore::MurmurHash> &childHashes )
+			:	m_plug( plug ), m_parentContext( parentContext ), m_parentPath( parentPath ), m_childNames( childNames ), m_childHashes( childHashes )
+		{
+		}
+
+		void operator()( const tbb::blocked_range<size_t> &r ) const
+		{
+			ScenePlug::ScenePath childPath( m_parentPath );
+			childPath.push_back( IECore::InternedString() );
+			for( size_t i=r.begin(); i!=r.end(); ++i )
+			{
+				childPath.back() = m_childNames[i];
+				hierarchyHashWalk( m_plug, m_parentContext, childPath, m_childHashes[i] );
+			}
+		}
+
+	private :
+
+		const ScenePlug *m_plug;
+		const Context *m_parentContext;
+		const ScenePlug::ScenePath &m_parentPath;
+		const std::vector<IECore::InternedString> &m_childNames;
+		std::vector<IECore::MurmurHash> &m_childHashes;
+
+};
+
+void hierarchyHashWalk( const ScenePlug *plug, const Context *parentContext, const ScenePlug::ScenePath &scenePath, IECore::MurmurHash &h )
+{
+	ContextPtr context = new Context( *parentContext );
+	context->set( ScenePlug::scenePathContextName, scenePath );
+	Context::Scope scopedContext( context.get() );
+
+	plug->boundPlug()->hash( h );
+	plug->transformPlug()->hash( h );
+	plug->attributesPlug()->hash( h );
+	plug->objectPlug()->hash( h );
+	plug->childNamesPlug()->hash( h );
+
+	IECore::ConstInternedStringVectorDataPtr childNamesData = plug->childNamesPlug()->getValue();
+	const std::vector<IECore::InternedString> &childNames = childNamesData->readable();
+	if( childNames.empty() )
+	{
+		return;
+	}
+
+	std::vector<IECore::MurmurHash> childHashes( childNames.size() );
+	tbb::parallel_for( tbb::blocked_range<size_t>( 0, childNames.size(), 1 ), ChildHashTask( plug, parentContext, scenePath, childNames, childHashes ) );
+
+	for( std::vector<IECore::MurmurHash>::const_iterator it = childHashes.begin(), eIt = childHashes.end(); it != eIt; ++it )
+	{
+		h.append( *it );
+	}
+}
+
+} // namespace
+
+IECore::MurmurHash ScenePlug::hierarchyHash( const ScenePath &scenePath ) const
+{
+	IECore::MurmurHash result;
+	if( scenePath.empty() )
+	{
+		globalsPlug()->hash( result );
+	}
+
+	hierarchyHashWalk( this, Context::current(), scenePath, result );
+	return result;
+}
+
 void ScenePlug::stringToPath( const std::string &s, ScenePlug::ScenePath &path )
 {
 	typedef boost::tokenizer<boost::char_separator<char> > Tokenizer;
@@ -242,15 +242,37 @@ void SceneProcedural::render( RendererPtr renderer ) const
 		std::set<float> deformationTimes;
 		motionTimes( ( m_options.deformationBlur && m_attributes.deformationBlur ) ? m_attributes.deformationBlurSegments : 0, deformationTimes );
 		{
-			ContextPtr timeContext = new Context( *m_context );
-			Context::Scope scopedTimeContext( timeContext );
-		
-			unsigned timeIndex = 0;
-			for( std::set<float>::const_iterator it = deformationTimes.begin(), eIt = deformationTimes.end(); it != eIt; it++, timeIndex++ )
+			vector<ConstContextPtr> timeContexts;
+			for( std::set<float>::const_iterator it = deformationTimes.begin(), eIt = deformationTimes.end(); it != eIt; it++ )
 			{
+				ContextPtr timeContext = new Context( *m_context );
 				timeContext->setFrame( *it );
-				ConstObjectPtr object = m_scenePlug->objectPlug()->getValue();
-				if( const Primitive *primitive = runTimeCast<const Primitive>( object.get() ) )
+				timeContexts.push_back( timeContext );
+			}
+			
+			// compute the first sample on its own, as only primitives
+			// are motion blurred and the remaining samples would be
+			// wasted on anything else.
+			vector<ConstObjectPtr> objects;
+			{
+				Context::Scope scopedTimeContext( timeContexts[0].get() );
+				objects.push_back( m_scenePlug->objectPlug()->getValue() );
+			}
+			
+			// then compute the remaining samples in parallel, rather
+			// than one after another.
+			if( timeContexts.size() > 1 && runTimeCast<const Primitive>( objects[0].get() ) )
+			{
+				vector<ConstContextPtr> remainingContexts( timeContexts.begin() + 1, timeContexts.end() );
+				vector<ConstObjectPtr> remainingObjects;
+				m_scenePlug->objectPlug()->getValues( remainingContexts, remainingObjects );
+				objects.insert( objects.end(), remainingObjects.begin(), remainingObjects.end() );
+			}
+		
+			for( unsigned timeIndex = 0; timeIndex < objects.size(); timeIndex++ )
+			{
+				const Object *object = objects[timeIndex].get();
+				if( const Primitive *primitive = runTimeCast<const Primitive>( object ) )
 				{
 					if( deformationTimes.size() > 1 && timeIndex == 0 )
 					{
@@ -264,7 +286,7 @@ void SceneProcedural::render( RendererPtr renderer ) const
 						renderer->motionEnd();
 					}
 				}
-				else if( const Camera *camera = runTimeCast<const Camera>( object.get() ) )
+				else if( const Camera *camera = runTimeCast<const Camera>( object ) )
 				{
 					/// \todo This absolutely does not belong here, but until we have
 					/// a mechanism for drawing manipulators, we don't have any other
@@ -275,7 +297,7 @@ void SceneProcedural::render( RendererPtr renderer ) const
 					}
 					break; // no motion blur for these chappies.
 				}
-				else if( const Light *light = runTimeCast<const Light>( object.get() ) )
+				else if( const Light *light = runTimeCast<const Light>( object ) )
 				{
 					/// \todo This doesn't belong here.
 					if( renderer->isInstanceOf( "IECoreGL::Renderer" ) )
@@ -284,7 +306,7 @@ void SceneProcedural::render( RendererPtr renderer ) const
 					}
 					break; // no motion blur for these chappies.
 				}
-				else if( const VisibleRenderable* renderable = runTimeCast< const VisibleRenderable >( object.get() ) )
+				else if( const VisibleRenderable* renderable = runTimeCast< const VisibleRenderable >( object ) )
 				{
 					renderable->render( renderer );
 					break; // no motion blur for these chappies.
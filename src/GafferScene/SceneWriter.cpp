@@ -55,7 +55,7 @@ const double SceneWriter::g_frameRate( 24 );
 size_t SceneWriter::g_firstPlugIndex = 0;
 
 SceneWriter::SceneWriter( const std::string &name )
-	:	Node( name )
+	:	ExecutableNode( name )
 {
 	storeIndexOfNextChild( g_firstPlugIndex );
 	addChild( new ScenePlug( "in", Plug::In ) );
@@ -86,44 +86,36 @@ const StringPlug *SceneWriter::fileNamePlug() const
 	return getChild<StringPlug>( g_firstPlugIndex + 1 );
 }
 
-void SceneWriter::writeLocation( GafferScene::ScenePlug *scenePlug, const ScenePlug::ScenePath &scenePath, IECore::SceneInterface *output )
+void SceneWriter::writeLocation( const GafferScene::ScenePlug *scenePlug, const ScenePlug::ScenePath &scenePath, IECore::SceneInterface *output ) const
 {
-	ContextPtr context = new Context;
-	
-	ScriptNodePtr script = ancestor<ScriptNode>();
-	
-	if( !script )
-	{
-		throw Exception( "SceneWrite::writeLocation: couldn't find parent script node!" );
-	}
-	
+	ContextPtr context = new Context( *Context::current() );
 	context->set( ScenePlug::scenePathContextName, scenePath );
-	context->setFrame( script->context()->getFrame() );
+	const double time = context->getFrame() / g_frameRate;
 	
 	Context::Scope scopedContext( context );
 	
 	ConstCompoundObjectPtr attributes = scenePlug->attributesPlug()->getValue();
 	for( CompoundObject::ObjectMap::const_iterator it = attributes->members().begin(), eIt = attributes->members().end(); it != eIt; it++ )
 	{
-		output->writeAttribute( it->first, it->second.get(), script->context()->getFrame() / g_frameRate );
+		output->writeAttribute( it->first, it->second.get(), time );
 	}
 	
 	if( scenePath.empty() )
 	{
 		ConstCompoundObjectPtr globals = scenePlug->globalsPlug()->getValue();
-		output->writeAttribute( "gaffer:globals", globals, script->context()->getFrame() / g_frameRate );
+		output->writeAttribute( "gaffer:globals", globals, time );
 	}
 	
 	ConstObjectPtr object = scenePlug->objectPlug()->getValue();
 	
 	if( object->typeId() != IECore::NullObjectTypeId && scenePath.size() > 0 )
 	{
-		output->writeObject( object, script->context()->getFrame() / g_frameRate );
+		output->writeObject( object, time );
 	}
 	
 	Imath::Box3f b = scenePlug->boundPlug()->getValue();
 	
-	output->writeBound( Imath::Box3d( Imath::V3f( b.min ), Imath::V3f( b.max ) ), script->context()->getFrame() / g_frameRate );
+	output->writeBound( Imath::Box3d( Imath::V3f( b.min ), Imath::V3f( b.max ) ), time );
 	
 	if( scenePath.size() )
 	{
@@ -135,7 +127,7 @@ void SceneWriter::writeLocation( GafferScene::ScenePlug *scenePlug, const SceneP
 			t[3][0], t[3][1], t[3][2], t[3][3]
 		);
 
-		output->writeTransform( new IECore::M44dData( transform ), script->context()->getFrame() / g_frameRate );
+		output->writeTransform( new IECore::M44dData( transform ), time );
 	}
 	
 	ConstInternedStringVectorDataPtr childNames = scenePlug->childNamesPlug()->getValue();
@@ -154,11 +146,65 @@ void SceneWriter::writeLocation( GafferScene::ScenePlug *scenePlug, const SceneP
 }
 
 
-void SceneWriter::execute()
+void SceneWriter::executionRequirements( const Context *context, Executable::Tasks &requirements ) const
+{
+	Executable::defaultRequirements( this, context, requirements );
+}
+
+IECore::MurmurHash SceneWriter::executionHash( const Context *context ) const
 {
-	ScenePlug* scenePlug = inPlug();
+	const ScenePlug *scenePlug = inPlug()->getInput<ScenePlug>();
+	if( !scenePlug )
+	{
+		return IECore::MurmurHash();
+	}
 
-	SceneInterfacePtr output = SceneInterface::create( fileNamePlug()->getValue(), IndexedIO::Write );
+	Context::Scope scopedContext( context );
+
+	IECore::MurmurHash h;
+	h.append( typeId() );
+	h.append( context->substitute( fileNamePlug()->getValue() ) );
+	h.append( context->getFrame() );
+	h.append( scenePlug->hierarchyHash( ScenePlug::ScenePath() ) );
+	return h;
+}
+
+void SceneWriter::execute( const Executable::Contexts &contexts ) const
+{
+	const ScenePlug *scenePlug = inPlug()->getInput<ScenePlug>();
+	if( !scenePlug )
+	{
+		throw IECore::Exception( "No input scene" );
+	}
+
+	for( Executable::Contexts::const_iterator it = contexts.begin(), eIt = contexts.end(); it != eIt; it++ )
+	{
+		Context::Scope scopedContext( it->get() );
+
+		const std::string fileName = (*it)->substitute( fileNamePlug()->getValue() );
+		SceneInterfacePtr output = SceneInterface::create( fileName, IndexedIO::Write );
 	
-	writeLocation( scenePlug, ScenePlug::ScenePath(), output.get() );
+		writeLocation( scenePlug, ScenePlug::ScenePath(), output.get() );
+	}
+}
+
+void SceneWriter::executionOutputs( const Context *context, std::vector<std::string> &fileNames ) const
+{
+	Context::Scope scopedContext( context );
+	const std::string fileName = context->substitute( fileNamePlug()->getValue() );
+	if( fileName.size() )
+	{
+		fileNames.push_back( fileName );
+	}
+}
+
+void SceneWriter::execute() const
+{
+	const ScriptNode *script = ancestor<ScriptNode>();
+	if( !script )
+	{
+		throw Exception( "SceneWriter::execute : couldn't find parent script node!" );
+	}
+
+	execute( Executable::Contexts( 1, script->context() ) );
 }
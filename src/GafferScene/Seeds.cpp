@@ -91,6 +91,11 @@ void Seeds::affects( const Plug *input, AffectedPlugsContainer &outputs ) const
 	}
 }
 
+bool Seeds::hashIsStableBetweenSessions() const
+{
+	return true;
+}
+
 void Seeds::hashBranchBound( const ScenePath &parentPath, const ScenePath &branchPath, const Gaffer::Context *context, IECore::MurmurHash &h ) const
 {
 	if( branchPath.size() == 0 )
@@ -139,6 +139,11 @@ void Sphere::affects( const Plug *input, AffectedPlugsContainer &outputs ) const
 	}
 }
 
+bool Sphere::hashIsStableBetweenSessions() const
+{
+	return true;
+}
+
 void Sphere::hashSource( const Gaffer::Context *context, IECore::MurmurHash &h ) const
 {
 	typePlug()->hash( h );
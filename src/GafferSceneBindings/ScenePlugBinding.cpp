@@ -40,6 +40,7 @@
 #include "boost/tokenizer.hpp"
 
 #include "IECorePython/RunTimeTypedBinding.h"
+#include "IECorePython/ScopedGILRelease.h"
 
 #include "GafferBindings/PlugBinding.h"
 
@@ -112,6 +113,13 @@ static IECore::ObjectPtr objectWrapper( const ScenePlug &plug, object scenePath,
 	return copy ? o->copy() : IECore::constPointerCast<IECore::Object>( o );
 }
 
+static Gaffer::ComputeFuturePtr objectAsyncWrapper( const ScenePlug &plug, object scenePath )
+{
+	ScenePlug::ScenePath p;
+	objectToScenePath( scenePath, p );
+	return plug.objectAsync( p );
+}
+
 static IECore::InternedStringVectorDataPtr childNamesWrapper( const ScenePlug &plug, object scenePath, bool copy=true )
 {
 	ScenePlug::ScenePath p;
@@ -162,6 +170,14 @@ IECore::MurmurHash childNamesHashWrapper( const ScenePlug &plug, object scenePat
 	return plug.childNamesHash( p );
 }
 
+IECore::MurmurHash hierarchyHashWrapper( const ScenePlug &plug, object scenePath )
+{
+	ScenePlug::ScenePath p;
+	objectToScenePath( scenePath, p );
+	IECorePython::ScopedGILRelease r;
+	return plug.hierarchyHash( p );
+}
+
 IECore::MurmurHash attributesHashWrapper( const ScenePlug &plug, object scenePath )
 {
 	ScenePlug::ScenePath p;
@@ -186,6 +202,7 @@ void GafferSceneBindings::bindScenePlug()
 		.def( "transform", &transformWrapper )
 		.def( "fullTransform", &fullTransformWrapper )
 		.def( "object", &objectWrapper, ( boost::python::arg_( "_copy" ) = true ) )
+		.def( "objectAsync", &objectAsyncWrapper )
 		.def( "childNames", &childNamesWrapper, ( boost::python::arg_( "_copy" ) = true ) )
 		.def( "attributes", &attributesWrapper, ( boost::python::arg_( "_copy" ) = true ) )
 		.def( "fullAttributes", &fullAttributesWrapper )
@@ -194,6 +211,7 @@ void GafferSceneBindings::bindScenePlug()
 		.def( "transformHash", &transformHashWrapper )
 		.def( "objectHash", &objectHashWrapper )
 		.def( "childNamesHash", &childNamesHashWrapper )
+		.def( "hierarchyHash", &hierarchyHashWrapper )
 		.def( "attributesHash", &attributesHashWrapper )
 	;
 	
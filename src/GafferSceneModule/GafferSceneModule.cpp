@@ -37,7 +37,10 @@
 
 #include "boost/python.hpp"
 
+#include "IECorePython/ScopedGILRelease.h"
+
 #include "GafferBindings/ComputeNodeBinding.h"
+#include "GafferBindings/ExecutableBinding.h"
 
 #include "GafferScene/SceneNode.h"
 #include "GafferScene/FileSource.h"
@@ -91,6 +94,12 @@ using namespace boost::python;
 using namespace GafferScene;
 using namespace GafferSceneBindings;
 
+static void sceneWriterExecute( const SceneWriter &sceneWriter )
+{
+	IECorePython::ScopedGILRelease gilRelease;
+	sceneWriter.execute();
+}
+
 BOOST_PYTHON_MODULE( _GafferScene )
 {
 	
@@ -121,9 +130,10 @@ BOOST_PYTHON_MODULE( _GafferScene )
 	GafferBindings::DependencyNodeClass<Camera>();
 	GafferBindings::DependencyNodeClass<GlobalsProcessor>();
 	GafferBindings::DependencyNodeClass<SceneReader>();
-	GafferBindings::NodeClass<SceneWriter>()
-		.def( "execute", &SceneWriter::execute )
-	;
+
+	GafferBindings::NodeClass<SceneWriter> sceneWriter;
+	GafferBindings::ExecutableBinding<GafferBindings::NodeClass<SceneWriter>, SceneWriter>::bind( sceneWriter );
+	sceneWriter.def( "execute", &sceneWriterExecute );
 
 	bindDisplays();
 	bindPathMatcher();
@@ -0,0 +1,117 @@
+//////////////////////////////////////////////////////////////////////////
+//  
+//  Copyright (c) 2013, Image Engine Design Inc. All rights reserved.
+//  
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//  
+//      * Redistributions of source code must retain the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer.
+//  
+//      * Redistributions in binary form must reproduce the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer in the documentation and/or other materials provided with
+//        the distribution.
+//  
+//      * Neither the name of John Haddon nor the names of
+//        any other contributors to this software may be used to endorse or
+//        promote products derived from this software without specific prior
+//        written permission.
+//  
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//  
+//////////////////////////////////////////////////////////////////////////
+
+
+#include "tbb/parallel_for.h"
+#include "tbb/blocked_range.h"
+
+#include "Gaffer/Context.h"
+
+#include "GafferTest/ParallelGetValue.h"
+
+using namespace Gaffer;
+
+namespace
+{
+
+class GetValue
+{
+
+	public :
+
+		GetValue( const IntPlug *plug, const Context *context )
+			:	m_plug( plug ), m_context( context )
+		{
+		}
+
+		void operator()( const tbb::blocked_range<size_t> &r ) const
+		{
+			Context::Scope scopedContext( m_context );
+			for( size_t i=r.begin(); i!=r.end(); ++i )
+			{
+				m_plug->getValue();
+			}
+		}
+
+	private :
+
+		const IntPlug *m_plug;
+		const Context *m_context;
+
+};
+
+class GetValueWithIteration
+{
+
+	public :
+
+		GetValueWithIteration( const IntPlug *plug, const Context *context, const IECore::InternedString &iterationVariable )
+			:	m_plug( plug ), m_context( context ), m_iterationVariable( iterationVariable )
+		{
+		}
+
+		void operator()( const tbb::blocked_range<size_t> &r ) const
+		{
+			for( size_t i=r.begin(); i!=r.end(); ++i )
+			{
+				ContextPtr context = new Context( *m_context );
+				context->set( m_iterationVariable, (int)i );
+				Context::Scope scopedContext( context.get() );
+				m_plug->getValue();
+			}
+		}
+
+	private :
+
+		const IntPlug *m_plug;
+		const Context *m_context;
+		const IECore::InternedString m_iterationVariable;
+
+};
+
+} // namespace
+
+void GafferTest::parallelGetValue( const Gaffer::IntPlug *plug, int iterations )
+{
+	GetValue getValue( plug, Context::current() );
+	tbb::parallel_for( tbb::blocked_range<size_t>( 0, iterations, 1 ), getValue );
+}
+
+void GafferTest::parallelGetValue( const Gaffer::IntPlug *plug, int iterations, const IECore::InternedString &iterationVariable )
+{
+	GetValueWithIteration getValue( plug, Context::current(), iterationVariable );
+	tbb::parallel_for( tbb::blocked_range<size_t>( 0, iterations, 1 ), getValue );
+}
@@ -35,15 +35,30 @@
 //  
 //////////////////////////////////////////////////////////////////////////
 
+#include "IECorePython/ScopedGILRelease.h"
+
 #include "GafferBindings/DependencyNodeBinding.h"
 
 #include "GafferTest/MultiplyNode.h"
 #include "GafferTest/RecursiveChildIteratorTest.h"
 #include "GafferTest/FilteredRecursiveChildIteratorTest.h"
+#include "GafferTest/ParallelGetValue.h"
 
 using namespace boost::python;
 using namespace GafferTest;
 
+static void parallelGetValueWrapper( const Gaffer::IntPlug *plug, int iterations )
+{
+	IECorePython::ScopedGILRelease gilRelease;
+	parallelGetValue( plug, iterations );
+}
+
+static void parallelGetValueWithIterationWrapper( const Gaffer::IntPlug *plug, int iterations, const std::string &iterationVariable )
+{
+	IECorePython::ScopedGILRelease gilRelease;
+	parallelGetValue( plug, iterations, iterationVariable );
+}
+
 BOOST_PYTHON_MODULE( _GafferTest )
 {
 	
@@ -51,5 +66,7 @@ BOOST_PYTHON_MODULE( _GafferTest )
 
 	def( "testRecursiveChildIterator", &testRecursiveChildIterator );
 	def( "testFilteredRecursiveChildIterator", &testFilteredRecursiveChildIterator );
+	def( "parallelGetValue", &parallelGetValueWrapper );
+	def( "parallelGetValue", &parallelGetValueWithIterationWrapper );
 
 }
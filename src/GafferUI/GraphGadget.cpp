@@ -72,7 +72,7 @@ using namespace std;
 IE_CORE_DEFINERUNTIMETYPED( GraphGadget );
 
 GraphGadget::GraphGadget( Gaffer::NodePtr root, Gaffer::SetPtr filter )
-	:	m_dragStartPosition( 0 ), m_lastDragPosition( 0 ), m_dragMode( None ), m_dragReconnectCandidate( 0 ), m_dragReconnectSrcNodule( 0 ), m_dragReconnectDstNodule( 0 )
+	:	m_graphUpdatePending( false ), m_dragStartPosition( 0 ), m_lastDragPosition( 0 ), m_dragMode( None ), m_dragReconnectCandidate( 0 ), m_dragReconnectSrcNodule( 0 ), m_dragReconnectDstNodule( 0 )
 {
 	keyPressSignal().connect( boost::bind( &GraphGadget::keyPressed, this, ::_1,  ::_2 ) );
 	buttonPressSignal().connect( boost::bind( &GraphGadget::buttonPress, this, ::_1,  ::_2 ) );
@@ -123,6 +123,16 @@ void GraphGadget::setRoot( Gaffer::NodePtr root, Gaffer::SetPtr filter )
 		m_scriptNode = m_root->scriptNode();
 	}
 	
+	if( m_scriptNode )
+	{
+		m_scriptExecutionFinishedConnection = m_scriptNode->executionFinishedSignal().connect( boost::bind( &GraphGadget::scriptExecutionFinished, this, ::_1 ) );
+	}
+	else
+	{
+		m_scriptExecutionFinishedConnection.disconnect();
+	}
+	m_graphUpdatePending = false;
+	
 	if( filter != m_filter )
 	{
 		setFilter( filter );
@@ -471,6 +481,15 @@ void GraphGadget::rootChildAdded( Gaffer::GraphComponent *root, Gaffer::GraphCom
 	Gaffer::Node *node = IECore::runTimeCast<Gaffer::Node>( child );
 	if( node && ( !m_filter || m_filter->contains( node ) ) )
 	{
+		if( m_scriptNode && m_scriptNode->isExecuting() )
+		{
+			// the script is probably being loaded or pasted, and making the
+			// gadgets and connections for each node as it arrives would be
+			// slow, so we defer until execution is finished.
+			m_graphUpdatePending = true;
+			return;
+		}
+		
 		if( !findNodeGadget( node ) )
 		{	addNodeGadget( node );
 			addConnectionGadgets( node );   
@@ -478,6 +497,15 @@ void GraphGadget::rootChildAdded( Gaffer::GraphComponent *root, Gaffer::GraphCom
 	}
 }
 
+void GraphGadget::scriptExecutionFinished( Gaffer::GraphComponent *script )
+{
+	if( m_graphUpdatePending )
+	{
+		m_graphUpdatePending = false;
+		updateGraph();
+	}
+}
+
 void GraphGadget::rootChildRemoved( Gaffer::GraphComponent *root, Gaffer::GraphComponent *child )
 {
 	Gaffer::Node *node = IECore::runTimeCast<Gaffer::Node>( child );
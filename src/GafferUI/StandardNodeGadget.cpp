@@ -68,7 +68,7 @@ static const float g_minWidth = 10.0f;
 static const float g_spacing = 0.5f;
 
 StandardNodeGadget::StandardNodeGadget( Gaffer::NodePtr node, LinearContainer::Orientation orientation )
-	:	NodeGadget( node ), m_nodeEnabled( true ), m_labelsVisibleOnHover( true ), m_dragDestinationProxy( 0 )
+	:	NodeGadget( node ), m_nodeEnabled( true ), m_labelsVisibleOnHover( true ), m_selected( false ), m_dragDestinationProxy( 0 )
 {
 	LinearContainer::Orientation oppositeOrientation = orientation == LinearContainer::X ? LinearContainer::Y : LinearContainer::X;
 
@@ -100,8 +100,10 @@ StandardNodeGadget::StandardNodeGadget( Gaffer::NodePtr node, LinearContainer::O
 	Gaffer::ScriptNodePtr script = node->scriptNode();
 	if( script )
 	{
-		script->selection()->memberAddedSignal().connect( boost::bind( &StandardNodeGadget::selectionChanged, this, ::_1,  ::_2 ) );
-		script->selection()->memberRemovedSignal().connect( boost::bind( &StandardNodeGadget::selectionChanged, this, ::_1,  ::_2 ) );
+		// we use the batched signal so that selecting many nodes at once
+		// costs each gadget a single update rather than one per node.
+		m_selected = script->selection()->contains( node );
+		script->selection()->membersChangedSignal().connect( boost::bind( &StandardNodeGadget::selectionChanged, this, ::_1 ) );
 	}
 	
 	node->childAddedSignal().connect( boost::bind( &StandardNodeGadget::childAdded, this, ::_1,  ::_2 ) );
@@ -349,10 +351,12 @@ const LinearContainer *StandardNodeGadget::inputNoduleContainer() const
 	return getChild<Gadget>()->getChild<LinearContainer>( 2 );
 }
 
-void StandardNodeGadget::selectionChanged( Gaffer::Set *selection, IECore::RunTimeTyped *n )
+void StandardNodeGadget::selectionChanged( Gaffer::Set *selection )
 {
-	if( n==node() )
+	bool selected = selection->contains( node() );
+	if( selected != m_selected )
 	{
+		m_selected = selected;
 		renderRequestSignal()( this );
 	}
 }
@@ -36,6 +36,7 @@
 ##########################################################################
 
 import Gaffer
+import GafferUI
 
 # add plugs to the preferences node
 
@@ -43,6 +44,75 @@ preferences = application.root()["preferences"]
 preferences["cache"] = Gaffer.CompoundPlug()
 preferences["cache"]["enabled"] = Gaffer.BoolPlug( defaultValue = True )
 preferences["cache"]["memoryLimit"] = Gaffer.IntPlug( defaultValue = Gaffer.ValuePlug.getCacheMemoryLimit() / ( 1024 * 1024 ) )
+preferences["cache"]["diskCacheDirectory"] = Gaffer.StringPlug()
+preferences["cache"]["diskCacheLimit"] = Gaffer.IntPlug( defaultValue = Gaffer.ValuePlug.getDiskCacheLimit() / ( 1024 * 1024 ) )
+# this plug exists purely to provide a place for the statistics widget below,
+# so we don't want it saved with the preferences.
+preferences["cache"]["statistics"] = Gaffer.StringPlug( flags = Gaffer.Plug.Flags.Default & ~Gaffer.Plug.Flags.Serialisable )
+
+# display cache statistics in the preferences
+
+class _CacheStatisticsPlugValueWidget( GafferUI.PlugValueWidget ) :
+
+	def __init__( self, plug, **kw ) :
+	
+		column = GafferUI.ListContainer( GafferUI.ListContainer.Orientation.Vertical, spacing = 4 )
+		
+		GafferUI.PlugValueWidget.__init__( self, column, plug, **kw )
+		
+		with column :
+		
+			self.__label = GafferUI.Label( "" )
+			
+			refreshButton = GafferUI.Button( "Refresh" )
+			self.__refreshButtonClickedConnection = refreshButton.clickedSignal().connect( Gaffer.WeakMethod( self.__refreshClicked ) )
+			
+		self._updateFromPlug()
+		
+	def hasLabel( self ) :
+	
+		return True
+		
+	def _updateFromPlug( self ) :
+	
+		statistics = Gaffer.ValuePlug.cacheStatistics()
+		
+		def megabytes( bytes ) :
+			return "%.1fMB" % ( bytes / ( 1024.0 * 1024.0 ) )
+		
+		hits = statistics["hits"].value
+		misses = statistics["misses"].value
+		lookups = hits + misses
+		
+		text = "<h4>Statistics</h4>"
+		text += "<table>"
+		text += "<tr><td>Memory used</td><td>%s of %s</td></tr>" % ( megabytes( statistics["currentCost"].value ), megabytes( statistics["maxCost"].value ) )
+		text += "<tr><td>Hits</td><td>%d (%.1f%%)</td></tr>" % ( hits, 100.0 * hits / lookups if lookups else 0 )
+		text += "<tr><td>Misses</td><td>%d</td></tr>" % misses
+		text += "<tr><td>Evictions</td><td>%d</td></tr>" % statistics["evictions"].value
+		if Gaffer.ValuePlug.getDiskCacheDirectory() :
+			text += "<tr><td>Disk used</td><td>%s of %s</td></tr>" % ( megabytes( statistics["diskCurrentCost"].value ), megabytes( statistics["diskMaxCost"].value ) )
+			text += "<tr><td>Disk hits</td><td>%d</td></tr>" % statistics["diskHits"].value
+		text += "</table>"
+		
+		for title, key in ( ( "Memory by node type", "costByNodeType" ), ( "Memory by node", "costByNode" ) ) :
+			costs = sorted( [ ( v.value, k ) for k, v in statistics[key].items() ], reverse = True )
+			text += "<h4>%s</h4><table>" % title
+			for cost, name in costs[:10] :
+				text += "<tr><td>%s</td><td>%s</td></tr>" % ( name, megabytes( cost ) )
+			text += "</table>"
+			
+		self.__label.setText( text )
+	
+	def __refreshClicked( self, button ) :
+	
+		self._updateFromPlug()
+
+GafferUI.PlugValueWidget.registerCreator(
+	Gaffer.Preferences.staticTypeId(),
+	"cache.statistics",
+	_CacheStatisticsPlugValueWidget,
+)
 
 # update cache settings when they change
 
@@ -57,4 +127,13 @@ def __plugSet( plug ) :
 	
 	Gaffer.ValuePlug.setCacheMemoryLimit( memoryLimit )
 	
+	Gaffer.ValuePlug.setDiskCacheLimit( plug["diskCacheLimit"].getValue() * 1024 * 1024 )
+	# changing directory rescans the cache files, so we
+	# only do it when the directory really has changed.
+	diskCacheDirectory = plug["diskCacheDirectory"].getValue()
+	if not plug["enabled"].getValue() :
+		diskCacheDirectory = ""
+	if diskCacheDirectory != Gaffer.ValuePlug.getDiskCacheDirectory() :
+		Gaffer.ValuePlug.setDiskCacheDirectory( diskCacheDirectory )
+	
 application.__cachePlugSetConnection = preferences.plugSetSignal().connect( __plugSet )